@@ -12,6 +12,8 @@ Commands:
   
   
   web       deploy web
+  confirm   deploy transfer confirmation worker
+  replace   deploy stuck transfer replacement worker
   migrate   deploy migrate
   *         Help
 "
@@ -22,8 +24,15 @@ case "$1" in
   
   
   web)
+    flask sync-nonces
     uwsgi --ini ./uwsgi.ini --enable-threads --single-interpreter
     ;;
+  confirm)
+    flask confirm-transfers
+    ;;
+  replace)
+    flask replace-stuck-transfers
+    ;;
   migrate)
     flask db upgrade
     ;;
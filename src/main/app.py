@@ -7,6 +7,8 @@ from flask import Flask
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from main import config
+from main.application_layer.adapters.failover_provider import FailoverProvider
 from main.presentation_layer import install_error_handlers
 from sqlalchemy import MetaData
 from web3 import Web3
@@ -25,7 +27,10 @@ convention = {
 
 metadata = MetaData(naming_convention=convention)
 db = SQLAlchemy(metadata=metadata)
-w3 = Web3(Web3.HTTPProvider(os.getenv("WEB3_PROVIDER")))
+provider_config = getattr(config, f'{ENV}Config')
+# WEB3_PROVIDER aceita vários endpoints separados por vírgula
+provider_uris = [uri.strip() for uri in os.getenv("WEB3_PROVIDER", "").split(",") if uri.strip()] or [None]
+w3 = Web3(FailoverProvider.from_config(provider_uris, provider_config))
 
 
 def create_app(deploy_env: str = ENV) -> Flask:
@@ -65,9 +70,16 @@ def __configure_logger(app: Flask):
 
 
 def __register_commands(app):
-    from main.commands import drop_create_tables
+    from main.commands import (
+        drop_create_tables, confirm_transfers, replace_stuck_transfers, sync_nonces, hot_wallet,
+        rebuild_whitelist_index)
 
     app.cli.command("drop-create-tables")(drop_create_tables)
+    app.cli.command("confirm-transfers")(confirm_transfers)
+    app.cli.command("replace-stuck-transfers")(replace_stuck_transfers)
+    app.cli.command("sync-nonces")(sync_nonces)
+    app.cli.command("hot-wallet")(hot_wallet)
+    app.cli.command("rebuild-whitelist-index")(rebuild_whitelist_index)
 
 
 
@@ -2,6 +2,8 @@ import logging
 import uuid
 
 from main.app import db
+from main.application_layer.adapters.counter_repository import SQLAlchemyCounterRepository
+from main.application_layer.adapters.whitelist_index import PENDING_KEY, WHITELIST_COUNTER
 from main.application_layer.persistency.tables import address_table
 from main.domain_layer.factories import AddressFactory
 
@@ -84,7 +86,141 @@ class SQLAlchemyAddressRepository:
             raise e
     
     @classmethod
-    def create(cls, address, private_key):
+    def get_addresses(cls):
+        """Retrieve only the address strings, without loading the keys."""
+
+        logger.info(
+            "Getting Address list",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "get_addresses",
+                }
+            }
+        )
+
+        try:
+            return db.session.scalars(address_table.select().with_only_columns(address_table.c.address)).all()
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get Address list",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "get_addresses",
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def get_addresses_since(cls, whitelist_version: int):
+        """Retrieve the committed addresses created after a whitelist
+        version, on a connection of their own."""
+
+        logger.info(
+            "Getting Address list since version",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "get_addresses_since",
+                    "whitelist_version": whitelist_version
+                }
+            }
+        )
+
+        try:
+            with db.engine.connect() as connection:
+                return connection.scalars(
+                    address_table.select().with_only_columns(address_table.c.address).where(
+                        address_table.c.whitelist_version > whitelist_version)
+                ).all()
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get Address list since version",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "get_addresses_since",
+                        "whitelist_version": whitelist_version,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def get_hot_wallets(cls):
+        """Retrieve the addresses in the hot wallet pool."""
+
+        logger.info(
+            "Getting hot wallets",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "get_hot_wallets",
+                }
+            }
+        )
+
+        try:
+            addresses = db.session.query(address_table).filter(address_table.c.hot_wallet.is_(True)).all()
+
+            return [
+                AddressFactory(
+                    uuid=address.uuid,
+                    address=address.address,
+                    private_key=address.private_key
+                ).create_address() for address in addresses
+            ]
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get hot wallets",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "get_hot_wallets",
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def set_hot_wallet(cls, address: str, hot_wallet: bool):
+        """Add an address to, or remove it from, the hot wallet pool."""
+
+        logger.info(
+            "Updating hot wallet flag",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "set_hot_wallet",
+                    "address": address,
+                    "hot_wallet": hot_wallet
+                }
+            }
+        )
+
+        try:
+            update_stmt = address_table.update().values(hot_wallet=hot_wallet).where(address_table.c.address == address)
+            result = db.session.execute(update_stmt)
+            db.session.flush()
+            return result.rowcount == 1
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to update hot wallet flag",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "set_hot_wallet",
+                        "address": address,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def create(cls, address, private_key, hot_wallet=False):
         """Add a new address to the repository."""
         
         logger.info(
@@ -94,19 +230,27 @@ class SQLAlchemyAddressRepository:
                     "service": "PostgreSQL",
                     "service method": "create",
                     "address": address,
-                    "private_key": private_key
+                    "private_key": private_key,
+                    "hot_wallet": hot_wallet
                 }
             }
         )
 
         try:
+            # Versão da whitelist gravada na mesma transação do endereço;
+            # os outros hosts buscam os endereços acima da versão que têm
+            whitelist_version = SQLAlchemyCounterRepository.increment(WHITELIST_COUNTER)
             new_address = address_table.insert().values(
                 uuid=uuid.uuid4(),
                 address=address,
-                private_key=private_key
+                private_key=private_key,
+                hot_wallet=hot_wallet,
+                whitelist_version=whitelist_version
             )
             db.session.execute(new_address)
             db.session.flush()
+            # Entra no índice da whitelist só depois do commit
+            db.session.info.setdefault(PENDING_KEY, []).append(address)
 
         except Exception as e:
             logger.exception(
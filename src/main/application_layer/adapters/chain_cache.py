@@ -0,0 +1,239 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from flask import current_app
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+
+from main.application_layer.metrics import metrics
+
+logger = logging.getLogger("teste-mb." + __name__)
+
+# Intervalo mínimo entre leituras do bloco atual para decidir a finalidade
+HEAD_TTL = 12
+
+# O acesso só é regravado depois desse intervalo, para não escrever a cada hit
+TOUCH_INTERVAL = 60
+
+# Versão do formato das entradas; arquivos de outra versão são descartados
+SCHEMA_VERSION = 2
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def encode(value):
+    """JSON-ready form of chain data. The web3 types, bytes and tuples are
+    tagged so that `decode` gives them back."""
+
+    if isinstance(value, HexBytes):
+        return {"__hexbytes__": value.to_0x_hex()}
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": bytes(value).hex()}
+    if isinstance(value, AttributeDict):
+        return {"__attributedict__": {key: encode(item) for key, item in value.items()}}
+    if isinstance(value, dict):
+        return {key: encode(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return {"__tuple__": [encode(item) for item in value]}
+    if isinstance(value, list):
+        return [encode(item) for item in value]
+    return value
+
+
+def decode(value):
+
+    if isinstance(value, list):
+        return [decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if "__hexbytes__" in value:
+        return HexBytes(value["__hexbytes__"])
+    if "__bytes__" in value:
+        return bytes.fromhex(value["__bytes__"])
+    if "__attributedict__" in value:
+        return AttributeDict({key: decode(item) for key, item in value["__attributedict__"].items()})
+    if "__tuple__" in value:
+        return tuple(decode(item) for item in value["__tuple__"])
+    return {key: decode(item) for key, item in value.items()}
+
+
+def get_chain_cache():
+    """Process-wide cache configured by CHAIN_CACHE_PATH; None when it is
+    disabled."""
+
+    path = current_app.config["CHAIN_CACHE_PATH"]
+    if not path:
+        return None
+
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = ChainCache(
+                path,
+                max_bytes=current_app.config["CHAIN_CACHE_MAX_BYTES"],
+                finality_depth=current_app.config["CHAIN_CACHE_FINALITY_DEPTH"])
+        return _caches[path]
+
+
+class ChainCache:
+    """On-disk cache of chain data that can no longer change: transactions
+    and receipts of finalized blocks and eth_call results pinned to one.
+
+    Entries live in a SQLite file shared by the worker processes, stored
+    as JSON, and the least recently used ones are evicted once `max_bytes`
+    is exceeded. The total size is kept in the `meta` table, updated in the
+    same transaction as every write."""
+
+    def __init__(self, path: str, max_bytes: int, finality_depth: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.finality_depth = finality_depth
+        self.head = 0
+        self.head_updated_at = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("BEGIN IMMEDIATE")
+        with self._connection:
+            if self._connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                # Entradas de um formato anterior são descartadas
+                self._connection.execute("DROP TABLE IF EXISTS entries")
+                self._connection.execute("DROP TABLE IF EXISTS meta")
+                self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed_at REAL NOT NULL)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS ix_entries_accessed_at ON entries (accessed_at)")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self._connection.execute(
+                "INSERT OR IGNORE INTO meta (name, value) VALUES "
+                "('entries', (SELECT COUNT(*) FROM entries)), ('bytes', (SELECT COALESCE(SUM(size), 0) FROM entries))")
+
+        metrics.gauge(f"chain_cache.{os.path.basename(path)}", self.stats)
+
+    def observe_head(self, block_number: int):
+
+        with self._lock:
+            if block_number > self.head:
+                self.head = block_number
+            self.head_updated_at = time.monotonic()
+
+    def is_final(self, block_number, get_head=None):
+        """Whether a block is below the finality depth. The known head only
+        grows, so a stale one just makes the answer more conservative;
+        `get_head` refreshes it at most once per HEAD_TTL."""
+
+        if block_number is None:
+            return False
+        if block_number <= self.head - self.finality_depth:
+            return True
+
+        if get_head is not None and time.monotonic() - self.head_updated_at >= HEAD_TTL:
+            self.observe_head(get_head())
+            return block_number <= self.head - self.finality_depth
+        return False
+
+    def get(self, key: str):
+
+        try:
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT value, accessed_at FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is not None and time.time() - row[1] >= TOUCH_INTERVAL:
+                    self._connection.execute(
+                        "UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error as e:
+            # O cache nunca derruba a chamada; vai ao nó
+            logger.warning(
+                "Error while reading chain cache",
+                extra={
+                    "props": {
+                        "service": "ChainCache",
+                        "service method": "get",
+                        "key": key,
+                        "error message": str(e)
+                    }
+                })
+            row = None
+
+        if row is None:
+            metrics.increment("chain_cache.misses")
+            return None
+
+        metrics.increment("chain_cache.hits")
+        return decode(json.loads(row[0]))
+
+    def set(self, key: str, value):
+
+        data = json.dumps(encode(value), separators=(",", ":")).encode()
+        try:
+            with self._lock:
+                self._connection.execute("BEGIN IMMEDIATE")
+                with self._connection:
+                    previous = self._connection.execute(
+                        "SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO entries (key, value, size, accessed_at) VALUES (?, ?, ?, ?)",
+                        (key, data, len(data), time.time()))
+                    self._add_totals(
+                        entries=0 if previous else 1, size=len(data) - (previous[0] if previous else 0))
+                    self._evict()
+        except sqlite3.Error as e:
+            logger.warning(
+                "Error while writing chain cache",
+                extra={
+                    "props": {
+                        "service": "ChainCache",
+                        "service method": "set",
+                        "key": key,
+                        "error message": str(e)
+                    }
+                })
+
+    def _add_totals(self, entries: int, size: int):
+
+        self._connection.execute(
+            "UPDATE meta SET value = value + CASE name WHEN 'entries' THEN ? ELSE ? END", (entries, size))
+
+    def _totals(self):
+
+        return dict(self._connection.execute("SELECT name, value FROM meta").fetchall())
+
+    def _evict(self):
+
+        total = self._totals()["bytes"]
+        if total <= self.max_bytes:
+            return
+
+        # Libera até 90% do limite para não despejar a cada escrita
+        target = total - int(self.max_bytes * 0.9)
+        evicted = 0
+        count = 0
+        while evicted < target:
+            rows = self._connection.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT 100").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                evicted += size
+                count += 1
+                metrics.increment("chain_cache.evictions")
+                if evicted >= target:
+                    break
+        self._add_totals(entries=-count, size=-evicted)
+
+    def stats(self):
+
+        with self._lock:
+            totals = self._totals()
+        return {"entries": totals["entries"], "bytes": totals["bytes"]}
@@ -0,0 +1,79 @@
+import logging
+
+from main.app import db
+from main.application_layer.persistency.tables import checkpoint_table
+
+logger = logging.getLogger("teste-mb." + __name__)
+
+class SQLAlchemyCheckpointRepository:
+    """Repository for the last block processed by each worker.
+
+    Statements run on the request's session, so a checkpoint is committed
+    together with the work done up to it.
+    """
+
+    @classmethod
+    def get(cls, name: str):
+        """Retrieve the last block processed by a worker, or None."""
+
+        logger.info(
+            "Getting Checkpoint",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "get",
+                    "name": name
+                }
+            }
+        )
+
+        try:
+            return db.session.query(checkpoint_table.c.block).filter(checkpoint_table.c.name == name).scalar()
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get Checkpoint",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "get",
+                        "name": name,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def save(cls, name: str, block: int):
+        """Record the last block processed by a worker."""
+
+        logger.info(
+            "Saving Checkpoint",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "save",
+                    "name": name,
+                    "block": block
+                }
+            }
+        )
+
+        try:
+            update_stmt = checkpoint_table.update().values(block=block).where(checkpoint_table.c.name == name)
+            if db.session.execute(update_stmt).rowcount == 0:
+                db.session.execute(checkpoint_table.insert().values(name=name, block=block))
+            db.session.flush()
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to save Checkpoint",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "save",
+                        "name": name,
+                        "block": block,
+                        "error message": str(e)
+                    }
+                })
+            raise e
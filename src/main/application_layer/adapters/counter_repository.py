@@ -0,0 +1,86 @@
+import logging
+
+from main.app import db
+from main.application_layer.persistency.tables import counter_table
+
+logger = logging.getLogger("teste-mb." + __name__)
+
+class SQLAlchemyCounterRepository:
+    """Repository for named counters that version shared data, such as
+    the whitelist.
+
+    Increments run on the request's session, so the new value commits
+    together with the change it versions and concurrent writers are
+    serialised by the row lock. Reads use their own connection and only
+    see committed values.
+    """
+
+    @classmethod
+    def get(cls, name: str):
+        """Retrieve the committed value of a counter, 0 when it was never
+        incremented."""
+
+        logger.info(
+            "Getting Counter",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "get",
+                    "name": name
+                }
+            }
+        )
+
+        try:
+            with db.engine.connect() as connection:
+                value = connection.execute(
+                    counter_table.select().with_only_columns(counter_table.c.value).where(counter_table.c.name == name)
+                ).scalar()
+            return value or 0
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get Counter",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "get",
+                        "name": name,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def increment(cls, name: str):
+        """Increment a counter and return its new value."""
+
+        logger.info(
+            "Incrementing Counter",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "increment",
+                    "name": name
+                }
+            }
+        )
+
+        try:
+            update_stmt = counter_table.update().values(value=counter_table.c.value + 1).where(counter_table.c.name == name)
+            if db.session.execute(update_stmt).rowcount == 0:
+                db.session.execute(counter_table.insert().values(name=name, value=1))
+            db.session.flush()
+            return db.session.query(counter_table.c.value).filter(counter_table.c.name == name).scalar()
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to increment Counter",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "increment",
+                        "name": name,
+                        "error message": str(e)
+                    }
+                })
+            raise e
@@ -1,13 +1,71 @@
+import contextlib
 import logging
+from eth_utils.abi import get_abi_output_types
 from web3 import Web3
+from web3.exceptions import ContractLogicError, Web3RPCError
 
 logger = logging.getLogger("teste-mb." + __name__)
 
+# Endereço do Multicall3, o mesmo em todas as redes em que foi implantado
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Chamadas por aggregate3; acima disso o eth_call fica pesado para o nó
+MULTICALL_CHUNK_SIZE = 500
+
+MULTICALL3_ABI = [{
+    "name": "aggregate3",
+    "inputs": [{
+        "name": "calls",
+        "type": "tuple[]",
+        "components": [
+            {"name": "target", "type": "address"},
+            {"name": "allowFailure", "type": "bool"},
+            {"name": "callData", "type": "bytes"}
+        ]
+    }],
+    "outputs": [{
+        "name": "returnData",
+        "type": "tuple[]",
+        "components": [
+            {"name": "success", "type": "bool"},
+            {"name": "returnData", "type": "bytes"}
+        ]
+    }],
+    "stateMutability": "payable",
+    "type": "function"
+}, {
+    "name": "getEthBalance",
+    "inputs": [{"name": "addr", "type": "address"}],
+    "outputs": [{"name": "balance", "type": "uint256"}],
+    "stateMutability": "view",
+    "type": "function"
+}]
+
+# Chain id por conexão; não muda durante a vida do processo
+_chain_ids = {}
+
 class EthereumService:
     """Service for managing Ethereum-related operations."""
 
-    def __init__(self, w3: Web3):
+    def __init__(self, w3: Web3, hedge: bool = False, cache=None, broadcast: bool = False):
         self.w3 = w3
+        self.hedge = hedge
+        self.cache = cache
+        self.broadcast = broadcast
+
+    def hedging(self):
+        """Hedge the reads made inside the block, when enabled and supported
+        by the provider."""
+        if self.hedge and hasattr(self.w3.provider, "hedging"):
+            return self.w3.provider.hedging()
+        return contextlib.nullcontext()
+
+    def broadcasting(self):
+        """Send the raw transactions inside the block to every provider,
+        when enabled and supported by the provider."""
+        if self.broadcast and hasattr(self.w3.provider, "broadcasting"):
+            return self.w3.provider.broadcasting()
+        return contextlib.nullcontext()
 
     @property
     def is_connected(self):
@@ -17,8 +75,255 @@ class EthereumService:
     @property
     def gas_price(self):
         """Get the current gas price."""
-        return self.w3.eth.gas_price
+        with self.hedging():
+            return self.w3.eth.gas_price
+
+    @property
+    def block_number(self):
+        """Get the number of the most recent block."""
+        with self.hedging():
+            return self.w3.eth.block_number
+
+    @property
+    def chain_id(self):
+        """Get the chain id, read from the node once per process."""
+        if self.w3 not in _chain_ids:
+            _chain_ids[self.w3] = self.w3.eth.chain_id
+        return _chain_ids[self.w3]
+
+    def _cache_key(self, request):
+        """Chain cache key of a request, or None when it is not cacheable:
+        transactions, receipts and eth_call pinned to a block number."""
+
+        if self.cache is None:
+            return None
+
+        method, *args = request
+        if method in ("get_transaction", "get_transaction_receipt"):
+            return f"{self.chain_id}:{method}:{str(args[0]).lower()}"
+        if method == "call" and isinstance(args[1], int):
+            contract_function, block_identifier = args
+            data = contract_function._encode_transaction_data()
+            return f"{self.chain_id}:eth_call:{contract_function.address.lower()}:{data}:{block_identifier}"
+        return None
+
+    @staticmethod
+    def _block_of(request, result):
+
+        if request[0] == "call":
+            return request[2]
+        return result.get("blockNumber")
+
+    def _read_through(self, request, fetch):
+        """Serve a request from the chain cache, storing the answer once its
+        block is final."""
+
+        key = self._cache_key(request)
+        if key is None:
+            return fetch()
+
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+
+        result = fetch()
+        if self.cache.is_final(self._block_of(request, result), get_head=lambda: self.w3.eth.block_number):
+            self.cache.set(key, result)
+        return result
+
+    def fee_history(self, block_count: int, newest_block, reward_percentiles: list):
+        """Get base fees and priority fee percentiles of recent blocks."""
+        
+        logger.info(
+            "Getting fee history",
+            extra={
+                "props": {
+                    "service": "Ethereum",
+                    "service method": "fee_history",
+                    "block_count": block_count,
+                    "newest_block": newest_block
+                }
+            }
+        )
+
+        try:
+            with self.hedging():
+                return self.w3.eth.fee_history(block_count, newest_block, reward_percentiles)
+        
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get fee history",
+                extra={
+                    "props": {
+                        "service": "Ethereum",
+                        "service method": "fee_history",
+                        "block_count": block_count,
+                        "newest_block": newest_block,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+
+    def batch(self, requests: list):
+        """Send several JSON-RPC calls in a single HTTP POST.
+
+        `requests` holds `(method, *args)` tuples naming `w3.eth` methods,
+        e.g. `("get_transaction", tx_hash)`, contract function calls such
+        as `contract.functions.decimals()`, or `("call", function, block)`
+        for a call pinned to a block. Results come back in the same order;
+        a call that failed is returned as its exception instead of failing
+        the whole batch. Finalized data is served from the chain cache."""
+
+        logger.info(
+            "Sending batch request",
+            extra={
+                "props": {
+                    "service": "Ethereum",
+                    "service method": "batch",
+                    "count": len(requests)
+                }
+            }
+        )
+
+        try:
+            keys = [None if hasattr(request, "call") else self._cache_key(request) for request in requests]
+            results = [self.cache.get(key) if key else None for key in keys]
+
+            missing = [index for index, result in enumerate(results) if result is None]
+            if not missing:
+                return results
+
+            sent = [requests[index] for index in missing]
+            # O bloco atual vai no mesmo lote para decidir o que já é final
+            learn_head = any(keys[index] for index in missing)
+            if learn_head:
+                sent.append(("get_block_number",))
+
+            responses = self._send_batch(sent)
+            if learn_head:
+                head = responses.pop()
+                if not isinstance(head, Exception):
+                    self.cache.observe_head(head)
+
+            for index, response in zip(missing, responses):
+                results[index] = response
+                if keys[index] and not isinstance(response, Exception) \
+                        and self.cache.is_final(self._block_of(requests[index], response)):
+                    self.cache.set(keys[index], response)
+            return results
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to send batch request",
+                extra={
+                    "props": {
+                        "service": "Ethereum",
+                        "service method": "batch",
+                        "count": len(requests),
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    def multicall(self, calls: list, block_identifier="latest", address: str = MULTICALL3_ADDRESS):
+        """Run contract view calls through Multicall3 `aggregate3`.
+
+        Every MULTICALL_CHUNK_SIZE calls become one eth_call, and all of
+        them go in a single batch. Results come back in the same order,
+        decoded as `.call()` would; a call that reverted or could not be
+        decoded is returned as its exception."""
+
+        logger.info(
+            "Sending multicall",
+            extra={
+                "props": {
+                    "service": "Ethereum",
+                    "service method": "multicall",
+                    "count": len(calls),
+                    "block_identifier": block_identifier
+                }
+            }
+        )
+
+        try:
+            if not calls:
+                return []
+
+            multicall = self.w3.eth.contract(address=address, abi=MULTICALL3_ABI)
+            chunks = [calls[start:start + MULTICALL_CHUNK_SIZE] for start in range(0, len(calls), MULTICALL_CHUNK_SIZE)]
+            responses = self.batch([
+                ("call", multicall.functions.aggregate3([
+                    (call.address, True, call._encode_transaction_data()) for call in chunk
+                ]), block_identifier)
+                for chunk in chunks
+            ])
+
+            results = []
+            for chunk, response in zip(chunks, responses):
+                if isinstance(response, Exception):
+                    results.extend([response] * len(chunk))
+                    continue
+                results.extend(
+                    self._decode_call_result(call, success, return_data)
+                    for call, (success, return_data) in zip(chunk, response))
+            return results
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to send multicall",
+                extra={
+                    "props": {
+                        "service": "Ethereum",
+                        "service method": "multicall",
+                        "count": len(calls),
+                        "block_identifier": block_identifier,
+                        "error message": str(e)
+                    }
+                })
+            raise e
 
+    def _decode_call_result(self, call, success: bool, return_data: bytes):
+
+        if not success:
+            return ContractLogicError(f"{call.fn_name} reverted", data=return_data.hex())
+        try:
+            values = self.w3.codec.decode(get_abi_output_types(call.abi), return_data)
+        except Exception as e:
+            # Ex.: endereço sem código devolve sucesso com retorno vazio
+            return e
+        return values[0] if len(values) == 1 else list(values)
+
+    def _send_batch(self, requests: list):
+
+        requests_info = []
+        with self.w3.batch_requests() as batch:
+            # Em modo batch as chamadas só devolvem a requisição montada
+            for request in requests:
+                if hasattr(request, "call"):
+                    requests_info.append(request.call())
+                elif request[0] == "call":
+                    _, contract_function, block_identifier = request
+                    requests_info.append(contract_function.call(block_identifier=block_identifier))
+                else:
+                    method, *args = request
+                    requests_info.append(getattr(self.w3.eth, method)(*args))
+            batch.cancel()
+
+        request_func = self.w3.provider.batch_request_func(self.w3, self.w3.middleware_onion)
+        with self.hedging():
+            responses = request_func([request_info[0] for request_info in requests_info])
+        if not isinstance(responses, list):
+            # O nó recusou o lote inteiro
+            raise Web3RPCError(str(responses.get("error", responses)))
+
+        results = []
+        for request_info, response in zip(requests_info, responses):
+            try:
+                results.append(self.w3.manager._format_batched_response(request_info, response))
+            except Exception as e:
+                results.append(e)
+        return results
 
     def create(self):
         """Create Ethereum account."""
@@ -63,7 +368,9 @@ class EthereumService:
         )
 
         try:
-            return self.w3.eth.get_transaction(tx_hash)
+            with self.hedging():
+                return self._read_through(
+                    ("get_transaction", tx_hash), lambda: self.w3.eth.get_transaction(tx_hash))
         
         except Exception as e:
             logger.exception(
@@ -93,7 +400,9 @@ class EthereumService:
         )
 
         try:
-            return self.w3.eth.get_transaction_receipt(tx_hash)
+            with self.hedging():
+                return self._read_through(
+                    ("get_transaction_receipt", tx_hash), lambda: self.w3.eth.get_transaction_receipt(tx_hash))
         
         except Exception as e:
             logger.exception(
@@ -108,6 +417,72 @@ class EthereumService:
                 })
             raise e
         
+    def get_block_receipts(self, block_identifier):
+        """Get every transaction receipt of a block in a single call."""
+        
+        logger.info(
+            "Getting block receipts",
+            extra={
+                "props": {
+                    "service": "Ethereum",
+                    "service method": "get_block_receipts",
+                    "block_identifier": block_identifier
+                }
+            }
+        )
+
+        try:
+            return self.w3.eth.get_block_receipts(block_identifier)
+        
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get block receipts",
+                extra={
+                    "props": {
+                        "service": "Ethereum",
+                        "service method": "get_block_receipts",
+                        "block_identifier": block_identifier,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+        
+    def call(self, contract_function, block_identifier="latest"):
+        """Call a contract function; calls pinned to a finalized block are
+        served from the chain cache."""
+        
+        logger.info(
+            "Calling contract function",
+            extra={
+                "props": {
+                    "service": "Ethereum",
+                    "service method": "call",
+                    "function": contract_function.fn_name,
+                    "block_identifier": block_identifier
+                }
+            }
+        )
+
+        try:
+            with self.hedging():
+                return self._read_through(
+                    ("call", contract_function, block_identifier),
+                    lambda: contract_function.call(block_identifier=block_identifier))
+        
+        except Exception as e:
+            logger.exception(
+                "Error while trying to call contract function",
+                extra={
+                    "props": {
+                        "service": "Ethereum",
+                        "service method": "call",
+                        "function": contract_function.fn_name,
+                        "block_identifier": block_identifier,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+        
     def to_checksum_address(self, address: str):
         """Convert address to checksum format."""
         
@@ -202,7 +577,38 @@ class EthereumService:
                 })
             raise e
         
-    def get_transaction_count(self, address: str):
+    def get_balance(self, address: str):
+        """Get the ETH balance of an address, in wei."""
+        
+        logger.info(
+            "Getting balance for address",
+            extra={
+                "props": {
+                    "service": "Ethereum",
+                    "service method": "get_balance",
+                    "address": address
+                }
+            }
+        )
+
+        try:
+            with self.hedging():
+                return self.w3.eth.get_balance(address)
+        
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get balance",
+                extra={
+                    "props": {
+                        "service": "Ethereum",
+                        "service method": "get_balance",
+                        "address": address,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+        
+    def get_transaction_count(self, address: str, block_identifier: str = "latest"):
         """Get the number of transactions sent from an address."""
         
         logger.info(
@@ -211,13 +617,14 @@ class EthereumService:
                 "props": {
                     "service": "Ethereum",
                     "service method": "get_transaction_count",
-                    "address": address
+                    "address": address,
+                    "block_identifier": block_identifier
                 }
             }
         )
 
         try:
-            return self.w3.eth.get_transaction_count(address)
+            return self.w3.eth.get_transaction_count(address, block_identifier)
         
         except Exception as e:
             logger.exception(
@@ -227,6 +634,7 @@ class EthereumService:
                         "service": "Ethereum",
                         "service method": "get_transaction_count",
                         "address": address,
+                        "block_identifier": block_identifier,
                         "error message": str(e)
                     }
                 })
@@ -401,7 +809,8 @@ class EthereumService:
         )
 
         try:
-            return self.w3.eth.send_raw_transaction(tx)
+            with self.broadcasting():
+                return self.w3.eth.send_raw_transaction(tx)
         
         except Exception as e:
             logger.exception(
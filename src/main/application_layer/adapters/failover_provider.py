@@ -0,0 +1,482 @@
+import collections
+import concurrent.futures
+import contextlib
+import logging
+import random
+import statistics
+import threading
+import time
+
+import requests
+from urllib3.exceptions import NewConnectionError
+from web3 import Web3
+from web3.exceptions import Web3RPCError
+from web3.providers import JSONBaseProvider
+
+from main.application_layer.adapters.http_provider import PooledHTTPProvider
+from main.application_layer.adapters.replay_provider import RecordReplayProvider
+from main.application_layer.exceptions import RateLimitExceeded
+from main.application_layer.metrics import metrics
+
+logger = logging.getLogger("teste-mb." + __name__)
+
+# Chamadas que precisam ver o mesmo mempool: o nonce pendente lido e o
+# envio da transação assinada com ele
+STICKY_METHODS = {"eth_getTransactionCount", "eth_sendRawTransaction"}
+
+# Respostas de nós que já tinham a transação no mempool
+KNOWN_TRANSACTION_ERRORS = ("already known", "known transaction", "already imported", "already exists")
+
+
+class NoProviderAvailable(requests.ConnectionError):
+    """No endpoint could be tried: nothing left the process."""
+
+
+# Falhas de um endpoint que passam para o próximo; o limite local de
+# chamadas não conta contra a saúde do nó
+PROVIDER_ERRORS = (requests.RequestException, RateLimitExceeded)
+
+
+def never_delivered(error):
+    """True when a request provably never reached a node: no endpoint was
+    tried, the local rate limit held it back, or the connection could not
+    even be opened. A read timeout, a reset after sending or a JSON-RPC
+    error may follow a delivery."""
+
+    if isinstance(error, (NoProviderAvailable, RateLimitExceeded, requests.ConnectTimeout)):
+        return True
+    if isinstance(error, requests.ConnectionError):
+        reason = error.args[0] if error.args else None
+        return isinstance(getattr(reason, "reason", reason), NewConnectionError)
+    return False
+
+
+def is_known_transaction_error(error):
+    """True for a node's answer that the transaction is already in its
+    mempool, i.e. it was accepted by an earlier attempt."""
+
+    message = str(error).lower()
+    return any(known in message for known in KNOWN_TRANSACTION_ERRORS)
+
+
+def is_rejected(error):
+    """True for a JSON-RPC error in which the node refused the transaction
+    (insufficient funds, nonce too low, fee cap too low...): unlike after a
+    timeout or a reset, no node holds it."""
+
+    return isinstance(error, Web3RPCError) and not is_known_transaction_error(error)
+
+# Leituras idempotentes que podem ir a dois nós ao mesmo tempo
+HEDGE_METHODS = {
+    "eth_blockNumber",
+    "eth_call",
+    "eth_chainId",
+    "eth_feeHistory",
+    "eth_gasPrice",
+    "eth_getBalance",
+    "eth_getBlockByNumber",
+    "eth_getCode",
+    "eth_getTransactionByHash",
+    "eth_getTransactionReceipt",
+}
+
+
+class ProviderHealth:
+    """Rolling latency and error rate of one endpoint, plus its circuit
+    breaker: closed, open (skipped until the cooldown ends) and half-open
+    (a single probe call decides whether it closes again)."""
+
+    def __init__(self, window: int = 20, min_calls: int = 5, error_rate: float = 0.5, cooldown: float = 30):
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate
+        self.cooldown = cooldown
+        self.outcomes = collections.deque(maxlen=window)
+        self.state = "closed"
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def latency(self):
+        """Median latency of the recent successful calls; 0 while unknown so
+        new endpoints get traffic."""
+
+        with self._lock:
+            latencies = [latency for ok, latency in self.outcomes if ok]
+        return statistics.median(latencies) if latencies else 0
+
+    @property
+    def error_rate(self):
+
+        with self._lock:
+            if not self.outcomes:
+                return 0
+            return sum(1 for ok, _ in self.outcomes if not ok) / len(self.outcomes)
+
+    def is_open(self):
+
+        with self._lock:
+            return self.state == "open" and time.monotonic() - self.opened_at < self.cooldown
+
+    def acquire(self):
+        """Whether a call may go to this endpoint now."""
+
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                # Libera uma única chamada de teste
+                self.state = "half-open"
+                return True
+            return False
+
+    def skip(self):
+        """A call allowed by `acquire` that was never made; a half-open
+        circuit gets its probe back."""
+
+        with self._lock:
+            if self.state == "half-open":
+                self.state = "open"
+
+    def record(self, ok: bool, latency: float):
+        """Record a call; returns True when it opened the circuit."""
+
+        with self._lock:
+            if self.state == "half-open":
+                if ok:
+                    self.state = "closed"
+                    self.outcomes.clear()
+                    self.outcomes.append((ok, latency))
+                    return False
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                return True
+
+            self.outcomes.append((ok, latency))
+            if self.state == "closed" and len(self.outcomes) >= self.min_calls:
+                errors = sum(1 for outcome, _ in self.outcomes if not outcome)
+                if errors / len(self.outcomes) >= self.error_rate_threshold:
+                    self.state = "open"
+                    self.opened_at = time.monotonic()
+                    return True
+            return False
+
+    def stats(self):
+
+        return {
+            "state": "open" if self.is_open() else self.state,
+            "latency": self.latency,
+            "error_rate": self.error_rate,
+        }
+
+
+class FailoverProvider(JSONBaseProvider):
+    """Routes every call to the fastest healthy endpoint and fails over to
+    the next one on connection errors, timeouts and HTTP errors. JSON-RPC
+    errors are answers from a healthy node and are returned as they are.
+
+    Nonce reads and broadcasts stay on one endpoint for as long as it is
+    healthy. A small share of the other calls goes to a random healthy
+    endpoint so the latency of the ones not in use stays current.
+
+    Inside `hedging()`, idempotent reads not answered within the recent
+    latency percentile of the method are sent to a second endpoint as
+    well, and the first answer wins. Inside `broadcasting()`, signed
+    transactions go to every endpoint at once and the first one to accept
+    them wins."""
+
+    def __init__(self, providers: list, window: int = 20, min_calls: int = 5, error_rate: float = 0.5,
+                 cooldown: float = 30, explore_rate: float = 0.05, hedge_percentile: int = 95,
+                 hedge_delay: float = 0.1, **kwargs):
+        super().__init__(**kwargs)
+
+        self.providers = providers
+        self.health = [ProviderHealth(window, min_calls, error_rate, cooldown) for _ in providers]
+        self.explore_rate = explore_rate
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self._sticky = None
+        self._sticky_lock = threading.Lock()
+        self._local = threading.local()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+        metrics.gauge("rpc.providers", self.provider_stats)
+        metrics.gauge("rpc.hedge", self.hedge_stats)
+
+    @classmethod
+    def from_config(cls, endpoint_uris: list, config):
+
+        providers = [PooledHTTPProvider.from_config(endpoint_uri, config) for endpoint_uri in endpoint_uris]
+        if config.RPC_CASSETTE_MODE:
+            # Grava o tráfego de cada endpoint no seu cassete ou o reproduz sem rede
+            providers = [
+                RecordReplayProvider.from_config(config, provider, endpoint, len(providers))
+                for endpoint, provider in enumerate(providers)]
+
+        return cls(
+            providers,
+            window=config.RPC_BREAKER_WINDOW,
+            min_calls=config.RPC_BREAKER_MIN_CALLS,
+            error_rate=config.RPC_BREAKER_ERROR_RATE,
+            cooldown=config.RPC_BREAKER_COOLDOWN,
+            explore_rate=config.RPC_EXPLORE_RATE,
+            hedge_percentile=config.RPC_HEDGE_PERCENTILE,
+            hedge_delay=config.RPC_HEDGE_DELAY)
+
+    def __str__(self):
+        return f"Failover connection {[str(provider) for provider in self.providers]}"
+
+    def provider_stats(self):
+
+        return {provider.host: health.stats() for provider, health in zip(self.providers, self.health)}
+
+    def hedge_stats(self):
+
+        calls = metrics.counter("rpc.hedge.calls")
+        hedged = metrics.counter("rpc.hedge.hedged")
+        wins = metrics.counter("rpc.hedge.wins")
+        return {
+            "calls": calls,
+            "hedged": hedged,
+            "wins": wins,
+            "hedge_rate": hedged / calls if calls else 0,
+            "win_rate": wins / hedged if hedged else 0,
+        }
+
+    @contextlib.contextmanager
+    def hedging(self):
+        """Hedge the idempotent reads made by this thread inside the block."""
+
+        previous = getattr(self._local, "hedging", False)
+        self._local.hedging = True
+        try:
+            yield
+        finally:
+            self._local.hedging = previous
+
+    @contextlib.contextmanager
+    def broadcasting(self):
+        """Send the raw transactions of this thread inside the block to
+        every endpoint."""
+
+        previous = getattr(self._local, "broadcasting", False)
+        self._local.broadcasting = True
+        try:
+            yield
+        finally:
+            self._local.broadcasting = previous
+
+    def _by_latency(self):
+
+        indexes = [index for index, health in enumerate(self.health) if not health.is_open()]
+        indexes.sort(key=lambda index: self.health[index].latency)
+        if len(indexes) > 1 and random.random() < self.explore_rate:
+            explored = random.choice(indexes[1:])
+            indexes.remove(explored)
+            indexes.insert(0, explored)
+        return indexes
+
+    def _sticky_first(self):
+
+        with self._sticky_lock:
+            if self._sticky is None or self.health[self._sticky].is_open():
+                healthy = [index for index, health in enumerate(self.health) if not health.is_open()]
+                if healthy:
+                    self._sticky = min(healthy, key=lambda index: self.health[index].latency)
+            sticky = self._sticky
+
+        indexes = [index for index in self._by_latency() if index != sticky]
+        return ([sticky] if sticky is not None else []) + indexes
+
+    def route(self, methods: list):
+        """Endpoints to try, in order, followed by the ones with an open
+        circuit, tried only as a last resort."""
+
+        if any(method in STICKY_METHODS for method in methods):
+            indexes = self._sticky_first()
+        else:
+            indexes = self._by_latency()
+
+        opened = [index for index in range(len(self.providers)) if index not in indexes]
+        return indexes, sorted(opened, key=lambda index: self.health[index].opened_at)
+
+    def _try(self, name: str, index: int, make_request):
+
+        provider, health = self.providers[index], self.health[index]
+        started = time.monotonic()
+        try:
+            response = make_request(provider)
+        except RateLimitExceeded as e:
+            health.skip()
+            metrics.increment(f"rpc.rate_limited.{provider.host}")
+            raise e
+        except requests.RequestException as e:
+            if health.record(False, time.monotonic() - started):
+                metrics.increment(f"rpc.breaker_opened.{provider.host}")
+                logger.warning(
+                    "RPC circuit breaker opened",
+                    extra={
+                        "props": {
+                            "service": "Ethereum",
+                            "provider": provider.host,
+                            "error rate": health.error_rate
+                        }
+                    })
+            metrics.increment("rpc.failovers")
+            logger.warning(
+                "RPC provider failed, trying the next one",
+                extra={
+                    "props": {
+                        "service": "Ethereum",
+                        "service method": name,
+                        "provider": provider.host,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+        health.record(True, time.monotonic() - started)
+        return response
+
+    def _hedge_delay(self, name: str):
+
+        delay = metrics.percentile(f"rpc.latency.{name}", self.hedge_percentile)
+        return self.hedge_delay if delay is None else delay
+
+    def _submit(self, *args):
+
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(thread_name_prefix="rpc-hedge")
+        return self._executor.submit(*args)
+
+    def _hedged(self, name: str, indexes: list, make_request):
+
+        metrics.increment("rpc.hedge.calls")
+        primary = self._submit(self._try, name, indexes[0], make_request)
+        pending = {primary}
+
+        done, _ = concurrent.futures.wait(pending, timeout=self._hedge_delay(name))
+        if not done or primary.exception() is not None:
+            # Sem resposta no percentil (ou o primeiro falhou): vai ao segundo
+            if not done:
+                metrics.increment("rpc.hedge.hedged")
+            pending.add(self._submit(self._try, name, indexes[1], make_request))
+
+        last_error = None
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    last_error = future.exception()
+                    continue
+                if future is not primary and primary in pending:
+                    metrics.increment("rpc.hedge.wins")
+                return future.result()
+
+        raise last_error
+
+    def _call(self, name: str, methods: list, make_request):
+
+        candidates, last_resort = self.route(methods)
+        last_error = NoProviderAvailable("No RPC provider available")
+        # Erro de uma tentativa que pode ter chegado ao nó; tem preferência
+        # sobre uma falha de conexão posterior em outro nó
+        delivered_error = None
+
+        if getattr(self._local, "hedging", False) and all(method in HEDGE_METHODS for method in methods):
+            # Só nós com o circuito fechado, que não dependem de acquire()
+            closed = [index for index in candidates if self.health[index].state == "closed"]
+            if len(closed) > 1:
+                try:
+                    return self._hedged(name, closed[:2], make_request)
+                except PROVIDER_ERRORS as e:
+                    last_error = e
+                    if not never_delivered(e):
+                        delivered_error = e
+                    candidates = [index for index in candidates if index not in closed[:2]]
+
+        for index in candidates + last_resort:
+            # Meio-abertos com a chamada de teste em andamento ficam de fora
+            if index in candidates and not self.health[index].acquire():
+                continue
+            try:
+                return self._try(name, index, make_request)
+            except PROVIDER_ERRORS as e:
+                last_error = e
+                if delivered_error is None and not never_delivered(e):
+                    delivered_error = e
+
+        raise delivered_error or last_error
+
+    @staticmethod
+    def _is_known_transaction(response):
+
+        message = str(response.get("error", {}).get("message", "")).lower()
+        return any(error in message for error in KNOWN_TRANSACTION_ERRORS)
+
+    def _broadcast_to(self, index: int, method, params):
+
+        host = self.providers[index].host
+        started = time.monotonic()
+        response = self._try(method, index, lambda provider: provider.make_request(method, params))
+
+        if "error" not in response:
+            outcome = "accepted"
+        elif self._is_known_transaction(response):
+            outcome = "duplicates"
+        else:
+            outcome = "rejected"
+        metrics.increment(f"rpc.broadcast.{outcome}.{host}")
+        if outcome != "rejected":
+            metrics.observe(f"rpc.broadcast.latency.{host}", time.monotonic() - started)
+        return response
+
+    def _broadcast(self, method, params):
+        """First acceptance of the signed transaction by any endpoint; a node
+        that already knew it also counts, since it is in its mempool."""
+
+        indexes = [index for index, health in enumerate(self.health) if not health.is_open()]
+        futures = [self._submit(self._broadcast_to, index, method, params) for index in indexes or range(len(self.providers))]
+
+        rejected = None
+        last_error = NoProviderAvailable("No RPC provider available")
+        delivered_error = None
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                response = future.result()
+            except PROVIDER_ERRORS as e:
+                last_error = e
+                if delivered_error is None and not never_delivered(e):
+                    delivered_error = e
+                continue
+
+            if "error" not in response:
+                return response
+            if self._is_known_transaction(response):
+                return {"jsonrpc": "2.0", "id": response["id"], "result": Web3.keccak(hexstr=params[0]).to_0x_hex()}
+            rejected = rejected or response
+
+        # Um nó que pode ter recebido a transação deixa o resultado em aberto,
+        # mesmo que outro a tenha recusado
+        if delivered_error is not None:
+            raise delivered_error
+        # Nenhum nó aceitou: devolve a recusa (ex.: nonce too low) para o web3
+        if rejected is not None:
+            return rejected
+        raise last_error
+
+    def make_request(self, method, params):
+
+        if method == "eth_sendRawTransaction" and getattr(self._local, "broadcasting", False) \
+                and len(self.providers) > 1:
+            return self._broadcast(method, params)
+
+        return self._call(method, [method], lambda provider: provider.make_request(method, params))
+
+    def make_batch_request(self, batch_requests):
+
+        return self._call(
+            "batch",
+            [method for method, _ in batch_requests],
+            lambda provider: provider.make_batch_request(batch_requests))
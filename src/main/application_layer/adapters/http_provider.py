@@ -0,0 +1,188 @@
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import HTTPProvider
+from web3._utils.batching import sort_batch_response_by_response_ids
+
+from main.application_layer.adapters.rate_limiter import TokenBucketLimiter
+from main.application_layer.metrics import metrics
+
+logger = logging.getLogger("teste-mb." + __name__)
+
+# Classe de cada método RPC; o resto é "read"
+METHOD_CLASSES = {
+    "eth_sendRawTransaction": "write",
+    "eth_getBlockReceipts": "heavy",
+    "eth_getLogs": "heavy",
+}
+HEAVY_PREFIXES = ("debug_", "trace_")
+
+# Ordem usada para escolher o timeout de um batch
+CLASS_WEIGHT = {"read": 0, "write": 1, "heavy": 2}
+
+
+def method_class(method: str):
+
+    if method.startswith(HEAVY_PREFIXES):
+        return "heavy"
+    return METHOD_CLASSES.get(method, "read")
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that counts the TCP connections opened by its pools,
+    including reconnections after the node drops an idle one."""
+
+    def __init__(self, *args, **kwargs):
+        self.connections_opened = 0
+        self._opened_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+
+        adapter = self
+
+        def counting(pool_cls):
+            class Connection(pool_cls.ConnectionCls):
+                def _new_conn(self):
+                    sock = super()._new_conn()
+                    with adapter._opened_lock:
+                        adapter.connections_opened += 1
+                    return sock
+
+            return type(pool_cls.__name__, (pool_cls,), {"ConnectionCls": Connection})
+
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: counting(pool_cls) for scheme, pool_cls in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+
+class PooledHTTPProvider(HTTPProvider):
+    """HTTPProvider over a single keep-alive connection pool shared by all
+    threads, with a read timeout per method class and retries on connection
+    errors. Latencies and connection reuse are recorded in the metrics.
+
+    With a `limiter`, every request first takes its read or write budget;
+    a batch costs one token per call, as hosted providers count them."""
+
+    def __init__(self, endpoint_uri: str, pool_size: int = 10, keep_alive: bool = True,
+                 connect_timeout: float = 3, timeouts: dict = None, retries: int = 2,
+                 retry_backoff: float = 0.1, limiter: TokenBucketLimiter = None, **kwargs):
+        super().__init__(endpoint_uri, **kwargs)
+
+        self.limiter = limiter
+        self.connect_timeout = connect_timeout
+        self.timeouts = {"read": 10, "write": 30, "heavy": 60, **(timeouts or {})}
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+
+        # O HTTPSessionManager do web3 guarda uma sessão por thread; aqui
+        # todas as threads dividem o mesmo pool
+        self.adapter = CountingHTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+        url = urlparse(str(self.endpoint_uri))
+        self.host = f"{url.hostname}:{url.port}" if url.port else url.hostname
+        metrics.gauge(f"rpc.connections.{self.host}", self.connection_stats)
+
+    @classmethod
+    def from_config(cls, endpoint_uri: str, config):
+
+        provider = cls(
+            endpoint_uri,
+            pool_size=config.RPC_POOL_SIZE,
+            keep_alive=config.RPC_KEEP_ALIVE,
+            connect_timeout=config.RPC_CONNECT_TIMEOUT,
+            timeouts={
+                "read": config.RPC_READ_TIMEOUT,
+                "write": config.RPC_WRITE_TIMEOUT,
+                "heavy": config.RPC_HEAVY_TIMEOUT,
+            },
+            retries=config.RPC_RETRIES,
+            retry_backoff=config.RPC_RETRY_BACKOFF)
+        provider.limiter = TokenBucketLimiter.from_config(config, provider.host)
+        return provider
+
+    def connection_stats(self):
+        """Connections opened and requests sent through the pool; every
+        request beyond the opened connections reused one."""
+
+        sent = 0
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            sent += pools[key].num_requests
+
+        opened = self.adapter.connections_opened
+        return {"opened": opened, "requests": sent, "reused": sent - opened}
+
+    def timeout(self, methods: list):
+
+        heaviest = max((method_class(method) for method in methods), key=CLASS_WEIGHT.get)
+        return (self.connect_timeout, self.timeouts[heaviest])
+
+    def retry_errors(self, methods: list):
+
+        if any(method_class(method) == "write" for method in methods):
+            # Um reset depois do envio pode ter chegado ao nó; só repete
+            # quando a conexão nem foi aberta
+            return (requests.ConnectTimeout,)
+        return (requests.ConnectionError,)
+
+    def _post(self, name: str, methods: list, request_data: bytes):
+
+        kwargs = dict(self.get_request_kwargs())
+        kwargs["timeout"] = self.timeout(methods)
+        retry_errors = self.retry_errors(methods)
+
+        if self.limiter is not None:
+            bucket = "write" if any(method_class(method) == "write" for method in methods) else "read"
+            self.limiter.acquire(bucket, cost=len(methods))
+
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                response = self.session.post(self.endpoint_uri, data=request_data, **kwargs)
+                response.raise_for_status()
+                metrics.observe(f"rpc.latency.{name}", time.monotonic() - started)
+                return response.content
+            except retry_errors as e:
+                metrics.increment(f"rpc.connection_errors.{self.host}")
+                if attempt >= self.retries:
+                    raise e
+
+                logger.warning(
+                    "Retrying RPC request after connection error",
+                    extra={
+                        "props": {
+                            "service": "Ethereum",
+                            "service method": name,
+                            "attempt": attempt + 1,
+                            "error message": str(e)
+                        }
+                    })
+                metrics.increment(f"rpc.retries.{self.host}")
+                time.sleep(self.retry_backoff * 2 ** attempt)
+                attempt += 1
+
+    def _make_request(self, method, request_data: bytes):
+
+        return self._post(method, [method], request_data)
+
+    def make_batch_request(self, batch_requests):
+
+        request_data = self.encode_batch_rpc_request(batch_requests)
+        raw_response = self._post("batch", [method for method, _ in batch_requests], request_data)
+        response = self.decode_rpc_response(raw_response)
+        if not isinstance(response, list):
+            # Erro do batch inteiro
+            return response
+        return sort_batch_response_by_response_ids(response)
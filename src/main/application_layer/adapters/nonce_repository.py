@@ -0,0 +1,183 @@
+import logging
+
+from sqlalchemy import case
+from sqlalchemy.exc import IntegrityError
+
+from main.app import db
+from main.application_layer.persistency.tables import nonce_table
+
+logger = logging.getLogger("teste-mb." + __name__)
+
+class SQLAlchemyNonceRepository:
+    """Repository for allocating account nonces shared by every worker.
+
+    Each statement runs in its own short transaction on a dedicated
+    connection, so the row lock taken by the increment is held only for
+    the allocation itself and never for the request's session.
+    """
+
+    @classmethod
+    def get(cls):
+        """Retrieve the tracked addresses and their next nonce."""
+
+        logger.info(
+            "Getting Nonces",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "get",
+                }
+            }
+        )
+
+        try:
+            with db.engine.begin() as conn:
+                rows = conn.execute(nonce_table.select()).all()
+
+            return {row.address: row.nonce for row in rows}
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get Nonces",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "get",
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def allocate(cls, address: str, chain_nonce, count: int = 1):
+        """Reserve `count` consecutive nonces for an address and return the
+        first one. `chain_nonce` is only called when the address is not
+        tracked yet."""
+
+        logger.info(
+            "Allocating Nonce",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "allocate",
+                    "address": address,
+                    "count": count
+                }
+            }
+        )
+
+        try:
+            increment = nonce_table.update().values(
+                nonce=nonce_table.c.nonce + count
+            ).where(nonce_table.c.address == address).returning(nonce_table.c.nonce)
+
+            with db.engine.begin() as conn:
+                row = conn.execute(increment).first()
+            if row:
+                return row.nonce - count
+
+            first_nonce = chain_nonce()
+            try:
+                with db.engine.begin() as conn:
+                    conn.execute(nonce_table.insert().values(address=address, nonce=first_nonce + count))
+                return first_nonce
+            except IntegrityError:
+                # Another worker tracked the address first
+                with db.engine.begin() as conn:
+                    row = conn.execute(increment).first()
+                return row.nonce - count
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to allocate Nonce",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "allocate",
+                        "address": address,
+                        "count": count,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def release(cls, address: str, nonce: int, count: int = 1):
+        """Give back the last allocated nonces when they were never
+        broadcast. Returns False when later nonces were allocated in the
+        meantime, leaving a gap that needs a resync."""
+
+        logger.info(
+            "Releasing Nonce",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "release",
+                    "address": address,
+                    "nonce": nonce,
+                    "count": count
+                }
+            }
+        )
+
+        try:
+            release_stmt = nonce_table.update().values(nonce=nonce).where(
+                nonce_table.c.address == address,
+                nonce_table.c.nonce == nonce + count)
+
+            with db.engine.begin() as conn:
+                return conn.execute(release_stmt).rowcount == 1
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to release Nonce",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "release",
+                        "address": address,
+                        "nonce": nonce,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def resync(cls, address: str, chain_nonce: int, force: bool = False):
+        """Align the next nonce with the chain. Without `force` the stored
+        nonce only moves forward, keeping nonces already handed out."""
+
+        logger.info(
+            "Resyncing Nonce",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "resync",
+                    "address": address,
+                    "chain_nonce": chain_nonce,
+                    "force": force
+                }
+            }
+        )
+
+        try:
+            value = chain_nonce if force else case(
+                (nonce_table.c.nonce < chain_nonce, chain_nonce), else_=nonce_table.c.nonce)
+            update_stmt = nonce_table.update().values(nonce=value).where(nonce_table.c.address == address)
+
+            with db.engine.begin() as conn:
+                if conn.execute(update_stmt).rowcount == 0:
+                    conn.execute(nonce_table.insert().values(address=address, nonce=chain_nonce))
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to resync Nonce",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "resync",
+                        "address": address,
+                        "chain_nonce": chain_nonce,
+                        "error message": str(e)
+                    }
+                })
+            raise e
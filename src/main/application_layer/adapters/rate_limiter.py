@@ -0,0 +1,100 @@
+import fcntl
+import os
+import struct
+import threading
+import time
+
+from main.application_layer.exceptions import RateLimitExceeded
+from main.application_layer.metrics import metrics
+
+BUCKETS = ("read", "write")
+
+# Tokens disponíveis e instante da última recarga de cada balde
+RECORD = struct.Struct("dd")
+
+
+class TokenBucketLimiter:
+    """Token buckets for outbound RPC shared by every worker process of
+    the host through a small state file guarded by flock.
+
+    A caller over budget takes the tokens in advance and sleeps until they
+    are refilled, so callers queue in arrival order; if that wait would be
+    longer than `max_wait` it fails instead. A cost above the burst always
+    waits for its own excess, which does not count towards `max_wait`."""
+
+    def __init__(self, path: str, rates: dict, bursts: dict, max_wait: float):
+        self.path = path
+        self.rates = rates
+        self.bursts = bursts
+        self.max_wait = max_wait
+        self._fd = None
+        self._pid = None
+        # flock não exclui threads que dividem o mesmo descritor
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config, name: str):
+        """Limiter of one endpoint, or None when rate limiting is disabled."""
+
+        if not config.RPC_RATE_LIMIT_PATH:
+            return None
+
+        return cls(
+            os.path.join(config.RPC_RATE_LIMIT_PATH, f"{name}.bucket"),
+            rates={"read": config.RPC_READ_RATE, "write": config.RPC_WRITE_RATE},
+            bursts={"read": config.RPC_READ_BURST, "write": config.RPC_WRITE_BURST},
+            max_wait=config.RPC_RATE_LIMIT_MAX_WAIT)
+
+    def _file(self):
+
+        # Descritor aberto antes do fork do uWSGI seria o mesmo lock para
+        # todos os workers; cada processo abre o seu
+        if self._pid != os.getpid():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        return self._fd
+
+    def reserve(self, bucket: str, cost: int = 1):
+        """Take `cost` tokens and return how long to wait before using them."""
+
+        rate = self.rates[bucket]
+        if not rate:
+            return 0
+        burst = self.bursts[bucket]
+        offset = BUCKETS.index(bucket) * RECORD.size
+
+        with self._lock:
+            fd = self._file()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                data = os.pread(fd, RECORD.size, offset)
+                tokens, updated_at = RECORD.unpack(data) if len(data) == RECORD.size else (burst, now)
+                tokens = min(burst, tokens + max(0, now - updated_at) * rate)
+
+                wait = max(0, (cost - tokens) / rate)
+                # Um lote maior que o balde cheio nunca caberia no max_wait;
+                # só a espera por chamadas de outros conta
+                if wait - max(0, cost - burst) / rate > self.max_wait:
+                    metrics.increment(f"rpc.rate_limit.rejected.{bucket}")
+                    raise RateLimitExceeded(
+                        f"RPC {bucket} budget exhausted for {wait:.2f}s at {os.path.basename(self.path)}")
+
+                os.pwrite(fd, RECORD.pack(tokens - cost, now), offset)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+        return wait
+
+    def acquire(self, bucket: str, cost: int = 1):
+        """Wait for `cost` tokens of a bucket; returns the time waited."""
+
+        wait = self.reserve(bucket, cost)
+        metrics.observe(f"rpc.rate_limit.wait.{bucket}", wait)
+        if wait:
+            time.sleep(wait)
+        return wait
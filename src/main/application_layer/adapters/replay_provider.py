@@ -0,0 +1,243 @@
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+
+import requests
+from web3._utils.encoding import FriendlyJsonSerde, Web3JsonEncoder
+from web3.providers import JSONBaseProvider
+
+from main.application_layer.metrics import metrics
+
+logger = logging.getLogger("teste-mb." + __name__)
+
+MODES = ("record", "replay")
+
+
+class CassetteMiss(Exception):
+    """A replayed request was never recorded."""
+
+
+def endpoint_cassette(cassette: str, endpoint: int, endpoints: int):
+    """Cassette of one endpoint: rpc.jsonl, or rpc.0.jsonl, rpc.1.jsonl...
+    when there are several."""
+
+    if endpoints == 1:
+        return cassette
+    root, extension = os.path.splitext(cassette)
+    return f"{root}.{endpoint}{extension}"
+
+
+def canonical_params(params):
+    """Params as the JSON the node received, so lookups ignore Python types
+    (HexBytes, checksummed addresses...)."""
+
+    encoded = FriendlyJsonSerde().json_encode(params or [], Web3JsonEncoder)
+    return json.dumps(json.loads(encoded), sort_keys=True).lower()
+
+
+class LatencyProfile:
+    """Per-method latency distribution, jitter and error injection.
+
+    `profile` maps a method (or "default") to:
+        {"latency": {"distribution": "fixed", "value": 0.05}
+                    | {"distribution": "uniform", "low": 0.01, "high": 0.1}
+                    | {"distribution": "normal", "mean": 0.05, "stddev": 0.01}
+                    | {"distribution": "lognormal", "median": 0.05, "sigma": 0.5}
+                    | {"distribution": "recorded"},
+         "jitter": 0.1,
+         "errors": {"rate": 0.01, "kind": "timeout" | "connection" | "http" | "rpc"}}
+
+    In a profile file, "endpoints" maps the index of an endpoint to
+    methods of its own, which replace the shared ones for it."""
+
+    def __init__(self, profile: dict = None, seed: int = None):
+        self.profile = profile or {}
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, endpoint: int = 0):
+
+        profile = {}
+        if config.RPC_REPLAY_PROFILE:
+            with open(config.RPC_REPLAY_PROFILE) as profile_file:
+                profile = json.load(profile_file)
+
+        overrides = profile.pop("endpoints", {}).get(str(endpoint), {})
+        # Uma semente por endpoint, para que não sorteiem as mesmas latências
+        seed = None if config.RPC_REPLAY_SEED is None else config.RPC_REPLAY_SEED + endpoint
+        return cls({**profile, **overrides}, seed=seed)
+
+    def _settings(self, method: str):
+
+        return {**self.profile.get("default", {}), **self.profile.get(method, {})}
+
+    def latency(self, method: str, recorded: float):
+
+        settings = self._settings(method)
+        latency = settings.get("latency", {"distribution": "recorded"})
+        distribution = latency["distribution"]
+
+        with self._lock:
+            if distribution == "fixed":
+                value = latency["value"]
+            elif distribution == "uniform":
+                value = self.random.uniform(latency["low"], latency["high"])
+            elif distribution == "normal":
+                value = self.random.gauss(latency["mean"], latency["stddev"])
+            elif distribution == "lognormal":
+                value = self.random.lognormvariate(math.log(latency["median"]), latency["sigma"])
+            elif distribution == "recorded":
+                value = recorded
+            else:
+                raise ValueError(f"Latency distribution '{distribution}' not supported")
+
+            jitter = settings.get("jitter", 0)
+            if jitter:
+                value *= 1 + self.random.uniform(-jitter, jitter)
+
+        return max(0, value)
+
+    def error(self, method: str):
+        """Kind of error to inject in this call, or None."""
+
+        errors = self._settings(method).get("errors")
+        if not errors:
+            return None
+        with self._lock:
+            return errors.get("kind", "rpc") if self.random.random() < errors["rate"] else None
+
+
+class RecordReplayProvider(JSONBaseProvider):
+    """Records the JSON-RPC traffic of a real provider to a cassette (JSON
+    lines) and replays it offline, with the latencies and errors of a
+    LatencyProfile, so validate and transfer can be measured without a
+    node.
+
+    Requests are matched by method and params; when the same request was
+    recorded several times, the answers are replayed in order and the last
+    one repeats.
+
+    It stands in for one endpoint inside the FailoverProvider, so failover,
+    circuit breakers, hedging and broadcasts run as they do against real
+    nodes."""
+
+    def __init__(self, cassette: str, mode: str = "replay", provider=None, profile: LatencyProfile = None, **kwargs):
+        super().__init__(**kwargs)
+
+        if mode not in MODES:
+            raise ValueError(f"Mode '{mode}' not supported")
+        if mode == "record" and provider is None:
+            raise ValueError("Recording needs a provider")
+
+        self.cassette = cassette
+        self.mode = mode
+        self.provider = provider
+        self.host = getattr(provider, "host", None) or cassette
+        self.profile = profile or LatencyProfile()
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._positions = {}
+
+        if mode == "replay":
+            self._load()
+
+    @classmethod
+    def from_config(cls, config, provider=None, endpoint: int = 0, endpoints: int = 1):
+
+        return cls(
+            endpoint_cassette(config.RPC_CASSETTE, endpoint, endpoints),
+            mode=config.RPC_CASSETTE_MODE,
+            provider=provider,
+            profile=LatencyProfile.from_config(config, endpoint))
+
+    def __str__(self):
+        return f"Record/replay connection {self.cassette} ({self.mode})"
+
+    def _load(self):
+
+        with open(self.cassette) as cassette:
+            for line in cassette:
+                if line.strip():
+                    entry = json.loads(line)
+                    key = (entry["method"], canonical_params(entry["params"]))
+                    self._entries.setdefault(key, []).append(entry)
+
+    def _record(self, method, params, response, latency: float):
+
+        entry = {"method": method, "params": json.loads(canonical_params(params)), "latency": latency}
+        entry["response"] = {key: value for key, value in response.items() if key not in ("id", "jsonrpc")}
+        with self._lock:
+            with open(self.cassette, "a") as cassette:
+                cassette.write(json.dumps(entry) + "\n")
+
+    def _replay(self, method, params):
+
+        key = (method, canonical_params(params))
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise CassetteMiss(f"{method} {key[1]} not in {self.cassette}")
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+        return entries[min(position, len(entries) - 1)]
+
+    def _inject(self, method, request_id, entry):
+        """Response of a replayed call after the profile's latency and
+        errors; returns (latency, response)."""
+
+        latency = self.profile.latency(method, entry.get("latency", 0))
+        error = self.profile.error(method)
+        if error == "timeout":
+            raise requests.ReadTimeout(f"Injected timeout on {method}")
+        if error == "connection":
+            raise requests.ConnectionError(f"Injected connection error on {method}")
+        if error == "http":
+            response = requests.Response()
+            response.status_code = 503
+            raise requests.HTTPError(f"Injected HTTP 503 on {method}", response=response)
+        if error == "rpc":
+            return latency, {"jsonrpc": "2.0", "id": request_id,
+                             "error": {"code": -32000, "message": f"Injected error on {method}"}}
+        return latency, {"jsonrpc": "2.0", "id": request_id, **entry["response"]}
+
+    def make_request(self, method, params):
+
+        if self.mode == "record":
+            started = time.monotonic()
+            response = self.provider.make_request(method, params)
+            self._record(method, params, response, time.monotonic() - started)
+            return response
+
+        request_id = next(self.request_counter)
+        latency, response = self._inject(method, request_id, self._replay(method, params))
+        time.sleep(latency)
+        # Alimenta o percentil de latência que define o atraso do hedge
+        metrics.observe(f"rpc.latency.{method}", latency)
+        return response
+
+    def make_batch_request(self, batch_requests):
+
+        if self.mode == "record":
+            started = time.monotonic()
+            responses = self.provider.make_batch_request(batch_requests)
+            latency = time.monotonic() - started
+            if isinstance(responses, list):
+                for (method, params), response in zip(batch_requests, responses):
+                    self._record(method, params, response, latency)
+            return responses
+
+        # Um único round trip: a latência do lote é a da chamada mais lenta
+        slowest = 0
+        responses = []
+        for method, params in batch_requests:
+            latency, response = self._inject(method, next(self.request_counter), self._replay(method, params))
+            slowest = max(slowest, latency)
+            responses.append(response)
+        time.sleep(slowest)
+        metrics.observe("rpc.latency.batch", slowest)
+        return responses
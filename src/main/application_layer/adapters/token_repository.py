@@ -0,0 +1,107 @@
+import logging
+
+from sqlalchemy.exc import IntegrityError
+
+from main.app import db
+from main.application_layer.persistency.tables import token_table
+from main.domain_layer.factories import TokenFactory
+
+logger = logging.getLogger("teste-mb." + __name__)
+
+class SQLAlchemyTokenRepository:
+    """Repository for the ERC-20 metadata known to the service.
+
+    Statements run on their own short transactions, so a token discovered
+    while validating is kept even when the request's session rolls back.
+    """
+
+    @classmethod
+    def get(cls, chain_id: int):
+        """Retrieve the known tokens of a chain."""
+
+        logger.info(
+            "Getting Tokens",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "get",
+                    "chain_id": chain_id
+                }
+            }
+        )
+
+        try:
+            with db.engine.begin() as conn:
+                rows = conn.execute(token_table.select().where(token_table.c.chain_id == chain_id)).all()
+
+            return [
+                TokenFactory(
+                    chain_id=row.chain_id,
+                    address=row.address,
+                    symbol=row.symbol,
+                    decimals=row.decimals
+                ).create_token() for row in rows
+            ]
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get Tokens",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "get",
+                        "chain_id": chain_id,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def create(cls, chain_id: int, address: str, symbol: str, decimals: int):
+        """Add a token; when another worker added it first, the stored one
+        is returned."""
+
+        logger.info(
+            "Creating Token",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "create",
+                    "chain_id": chain_id,
+                    "address": address,
+                    "symbol": symbol,
+                    "decimals": decimals
+                }
+            }
+        )
+
+        try:
+            try:
+                with db.engine.begin() as conn:
+                    conn.execute(token_table.insert().values(
+                        chain_id=chain_id, address=address, symbol=symbol, decimals=decimals))
+            except IntegrityError:
+                with db.engine.begin() as conn:
+                    row = conn.execute(token_table.select().where(
+                        token_table.c.chain_id == chain_id, token_table.c.address == address)).first()
+                symbol, decimals = row.symbol, row.decimals
+
+            return TokenFactory(
+                chain_id=chain_id,
+                address=address,
+                symbol=symbol,
+                decimals=decimals
+            ).create_token()
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to create Token",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "create",
+                        "chain_id": chain_id,
+                        "address": address,
+                        "error message": str(e)
+                    }
+                })
+            raise e
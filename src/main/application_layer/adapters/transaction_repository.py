@@ -1,5 +1,6 @@
 import logging
 import uuid
+from sqlalchemy.exc import IntegrityError
 from main.app import db
 from main.application_layer.persistency.tables import transaction_table
 from main.domain_layer.factories import TransactionFactory
@@ -125,4 +126,112 @@ class SQLAlchemyTransactionRepository:
                         "error message": str(e)
                     }
                 })
-            raise e
\ No newline at end of file
+            raise e
+
+    @classmethod
+    def get_registered_hashes(cls, tx_hashes: list):
+        """Retrieve, in a single query, which of the hashes are already
+        registered."""
+
+        logger.info(
+            "Getting registered Transaction hashes",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "get_registered_hashes",
+                    "count": len(tx_hashes)
+                }
+            }
+        )
+
+        try:
+            if not tx_hashes:
+                return set()
+
+            query = transaction_table.select().with_only_columns(
+                transaction_table.c.tx_hash).where(transaction_table.c.tx_hash.in_(tx_hashes))
+            return set(db.session.scalars(query).all())
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get registered Transaction hashes",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "get_registered_hashes",
+                        "count": len(tx_hashes),
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def create_many(cls, transactions: list):
+        """Insert several transactions with a single multi-row INSERT."""
+
+        logger.info(
+            "Creating Transactions",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "create_many",
+                    "count": len(transactions)
+                }
+            }
+        )
+
+        try:
+            rows = [dict(transaction, uuid=uuid.uuid4()) for transaction in transactions]
+            db.session.execute(transaction_table.insert().values(rows))
+            db.session.flush()
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to create Transactions",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "create_many",
+                        "count": len(transactions),
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def create_each(cls, groups: dict):
+        """Insert each group of transactions in its own savepoint, so a
+        rejected group does not undo the others. Returns the keys of the
+        groups that violated a constraint."""
+
+        logger.info(
+            "Creating Transactions by group",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "create_each",
+                    "count": len(groups)
+                }
+            }
+        )
+
+        rejected = set()
+        for key, transactions in groups.items():
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(transaction_table.insert().values(
+                        [dict(transaction, uuid=uuid.uuid4()) for transaction in transactions]))
+            except IntegrityError as e:
+                logger.warning(
+                    "Transactions rejected",
+                    extra={
+                        "props": {
+                            "service": "PostgreSQL",
+                            "service method": "create_each",
+                            "key": key,
+                            "error message": str(e)
+                        }
+                    })
+                rejected.add(key)
+        db.session.flush()
+        return rejected
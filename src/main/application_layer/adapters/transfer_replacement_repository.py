@@ -0,0 +1,181 @@
+import logging
+import uuid
+
+from uuid import UUID
+from main.app import db
+from main.application_layer.persistency.tables import transfer_replacement_table, transfer_table
+from main.domain_layer.factories import TransferReplacementFactory
+
+logger = logging.getLogger("teste-mb." + __name__)
+
+class SQLAlchemyTransferReplacementRepository:
+    """Repository for the replacement transactions of stuck transfers."""
+
+    @classmethod
+    def get_by_transfer(cls, transfer_uuid: UUID):
+        """Retrieve the replacements of a transfer, oldest first."""
+
+        logger.info(
+            "Getting Transfer Replacements",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "get_by_transfer",
+                    "transfer_uuid": str(transfer_uuid)
+                }
+            }
+        )
+
+        try:
+            replacements = db.session.query(transfer_replacement_table).filter(
+                transfer_replacement_table.c.transfer_uuid == transfer_uuid
+            ).order_by(transfer_replacement_table.c.block).all()
+
+            return [
+                TransferReplacementFactory(
+                    uuid=replacement.uuid,
+                    transfer_uuid=replacement.transfer_uuid,
+                    tx_hash=replacement.tx_hash,
+                    replaced_tx_hash=replacement.replaced_tx_hash,
+                    max_fee_per_gas=replacement.max_fee_per_gas,
+                    max_priority_fee_per_gas=replacement.max_priority_fee_per_gas,
+                    block=replacement.block,
+                ).create_transfer_replacement() for replacement in replacements
+            ]
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get Transfer Replacements",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "get_by_transfer",
+                        "transfer_uuid": str(transfer_uuid),
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def get_replaced_hashes(cls, status: str):
+        """Retrieve (replaced_tx_hash, transfer_uuid) pairs of the transfers
+        with a given status, since any of those hashes may be the one mined."""
+
+        logger.info(
+            "Getting replaced hashes",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "get_replaced_hashes",
+                    "status": status
+                }
+            }
+        )
+
+        try:
+            rows = db.session.query(
+                transfer_replacement_table.c.replaced_tx_hash,
+                transfer_replacement_table.c.transfer_uuid
+            ).join(
+                transfer_table, transfer_table.c.uuid == transfer_replacement_table.c.transfer_uuid
+            ).filter(transfer_table.c.status == status).all()
+
+            return [(replaced_tx_hash, transfer_uuid) for replaced_tx_hash, transfer_uuid in rows]
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get replaced hashes",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "get_replaced_hashes",
+                        "status": status,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def create_many(
+        cls,
+        transfer_uuids: list,
+        tx_hash: str,
+        replaced_tx_hash: str,
+        max_fee_per_gas: float,
+        max_priority_fee_per_gas: float,
+        block: int):
+        """Record one replacement for each transfer sharing the replaced hash."""
+
+        logger.info(
+            "Creating Transfer Replacements",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "create_many",
+                    "transfer_uuids": [str(u) for u in transfer_uuids],
+                    "tx_hash": tx_hash,
+                    "replaced_tx_hash": replaced_tx_hash
+                }
+            }
+        )
+
+        try:
+            rows = [
+                {
+                    "uuid": uuid.uuid4(),
+                    "transfer_uuid": transfer_uuid,
+                    "tx_hash": tx_hash,
+                    "replaced_tx_hash": replaced_tx_hash,
+                    "max_fee_per_gas": max_fee_per_gas,
+                    "max_priority_fee_per_gas": max_priority_fee_per_gas,
+                    "block": block,
+                } for transfer_uuid in transfer_uuids
+            ]
+            db.session.execute(transfer_replacement_table.insert().values(rows))
+            db.session.flush()
+
+            return [row["uuid"] for row in rows]
+        except Exception as e:
+            logger.exception(
+                "Error while trying to create Transfer Replacements",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "create_many",
+                        "transfer_uuids": [str(u) for u in transfer_uuids],
+                        "tx_hash": tx_hash,
+                        "replaced_tx_hash": replaced_tx_hash,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def delete(cls, tx_hash: str):
+        """Remove the records of a replacement that never reached a node."""
+
+        logger.info(
+            "Deleting Transfer Replacements",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "delete",
+                    "tx_hash": tx_hash
+                }
+            }
+        )
+
+        try:
+            db.session.execute(
+                transfer_replacement_table.delete().where(transfer_replacement_table.c.tx_hash == tx_hash))
+            db.session.flush()
+        except Exception as e:
+            logger.exception(
+                "Error while trying to delete Transfer Replacements",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "delete",
+                        "tx_hash": tx_hash,
+                        "error message": str(e)
+                    }
+                })
+            raise e
@@ -2,6 +2,7 @@ import logging
 import uuid
 
 from uuid import UUID
+from sqlalchemy import func
 from main.app import db
 from main.application_layer.persistency.tables import transfer_table
 from main.domain_layer.factories import TransferFactory
@@ -28,6 +29,8 @@ class SQLAlchemyTransferRepository:
         try:
             if uuid:
                 transfer = db.session.query(transfer_table).filter(transfer_table.c.uuid == uuid).first()
+                if not transfer:
+                    return None
 
                 return TransferFactory(
                     uuid=transfer.uuid,
@@ -68,6 +71,220 @@ class SQLAlchemyTransferRepository:
                 })
             raise e
         
+    @classmethod
+    def get_by_status(cls, status: str):
+        """Retrieve the transfers with a given status."""
+
+        logger.info(
+            "Getting Transfers by status",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "get_by_status",
+                    "status": status
+                }
+            }
+        )
+
+        try:
+            transfers = db.session.query(transfer_table).filter(transfer_table.c.status == status).all()
+
+            return [
+                TransferFactory(
+                    uuid=transfer.uuid,
+                    tx_hash=transfer.tx_hash,
+                    from_address=transfer.from_address,
+                    to_address=transfer.to_address,
+                    asset=transfer.asset,
+                    value=transfer.value,
+                    status=transfer.status,
+                    gas_used=transfer.gas_used,
+                    gas_price=transfer.gas_price,
+                ).create_transfer() for transfer in transfers
+            ]
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get Transfers by status",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "get_by_status",
+                        "status": status,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def get_by_batch(cls, batch_uuid: UUID):
+        """Retrieve the transfers of a batch."""
+
+        logger.info(
+            "Getting Transfers by batch",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "get_by_batch",
+                    "batch_uuid": str(batch_uuid)
+                }
+            }
+        )
+
+        try:
+            transfers = db.session.query(transfer_table).filter(transfer_table.c.batch_uuid == batch_uuid).all()
+
+            return [
+                TransferFactory(
+                    uuid=transfer.uuid,
+                    tx_hash=transfer.tx_hash,
+                    from_address=transfer.from_address,
+                    to_address=transfer.to_address,
+                    asset=transfer.asset,
+                    value=transfer.value,
+                    status=transfer.status,
+                    gas_used=transfer.gas_used,
+                    gas_price=transfer.gas_price,
+                ).create_transfer() for transfer in transfers
+            ]
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get Transfers by batch",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "get_by_batch",
+                        "batch_uuid": str(batch_uuid),
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def get_in_flight(cls):
+        """Summarise the 'sent' transfers of each sending address: how many
+        there are, the value still leaving per asset and the sum of the max
+        fee per gas of their transactions, counting a multi-send once."""
+
+        logger.info(
+            "Getting in-flight Transfers",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "get_in_flight",
+                }
+            }
+        )
+
+        try:
+            rows = db.session.query(
+                transfer_table.c.from_address,
+                transfer_table.c.asset,
+                func.count(),
+                func.sum(transfer_table.c.value),
+                func.max(transfer_table.c.gas_price)
+            ).filter(transfer_table.c.status == "sent").group_by(
+                # Uma linha por transação: as de um multi-send dividem o gas
+                transfer_table.c.from_address, transfer_table.c.asset, transfer_table.c.tx_hash).all()
+
+            in_flight = {}
+            for from_address, asset, count, value, gas_price in rows:
+                summary = in_flight.setdefault(from_address, {"count": 0, "value": {}, "gas_price": 0})
+                summary["count"] += count
+                summary["value"][asset] = summary["value"].get(asset, 0) + value
+                summary["gas_price"] += gas_price
+            return in_flight
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get in-flight Transfers",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "get_in_flight",
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def get_holders(cls, asset: str, addresses: list):
+        """Retrieve which of the addresses already received a confirmed
+        transfer of an asset."""
+
+        logger.info(
+            "Getting Transfers holders",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "get_holders",
+                    "asset": asset,
+                    "count": len(addresses)
+                }
+            }
+        )
+
+        try:
+            rows = db.session.query(transfer_table.c.to_address).filter(
+                transfer_table.c.asset == asset,
+                transfer_table.c.status == "confirmed",
+                transfer_table.c.to_address.in_(addresses)
+            ).distinct().all()
+
+            return {row.to_address for row in rows}
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get Transfers holders",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "get_holders",
+                        "asset": asset,
+                        "count": len(addresses),
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def get_gas_used(cls, asset: str, recipient_class: str, limit: int):
+        """Retrieve the gas used by the latest confirmed single transfers of
+        an asset to a recipient class, newest first."""
+
+        logger.info(
+            "Getting Transfers gas used",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "get_gas_used",
+                    "asset": asset,
+                    "recipient_class": recipient_class,
+                    "limit": limit
+                }
+            }
+        )
+
+        try:
+            rows = db.session.query(transfer_table.c.gas_used).filter(
+                transfer_table.c.asset == asset,
+                transfer_table.c.recipient_class == recipient_class,
+                transfer_table.c.status == "confirmed",
+                transfer_table.c.gas_used.is_not(None)
+            ).order_by(transfer_table.c.insert_at.desc()).limit(limit).all()
+
+            return [int(row.gas_used) for row in rows]
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get Transfers gas used",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "get_gas_used",
+                        "asset": asset,
+                        "recipient_class": recipient_class,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
     @classmethod
     def create(
         cls, 
@@ -78,7 +295,9 @@ class SQLAlchemyTransferRepository:
         value:float, 
         status:str, 
         gas_used:float, 
-        gas_price:float):
+        gas_price:float,
+        recipient_class:str = None,
+        nonce:int = None):
 
         logger.info(
             "Creating Transfer",
@@ -107,7 +326,9 @@ class SQLAlchemyTransferRepository:
                 value=value,
                 status=status,
                 gas_used=gas_used,
-                gas_price=gas_price
+                gas_price=gas_price,
+                recipient_class=recipient_class,
+                nonce=nonce
             )
             cursor = db.session.execute(insert_stmt)
             db.session.flush()
@@ -134,6 +355,239 @@ class SQLAlchemyTransferRepository:
             raise e
 
 
+    @classmethod
+    def create_many(cls, transfers: list, batch_uuid: UUID = None):
+        """Insert several transfers with a single multi-row INSERT and
+        return their uuids in the same order."""
+
+        logger.info(
+            "Creating Transfers",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "create_many",
+                    "batch_uuid": str(batch_uuid),
+                    "count": len(transfers)
+                }
+            }
+        )
+        try:
+            rows = [
+                dict(transfer, uuid=uuid.uuid4(), batch_uuid=batch_uuid) for transfer in transfers
+            ]
+            db.session.execute(transfer_table.insert().values(rows))
+            db.session.flush()
+            return [row["uuid"] for row in rows]
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to create Transfers",
+                extra={
+                        "props": {
+                        "service": "PostgreSQL",
+                        "service method": "create_many",
+                        "batch_uuid": str(batch_uuid),
+                        "count": len(transfers),
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def update_status_many(cls, uuids: list, status: str):
+        """Update the status of several transfers at once."""
+
+        logger.info(
+            "Update Transfers status",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "update_status_many",
+                    "uuids": [str(u) for u in uuids],
+                    "status": status
+                }
+            }
+        )
+        try:
+            update_stmt = transfer_table.update().values(status=status).where(transfer_table.c.uuid.in_(uuids))
+            db.session.execute(update_stmt)
+            db.session.flush()
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to update transfers",
+                extra={
+                        "props": {
+                        "service": "PostgreSQL",
+                        "service method": "update_status_many",
+                        "uuids": [str(u) for u in uuids],
+                        "status": status,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def mark_sent_block(cls, block_number: int):
+        """Stamp the 'sent' transfers not yet seen by the replacement worker
+        with the current block, the reference for how long they are stuck."""
+
+        logger.info(
+            "Marking sent block of Transfers",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "mark_sent_block",
+                    "block_number": block_number
+                }
+            }
+        )
+        try:
+            update_stmt = transfer_table.update().values(sent_block=block_number).where(
+                transfer_table.c.status == "sent",
+                transfer_table.c.sent_block.is_(None))
+            result = db.session.execute(update_stmt)
+            db.session.flush()
+            return result.rowcount
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to mark sent block of transfers",
+                extra={
+                        "props": {
+                        "service": "PostgreSQL",
+                        "service method": "mark_sent_block",
+                        "block_number": block_number,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def get_stuck(cls, sent_before_block: int):
+        """Retrieve the 'sent' transfers broadcast at or before a block."""
+
+        logger.info(
+            "Getting stuck Transfers",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "get_stuck",
+                    "sent_before_block": sent_before_block
+                }
+            }
+        )
+
+        try:
+            transfers = db.session.query(transfer_table).filter(
+                transfer_table.c.status == "sent",
+                transfer_table.c.sent_block <= sent_before_block).all()
+
+            return [
+                TransferFactory(
+                    uuid=transfer.uuid,
+                    tx_hash=transfer.tx_hash,
+                    from_address=transfer.from_address,
+                    to_address=transfer.to_address,
+                    asset=transfer.asset,
+                    value=transfer.value,
+                    status=transfer.status,
+                    gas_used=transfer.gas_used,
+                    gas_price=transfer.gas_price,
+                    nonce=transfer.nonce,
+                    sent_block=transfer.sent_block,
+                    approval_tx_hash=transfer.approval_tx_hash,
+                ).create_transfer() for transfer in transfers
+            ]
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get stuck Transfers",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "get_stuck",
+                        "sent_before_block": sent_before_block,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def update_replacement(cls, uuids: list, tx_hash: str, gas_price: float, sent_block: int):
+        """Point transfers at the hash of their replacement transaction."""
+
+        logger.info(
+            "Update Transfers replacement",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "update_replacement",
+                    "uuids": [str(u) for u in uuids],
+                    "tx_hash": tx_hash,
+                    "sent_block": sent_block
+                }
+            }
+        )
+        try:
+            update_stmt = transfer_table.update().values(
+                tx_hash=tx_hash, gas_price=gas_price, sent_block=sent_block
+            ).where(transfer_table.c.uuid.in_(uuids))
+            db.session.execute(update_stmt)
+            db.session.flush()
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to update transfers replacement",
+                extra={
+                        "props": {
+                        "service": "PostgreSQL",
+                        "service method": "update_replacement",
+                        "uuids": [str(u) for u in uuids],
+                        "tx_hash": tx_hash,
+                        "sent_block": sent_block,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def update_approval(cls, uuids: list, approval_tx_hash: str, sent_block: int):
+        """Point the transfers of a multi-send at the hash of its approval."""
+
+        logger.info(
+            "Update Transfers approval",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "update_approval",
+                    "uuids": [str(u) for u in uuids],
+                    "approval_tx_hash": approval_tx_hash,
+                    "sent_block": sent_block
+                }
+            }
+        )
+        try:
+            update_stmt = transfer_table.update().values(
+                approval_tx_hash=approval_tx_hash, sent_block=sent_block
+            ).where(transfer_table.c.uuid.in_(uuids))
+            db.session.execute(update_stmt)
+            db.session.flush()
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to update transfers approval",
+                extra={
+                        "props": {
+                        "service": "PostgreSQL",
+                        "service method": "update_approval",
+                        "uuids": [str(u) for u in uuids],
+                        "approval_tx_hash": approval_tx_hash,
+                        "sent_block": sent_block,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
     @classmethod
     def update_status(
         cls, 
@@ -0,0 +1,185 @@
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+
+from main.app import db
+from main.application_layer.persistency.tables import validation_lock_table
+from main.domain_layer.factories import ValidationLockFactory
+
+logger = logging.getLogger("teste-mb." + __name__)
+
+class SQLAlchemyValidationLockRepository:
+    """Repository for the validation claims shared by every worker.
+
+    Statements run on their own short transactions: a claim must be seen
+    by the other workers while its owner is still computing, and outlive a
+    request session that rolls back.
+    """
+
+    @classmethod
+    def get(cls, tx_hash: str):
+        """Retrieve the claim on a transaction, if any."""
+
+        logger.info(
+            "Getting Validation Lock",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "get",
+                    "tx_hash": tx_hash
+                }
+            }
+        )
+
+        try:
+            with db.engine.begin() as conn:
+                row = conn.execute(validation_lock_table.select().where(
+                    validation_lock_table.c.tx_hash == tx_hash.lower())).first()
+
+            return ValidationLockFactory(
+                tx_hash=row.tx_hash,
+                owner=row.owner,
+                result=json.loads(row.result) if row.result is not None else None,
+                acquired_at=row.acquired_at,
+                completed_at=row.completed_at
+            ).create_validation_lock() if row else None
+        except Exception as e:
+            logger.exception(
+                "Error while trying to get Validation Lock",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "get",
+                        "tx_hash": tx_hash,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def acquire(cls, tx_hash: str, owner: str, timeout: float, result_ttl: float):
+        """Claim a transaction. Claims older than `timeout` without a result
+        and results older than `result_ttl` are dropped first, so a crashed
+        worker never blocks a hash for good. Returns False when the hash is
+        already claimed."""
+
+        logger.info(
+            "Acquiring Validation Lock",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "acquire",
+                    "tx_hash": tx_hash,
+                    "owner": owner
+                }
+            }
+        )
+
+        try:
+            now = datetime.now(timezone.utc)
+            expired = validation_lock_table.delete().where(or_(
+                and_(validation_lock_table.c.completed_at.is_(None),
+                     validation_lock_table.c.acquired_at < now - timedelta(seconds=timeout)),
+                validation_lock_table.c.completed_at < now - timedelta(seconds=result_ttl)))
+
+            try:
+                with db.engine.begin() as conn:
+                    conn.execute(expired)
+                    conn.execute(validation_lock_table.insert().values(
+                        tx_hash=tx_hash.lower(), owner=owner, acquired_at=now))
+                return True
+            except IntegrityError:
+                return False
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to acquire Validation Lock",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "acquire",
+                        "tx_hash": tx_hash,
+                        "owner": owner,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def complete(cls, tx_hash: str, owner: str, result: dict):
+        """Store the result on the claim. Returns False when the claim was
+        taken over in the meantime."""
+
+        logger.info(
+            "Completing Validation Lock",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "complete",
+                    "tx_hash": tx_hash,
+                    "owner": owner
+                }
+            }
+        )
+
+        try:
+            update_stmt = validation_lock_table.update().values(
+                result=json.dumps(result), completed_at=datetime.now(timezone.utc)
+            ).where(validation_lock_table.c.tx_hash == tx_hash.lower(), validation_lock_table.c.owner == owner)
+
+            with db.engine.begin() as conn:
+                return conn.execute(update_stmt).rowcount == 1
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to complete Validation Lock",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "complete",
+                        "tx_hash": tx_hash,
+                        "owner": owner,
+                        "error message": str(e)
+                    }
+                })
+            raise e
+
+    @classmethod
+    def release(cls, tx_hash: str, owner: str):
+        """Delete a claim that produced no result."""
+
+        logger.info(
+            "Releasing Validation Lock",
+            extra={
+                "props": {
+                    "service": "PostgreSQL",
+                    "service method": "release",
+                    "tx_hash": tx_hash,
+                    "owner": owner
+                }
+            }
+        )
+
+        try:
+            delete_stmt = validation_lock_table.delete().where(
+                validation_lock_table.c.tx_hash == tx_hash.lower(), validation_lock_table.c.owner == owner)
+
+            with db.engine.begin() as conn:
+                conn.execute(delete_stmt)
+
+        except Exception as e:
+            logger.exception(
+                "Error while trying to release Validation Lock",
+                extra={
+                    "props": {
+                        "service": "PostgreSQL",
+                        "service method": "release",
+                        "tx_hash": tx_hash,
+                        "owner": owner,
+                        "error message": str(e)
+                    }
+                })
+            raise e
@@ -0,0 +1,364 @@
+import fcntl
+import heapq
+import mmap
+import os
+import struct
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from main.application_layer.metrics import metrics
+
+# Identificação do formato, versão da whitelist no banco e quantidade de endereços
+HEADER = struct.Struct("<4sQQ")
+MAGIC = b"WLI3"
+RECORD_SIZE = 20
+
+# Cabeçalho do segmento de acréscimos: versão do banco já incluída e
+# sequência de escritas, que cresce a cada acréscimo e fusão
+DELTA_HEADER = struct.Struct("<QQ")
+
+# Chave em session.info com os endereços criados e ainda não commitados
+PENDING_KEY = "whitelist_index.pending"
+
+# Contador no banco incrementado a cada endereço criado
+WHITELIST_COUNTER = "whitelist"
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _configured_index():
+
+    path = current_app.config["WHITELIST_INDEX_PATH"]
+    if not path:
+        return None
+
+    with _indexes_lock:
+        if path not in _indexes:
+            _indexes[path] = WhitelistIndex(path, delta_max=current_app.config["WHITELIST_INDEX_DELTA_MAX_ENTRIES"])
+        return _indexes[path]
+
+
+def get_whitelist_index():
+    """Process-wide index configured by WHITELIST_INDEX_PATH, built from
+    the addresses table when the file does not exist yet and brought up to
+    the whitelist version in the database at most once per
+    WHITELIST_INDEX_REFRESH_INTERVAL; None when it is disabled."""
+
+    index = _configured_index()
+    if index is None:
+        return None
+
+    from main.application_layer.adapters.address_repository import SQLAlchemyAddressRepository
+    from main.application_layer.adapters.counter_repository import SQLAlchemyCounterRepository
+
+    def load_version():
+        return SQLAlchemyCounterRepository.get(WHITELIST_COUNTER)
+
+    if not index.exists():
+        index.ensure(SQLAlchemyAddressRepository.get_addresses, load_version)
+    elif index.refresh_due(current_app.config["WHITELIST_INDEX_REFRESH_INTERVAL"]):
+        index.refresh(load_version, SQLAlchemyAddressRepository.get_addresses_since)
+    return index
+
+
+def address_key(address: str):
+    """The 20 bytes of an address, so checksummed and lowercase forms are
+    the same entry; None when it is not an address."""
+
+    digits = address[2:] if address[:2] in ("0x", "0X") else address
+    try:
+        key = bytes.fromhex(digits)
+    except ValueError:
+        return None
+    return key if len(key) == RECORD_SIZE else None
+
+
+def address_keys(addresses):
+
+    return sorted({address_key(address) for address in addresses} - {None})
+
+
+class WhitelistIndex:
+    """Sorted array of 20-byte addresses in a file memory-mapped by every
+    worker, plus an append-only segment with the addresses added since,
+    answering membership with a binary search and a set lookup and no
+    database round trip.
+
+    New addresses are appended to the segment under flock, so a commit
+    costs only what it adds; once the segment holds `delta_max` addresses
+    it is merged into a new sorted file, atomically replaced. Readers pick
+    up appends and replaced files on their next lookup.
+
+    The files record the whitelist version in the database they include,
+    so `refresh` fetches what other hosts committed since. The write
+    sequence of the segment grows with every change and is the version
+    results derived from the whitelist can be keyed by."""
+
+    def __init__(self, path: str, delta_max: int = 4096):
+        self.path = path
+        self.delta_path = f"{path}.delta"
+        self.delta_max = delta_max
+        self._lock = threading.Lock()
+        self._map = None
+        self._count = 0
+        self._identity = None
+        self._delta = set()
+        self._delta_identity = None
+        self._delta_offset = 0
+        self._synced = 0
+        self._sequence = None
+        self._refreshed_at = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        metrics.gauge(f"whitelist_index.{os.path.basename(path)}", self.stats)
+
+    def exists(self):
+
+        # Um arquivo sem segmento é de um formato anterior e é reconstruído
+        return os.path.exists(self.path) and os.path.exists(self.delta_path)
+
+    def _read_delta(self):
+        """Read the records appended to the segment since the last lookup,
+        or all of them when it was replaced."""
+
+        try:
+            delta_file = open(self.delta_path, "rb")
+        except FileNotFoundError:
+            self._delta, self._delta_identity, self._delta_offset, self._sequence = set(), None, 0, None
+            return
+
+        with delta_file:
+            stat = os.fstat(delta_file.fileno())
+            identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if identity == self._delta_identity:
+                return
+            if self._delta_identity is None or stat.st_ino != self._delta_identity[0]:
+                self._delta, self._delta_offset = set(), DELTA_HEADER.size
+
+            self._synced, self._sequence = DELTA_HEADER.unpack(delta_file.read(DELTA_HEADER.size))
+            delta_file.seek(self._delta_offset)
+            data = delta_file.read(stat.st_size - self._delta_offset)
+            # Um registro ainda sendo escrito fica para a próxima leitura
+            complete = len(data) - len(data) % RECORD_SIZE
+            self._delta.update(data[offset:offset + RECORD_SIZE] for offset in range(0, complete, RECORD_SIZE))
+            self._delta_offset += complete
+            self._delta_identity = identity
+
+    def _remap(self):
+        """Load what changed in both files since the last lookup. The
+        segment is read first: a merge replaces the sorted file before
+        emptying the segment, so no address is missed in between."""
+
+        self._read_delta()
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if identity == self._identity:
+            return True
+
+        with open(self.path, "rb") as index_file:
+            mapped = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, _, count = HEADER.unpack_from(mapped)
+        if magic != MAGIC or len(mapped) != HEADER.size + count * RECORD_SIZE:
+            mapped.close()
+            raise ValueError(f"Invalid whitelist index {self.path}")
+
+        if self._map is not None:
+            self._map.close()
+        self._map, self._count, self._identity = mapped, count, identity
+        return True
+
+    def _in_sorted(self, key: bytes):
+
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            offset = HEADER.size + middle * RECORD_SIZE
+            record = self._map[offset:offset + RECORD_SIZE]
+            if record < key:
+                low = middle + 1
+            elif record > key:
+                high = middle
+            else:
+                return True
+        return False
+
+    def contains(self, address: str):
+
+        key = address_key(address)
+        if key is None:
+            return False
+
+        with self._lock:
+            if not self._remap():
+                return False
+            return key in self._delta or self._in_sorted(key)
+
+    def version(self):
+        """Version of the current contents, or None without an index."""
+
+        with self._lock:
+            return self._sequence if self._remap() else None
+
+    def _replace(self, path: str, data: bytes):
+
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as index_file:
+            index_file.write(data)
+            index_file.flush()
+            os.fsync(index_file.fileno())
+        os.replace(temporary, path)
+
+    def _write(self, keys, synced: int, sequence: int):
+        """Replace the sorted file and start an empty segment."""
+
+        self._replace(self.path, HEADER.pack(MAGIC, synced, len(keys)) + b"".join(keys))
+        self._replace(self.delta_path, DELTA_HEADER.pack(synced, sequence))
+
+    def _delta_header(self):
+
+        try:
+            with open(self.delta_path, "rb") as delta_file:
+                return DELTA_HEADER.unpack(delta_file.read(DELTA_HEADER.size))
+        except FileNotFoundError:
+            return 0, 0
+
+    def _append(self, keys, synced: int = 0):
+
+        with open(self.delta_path, "r+b") as delta_file:
+            old_synced, sequence = DELTA_HEADER.unpack(delta_file.read(DELTA_HEADER.size))
+            delta_file.seek(0, os.SEEK_END)
+            delta_file.write(b"".join(keys))
+            size = delta_file.tell()
+            delta_file.seek(0)
+            delta_file.write(DELTA_HEADER.pack(max(old_synced, synced), sequence + 1))
+            delta_file.flush()
+            os.fsync(delta_file.fileno())
+
+        if (size - DELTA_HEADER.size) // RECORD_SIZE >= self.delta_max:
+            self._merge()
+
+    def _merge(self):
+        """Fold the segment into a new sorted file."""
+
+        with open(self.path, "rb") as index_file:
+            data = index_file.read()
+        with open(self.delta_path, "rb") as delta_file:
+            delta = delta_file.read()
+
+        synced, sequence = DELTA_HEADER.unpack_from(delta)
+        complete = len(delta) - (len(delta) - DELTA_HEADER.size) % RECORD_SIZE
+        added = sorted({delta[offset:offset + RECORD_SIZE] for offset in range(DELTA_HEADER.size, complete, RECORD_SIZE)})
+
+        keys = []
+        for key in heapq.merge((data[offset:offset + RECORD_SIZE] for offset in range(HEADER.size, len(data), RECORD_SIZE)), added):
+            if not keys or keys[-1] != key:
+                keys.append(key)
+        self._write(keys, synced, sequence + 1)
+        metrics.increment("whitelist_index.merges")
+
+    def _locked(self):
+
+        lock_file = open(f"{self.path}.lock", "a")
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return lock_file
+
+    def rebuild(self, addresses, version: int = 0):
+        """Replace the index with exactly these addresses, read from the
+        database at `version`."""
+
+        keys = address_keys(addresses)
+        with self._locked():
+            self._write(keys, version, self._delta_header()[1] + 1)
+
+    def ensure(self, load_addresses, load_version):
+        """Build the index from `load_addresses()` unless another worker
+        already did."""
+
+        with self._locked():
+            if not self.exists():
+                # Versão lida antes dos endereços: o que for commitado no
+                # meio volta no próximo refresh
+                version = load_version()
+                self._write(address_keys(load_addresses()), version, self._delta_header()[1] + 1)
+
+    def add(self, addresses):
+        """Append new addresses to the segment. Returns False when there is
+        no index yet, leaving the first lookup to build it."""
+
+        new_keys = address_keys(addresses)
+        if not new_keys:
+            return True
+
+        with self._locked():
+            if not self.exists():
+                return False
+            self._append(new_keys)
+        return True
+
+    def refresh_due(self, interval: float):
+        """Whether this process should compare the index with the database
+        now; at most once per `interval`."""
+
+        with self._lock:
+            now = time.monotonic()
+            if self._refreshed_at is not None and now - self._refreshed_at < interval:
+                return False
+            self._refreshed_at = now
+            return True
+
+    def refresh(self, load_version, load_addresses_since):
+        """Append the addresses committed since the version the index
+        includes, by this or any other host. Returns whether it changed."""
+
+        version = load_version()
+        with self._lock:
+            if self._remap() and version <= self._synced:
+                return False
+
+        with self._locked():
+            synced = self._delta_header()[0]
+            if not self.exists() or version <= synced:
+                # Outro worker já buscou
+                return False
+            self._append(address_keys(load_addresses_since(synced)), synced=version)
+
+        metrics.increment("whitelist_index.refreshes")
+        return True
+
+    def stats(self):
+
+        with self._lock:
+            if not self._remap():
+                return {"entries": 0}
+            added = sum(1 for key in self._delta if not self._in_sorted(key))
+            return {"entries": self._count + added}
+
+
+@event.listens_for(Session, "after_commit")
+def _add_committed_addresses(session):
+
+    # Sem SQL aqui: se o índice ainda não existe, a primeira consulta o
+    # constrói a partir da tabela, já com estes endereços
+    addresses = session.info.pop(PENDING_KEY, None)
+    if addresses:
+        whitelist_index = _configured_index()
+        if whitelist_index is not None:
+            whitelist_index.add(addresses)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_addresses(session):
+
+    session.info.pop(PENDING_KEY, None)
@@ -0,0 +1,8 @@
+class NoHotWalletAvailable(Exception):
+    pass
+
+
+class RateLimitExceeded(Exception):
+    """The outbound RPC budget would only be available after the longest
+    allowed wait. Nothing was sent, so failover tries the next provider
+    without counting it against the endpoint's health."""
@@ -0,0 +1,94 @@
+import collections
+import statistics
+import threading
+
+# Amostras guardadas por timing para os percentis
+TIMING_WINDOW = 1024
+
+
+class Metrics:
+    """Process-local counters, timings and gauges.
+
+    Each worker process keeps its own values; they are exposed as JSON by
+    the /metrics endpoint and read back by the code that adapts to them
+    (e.g. hedged requests use the latency percentiles)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = collections.defaultdict(int)
+        self._timings = {}
+        self._gauges = {}
+
+    def increment(self, name: str, value: int = 1):
+
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, value: float):
+        """Record a timing, in seconds."""
+
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                timing = self._timings[name] = {
+                    "count": 0, "sum": 0.0, "max": 0.0,
+                    "samples": collections.deque(maxlen=TIMING_WINDOW),
+                }
+            timing["count"] += 1
+            timing["sum"] += value
+            timing["max"] = max(timing["max"], value)
+            timing["samples"].append(value)
+
+    def gauge(self, name: str, callback):
+        """Register a callback read every time a snapshot is taken."""
+
+        with self._lock:
+            self._gauges[name] = callback
+
+    def counter(self, name: str):
+
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def percentile(self, name: str, percentile: int):
+        """Percentile of the recent samples of a timing, or None when there
+        are not enough samples yet."""
+
+        with self._lock:
+            timing = self._timings.get(name)
+            samples = list(timing["samples"]) if timing else []
+
+        if len(samples) < 2:
+            return None
+        return statistics.quantiles(samples, n=100, method="inclusive")[percentile - 1]
+
+    def snapshot(self):
+
+        with self._lock:
+            counters = dict(self._counters)
+            timings = {name: dict(timing, samples=list(timing["samples"])) for name, timing in self._timings.items()}
+            gauges = dict(self._gauges)
+
+        result = {"counters": counters, "timings": {}, "gauges": {}}
+        for name, timing in timings.items():
+            samples = timing.pop("samples")
+            quantiles = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+            result["timings"][name] = dict(
+                timing, p50=quantiles[49], p95=quantiles[94], p99=quantiles[98])
+        for name, callback in gauges.items():
+            try:
+                result["gauges"][name] = callback()
+            except Exception:
+                result["gauges"][name] = None
+
+        return result
+
+    def reset(self):
+
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+            self._gauges.clear()
+
+
+metrics = Metrics()
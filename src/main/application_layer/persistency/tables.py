@@ -1,4 +1,4 @@
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, false as sa_false
 from uuid import UUID
 
 from main.app import db
@@ -10,6 +10,8 @@ address_table = db.Table(
               unique=True, nullable=False, primary_key=True),
     db.Column('address', db.String(100), unique=True, nullable=False),
     db.Column('private_key', db.String, nullable=False),
+    db.Column('hot_wallet', db.Boolean, nullable=False, server_default=sa_false()),
+    db.Column('whitelist_version', db.BigInteger, nullable=True, index=True),
     db.Column('insert_at', db.DateTime(timezone=True), server_default=func.now()),
 )
 
@@ -31,13 +33,77 @@ transfer_table = db.Table(
     db.Column('uuid',
               db.Uuid(as_uuid=True),
               unique=True, nullable=False, primary_key=True),
-    db.Column('tx_hash', db.String(100), unique=True, nullable=False),
+    db.Column('tx_hash', db.String(100), nullable=False, index=True),
     db.Column('from_address', db.String(100), nullable=False),
     db.Column('to_address', db.String(100), nullable=False),
     db.Column('asset', db.String(10), nullable=False),
-    db.Column('value', db.Float(asdecimal=True), nullable=False),
+    db.Column('value', db.Numeric(asdecimal=True), nullable=False),
     db.Column('status', db.String(10), nullable=False),
-    db.Column('gas_used', db.Float(asdecimal=True), nullable=False),
+    db.Column('gas_used', db.Float(asdecimal=True), nullable=True),
     db.Column('gas_price', db.Float(asdecimal=True), nullable=False),
+    db.Column('batch_uuid', db.Uuid(as_uuid=True), nullable=True, index=True),
+    db.Column('sent_block', db.BigInteger, nullable=True),
+    db.Column('recipient_class', db.String(10), nullable=True),
+    db.Column('nonce', db.BigInteger, nullable=True),
+    db.Column('approval_tx_hash', db.String(100), nullable=True),
     db.Column('insert_at', db.DateTime(timezone=True), server_default=func.now()),
 )   
+
+
+nonce_table = db.Table(
+    'nonces', db.metadata,
+    db.Column('address', db.String(100), unique=True, nullable=False, primary_key=True),
+    db.Column('nonce', db.BigInteger, nullable=False),
+    db.Column('updated_at', db.DateTime(timezone=True), server_default=func.now(), onupdate=func.now()),
+)
+
+
+transfer_replacement_table = db.Table(
+    'transfer_replacements', db.metadata,
+    db.Column('uuid',
+              db.Uuid(as_uuid=True),
+              unique=True, nullable=False, primary_key=True),
+    db.Column('transfer_uuid', db.Uuid(as_uuid=True), db.ForeignKey('transfers.uuid'), nullable=False, index=True),
+    db.Column('tx_hash', db.String(100), nullable=False),
+    db.Column('replaced_tx_hash', db.String(100), nullable=False),
+    db.Column('max_fee_per_gas', db.Float(asdecimal=True), nullable=False),
+    db.Column('max_priority_fee_per_gas', db.Float(asdecimal=True), nullable=False),
+    db.Column('block', db.BigInteger, nullable=False),
+    db.Column('insert_at', db.DateTime(timezone=True), server_default=func.now()),
+)
+
+
+token_table = db.Table(
+    'tokens', db.metadata,
+    db.Column('chain_id', db.BigInteger, nullable=False, primary_key=True),
+    db.Column('address', db.String(100), nullable=False, primary_key=True),
+    db.Column('symbol', db.String(50), nullable=False),
+    db.Column('decimals', db.Integer, nullable=False),
+    db.Column('insert_at', db.DateTime(timezone=True), server_default=func.now()),
+)
+
+
+validation_lock_table = db.Table(
+    'validation_locks', db.metadata,
+    db.Column('tx_hash', db.String(100), nullable=False, primary_key=True),
+    db.Column('owner', db.String(100), nullable=False),
+    db.Column('result', db.Text, nullable=True),
+    db.Column('acquired_at', db.DateTime(timezone=True), nullable=False, index=True),
+    db.Column('completed_at', db.DateTime(timezone=True), nullable=True, index=True),
+)
+
+
+checkpoint_table = db.Table(
+    'worker_checkpoints', db.metadata,
+    db.Column('name', db.String(50), nullable=False, primary_key=True),
+    db.Column('block', db.BigInteger, nullable=False),
+    db.Column('updated_at', db.DateTime(timezone=True), server_default=func.now(), onupdate=func.now()),
+)
+
+
+counter_table = db.Table(
+    'counters', db.metadata,
+    db.Column('name', db.String(50), nullable=False, primary_key=True),
+    db.Column('value', db.BigInteger, nullable=False),
+    db.Column('updated_at', db.DateTime(timezone=True), server_default=func.now(), onupdate=func.now()),
+)
@@ -6,7 +6,7 @@ from main.domain_layer.models.address import Address
 class AddressUseCase:
 
     @transaction()
-    def generate(self, quantity: int):
+    def generate(self, quantity: int, hot_wallet: bool = False):
 
         ethereum_service = EthereumService(w3=w3)
 
@@ -15,7 +15,8 @@ class AddressUseCase:
             account = ethereum_service.create()
             Address.create(
                 address=account.address,
-                private_key=account.key.hex()
+                private_key=account.key.hex(),
+                hot_wallet=hot_wallet
             )
             generated.append(account.address)
 
@@ -23,3 +24,7 @@ class AddressUseCase:
     
     def get(self):
         return Address.get()
+
+    @transaction()
+    def set_hot_wallet(self, address: str, hot_wallet: bool):
+        return Address.set_hot_wallet(address=address, hot_wallet=hot_wallet)
@@ -0,0 +1,167 @@
+import logging
+import time
+
+from flask import current_app
+
+from main.app import w3
+from main.application_layer.use_cases import transaction
+from main.application_layer.adapters.chain_cache import get_chain_cache
+from main.application_layer.adapters.ethereum_service import EthereumService
+from main.domain_layer.models.checkpoint import Checkpoint
+from main.domain_layer.models.transfer import Transfer
+from main.domain_layer.models.transfer_replacement import TransferReplacement
+
+logger = logging.getLogger("teste-mb." + __name__)
+
+CHECKPOINT = "confirm-transfers"
+
+
+def receipt_status(receipt):
+    return "confirmed" if receipt["status"] == 1 else "failed"
+
+
+def gas_share(receipt, transfers: list):
+    """Gas used by each transfer of a transaction: the rows of a multi-send
+    split the receipt's gasUsed, so summing them gives it back once."""
+
+    return receipt["gasUsed"] / len(transfers)
+
+
+class ConfirmationUseCase:
+    """Confirms every 'sent' transfer from the receipts of each new block,
+    so the RPC volume follows the chain and not the number of pending
+    transfers."""
+
+    def __init__(self):
+        self.ethereum_service = EthereumService(w3=w3, cache=get_chain_cache())
+        self.last_block = None
+
+    def _pending_by_hash(self):
+        pending = {}
+        transfers = {}
+        for transfer in Transfer.get_by_status(status="sent"):
+            pending.setdefault(transfer.tx_hash.lower(), []).append(transfer)
+            transfers[transfer.uuid] = transfer
+
+        # Uma transação substituída ainda pode ser a minerada
+        for replaced_tx_hash, transfer_uuid in TransferReplacement.get_replaced_hashes(status="sent"):
+            if transfer_uuid in transfers:
+                pending.setdefault(replaced_tx_hash.lower(), []).append(transfers[transfer_uuid])
+        return pending
+
+    @transaction()
+    def reconcile(self):
+        """Check the transfers left 'sent' before the worker started, with
+        one batch of receipts, since their blocks will not be scanned again."""
+
+        pending = self._pending_by_hash()
+        if not pending:
+            return []
+
+        receipts = self.ethereum_service.batch(
+            [("get_transaction_receipt", tx_hash) for tx_hash in pending])
+
+        confirmed = []
+        for (tx_hash, transfers), receipt in zip(pending.items(), receipts):
+            if isinstance(receipt, Exception):
+                # Ainda não minerada
+                continue
+
+            for transfer in transfers:
+                if transfer.uuid in confirmed:
+                    continue
+                Transfer.update_confirmation(
+                    uuid=transfer.uuid,
+                    status=receipt_status(receipt),
+                    gas_used=gas_share(receipt, transfers),
+                    tx_hash=tx_hash)
+                confirmed.append(transfer.uuid)
+
+        return confirmed
+
+    @transaction()
+    def confirm_block(self, block_number: int):
+        """Match the receipts of a block against the pending transfers and
+        record every confirmation, and the block as processed, in a single
+        DB transaction."""
+
+        Checkpoint.save(name=CHECKPOINT, block=block_number)
+
+        pending = self._pending_by_hash()
+        if not pending:
+            return []
+
+        confirmed = []
+        for receipt in self.ethereum_service.get_block_receipts(block_number):
+            tx_hash = receipt["transactionHash"].to_0x_hex().lower()
+            transfers = pending.get(tx_hash, [])
+            for transfer in transfers:
+                Transfer.update_confirmation(
+                    uuid=transfer.uuid,
+                    status=receipt_status(receipt),
+                    gas_used=gas_share(receipt, transfers),
+                    tx_hash=tx_hash)
+                confirmed.append(transfer.uuid)
+
+        return confirmed
+
+    @transaction()
+    def _checkpoint(self):
+
+        return Checkpoint.get(name=CHECKPOINT)
+
+    def start(self):
+        """Resume from the last processed block. The head is read before
+        the reconcile, so every block mined after it is scanned; when the
+        checkpoint is missing or more than CONFIRMATION_MAX_CATCHUP_BLOCKS
+        behind, the reconcile covers what lies before the head."""
+
+        head = self.ethereum_service.block_number
+        checkpoint = self._checkpoint()
+        self.reconcile()
+
+        if checkpoint is not None and head - checkpoint <= current_app.config["CONFIRMATION_MAX_CATCHUP_BLOCKS"]:
+            self.last_block = checkpoint
+        else:
+            self.last_block = head - 1
+
+    def poll(self):
+        """Process every block mined since the last poll."""
+
+        if self.last_block is None:
+            self.start()
+        head = self.ethereum_service.block_number
+
+        confirmed = []
+        for block_number in range(self.last_block + 1, head + 1):
+            confirmed.extend(self.confirm_block(block_number))
+            self.last_block = block_number
+
+        return confirmed
+
+    def run(self, poll_interval: float):
+
+        while True:
+            try:
+                confirmed = self.poll()
+                if confirmed:
+                    logger.info(
+                        "Transfers confirmed",
+                        extra={
+                            "props": {
+                                "worker": "confirm-transfers",
+                                "block": self.last_block,
+                                "transfers": [str(uuid) for uuid in confirmed]
+                            }
+                        })
+            except Exception as e:
+                logger.exception(
+                    "Error while confirming transfers",
+                    extra={
+                        "props": {
+                            "worker": "confirm-transfers",
+                            "block": self.last_block,
+                            "error message": str(e)
+                        }
+                    })
+            time.sleep(poll_interval)
@@ -0,0 +1,75 @@
+import statistics
+import threading
+import time
+
+from main.app import w3
+from main.application_layer.adapters.ethereum_service import EthereumService
+
+FEE_HISTORY_BLOCKS = 10
+
+# Intervalo máximo entre leituras do histórico de taxas; dentro dele as
+# cotações saem do cache sem nenhuma chamada RPC
+QUOTE_TTL = 3
+
+# Percentil da gorjeta paga nos últimos blocos usado por cada urgência
+URGENCY_PERCENTILES = {
+    "slow": 10,
+    "standard": 50,
+    "fast": 90,
+}
+
+_fee_cache = {"quotes": None, "fetched_at": 0}
+_fee_cache_lock = threading.Lock()
+
+
+def build_quotes(fee_history):
+    """Turn an eth_feeHistory answer into maxFeePerGas and
+    maxPriorityFeePerGas per urgency tier."""
+
+    # O último base fee do histórico é o do próximo bloco
+    base_fee = fee_history["baseFeePerGas"][-1]
+    newest_block = fee_history["oldestBlock"] + len(fee_history["reward"]) - 1
+
+    tiers = {}
+    for index, urgency in enumerate(URGENCY_PERCENTILES):
+        priority_fee = int(statistics.median(reward[index] for reward in fee_history["reward"]))
+        tiers[urgency] = {
+            # 2x o base fee cobre vários blocos cheios seguidos
+            "maxFeePerGas": 2 * base_fee + priority_fee,
+            "maxPriorityFeePerGas": priority_fee,
+        }
+
+    return {"block": newest_block, "base_fee": base_fee, "tiers": tiers}
+
+
+class FeeUseCase:
+    """EIP-1559 fee quotes served from a process cache. eth_feeHistory is
+    read on the latest block at most once per QUOTE_TTL, well under a block
+    time, and every quote in between costs no RPC."""
+
+    def __init__(self, ethereum_service: EthereumService = None):
+        self.ethereum_service = ethereum_service or EthereumService(w3=w3)
+
+    def get_quotes(self):
+
+        now = time.monotonic()
+        with _fee_cache_lock:
+            quotes = _fee_cache["quotes"]
+            if quotes is None or now - _fee_cache["fetched_at"] >= QUOTE_TTL:
+                # O histórico já traz o bloco mais novo: uma única chamada
+                fee_history = self.ethereum_service.fee_history(
+                    FEE_HISTORY_BLOCKS, "latest", list(URGENCY_PERCENTILES.values()))
+                fresh = build_quotes(fee_history)
+                # Um nó atrasado não faz a cotação voltar a um bloco anterior
+                if quotes is None or fresh["block"] >= quotes["block"]:
+                    _fee_cache["quotes"] = fresh
+                _fee_cache["fetched_at"] = now
+
+            return _fee_cache["quotes"]
+
+    def quote(self, urgency: str = "standard"):
+
+        if urgency not in URGENCY_PERCENTILES:
+            raise ValueError(f"Urgency '{urgency}' not supported")
+
+        return self.get_quotes()["tiers"][urgency]
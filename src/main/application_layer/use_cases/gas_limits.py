@@ -0,0 +1,84 @@
+import statistics
+import threading
+import time
+
+from flask import current_app
+
+from main.app import w3
+from main.application_layer.adapters.ethereum_service import EthereumService
+from main.domain_layer.models.transfer import Transfer
+
+# Folga sobre o gas observado/estimado
+GAS_LIMIT_MARGIN = 1.25
+
+_gas_limit_cache = {}
+_gas_limit_cache_lock = threading.Lock()
+
+
+def gas_limit_from_samples(samples: list, percentile: int, max_spread: float, min_samples: int):
+    """Gas limit from a high percentile of the observed gasUsed, or None
+    when there are too few samples or they are too spread to be trusted."""
+
+    if len(samples) < min_samples:
+        return None
+
+    high = statistics.quantiles(samples, n=100, method="inclusive")[percentile - 1]
+    if (high - statistics.median(samples)) / high > max_spread:
+        return None
+
+    return int(high * GAS_LIMIT_MARGIN)
+
+
+class GasLimitUseCase:
+    """Gas limits of token transfers taken from the gas used by previous
+    transfers of the same token, so the hot path makes no RPC.
+
+    Transfers are sampled per recipient class: 'holding' for an address
+    this service already paid in the token, 'fresh' otherwise. The class
+    comes from local history and may be stale, since a holder can empty
+    its balance before the transfer is mined. So every transfer takes the
+    'fresh' limit, which covers the extra storage write. An unused limit
+    is not charged."""
+
+    def __init__(self, ethereum_service: EthereumService = None):
+        self.ethereum_service = ethereum_service or EthereumService(w3=w3)
+
+    def recipient_class(self, asset: str, to_address: str):
+
+        return self.recipient_classes(asset, [to_address])[0]
+
+    def recipient_classes(self, asset: str, to_addresses: list):
+        """Recipient classes of several addresses, from one query of the
+        transfer history."""
+
+        holders = Transfer.get_holders(asset=asset, addresses=list(set(to_addresses)))
+        return ["holding" if to_address in holders else "fresh" for to_address in to_addresses]
+
+    def cached_gas_limit(self, asset: str, recipient_class: str):
+
+        key = (asset, recipient_class)
+        with _gas_limit_cache_lock:
+            entry = _gas_limit_cache.get(key)
+            if entry is None or time.monotonic() >= entry["expires_at"]:
+                samples = Transfer.get_gas_used(
+                    asset=asset, recipient_class=recipient_class, limit=current_app.config["GAS_LIMIT_SAMPLES"])
+                entry = {
+                    "expires_at": time.monotonic() + current_app.config["GAS_LIMIT_CACHE_TTL"],
+                    "gas_limit": gas_limit_from_samples(
+                        samples,
+                        current_app.config["GAS_LIMIT_PERCENTILE"],
+                        current_app.config["GAS_LIMIT_MAX_SPREAD"],
+                        current_app.config["GAS_LIMIT_MIN_SAMPLES"]),
+                }
+                _gas_limit_cache[key] = entry
+
+            return entry["gas_limit"]
+
+    def gas_limit(self, asset: str, tx: dict):
+
+        # O limite de um destinatário novo também cobre um que zerou o saldo
+        gas_limit = self.cached_gas_limit(asset, "fresh")
+        if gas_limit is None:
+            # Sem histórico suficiente: estimativa ao vivo
+            gas_limit = int(self.ethereum_service.estimate_gas(tx) * GAS_LIMIT_MARGIN)
+        return gas_limit
@@ -0,0 +1,113 @@
+import decimal
+import random
+
+from flask import current_app
+
+from main.application_layer.adapters.ethereum_service import MULTICALL3_ABI, MULTICALL3_ADDRESS, EthereumService
+from main.application_layer.exceptions import NoHotWalletAvailable
+from main.application_layer.use_cases.tokens import ERC20_ABI, get_token_address, get_token_decimals
+from main.domain_layer.models.address import Address
+from main.domain_layer.models.transfer import Transfer
+
+
+class HotWalletPool:
+    """Spreads payouts over the hot wallets flagged in the addresses table,
+    so transfers are not serialised behind a single sender's nonces."""
+
+    def __init__(self, ethereum_service: EthereumService):
+        self.ethereum_service = ethereum_service
+
+    def balance(self, address: str, asset: str):
+        """Balance of an address in units of the asset."""
+
+        return self.balances([address], asset)[0]
+
+    def balances(self, addresses: list, asset: str):
+        """Balances of several addresses, read in a single request: a batch
+        of eth_getBalance, or one multicall of balanceOf for tokens. A
+        balance that could not be read comes back as None."""
+
+        if asset == "ETH":
+            results = self.ethereum_service.batch([("get_balance", address) for address in addresses])
+            unit = decimal.Decimal(10) ** 18
+        else:
+            contract = self.ethereum_service.contract(address=get_token_address(asset), abi=ERC20_ABI)
+            results = self.ethereum_service.multicall([contract.functions.balanceOf(address) for address in addresses])
+            unit = decimal.Decimal(10) ** get_token_decimals(asset, self.ethereum_service)
+
+        return [
+            None if isinstance(result, Exception) else decimal.Decimal(result) / unit
+            for result in results
+        ]
+
+    def token_and_eth_balances(self, addresses: list, asset: str):
+        """Token and ETH balances of several addresses, both read in one
+        multicall: balanceOf on the token and getEthBalance on Multicall3.
+        A balance that could not be read comes back as None."""
+
+        token = self.ethereum_service.contract(address=get_token_address(asset), abi=ERC20_ABI)
+        multicall = self.ethereum_service.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+        results = self.ethereum_service.multicall(
+            [token.functions.balanceOf(address) for address in addresses]
+            + [multicall.functions.getEthBalance(address) for address in addresses])
+
+        units = [decimal.Decimal(10) ** get_token_decimals(asset, self.ethereum_service), decimal.Decimal(10) ** 18]
+        balances = [
+            None if isinstance(result, Exception) else decimal.Decimal(result) / unit
+            for unit, start in zip(units, (0, len(addresses)))
+            for result in results[start:start + len(addresses)]
+        ]
+        return balances[:len(addresses)], balances[len(addresses):]
+
+    def select(self, asset: str, amount: decimal.Decimal):
+        """Pick the hot wallet with the fewest in-flight transfers that holds
+        enough of the asset. Ties are broken at random so that concurrent
+        requests do not all land on the same wallet.
+
+        The value of the wallet's 'sent' transfers of the asset is still to
+        leave it, so it is taken off the balance first. The gas those
+        transfers may burn, HOT_WALLET_GAS_RESERVE per transaction at its max
+        fee per gas, is taken off the ETH balance, which for token sends must
+        still cover it."""
+
+        wallets = Address.get_hot_wallets()
+        if not wallets:
+            raise NoHotWalletAvailable("No hot wallet configured")
+
+        in_flight = Transfer.get_in_flight()
+        candidates = sorted(
+            wallets, key=lambda wallet: (in_flight.get(wallet.address, {}).get("count", 0), random.random()))
+
+        addresses = [wallet.address for wallet in candidates]
+        if asset == "ETH":
+            balances = eth_balances = self.balances(addresses, asset)
+        else:
+            # Envios de token também pagam gas em ETH
+            balances, eth_balances = self.token_and_eth_balances(addresses, asset)
+
+        for wallet, balance, eth_balance in zip(candidates, balances, eth_balances):
+            if balance is None or eth_balance is None:
+                continue
+            wallet_in_flight = in_flight.get(wallet.address)
+            gas = self._gas_reserved(wallet_in_flight)
+            if asset == "ETH":
+                enough = balance - self._committed(wallet_in_flight, asset) - gas >= amount
+            else:
+                enough = balance - self._committed(wallet_in_flight, asset) >= amount and eth_balance - gas >= 0
+            if enough:
+                return wallet
+
+        raise NoHotWalletAvailable(f"No hot wallet with enough {asset} balance")
+
+    def _committed(self, in_flight: dict, asset: str):
+
+        if not in_flight:
+            return 0
+        return decimal.Decimal(in_flight["value"].get(asset) or 0)
+
+    def _gas_reserved(self, in_flight: dict):
+
+        if not in_flight:
+            return 0
+        gas = decimal.Decimal(in_flight["gas_price"] or 0) * current_app.config["HOT_WALLET_GAS_RESERVE"]
+        return gas / decimal.Decimal(10) ** 18
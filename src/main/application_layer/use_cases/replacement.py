@@ -0,0 +1,279 @@
+import logging
+import math
+import time
+
+from flask import current_app
+from web3.exceptions import TransactionNotFound
+
+from main.app import w3
+from main.application_layer.use_cases import transaction
+from main.application_layer.adapters.ethereum_service import EthereumService
+from main.application_layer.use_cases.fees import FeeUseCase
+from main.application_layer.use_cases.tokens import get_token_address, get_token_decimals
+from main.application_layer.use_cases.transfer import TransferUseCase, send_transaction
+from main.domain_layer.models.address import Address
+from main.domain_layer.models.transfer import Transfer
+from main.domain_layer.models.transfer_replacement import TransferReplacement
+
+logger = logging.getLogger("teste-mb." + __name__)
+
+
+def bump(value: int, percent: float):
+    return math.ceil(value * (100 + percent) / 100)
+
+
+class ReplacementUseCase:
+    """Re-signs transfers stuck in the mempool with the same nonce and a
+    higher fee, keeping every replacement hash tied to the transfer row."""
+
+    def __init__(self, ethereum_service: EthereumService = None):
+        self.ethereum_service = ethereum_service or EthereumService(
+            w3=w3, broadcast=current_app.config["RPC_BROADCAST_ALL"])
+
+    def bumped_fees(self, tx):
+        """Fees of the replacement: at least the bump required by the nodes
+        over the stuck transaction, and never below the current fast quote."""
+
+        percent = current_app.config["REPLACEMENT_FEE_BUMP"]
+        # Transações legadas só têm gasPrice
+        max_fee = tx.get("maxFeePerGas", tx.get("gasPrice"))
+        priority_fee = tx.get("maxPriorityFeePerGas", tx.get("gasPrice"))
+
+        quote = FeeUseCase(self.ethereum_service).quote("fast")
+        priority_fee = max(bump(priority_fee, percent), quote["maxPriorityFeePerGas"])
+        max_fee = max(bump(max_fee, percent), quote["maxFeePerGas"], priority_fee)
+
+        return {"maxFeePerGas": max_fee, "maxPriorityFeePerGas": priority_fee}
+
+    def recorded_fees(self, transfer):
+        # Só a taxa máxima fica registrada; a gorjeta sai da cotação
+        return {"maxFeePerGas": int(transfer.gas_price), "maxPriorityFeePerGas": 0}
+
+    def rebuild(self, transfers: list):
+        """Rebuild the unsigned stuck transaction from its transfer rows, for
+        when the node already dropped it from the mempool. Several rows on
+        one hash are a multi-send call. Returns None for rows stored
+        without a nonce."""
+
+        first = transfers[0]
+        if first.nonce is None:
+            return None
+
+        fees = self.recorded_fees(first)
+        use_case = TransferUseCase()
+        if len(transfers) == 1:
+            tx, _ = use_case._build_transaction(
+                self.ethereum_service, first.from_address, first.to_address,
+                first.asset, first.value, first.nonce, fees)
+            return tx
+
+        decimals = get_token_decimals(first.asset, self.ethereum_service)
+        return use_case._build_multisend_transaction(
+            self.ethereum_service,
+            first.from_address,
+            self.ethereum_service.to_checksum_address(get_token_address(first.asset)),
+            [transfer.to_address for transfer in transfers],
+            [int(transfer.value * (10 ** decimals)) for transfer in transfers],
+            first.nonce,
+            fees)
+
+    def rebuild_approval(self, transfer):
+        """Rebuild the approval sent with a multi-send, on the nonce right
+        before the multi-send call."""
+
+        return TransferUseCase()._build_approve_transaction(
+            self.ethereum_service, transfer.from_address, transfer.asset, transfer.nonce - 1,
+            self.recorded_fees(transfer))
+
+    def pending(self, tx_hash: str, rebuild):
+        """The stuck transaction as the node holds it, or rebuilt when it was
+        dropped from the mempool. None once mined or when it cannot be
+        rebuilt."""
+
+        try:
+            tx = self.ethereum_service.get_transaction(tx_hash)
+        except TransactionNotFound:
+            # Descartada do mempool: remontar a partir das transferências
+            tx = rebuild()
+            if tx is None:
+                logger.warning(
+                    "Stuck transfer cannot be rebuilt",
+                    extra={
+                        "props": {
+                            "worker": "replace-stuck-transfers",
+                            "tx_hash": tx_hash
+                        }
+                    })
+                return None
+            tx["input"] = tx.get("data", b"")
+
+        if tx.get("blockNumber") is not None:
+            # Já minerada, o worker de confirmação cuida dela
+            return None
+        return tx
+
+    def replace(self, tx_hash: str, transfers: list, block_number: int):
+        """Rebroadcast a stuck transaction with bumped fees. A multi-send
+        whose approval is still pending gets the approval replaced instead,
+        since the call cannot be mined before it. Returns the replacement
+        hash, or None when there is nothing to replace."""
+
+        first = transfers[0]
+        uuids = [transfer.uuid for transfer in transfers]
+
+        # A aprovação usa o nonce anterior ao da chamada do multi-send
+        if first.approval_tx_hash and first.nonce is not None and \
+                self.ethereum_service.get_transaction_count(first.from_address, 'latest') < first.nonce:
+            approval = self.pending(first.approval_tx_hash, lambda: self.rebuild_approval(first))
+            if approval is not None:
+                return self.resend(
+                    approval, first.approval_tx_hash, first.from_address,
+                    record=lambda replacement_hash, fees: Transfer.update_approval(
+                        uuids=uuids, approval_tx_hash=replacement_hash, sent_block=block_number),
+                    discard=lambda replacement_hash: Transfer.update_approval(
+                        uuids=uuids, approval_tx_hash=first.approval_tx_hash, sent_block=first.sent_block))
+
+        tx = self.pending(tx_hash, lambda: self.rebuild(transfers))
+        if tx is None:
+            return None
+
+        def record(replacement_hash, fees):
+            TransferReplacement.create_many(
+                transfer_uuids=uuids,
+                tx_hash=replacement_hash,
+                replaced_tx_hash=tx_hash,
+                max_fee_per_gas=fees["maxFeePerGas"],
+                max_priority_fee_per_gas=fees["maxPriorityFeePerGas"],
+                block=block_number)
+            Transfer.update_replacement(
+                uuids=uuids, tx_hash=replacement_hash, gas_price=fees["maxFeePerGas"], sent_block=block_number)
+
+        def discard(replacement_hash):
+            TransferReplacement.delete(tx_hash=replacement_hash)
+            Transfer.update_replacement(
+                uuids=uuids, tx_hash=tx_hash, gas_price=first.gas_price, sent_block=first.sent_block)
+
+        return self.resend(tx, tx_hash, first.from_address, record, discard)
+
+    def resend(self, tx: dict, tx_hash: str, from_address: str, record, discard):
+        """Re-sign a transaction with bumped fees, commit the records of the
+        replacement and only then broadcast it. A replacement that may have
+        reached a node keeps its records, so it is confirmed if mined; they
+        are undone only when no node holds it."""
+
+        with transaction():
+            sender = Address.get(address=from_address)
+        if not sender:
+            logger.warning(
+                "Stuck transfer sender has no stored key",
+                extra={
+                    "props": {
+                        "worker": "replace-stuck-transfers",
+                        "tx_hash": tx_hash,
+                        "from_address": from_address
+                    }
+                })
+            return None
+
+        fees = self.bumped_fees(tx)
+        max_fee_cap = current_app.config["REPLACEMENT_MAX_FEE_PER_GAS"]
+        if max_fee_cap and fees["maxFeePerGas"] > max_fee_cap:
+            logger.warning(
+                "Replacement fee above cap",
+                extra={
+                    "props": {
+                        "worker": "replace-stuck-transfers",
+                        "tx_hash": tx_hash,
+                        "maxFeePerGas": fees["maxFeePerGas"]
+                    }
+                })
+            return None
+
+        replacement = {
+            'type': 2,
+            'chainId': self.ethereum_service.chain_id,
+            'nonce': tx["nonce"],
+            'to': tx["to"],
+            'value': tx["value"],
+            'data': tx["input"],
+            'gas': tx["gas"],
+            **fees,
+        }
+        signed_tx = self.ethereum_service.sign_transaction(replacement, sender.private_key)
+        replacement_hash = signed_tx.hash.to_0x_hex()
+
+        with transaction():
+            record(replacement_hash, fees)
+
+        try:
+            send_transaction(self.ethereum_service, signed_tx)
+        except Exception as e:
+            # Nenhum nó ficou com a substituição: volta para a transação anterior
+            with transaction():
+                discard(replacement_hash)
+            raise e
+
+        return replacement_hash
+
+    @transaction()
+    def _stuck_by_hash(self, block_number: int):
+        Transfer.mark_sent_block(block_number=block_number)
+
+        stuck = {}
+        sent_before_block = block_number - current_app.config["REPLACEMENT_PENDING_BLOCKS"]
+        for transfer in Transfer.get_stuck(sent_before_block=sent_before_block):
+            stuck.setdefault(transfer.tx_hash, []).append(transfer)
+        return stuck
+
+    def poll(self):
+        """Replace every transfer pending for more than the configured
+        number of blocks."""
+
+        block_number = self.ethereum_service.block_number
+
+        replaced = {}
+        for tx_hash, transfers in self._stuck_by_hash(block_number).items():
+            try:
+                replacement_hash = self.replace(tx_hash, transfers, block_number)
+            except Exception as e:
+                # Ex.: a original foi minerada entre a consulta e o envio
+                logger.warning(
+                    "Unable to replace stuck transfer",
+                    extra={
+                        "props": {
+                            "worker": "replace-stuck-transfers",
+                            "tx_hash": tx_hash,
+                            "error message": str(e)
+                        }
+                    })
+                continue
+
+            if replacement_hash:
+                replaced[tx_hash] = replacement_hash
+
+        return replaced
+
+    def run(self, poll_interval: float):
+
+        while True:
+            try:
+                replaced = self.poll()
+                if replaced:
+                    logger.info(
+                        "Stuck transfers replaced",
+                        extra={
+                            "props": {
+                                "worker": "replace-stuck-transfers",
+                                "replacements": replaced
+                            }
+                        })
+            except Exception as e:
+                logger.exception(
+                    "Error while replacing stuck transfers",
+                    extra={
+                        "props": {
+                            "worker": "replace-stuck-transfers",
+                            "error message": str(e)
+                        }
+                    })
+            time.sleep(poll_interval)
@@ -0,0 +1,208 @@
+import threading
+
+from eth_utils import keccak, to_checksum_address
+
+from main.domain_layer.models.token import Token
+
+ERC20_ABI = [
+    {
+        "constant": True,
+        "inputs": [],
+        "name": "decimals",
+        "outputs": [{"name": "", "type": "uint8"}],
+        "type": "function",
+    },
+    {
+        "constant": True,
+        "inputs": [{"name": "_owner", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "type": "function",
+    },
+    {
+        "constant": True,
+        "inputs": [
+            {"name": "_owner", "type": "address"},
+            {"name": "_spender", "type": "address"},
+        ],
+        "name": "allowance",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "type": "function",
+    },
+    {
+        "constant": False,
+        "inputs": [
+            {"name": "_spender", "type": "address"},
+            {"name": "_value", "type": "uint256"},
+        ],
+        "name": "approve",
+        "outputs": [{"name": "", "type": "bool"}],
+        "type": "function",
+    },
+    {
+        "constant": False,
+        "inputs": [
+            {"name": "_to", "type": "address"},
+            {"name": "_value", "type": "uint256"},
+        ],
+        "name": "transfer",
+        "outputs": [{"name": "", "type": "bool"}],
+        "type": "function",
+    },
+]
+
+TOKEN_METADATA_ABI = [{
+    "name": "symbol",
+    "outputs": [{"type": "string"}],
+    "inputs": [],
+    "stateMutability": "view",
+    "type": "function"
+}, {
+    "name": "decimals",
+    "outputs": [{"type": "uint8"}],
+    "inputs": [],
+    "stateMutability": "view",
+    "type": "function"
+}]
+
+# Disperse-style batching contract: pulls the tokens from the sender
+# (after an approval) and pays every recipient in one call
+MULTISEND_ABI = [
+    {
+        "constant": False,
+        "inputs": [
+            {"name": "token", "type": "address"},
+            {"name": "recipients", "type": "address[]"},
+            {"name": "values", "type": "uint256[]"},
+        ],
+        "name": "disperseToken",
+        "outputs": [],
+        "type": "function",
+    },
+]
+
+MAX_UINT256 = 2 ** 256 - 1
+
+# Endereços já em checksum, calculados uma única vez por processo
+TOKENS = {
+    symbol: to_checksum_address(address) for symbol, address in {
+        "USDC": "0x65aFADD39029741B3b8f0756952C74678c9cEC93",
+        "USDT": "0xD9BA894E0097f8cC2BBc9D24D308b98e36dc6D02",
+        "LINK": "0xAb2059ADBC674c9F2AAc2f11A423010fcd397A6C"
+    }.items()
+}
+
+TRANSFER_SELECTOR = keccak(text="transfer(address,uint256)")[:4]
+APPROVE_SELECTOR = keccak(text="approve(address,uint256)")[:4]
+
+
+class TokenRegistry:
+    """Process cache of the tokens table. Each chain's tokens are loaded
+    on first use; a contract never seen before has its symbol and decimals
+    read in one multicall and is persisted, so every worker pays for it
+    only once."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens = {}
+        self._loaded = set()
+
+    def _load(self, chain_id: int):
+
+        if chain_id not in self._loaded:
+            for token in Token.get(chain_id=chain_id):
+                self._tokens[(chain_id, token.address.lower())] = token
+            self._loaded.add(chain_id)
+
+    def get(self, address: str, ethereum_service, block_identifier="latest"):
+
+        return self.get_many([address], ethereum_service, block_identifier=block_identifier)[address]
+
+    def get_many(self, addresses: list, ethereum_service, block_identifier="latest"):
+        """Tokens of several contracts, keyed by the given addresses. The
+        metadata of unknown ones is read at `block_identifier`, so a call
+        pinned to a finalized block can come from the chain cache."""
+
+        chain_id = ethereum_service.chain_id
+        with self._lock:
+            self._load(chain_id)
+            tokens = {address: self._tokens.get((chain_id, address.lower())) for address in addresses}
+
+        # RPC fora do lock: dois workers descobrindo o mesmo token gravam o mesmo valor
+        unknown = [address for address, token in tokens.items() if token is None]
+        if not unknown:
+            return tokens
+
+        calls = []
+        for address in unknown:
+            contract = ethereum_service.contract(address=address, abi=TOKEN_METADATA_ABI)
+            calls.extend([contract.functions.symbol(), contract.functions.decimals()])
+        results = ethereum_service.multicall(calls, block_identifier=block_identifier)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+
+        for index, address in enumerate(unknown):
+            token = Token.create(
+                chain_id=chain_id, address=address, symbol=results[2 * index], decimals=results[2 * index + 1])
+            with self._lock:
+                self._tokens[(chain_id, address.lower())] = token
+            tokens[address] = token
+
+        return tokens
+
+    def clear(self):
+
+        with self._lock:
+            self._tokens.clear()
+            self._loaded.clear()
+
+
+token_registry = TokenRegistry()
+
+
+def get_token_address(symbol, ethereum_service=None):
+    symbol = symbol.upper()
+
+    if symbol == "ETH":
+        return None  # ETH não tem contrato (é nativo)
+
+    if symbol not in TOKENS:
+        raise ValueError(f"Token '{symbol}' não suportado.")
+
+    return TOKENS[symbol]
+
+
+def get_token_decimals(symbol, ethereum_service):
+    """Decimals of a supported token, from the token registry."""
+
+    return token_registry.get(get_token_address(symbol), ethereum_service).decimals
+
+
+def _encode_address_value(selector: bytes, address: str, value: int):
+
+    if not 0 <= value <= MAX_UINT256:
+        raise ValueError(f"Invalid token value {value}")
+
+    account = bytes.fromhex(address[2:])
+    if len(account) != 20:
+        raise ValueError(f"Invalid address {address}")
+
+    return (
+        selector
+        + account.rjust(32, b"\0")
+        + value.to_bytes(32, "big")
+    )
+
+
+def encode_transfer(to_address: str, value: int):
+    """Calldata of transfer(address,uint256), encoded without the ABI
+    machinery of a contract object."""
+
+    return _encode_address_value(TRANSFER_SELECTOR, to_address, value)
+
+
+def encode_approve(spender: str, value: int):
+    """Calldata of approve(address,uint256), encoded like encode_transfer."""
+
+    return _encode_address_value(APPROVE_SELECTOR, spender, value)
@@ -1,79 +1,252 @@
+import collections
+import concurrent.futures
+import os
+import socket
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+
 from main.app import w3
 from main.application_layer.use_cases import transaction
+from main.application_layer.adapters.chain_cache import get_chain_cache
 from main.application_layer.adapters.ethereum_service import EthereumService
+from main.application_layer.adapters.whitelist_index import get_whitelist_index
+from main.application_layer.metrics import metrics
+from main.application_layer.use_cases.tokens import token_registry
 from main.domain_layer.models.address import Address
 from main.domain_layer.models.transaction import Transaction
+from main.domain_layer.models.validation_lock import ValidationLock
 
 def is_whitelist(address: str):
-    return Address.get(address=address)
+    whitelist_index = get_whitelist_index()
+    if whitelist_index is None:
+        return Address.get(address=address)
+    # Consulta ao índice compartilhado, sem ir ao banco
+    return whitelist_index.contains(address)
+
+# Resultados negativos de validate por (hash, versão da whitelist); os
+# hashes já registrados não dependem da whitelist
+_validation_cache = collections.OrderedDict()
+_validation_cache_lock = threading.Lock()
+REGISTERED = "registered"
+
+def whitelist_version():
+    whitelist_index = get_whitelist_index()
+    return whitelist_index.version() if whitelist_index is not None else None
+
+def cached_validation(tx_hash: str, version):
+    """Result cached for a hash under the current whitelist, or None."""
+
+    now = time.monotonic()
+    with _validation_cache_lock:
+        for key in ((tx_hash.lower(), REGISTERED), (tx_hash.lower(), version)):
+            entry = _validation_cache.get(key)
+            if entry is None:
+                continue
+            if now >= entry[0]:
+                del _validation_cache[key]
+                continue
+            _validation_cache.move_to_end(key)
+            metrics.increment("validation_cache.hits")
+            return dict(entry[1])
+
+    metrics.increment("validation_cache.misses")
+    return None
+
+def cache_validation(tx_hash: str, version, result: dict, ttl: float):
+    """Keep a result until `ttl` expires or the whitelist version changes.
+    Without a whitelist index there is no version and nothing is kept."""
+
+    if version is None:
+        return
+
+    with _validation_cache_lock:
+        key = (tx_hash.lower(), version)
+        _validation_cache[key] = (time.monotonic() + ttl, dict(result))
+        _validation_cache.move_to_end(key)
+        while len(_validation_cache) > current_app.config["VALIDATION_CACHE_MAX_ENTRIES"]:
+            _validation_cache.popitem(last=False)
+
+class _Flight:
+    """A validate call in progress, shared with the threads asking for the
+    same hash while it runs."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+# Validações em andamento neste processo, por hash
+_flights = {}
+_flights_lock = threading.Lock()
+
+def raise_batch_errors(results: list):
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    return results
 
 class TransactionUseCase:
 
-    @transaction()
-    def validate(self, tx_hash: str):
+    def _result_ttl(self, ethereum_service: EthereumService, receipt):
+        """A result read from a final block only changes with the
+        whitelist; one from a recent block can still be reorged away."""
 
-        ethereum_service = EthereumService(w3=w3)
+        cache = ethereum_service.cache
+        if cache is not None and cache.is_final(
+                receipt.get("blockNumber"), get_head=lambda: ethereum_service.block_number):
+            return current_app.config["VALIDATION_CACHE_FINAL_TTL"]
+        return current_app.config["VALIDATION_CACHE_RECENT_TTL"]
 
-        transaction = Transaction.get(tx_hash=tx_hash)
-        if transaction:
-            return {"valid": False, "reason": f"Transaction {tx_hash} already registered"}
-        
-        tx = ethereum_service.get_transaction(tx_hash=tx_hash)
-        receipt = ethereum_service.get_transaction_receipt(tx_hash)
+    def _inspect(self, ethereum_service: EthereumService, tx, receipt):
+        """Reason to reject a transaction before any token metadata is
+        read, or None, and its ERC-20 Transfer logs with their checksummed
+        destinations."""
 
-        transfers = []
         if tx["to"] is None:
-            return {"valid": False, "reason": "Contract creation"}
-        
+            return "Contract creation", []
+
         # ETH Transfer
         if tx["input"] == "0x" and tx["value"] > 0:
-            to_address = ethereum_service.to_checksum_address(tx["to"])
-            if is_whitelist(address=to_address):
-                return {"valid": False, "reason": "Destination not whitelisted"}
+            if is_whitelist(address=ethereum_service.to_checksum_address(tx["to"])):
+                return "Destination not whitelisted", []
+            return None, []
+
+        # ERC-20 Token Transfer
+        erc20_transfer_signature = w3.keccak(text="Transfer(address,address,uint256)").hex()[:10]
+
+        token_logs = []
+        for log in receipt["logs"]:
+            if log["topics"][0].hex()[:10] == erc20_transfer_signature:
+                to_address = "0x" + log["topics"][2].hex()[-40:]
+                to_address = ethereum_service.to_checksum_address(to_address)
 
+                if is_whitelist(address=to_address):
+                    return "Destination not whitelisted", []
+
+                token_logs.append((log, to_address))
+
+        return None, token_logs
+
+    def _transfers(self, ethereum_service: EthereumService, tx, token_logs: list, tokens: dict):
+
+        if tx["input"] == "0x" and tx["value"] > 0:
             value = ethereum_service.from_wei(tx["value"], 'ether')
-            transfers.append({
+            return [{
                 "asset": "ETH",
-                "to": to_address,
+                "to": ethereum_service.to_checksum_address(tx["to"]),
                 "amount": str(value),
+            }]
+
+        transfers = []
+        for log, to_address in token_logs:
+            token = tokens[log["address"]]
+
+            amount = int(log["data"].hex(), 16) / (10 ** token.decimals)
+            transfers.append({
+                "asset": token.symbol,
+                "to": to_address,
+                "amount": str(amount),
             })
-        # ERC-20 Token Transfer
-        else:
+        return transfers
+
+    def validate(self, tx_hash: str):
+        """Validate a deposit, coalescing concurrent calls for the same
+        hash: one thread per process computes and the others wait for and
+        share its result or error."""
+
+        # Resultado em cache dispensa o voo e o lock
+        cached = cached_validation(tx_hash, whitelist_version())
+        if cached is not None:
+            return cached
+
+        key = tx_hash.lower()
+        with _flights_lock:
+            flight = _flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _flights[key] = _Flight()
+
+        if not leader:
+            metrics.increment("validation_flights.coalesced")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return dict(flight.result)
+
+        try:
+            flight.result = self._claimed_validate(tx_hash)
+            return dict(flight.result)
+        except Exception as e:
+            flight.error = e
+            raise e
+        finally:
+            with _flights_lock:
+                del _flights[key]
+            flight.done.set()
+
+    def _claimed_validate(self, tx_hash: str):
+        """Validate once across workers through the validation_locks table:
+        the worker holding the claim computes and stores the result; the
+        others poll until it shows up, or take over when the claim is
+        released or goes stale."""
+
+        owner = f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+        timeout = current_app.config["VALIDATION_LOCK_TIMEOUT"]
+        result_ttl = current_app.config["VALIDATION_LOCK_RESULT_TTL"]
+
+        while True:
+            if ValidationLock.acquire(tx_hash=tx_hash, owner=owner, timeout=timeout, result_ttl=result_ttl):
+                try:
+                    result = self._validate(tx_hash)
+                except Exception as e:
+                    ValidationLock.release(tx_hash=tx_hash, owner=owner)
+                    raise e
+                # Publicado só depois do commit de _validate
+                ValidationLock.complete(tx_hash=tx_hash, owner=owner, result=result)
+                return result
+
+            lock = ValidationLock.get(tx_hash=tx_hash)
+            if lock is not None and lock.result is not None:
+                metrics.increment("validation_flights.shared")
+                return lock.result
+            time.sleep(current_app.config["VALIDATION_LOCK_POLL_INTERVAL"])
+
+    @transaction()
+    def _validate(self, tx_hash: str):
+
+        version = whitelist_version()
+        ethereum_service = EthereumService(
+            w3=w3, hedge=current_app.config["RPC_HEDGE_READS"], cache=get_chain_cache())
+
+        transaction = Transaction.get(tx_hash=tx_hash)
+        if transaction:
+            result = {"valid": False, "reason": f"Transaction {tx_hash} already registered"}
+            cache_validation(tx_hash, REGISTERED, result, current_app.config["VALIDATION_CACHE_FINAL_TTL"])
+            return result
+        
+        # Transação e recibo são independentes: um único round trip
+        tx, receipt = raise_batch_errors(ethereum_service.batch([
+            ("get_transaction", tx_hash),
+            ("get_transaction_receipt", tx_hash),
+        ]))
+
+        reason, token_logs = self._inspect(ethereum_service, tx, receipt)
+        if reason:
+            result = {"valid": False, "reason": reason}
+            cache_validation(tx_hash, version, result, self._result_ttl(ethereum_service, receipt))
+            return result
 
-            erc20_transfer_signature = w3.keccak(text="Transfer(address,address,uint256)").hex()[:10]
-
-            for log in receipt["logs"]:
-                if log["topics"][0].hex()[:10] == erc20_transfer_signature:
-                    to_address = "0x" + log["topics"][2].hex()[-40:]
-                    to_address = ethereum_service.to_checksum_address(to_address)
-
-                    if is_whitelist(address=to_address):
-                        return {"valid": False, "reason": "Destination not whitelisted"}
-                    
-                    contract = ethereum_service.contract(address=log["address"], abi=[{
-                        "name": "symbol",
-                        "outputs": [{"type": "string"}],
-                        "inputs": [],
-                        "stateMutability": "view",
-                        "type": "function"
-                    }, {
-                        "name": "decimals",
-                        "outputs": [{"type": "uint8"}],
-                        "inputs": [],
-                        "stateMutability": "view",
-                        "type": "function"
-                    }])
-
-                    symbol = contract.functions.symbol().call()
-                    decimals = contract.functions.decimals().call()
-
-                    amount = int(log["data"].hex(), 16) / (10 ** decimals)
-                    transfers.append({
-                        "asset": symbol,
-                        "to": to_address,
-                        "amount": str(amount),
-                    })
+        # Tokens desconhecidos são lidos num único multicall, no bloco da
+        # transação para que o cache possa guardá-lo
+        tokens = token_registry.get_many(
+            list(dict.fromkeys(log["address"] for log, _ in token_logs)),
+            ethereum_service,
+            block_identifier=receipt["blockNumber"]) if token_logs else {}
 
+        transfers = self._transfers(ethereum_service, tx, token_logs, tokens)
         if transfers:
             for t in transfers:
                 Transaction.create(
@@ -84,8 +257,158 @@ class TransactionUseCase:
                 )
             return {"valid": True, "transfers": transfers}
         else:
-            return {"valid": False, "reason": "No valid transfers to whitelisted addresses"}
-        
+            result = {"valid": False, "reason": "No valid transfers to whitelisted addresses"}
+            cache_validation(tx_hash, version, result, self._result_ttl(ethereum_service, receipt))
+            return result
+
+    def _fetch(self, ethereum_service: EthereumService, tx_hashes: list):
+        """Transactions and receipts of the hashes, VALIDATE_BATCH_CHUNK_SIZE
+        hashes per JSON-RPC batch with at most RPC_MAX_CONCURRENCY batches in
+        flight. Yields each chunk's `{tx_hash: [tx, receipt]}` as soon as it
+        arrives; a failed call comes back as its exception."""
+
+        chunk_size = current_app.config["VALIDATE_BATCH_CHUNK_SIZE"]
+        chunks = [tx_hashes[start:start + chunk_size] for start in range(0, len(tx_hashes), chunk_size)]
+        if not chunks:
+            return
+
+        def fetch(chunk):
+            requests = [
+                request for tx_hash in chunk
+                for request in (("get_transaction", tx_hash), ("get_transaction_receipt", tx_hash))
+            ]
+            try:
+                results = ethereum_service.batch(requests)
+            except Exception as e:
+                results = [e] * len(requests)
+            return {tx_hash: results[2 * index:2 * index + 2] for index, tx_hash in enumerate(chunk)}
+
+        workers = min(current_app.config["RPC_MAX_CONCURRENCY"], len(chunks))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="validate") as executor:
+            for future in concurrent.futures.as_completed([executor.submit(fetch, chunk) for chunk in chunks]):
+                yield future.result()
+
+    def _resolve_tokens(self, ethereum_service: EthereumService, addresses: list, block_identifier):
+        """Tokens of a chunk in one registry lookup; when it fails, each
+        token is resolved alone so one bad contract only fails its own
+        transactions."""
+
+        try:
+            return token_registry.get_many(addresses, ethereum_service, block_identifier=block_identifier)
+        except Exception:
+            tokens = {}
+            for address in addresses:
+                try:
+                    tokens[address] = token_registry.get(address, ethereum_service, block_identifier=block_identifier)
+                except Exception as e:
+                    tokens[address] = e
+            return tokens
+
+    def _insert(self, rows_by_hash: dict):
+        """Register the rows of every hash in one INSERT. When it is rejected
+        each hash is inserted on its own, so a hash registered concurrently
+        by another request only fails itself. Returns the hashes that were
+        not registered, and of those the ones already registered."""
+
+        try:
+            with transaction():
+                Transaction.create_many([row for rows in rows_by_hash.values() for row in rows])
+            return set(), set()
+        except IntegrityError:
+            with transaction():
+                rejected = Transaction.create_each(rows_by_hash)
+                registered = Transaction.get_registered(list(rejected)) if rejected else set()
+            return rejected, registered
+
+    def validate_batch(self, tx_hashes: list):
+        """Validate several transactions, yielding one result per distinct
+        hash. Rejections are yielded as soon as they are known; the valid
+        ones after all their rows are registered with a single INSERT."""
+
+        ethereum_service = EthereumService(
+            w3=w3, hedge=current_app.config["RPC_HEDGE_READS"], cache=get_chain_cache())
+
+        version = whitelist_version()
+        tx_hashes = list(dict.fromkeys(tx_hashes))
+
+        pending = []
+        for tx_hash in tx_hashes:
+            cached = cached_validation(tx_hash, version)
+            if cached is None:
+                pending.append(tx_hash)
+            else:
+                yield dict(cached, tx_hash=tx_hash)
+
+        with transaction():
+            registered = Transaction.get_registered(pending)
+        for tx_hash in pending:
+            if tx_hash in registered:
+                result = {"valid": False, "reason": f"Transaction {tx_hash} already registered"}
+                cache_validation(tx_hash, REGISTERED, result, current_app.config["VALIDATION_CACHE_FINAL_TTL"])
+                yield dict(result, tx_hash=tx_hash)
+
+        rows = {}
+        accepted = []
+        for fetched in self._fetch(ethereum_service, [tx_hash for tx_hash in pending if tx_hash not in registered]):
+            inspected = {}
+            for tx_hash, results in fetched.items():
+                try:
+                    tx, receipt = raise_batch_errors(results)
+                    reason, token_logs = self._inspect(ethereum_service, tx, receipt)
+                except Exception as e:
+                    yield {"tx_hash": tx_hash, "error": str(e)}
+                    continue
+
+                if reason:
+                    result = {"valid": False, "reason": reason}
+                    cache_validation(tx_hash, version, result, self._result_ttl(ethereum_service, receipt))
+                    yield dict(result, tx_hash=tx_hash)
+                else:
+                    inspected[tx_hash] = (tx, receipt, token_logs)
+
+            # Metadados de todos os tokens do lote de uma vez, num bloco
+            # posterior a todas as transações
+            addresses = list(dict.fromkeys(
+                log["address"] for _, _, token_logs in inspected.values() for log, _ in token_logs))
+            tokens = self._resolve_tokens(
+                ethereum_service, addresses,
+                max(receipt["blockNumber"] for _, receipt, token_logs in inspected.values() if token_logs)
+            ) if addresses else {}
+
+            for tx_hash, (tx, receipt, token_logs) in inspected.items():
+                failed = [tokens[log["address"]] for log, _ in token_logs if isinstance(tokens[log["address"]], Exception)]
+                if failed:
+                    yield {"tx_hash": tx_hash, "error": str(failed[0])}
+                    continue
+
+                transfers = self._transfers(ethereum_service, tx, token_logs, tokens)
+                if not transfers:
+                    result = {"valid": False, "reason": "No valid transfers to whitelisted addresses"}
+                    cache_validation(tx_hash, version, result, self._result_ttl(ethereum_service, receipt))
+                    yield dict(result, tx_hash=tx_hash)
+                    continue
+
+                hash_rows = list({
+                    (t["to"], t["asset"], t["amount"]): {
+                        "tx_hash": tx_hash, "to_address": t["to"], "asset": t["asset"], "value": t["amount"]}
+                    for t in transfers}.values())
+                if len(hash_rows) > 1:
+                    # tx_hash é único na tabela: só cabe uma transferência por hash
+                    yield {"tx_hash": tx_hash, "error": f"Transaction {tx_hash} has several transfers to register"}
+                    continue
+
+                rows[tx_hash] = hash_rows
+                accepted.append((tx_hash, transfers))
+
+        rejected, registered = self._insert(rows) if rows else (set(), set())
+        for tx_hash, transfers in accepted:
+            if tx_hash in registered:
+                yield {"tx_hash": tx_hash, "valid": False, "reason": f"Transaction {tx_hash} already registered"}
+            elif tx_hash in rejected:
+                yield {"tx_hash": tx_hash, "error": f"Transaction {tx_hash} could not be registered"}
+            else:
+                yield {"tx_hash": tx_hash, "valid": True, "transfers": transfers}
+
     def get_transanctions(self):
 
         transactions = Transaction.get()
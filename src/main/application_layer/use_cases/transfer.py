@@ -1,151 +1,608 @@
 import decimal
-import threading
-from flask import jsonify
+import logging
+from uuid import UUID, uuid4
+from flask import jsonify, current_app
+from web3.exceptions import TimeExhausted
 
 from main.app import w3, db
 # from main.application_layer.use_cases import transaction
 from main.application_layer.adapters.ethereum_service import EthereumService
+from main.application_layer.adapters.failover_provider import (
+    is_known_transaction_error, is_rejected, never_delivered
+)
+from main.application_layer.use_cases.fees import FeeUseCase
+from main.application_layer.use_cases.gas_limits import GasLimitUseCase
+from main.application_layer.use_cases.hot_wallet import HotWalletPool
+from main.application_layer.use_cases.tokens import (
+    ERC20_ABI, MULTISEND_ABI, MAX_UINT256, encode_approve, encode_transfer, get_token_address, get_token_decimals
+)
+from main.domain_layer.models.nonce import Nonce
 from main.domain_layer.models.transfer import Transfer
+from main.domain_layer.models.transfer_replacement import TransferReplacement
 
-ERC20_ABI = [
-    {
-        "constant": True,
-        "inputs": [],
-        "name": "decimals",
-        "outputs": [{"name": "", "type": "uint8"}],
-        "type": "function",
-    },
-    {
-        "constant": False,
-        "inputs": [
-            {"name": "_to", "type": "address"},
-            {"name": "_value", "type": "uint256"},
-        ],
-        "name": "transfer",
-        "outputs": [{"name": "", "type": "bool"}],
-        "type": "function",
-    },
-]
-
-nonce_locks = {}
-nonce_locks_lock = threading.Lock()
-
-def get_nonce_lock(address):
-    with nonce_locks_lock:
-        if address not in nonce_locks:
-            nonce_locks[address] = threading.Lock()
-        return nonce_locks[address]
-    
-def get_token_address(symbol, ethereum_service):
-    symbol = symbol.upper()
-
-    if symbol == "ETH":
-        return None  # ETH não tem contrato (é nativo)
-
-    tokens = {
-        "USDC": "0x65aFADD39029741B3b8f0756952C74678c9cEC93",
-        "USDT": "0xD9BA894E0097f8cC2BBc9D24D308b98e36dc6D02",
-        "LINK": "0xAb2059ADBC674c9F2AAc2f11A423010fcd397A6C"
-    }
-
-    if symbol not in tokens:
-        raise ValueError(f"Token '{symbol}' não suportado.")
-
-    return ethereum_service.to_checksum_address(tokens[symbol])
+logger = logging.getLogger("teste-mb." + __name__)
+
+# Limite de gas da chamada multi-send quando ela não pode ser estimada
+# (aprovação ainda não minerada)
+MULTISEND_BASE_GAS = 60000
+MULTISEND_GAS_PER_TRANSFER = 40000
+
+# Limite de gas da aprovação; a primeira grava um slot novo de allowance
+APPROVE_GAS = 80000
+
+def allocate_nonce(address, ethereum_service, count=1):
+    return Nonce.allocate(
+        address=address,
+        chain_nonce=lambda: ethereum_service.get_transaction_count(address, 'pending'),
+        count=count)
+
+def release_nonce(address, nonce, ethereum_service, private_key, count=1):
+    """Give back nonces that provably never reached the network. When later
+    nonces were handed out in the meantime the shared counter is left as it
+    is, since rewinding it would hand those out again; the gap is filled
+    with zero-value transfers to the sender so the transactions behind it
+    are not stuck."""
+
+    if count <= 0 or Nonce.release(address=address, nonce=nonce, count=count):
+        return
+
+    fees = None
+    for gap in range(nonce, nonce + count):
+        try:
+            fees = fees or FeeUseCase(ethereum_service).quote("standard")
+            signed_tx = ethereum_service.sign_transaction({
+                'type': 2,
+                'chainId': ethereum_service.chain_id,
+                'nonce': gap,
+                'to': address,
+                'value': 0,
+                'gas': 21000,
+                **fees,
+            }, private_key)
+            ethereum_service.send_raw_transaction(signed_tx.raw_transaction)
+        except Exception as e:
+            if is_known_transaction_error(e):
+                continue
+            logger.exception(
+                "Unable to fill nonce gap",
+                extra={
+                    "props": {
+                        "service": "Ethereum",
+                        "address": address,
+                        "nonce": gap,
+                        "error message": str(e)
+                    }
+                })
+
+def send_transaction(ethereum_service, signed_tx):
+    """Broadcast a signed transaction, raising when no node holds it: it
+    never left the process, or the node refused it with a JSON-RPC error.
+    A node that already knew it accepted it. Timeouts and resets may follow
+    an acceptance, so the transfer is left 'sent' for the confirmation and
+    replacement workers."""
+
+    try:
+        ethereum_service.send_raw_transaction(signed_tx.raw_transaction)
+    except Exception as e:
+        if is_known_transaction_error(e):
+            return
+        if never_delivered(e) or is_rejected(e):
+            raise e
+        logger.warning(
+            "Broadcast outcome unknown, keeping the transfer as sent",
+            extra={
+                "props": {
+                    "service": "Ethereum",
+                    "tx_hash": signed_tx.hash.to_0x_hex(),
+                    "error message": str(e)
+                }
+            })
 
 class TransferUseCase:
 
-    def execute(
-        self,     
+    def _sender(
+        self,
+        ethereum_service: EthereumService,
         from_address: str,
         private_key: str,
+        asset: str,
+        amount: decimal.Decimal):
+        """Resolve the sending account, drawing one from the hot wallet pool
+        when the request does not name it."""
+
+        if from_address:
+            return ethereum_service.to_checksum_address(from_address), private_key
+
+        wallet = HotWalletPool(ethereum_service).select(asset=asset, amount=amount)
+        return wallet.address, wallet.private_key
+
+    def _build_transaction(
+        self,
+        ethereum_service: EthereumService,
+        from_address: str,
         to_address: str,
         asset: str,
-        amount: str):
+        amount: decimal.Decimal,
+        nonce: int,
+        fees: dict,
+        recipient_class: str = None):
+        """Build an unsigned type-2 transfer. Token transfers are encoded
+        locally, with chain id, token address and decimals taken from the
+        process caches. Returns the transaction and, for tokens, the
+        recipient class its gas used is sampled under, looked up in the
+        transfer history unless already given."""
 
-        ethereum_service = EthereumService(w3=w3)
+        if asset == "ETH":
+            value = ethereum_service.to_wei(amount, 'ether')
+            return {
+                'type': 2,
+                'chainId': ethereum_service.chain_id,
+                'nonce': nonce,
+                'to': to_address,
+                'value': value,
+                'gas': 21000,
+                **fees,
+            }, None
+
+        token_value = int(amount * (10 ** get_token_decimals(asset, ethereum_service)))
+        tx = {
+            'type': 2,
+            'chainId': ethereum_service.chain_id,
+            'from': from_address,
+            'nonce': nonce,
+            'to': get_token_address(asset),
+            'value': 0,
+            'data': encode_transfer(to_address, token_value),
+            **fees,
+        }
+        gas_limits = GasLimitUseCase(ethereum_service)
+        if recipient_class is None:
+            recipient_class = gas_limits.recipient_class(asset, to_address)
+        tx['gas'] = gas_limits.gas_limit(asset, tx)
+        return tx, recipient_class
+
+    def _build_approve_transaction(
+        self,
+        ethereum_service: EthereumService,
+        from_address: str,
+        asset: str,
+        nonce: int,
+        fees: dict):
+        """Build an unsigned approval of the maximum allowance of the token
+        to the multi-send contract, encoded locally like a token transfer,
+        with the fixed APPROVE_GAS limit."""
+
+        multisend_address = ethereum_service.to_checksum_address(current_app.config["MULTISEND_CONTRACT_ADDRESS"])
+        return {
+            'type': 2,
+            'chainId': ethereum_service.chain_id,
+            'from': from_address,
+            'nonce': nonce,
+            'to': get_token_address(asset),
+            'value': 0,
+            'data': encode_approve(multisend_address, MAX_UINT256),
+            'gas': APPROVE_GAS,
+            **fees,
+        }
+
+    def _build_multisend_transaction(
+        self,
+        ethereum_service: EthereumService,
+        from_address: str,
+        token_address: str,
+        recipients: list,
+        values: list,
+        nonce: int,
+        fees: dict):
+        """Build an unsigned call to the multi-send contract paying every
+        recipient its token value, with the fixed per-transfer gas limit."""
+
+        multisend_address = ethereum_service.to_checksum_address(current_app.config["MULTISEND_CONTRACT_ADDRESS"])
+        multisend = ethereum_service.contract(address=multisend_address, abi=MULTISEND_ABI)
+        return multisend.functions.disperseToken(token_address, recipients, values).build_transaction({
+            'chainId': ethereum_service.chain_id,
+            'from': from_address,
+            'nonce': nonce,
+            **fees,
+            'gas': MULTISEND_BASE_GAS + MULTISEND_GAS_PER_TRANSFER * len(recipients),
+        })
+
+    def _broadcast(
+        self,
+        ethereum_service: EthereumService,
+        from_address: str,
+        private_key: str,
+        to_address: str,
+        asset: str,
+        amount: decimal.Decimal,
+        urgency: str):
+        """Sign the transfer, register it as 'sent' and broadcast it."""
 
-        from_address = ethereum_service.to_checksum_address(from_address)
-        to_address = ethereum_service.to_checksum_address(to_address)
-        asset = asset.upper()
-        try:
-            amount = decimal.Decimal(amount)
-        except Exception:
-            return jsonify({"error": "Invalid amount format"}), 400
-        
-        status = "pending"
-        tx_hash_hex = None
-        gas_used = None
-        gas_price = None
         new_tx = None
-        lock = get_nonce_lock(from_address)
-        lock.acquire()
+        nonce = None
         try:
-            # Obter nonce de forma segura
-            nonce = w3.eth.get_transaction_count(from_address, 'pending')
-            gas_price = w3.eth.gas_price
-            gas_price_with_margin = int(gas_price * decimal.Decimal("1.25"))
-
-            if asset == "ETH":
-                value = ethereum_service.to_wei(amount, 'ether')
-                tx = {
-                    'nonce': nonce,
-                    'to': to_address,
-                    'value': value,
-                    'gas': 21000,
-                    'gasPrice': gas_price_with_margin,
-                }
-                signed_tx = w3.eth.account.sign_transaction(tx, private_key)
-            else:
-                # ABI local para ERC20 transfer
-
-                contract_address = get_token_address(asset, ethereum_service)
-                contract = ethereum_service.contract(address=contract_address, abi=ERC20_ABI)
-                decimals = contract.functions.decimals().call()
-                token_value = int(amount * (10 ** decimals))
-                tx = contract.functions.transfer(to_address, token_value).build_transaction({
-                    'from': from_address,
-                    'nonce': nonce,
-                    'gasPrice': gas_price_with_margin,
-                })
-                gas_estimate = ethereum_service.estimate_gas(tx)
-                tx['gas'] = int(gas_estimate * 1.25)
-                signed_tx = ethereum_service.sign_transaction(tx, private_key)
-            # Registrar como 'sent' antes de enviar
+            # Nonce reservado na tabela compartilhada entre os workers
+            nonce = allocate_nonce(from_address, ethereum_service)
+            fees = FeeUseCase(ethereum_service).quote(urgency)
+
+            tx, recipient_class = self._build_transaction(
+                ethereum_service, from_address, to_address, asset, amount, nonce, fees)
+            signed_tx = ethereum_service.sign_transaction(tx, private_key)
+
+            # Registrar como 'sent' com o hash já conhecido da transação assinada
             new_tx = Transfer.create(
-                tx_hash="pending",
+                tx_hash=signed_tx.hash.to_0x_hex(),
                 from_address=from_address,
                 to_address=to_address,
                 asset=asset,
-                amount=str(amount),
+                value=str(amount),
                 status="sent",
                 gas_used=None,
-                gas_price=str(gas_price_with_margin)
+                gas_price=str(fees['maxFeePerGas']),
+                recipient_class=recipient_class,
+                nonce=nonce
             )
             db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            if new_tx:
+                Transfer.update_status(uuid=new_tx.uuid, status='erro')
+                db.session.commit()
+            if nonce is not None:
+                release_nonce(from_address, nonce, ethereum_service, private_key)
+            raise e
 
-            # Enviar transação
-            tx_hash = ethereum_service.send_raw_transaction(signed_tx.rawTransaction)
-            tx_hash_hex = tx_hash.hex()
-            # Atualizar hash
-            Transfer.update_tx_hash(uuid=new_tx.uuid, tx_hash=tx_hash)
+        # Enviar transação
+        try:
+            send_transaction(ethereum_service, signed_tx)
+        except Exception as e:
+            Transfer.update_status(uuid=new_tx.uuid, status='erro')
             db.session.commit()
+            release_nonce(from_address, nonce, ethereum_service, private_key)
+            raise e
+        return new_tx, fees['maxFeePerGas']
+
+    def execute(
+        self,     
+        from_address: str,
+        private_key: str,
+        to_address: str,
+        asset: str,
+        amount: str,
+        urgency: str = "standard"):
+        """Broadcast the transfer and wait for its receipt. Without a
+        from_address the sender is drawn from the hot wallet pool."""
+
+        ethereum_service = EthereumService(w3=w3, broadcast=current_app.config["RPC_BROADCAST_ALL"])
+
+        to_address = ethereum_service.to_checksum_address(to_address)
+        asset = asset.upper()
+        try:
+            amount = decimal.Decimal(amount)
+        except Exception:
+            return jsonify({"error": "Invalid amount format"}), 400
+
+        from_address, private_key = self._sender(
+            ethereum_service, from_address, private_key, asset, amount)
+
+        new_tx, gas_price = self._broadcast(
+            ethereum_service, from_address, private_key, to_address, asset, amount, urgency)
+
+        gas_used = None
+        try:
             # Aguardar confirmação
-            receipt = ethereum_service.wait_for_transaction_receipt(tx_hash, timeout=120)
+            receipt = ethereum_service.wait_for_transaction_receipt(new_tx.tx_hash, timeout=120)
             gas_used = receipt.gasUsed
             status = "confirmed" if receipt.status == 1 else "failed"
-            Transfer.update_confirmation(uuid=new_tx.uuid, status=status, gas_used=gas_used, tx_hash=tx_hash)
+            Transfer.update_confirmation(uuid=new_tx.uuid, status=status, gas_used=gas_used, tx_hash=new_tx.tx_hash)
+            db.session.commit()
             return jsonify({
-                "tx_hash": tx_hash_hex,
+                "tx_hash": new_tx.tx_hash,
                 "status": status,
                 "gas_used": gas_used,
-                "gas_price": gas_price_with_margin
+                "gas_price": gas_price
             })
+        except TimeExhausted:
+            # Continua 'sent': o worker de substituição pode trocar o hash
+            # e o de confirmação finaliza a transferência
+            return jsonify({
+                "uuid": str(new_tx.uuid),
+                "tx_hash": new_tx.tx_hash,
+                "status": "sent",
+                "gas_price": gas_price
+            }), 202
         except Exception as e:
             db.session.rollback()
-            if new_tx:
-                Transfer.update_confirmation(uuid=new_tx.uuid, status='erro', gas_used=gas_used, tx_hash=tx_hash_hex or "erro")
+            Transfer.update_confirmation(uuid=new_tx.uuid, status='erro', gas_used=gas_used, tx_hash=new_tx.tx_hash)
+            db.session.commit()
+            raise e
+
+    def submit(
+        self,
+        from_address: str,
+        private_key: str,
+        to_address: str,
+        asset: str,
+        amount: str,
+        urgency: str = "standard"):
+        """Broadcast the transfer and return right away, leaving the
+        confirmation to the background worker."""
+
+        ethereum_service = EthereumService(w3=w3, broadcast=current_app.config["RPC_BROADCAST_ALL"])
+
+        to_address = ethereum_service.to_checksum_address(to_address)
+        asset = asset.upper()
+        try:
+            amount = decimal.Decimal(amount)
+        except Exception:
+            return jsonify({"error": "Invalid amount format"}), 400
+
+        from_address, private_key = self._sender(
+            ethereum_service, from_address, private_key, asset, amount)
+
+        new_tx, gas_price = self._broadcast(
+            ethereum_service, from_address, private_key, to_address, asset, amount, urgency)
+
+        return jsonify({
+            "uuid": str(new_tx.uuid),
+            "tx_hash": new_tx.tx_hash,
+            "status": new_tx.status,
+            "gas_price": gas_price
+        }), 202
+
+    def get(self, uuid: UUID):
+
+        transfer = Transfer.get(uuid=uuid)
+        if not transfer:
+            return None
+
+        return {
+            "uuid": str(transfer.uuid),
+            "tx_hash": transfer.tx_hash,
+            "from": transfer.from_address,
+            "to": transfer.to_address,
+            "asset": transfer.asset,
+            "amount": str(transfer.value),
+            "status": transfer.status,
+            "gas_used": str(transfer.gas_used) if transfer.gas_used is not None else None,
+            "gas_price": str(transfer.gas_price),
+            "replacements": [
+                replacement.tx_hash for replacement in TransferReplacement.get_by_transfer(transfer_uuid=transfer.uuid)
+            ],
+        }
+
+    def _execute_multisend(
+        self,
+        ethereum_service: EthereumService,
+        from_address: str,
+        private_key: str,
+        items: list,
+        urgency: str):
+        """Pay every item of a single-token batch with one call to the
+        multi-send contract. Each recipient keeps its own transfers row,
+        all pointing to the shared transaction hash."""
+
+        asset = items[0]["asset"]
+        multisend_address = ethereum_service.to_checksum_address(current_app.config["MULTISEND_CONTRACT_ADDRESS"])
+
+        token = ethereum_service.contract(address=get_token_address(asset), abi=ERC20_ABI)
+        decimals = get_token_decimals(asset, ethereum_service)
+        recipients = [item["to_address"] for item in items]
+        values = [int(item["amount"] * (10 ** decimals)) for item in items]
+
+        # A aprovação é feita uma única vez, com o valor máximo
+        needs_approval = token.functions.allowance(from_address, multisend_address).call() < sum(values)
+        count = 2 if needs_approval else 1
+
+        batch_uuid = uuid4()
+        uuids = []
+        sent = 0
+        first_nonce = allocate_nonce(from_address, ethereum_service, count=count)
+        try:
+            fees = FeeUseCase(ethereum_service).quote(urgency)
+
+            signed_txs = []
+            approval_tx_hash = None
+            if needs_approval:
+                approve_tx = self._build_approve_transaction(ethereum_service, from_address, asset, first_nonce, fees)
+                signed_txs.append(ethereum_service.sign_transaction(approve_tx, private_key))
+                approval_tx_hash = signed_txs[0].hash.to_0x_hex()
+
+            tx = self._build_multisend_transaction(
+                ethereum_service, from_address, token.address, recipients, values, first_nonce + count - 1, fees)
+            if not needs_approval:
+                # Sem aprovação pendente a chamada pode ser estimada
+                tx['gas'] = int(ethereum_service.estimate_gas(tx) * 1.25)
+            signed_tx = ethereum_service.sign_transaction(tx, private_key)
+            signed_txs.append(signed_tx)
+
+            tx_hash = signed_tx.hash.to_0x_hex()
+            uuids = Transfer.create_many(transfers=[{
+                "tx_hash": tx_hash,
+                "from_address": from_address,
+                "to_address": item["to_address"],
+                "asset": asset,
+                "value": str(item["amount"]),
+                "status": "sent",
+                "gas_used": None,
+                "gas_price": str(fees['maxFeePerGas']),
+                "nonce": first_nonce + count - 1,
+                "approval_tx_hash": approval_tx_hash,
+            } for item in items], batch_uuid=batch_uuid)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            if uuids:
+                Transfer.update_status_many(uuids=uuids, status='erro')
                 db.session.commit()
+            release_nonce(from_address, first_nonce, ethereum_service, private_key, count=count)
             raise e
-        finally:
-            lock.release()
+
+        try:
+            for signed in signed_txs:
+                send_transaction(ethereum_service, signed)
+                sent += 1
+        except Exception as e:
+            # A chamada do multi-send é a última: nenhuma transferência saiu
+            Transfer.update_status_many(uuids=uuids, status='erro')
+            db.session.commit()
+            release_nonce(from_address, first_nonce + sent, ethereum_service, private_key, count=count - sent)
+            raise e
+
+        return jsonify({
+            "batch_uuid": str(batch_uuid),
+            "from_address": from_address,
+            "tx_hash": tx_hash,
+            "transfers": [{
+                "uuid": str(transfer_uuid),
+                "tx_hash": tx_hash,
+                "status": "sent",
+            } for transfer_uuid in uuids],
+        }), 202
+
+    def execute_batch(
+        self,
+        from_address: str,
+        private_key: str,
+        transfers: list,
+        mode: str = None,
+        urgency: str = "standard"):
+        """Sign a list of transfers from one sender with consecutive nonces,
+        record them with a single insert and broadcast them back to back.
+        With mode 'multisend' a single-token batch is packed into one call
+        to the multi-send contract. Confirmation is left to the background
+        worker."""
+
+        ethereum_service = EthereumService(w3=w3, broadcast=current_app.config["RPC_BROADCAST_ALL"])
+
+        if not transfers:
+            return jsonify({"error": "Empty batch"}), 400
+        try:
+            items = [{
+                "to_address": ethereum_service.to_checksum_address(t["to_address"]),
+                "asset": t["asset"].upper(),
+                "amount": decimal.Decimal(str(t["amount"])),
+            } for t in transfers]
+        except Exception:
+            return jsonify({"error": "Invalid transfer format"}), 400
+
+        if not from_address:
+            assets = {item["asset"] for item in items}
+            if len(assets) != 1:
+                return jsonify({"error": "from_address is required for mixed-asset batches"}), 400
+        if mode == "multisend":
+            assets = {item["asset"] for item in items}
+            if len(assets) != 1 or "ETH" in assets:
+                return jsonify({"error": "Multi-send batches must carry a single ERC-20 asset"}), 400
+            if not current_app.config.get("MULTISEND_CONTRACT_ADDRESS"):
+                return jsonify({"error": "Multi-send contract not configured"}), 400
+
+        from_address, private_key = self._sender(
+            ethereum_service, from_address, private_key,
+            items[0]["asset"], sum(item["amount"] for item in items))
+
+        if mode == "multisend":
+            return self._execute_multisend(ethereum_service, from_address, private_key, items, urgency)
+
+        count = len(items)
+        batch_uuid = uuid4()
+        uuids = []
+        sent = 0
+        first_nonce = allocate_nonce(from_address, ethereum_service, count=count)
+        try:
+            # Entradas compartilhadas buscadas uma única vez para o lote
+            fees = FeeUseCase(ethereum_service).quote(urgency)
+
+            # Classes dos destinatários numa consulta por token
+            known_classes = {}
+            gas_limits = GasLimitUseCase(ethereum_service)
+            for asset in {item["asset"] for item in items} - {"ETH"}:
+                to_addresses = [item["to_address"] for item in items if item["asset"] == asset]
+                known_classes.update(zip(
+                    [(asset, to_address) for to_address in to_addresses],
+                    gas_limits.recipient_classes(asset, to_addresses)))
+
+            signed_txs = []
+            recipient_classes = []
+            for index, item in enumerate(items):
+                tx, recipient_class = self._build_transaction(
+                    ethereum_service, from_address, item["to_address"], item["asset"],
+                    item["amount"], first_nonce + index, fees,
+                    known_classes.get((item["asset"], item["to_address"])))
+                signed_txs.append(ethereum_service.sign_transaction(tx, private_key))
+                recipient_classes.append(recipient_class)
+
+            uuids = Transfer.create_many(transfers=[{
+                "tx_hash": signed_tx.hash.to_0x_hex(),
+                "from_address": from_address,
+                "to_address": item["to_address"],
+                "asset": item["asset"],
+                "value": str(item["amount"]),
+                "status": "sent",
+                "gas_used": None,
+                "gas_price": str(fees['maxFeePerGas']),
+                "recipient_class": recipient_class,
+                "nonce": first_nonce + index,
+            } for index, (item, signed_tx, recipient_class) in enumerate(zip(items, signed_txs, recipient_classes))], batch_uuid=batch_uuid)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            if uuids:
+                Transfer.update_status_many(uuids=uuids, status='erro')
+                db.session.commit()
+            release_nonce(from_address, first_nonce, ethereum_service, private_key, count=count)
+            raise e
+
+        # Um envio com resultado incerto conta como enviado; o lote só para
+        # quando o nó provavelmente não recebeu nada
+        try:
+            for signed_tx in signed_txs:
+                send_transaction(ethereum_service, signed_tx)
+                sent += 1
+        except Exception as e:
+            Transfer.update_status_many(uuids=uuids[sent:], status='erro')
+            db.session.commit()
+            release_nonce(from_address, first_nonce + sent, ethereum_service, private_key, count=count - sent)
+            if not sent:
+                raise e
+
+        return jsonify({
+            "batch_uuid": str(batch_uuid),
+            "from_address": from_address,
+            "transfers": [{
+                "uuid": str(transfer_uuid),
+                "tx_hash": signed_tx.hash.to_0x_hex(),
+                "status": "sent" if index < sent else "erro",
+            } for index, (transfer_uuid, signed_tx) in enumerate(zip(uuids, signed_txs))],
+        }), 202
+
+    def get_batch(self, batch_uuid: UUID):
+
+        transfers = Transfer.get_by_batch(batch_uuid=batch_uuid)
+        if not transfers:
+            return None
+
+        counts = {}
+        for transfer in transfers:
+            counts[transfer.status] = counts.get(transfer.status, 0) + 1
+
+        if counts.get("sent"):
+            status = "sent"
+        elif counts.get("confirmed") == len(transfers):
+            status = "confirmed"
+        else:
+            status = "partial"
+
+        return {
+            "batch_uuid": str(batch_uuid),
+            "status": status,
+            "counts": counts,
+            "transfers": [{
+                "uuid": str(transfer.uuid),
+                "tx_hash": transfer.tx_hash,
+                "to": transfer.to_address,
+                "asset": transfer.asset,
+                "amount": str(transfer.value),
+                "status": transfer.status,
+            } for transfer in transfers],
+        }
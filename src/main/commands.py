@@ -1,9 +1,14 @@
+import logging
+
+import click
 import flask_migrate
 from flask.cli import with_appcontext
 from flask import current_app
 
 from main.app import db
 
+logger = logging.getLogger("teste-mb." + __name__)
+
 
 class InvalidEnvironment(Exception):
     pass
@@ -26,4 +31,55 @@ def drop_create_tables():
     if current_app.config["DEPLOY_ENV"] == 'Production':
         raise InvalidEnvironment('Drop/Create tables unable for production')
     _drop_create_tables()
-    
+
+
+@with_appcontext
+def confirm_transfers():
+    from main.application_layer.use_cases.confirmation import ConfirmationUseCase
+
+    ConfirmationUseCase().run(poll_interval=current_app.config["CONFIRMATION_POLL_INTERVAL"])
+
+
+@with_appcontext
+def replace_stuck_transfers():
+    from main.application_layer.use_cases.replacement import ReplacementUseCase
+
+    ReplacementUseCase().run(poll_interval=current_app.config["REPLACEMENT_POLL_INTERVAL"])
+
+
+@with_appcontext
+def sync_nonces():
+    from main.app import w3
+    from main.application_layer.adapters.ethereum_service import EthereumService
+    from main.domain_layer.models.nonce import Nonce
+
+    ethereum_service = EthereumService(w3=w3)
+    for address in Nonce.get():
+        try:
+            Nonce.resync(address=address, chain_nonce=ethereum_service.get_transaction_count(address, 'pending'))
+        except Exception:
+            logger.exception(f"Unable to resync nonce for {address}")
+
+
+@click.argument("address")
+@click.option("--disable", is_flag=True, help="Remove the address from the pool.")
+@with_appcontext
+def hot_wallet(address, disable):
+    from main.application_layer.use_cases.address import AddressUseCase
+
+    if not AddressUseCase().set_hot_wallet(address=address, hot_wallet=not disable):
+        raise click.ClickException(f"Address {address} not found")
+
+
+@with_appcontext
+def rebuild_whitelist_index():
+    from main.application_layer.adapters.address_repository import SQLAlchemyAddressRepository
+    from main.application_layer.adapters.counter_repository import SQLAlchemyCounterRepository
+    from main.application_layer.adapters.whitelist_index import WHITELIST_COUNTER, get_whitelist_index
+
+    whitelist_index = get_whitelist_index()
+    if whitelist_index is None:
+        raise click.ClickException("WHITELIST_INDEX_PATH is not configured")
+    # Versão lida antes dos endereços, como no primeiro build
+    version = SQLAlchemyCounterRepository.get(WHITELIST_COUNTER)
+    whitelist_index.rebuild(SQLAlchemyAddressRepository.get_addresses(), version)
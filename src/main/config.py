@@ -16,6 +16,61 @@ class BaseConfig(object):
     RESTPLUS_VALIDATE = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('DB_URI', 'sqlite:////app/addresses.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = True
+    CONFIRMATION_POLL_INTERVAL = float(os.environ.get('CONFIRMATION_POLL_INTERVAL', 2))
+    CONFIRMATION_MAX_CATCHUP_BLOCKS = int(os.environ.get('CONFIRMATION_MAX_CATCHUP_BLOCKS', 1000))
+    MULTISEND_CONTRACT_ADDRESS = os.environ.get('MULTISEND_CONTRACT_ADDRESS')
+    RPC_MAX_CONCURRENCY = int(os.environ.get('RPC_MAX_CONCURRENCY', 50))
+    RPC_POOL_SIZE = int(os.environ.get('RPC_POOL_SIZE', 20))
+    RPC_KEEP_ALIVE = os.environ.get('RPC_KEEP_ALIVE', 'true').lower() == 'true'
+    RPC_CONNECT_TIMEOUT = float(os.environ.get('RPC_CONNECT_TIMEOUT', 3))
+    RPC_READ_TIMEOUT = float(os.environ.get('RPC_READ_TIMEOUT', 10))
+    RPC_WRITE_TIMEOUT = float(os.environ.get('RPC_WRITE_TIMEOUT', 30))
+    RPC_HEAVY_TIMEOUT = float(os.environ.get('RPC_HEAVY_TIMEOUT', 60))
+    RPC_RETRIES = int(os.environ.get('RPC_RETRIES', 2))
+    RPC_RETRY_BACKOFF = float(os.environ.get('RPC_RETRY_BACKOFF', 0.1))
+    RPC_BREAKER_WINDOW = int(os.environ.get('RPC_BREAKER_WINDOW', 20))
+    RPC_BREAKER_MIN_CALLS = int(os.environ.get('RPC_BREAKER_MIN_CALLS', 5))
+    RPC_BREAKER_ERROR_RATE = float(os.environ.get('RPC_BREAKER_ERROR_RATE', 0.5))
+    RPC_BREAKER_COOLDOWN = float(os.environ.get('RPC_BREAKER_COOLDOWN', 30))
+    RPC_EXPLORE_RATE = float(os.environ.get('RPC_EXPLORE_RATE', 0.05))
+    RPC_HEDGE_READS = os.environ.get('RPC_HEDGE_READS', 'false').lower() == 'true'
+    RPC_HEDGE_PERCENTILE = int(os.environ.get('RPC_HEDGE_PERCENTILE', 95))
+    RPC_HEDGE_DELAY = float(os.environ.get('RPC_HEDGE_DELAY', 0.1))
+    RPC_BROADCAST_ALL = os.environ.get('RPC_BROADCAST_ALL', 'true').lower() == 'true'
+    RPC_RATE_LIMIT_PATH = os.environ.get('RPC_RATE_LIMIT_PATH', '/tmp/teste-mb/rate-limit')
+    RPC_READ_RATE = float(os.environ.get('RPC_READ_RATE', 0))
+    RPC_READ_BURST = float(os.environ.get('RPC_READ_BURST', 50))
+    RPC_WRITE_RATE = float(os.environ.get('RPC_WRITE_RATE', 0))
+    RPC_WRITE_BURST = float(os.environ.get('RPC_WRITE_BURST', 10))
+    RPC_RATE_LIMIT_MAX_WAIT = float(os.environ.get('RPC_RATE_LIMIT_MAX_WAIT', 2))
+    RPC_CASSETTE_MODE = os.environ.get('RPC_CASSETTE_MODE', '')
+    RPC_CASSETTE = os.environ.get('RPC_CASSETTE', 'cassettes/rpc.jsonl')
+    RPC_REPLAY_PROFILE = os.environ.get('RPC_REPLAY_PROFILE', '')
+    RPC_REPLAY_SEED = int(os.environ['RPC_REPLAY_SEED']) if os.environ.get('RPC_REPLAY_SEED') else None
+    VALIDATE_BATCH_MAX_HASHES = int(os.environ.get('VALIDATE_BATCH_MAX_HASHES', 5000))
+    VALIDATE_BATCH_CHUNK_SIZE = int(os.environ.get('VALIDATE_BATCH_CHUNK_SIZE', 50))
+    VALIDATION_CACHE_RECENT_TTL = float(os.environ.get('VALIDATION_CACHE_RECENT_TTL', 12))
+    VALIDATION_CACHE_FINAL_TTL = float(os.environ.get('VALIDATION_CACHE_FINAL_TTL', 3600))
+    VALIDATION_CACHE_MAX_ENTRIES = int(os.environ.get('VALIDATION_CACHE_MAX_ENTRIES', 100000))
+    VALIDATION_LOCK_TIMEOUT = float(os.environ.get('VALIDATION_LOCK_TIMEOUT', 30))
+    VALIDATION_LOCK_POLL_INTERVAL = float(os.environ.get('VALIDATION_LOCK_POLL_INTERVAL', 0.05))
+    VALIDATION_LOCK_RESULT_TTL = float(os.environ.get('VALIDATION_LOCK_RESULT_TTL', 5))
+    WHITELIST_INDEX_PATH = os.environ.get('WHITELIST_INDEX_PATH', '/tmp/teste-mb/whitelist.idx')
+    WHITELIST_INDEX_DELTA_MAX_ENTRIES = int(os.environ.get('WHITELIST_INDEX_DELTA_MAX_ENTRIES', 4096))
+    WHITELIST_INDEX_REFRESH_INTERVAL = float(os.environ.get('WHITELIST_INDEX_REFRESH_INTERVAL', 5))
+    CHAIN_CACHE_PATH = os.environ.get('CHAIN_CACHE_PATH', '/tmp/teste-mb/chain-cache.db')
+    CHAIN_CACHE_MAX_BYTES = int(os.environ.get('CHAIN_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+    CHAIN_CACHE_FINALITY_DEPTH = int(os.environ.get('CHAIN_CACHE_FINALITY_DEPTH', 64))
+    HOT_WALLET_GAS_RESERVE = int(os.environ.get('HOT_WALLET_GAS_RESERVE', 100000))
+    GAS_LIMIT_CACHE_TTL = float(os.environ.get('GAS_LIMIT_CACHE_TTL', 60))
+    GAS_LIMIT_SAMPLES = int(os.environ.get('GAS_LIMIT_SAMPLES', 200))
+    GAS_LIMIT_MIN_SAMPLES = int(os.environ.get('GAS_LIMIT_MIN_SAMPLES', 20))
+    GAS_LIMIT_PERCENTILE = int(os.environ.get('GAS_LIMIT_PERCENTILE', 95))
+    GAS_LIMIT_MAX_SPREAD = float(os.environ.get('GAS_LIMIT_MAX_SPREAD', 0.2))
+    REPLACEMENT_POLL_INTERVAL = float(os.environ.get('REPLACEMENT_POLL_INTERVAL', 12))
+    REPLACEMENT_PENDING_BLOCKS = int(os.environ.get('REPLACEMENT_PENDING_BLOCKS', 5))
+    REPLACEMENT_FEE_BUMP = float(os.environ.get('REPLACEMENT_FEE_BUMP', 12.5))
+    REPLACEMENT_MAX_FEE_PER_GAS = int(os.environ.get('REPLACEMENT_MAX_FEE_PER_GAS', 0))
 
     
 
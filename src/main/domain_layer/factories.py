@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import datetime
 from uuid import UUID
 
 @dataclass
@@ -46,6 +47,9 @@ class TransferFactory:
     status: str
     gas_used: float
     gas_price: float
+    nonce: int = None
+    sent_block: int = None
+    approval_tx_hash: str = None
 
     def create_transfer(self):
         """Create a Transfer instance."""
@@ -59,5 +63,70 @@ class TransferFactory:
             value=self.value,
             status=self.status,
             gas_used=self.gas_used,
-            gas_price=self.gas_price
-        )
\ No newline at end of file
+            gas_price=self.gas_price,
+            nonce=self.nonce,
+            sent_block=self.sent_block,
+            approval_tx_hash=self.approval_tx_hash
+        )
+
+
+@dataclass
+class TransferReplacementFactory:
+    uuid: UUID
+    transfer_uuid: UUID
+    tx_hash: str
+    replaced_tx_hash: str
+    max_fee_per_gas: float
+    max_priority_fee_per_gas: float
+    block: int
+
+    def create_transfer_replacement(self):
+        """Create a TransferReplacement instance."""
+        from main.domain_layer.models.transfer_replacement import TransferReplacement
+        return TransferReplacement(
+            uuid=self.uuid,
+            transfer_uuid=self.transfer_uuid,
+            tx_hash=self.tx_hash,
+            replaced_tx_hash=self.replaced_tx_hash,
+            max_fee_per_gas=self.max_fee_per_gas,
+            max_priority_fee_per_gas=self.max_priority_fee_per_gas,
+            block=self.block
+        )
+
+
+@dataclass
+class TokenFactory:
+    chain_id: int
+    address: str
+    symbol: str
+    decimals: int
+
+    def create_token(self):
+        """Create a Token instance."""
+        from main.domain_layer.models.token import Token
+        return Token(
+            chain_id=self.chain_id,
+            address=self.address,
+            symbol=self.symbol,
+            decimals=self.decimals
+        )
+
+
+@dataclass
+class ValidationLockFactory:
+    tx_hash: str
+    owner: str
+    result: dict
+    acquired_at: datetime
+    completed_at: datetime
+
+    def create_validation_lock(self):
+        """Create a ValidationLock instance."""
+        from main.domain_layer.models.validation_lock import ValidationLock
+        return ValidationLock(
+            tx_hash=self.tx_hash,
+            owner=self.owner,
+            result=self.result,
+            acquired_at=self.acquired_at,
+            completed_at=self.completed_at
+        )
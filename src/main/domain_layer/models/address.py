@@ -17,6 +17,16 @@ class Address:
         return SQLAlchemyAddressRepository.get()
 
     @classmethod
-    def create(cls, address: str, private_key: str):
+    def get_hot_wallets(cls):
+        """Retrieve the addresses in the hot wallet pool."""
+        return SQLAlchemyAddressRepository.get_hot_wallets()
+
+    @classmethod
+    def set_hot_wallet(cls, address: str, hot_wallet: bool):
+        """Add an address to, or remove it from, the hot wallet pool."""
+        return SQLAlchemyAddressRepository.set_hot_wallet(address=address, hot_wallet=hot_wallet)
+
+    @classmethod
+    def create(cls, address: str, private_key: str, hot_wallet: bool = False):
         """Add a new address to the repository."""
-        return SQLAlchemyAddressRepository.create(address, private_key)
\ No newline at end of file
+        return SQLAlchemyAddressRepository.create(address, private_key, hot_wallet)
\ No newline at end of file
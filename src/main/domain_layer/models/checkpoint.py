@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+
+from main.application_layer.adapters.checkpoint_repository import SQLAlchemyCheckpointRepository
+
+@dataclass
+class Checkpoint:
+    """Last block processed by a worker, kept across restarts."""
+
+    name: str
+    block: int
+
+    @classmethod
+    def get(cls, name: str):
+        """Retrieve the last block processed by a worker, or None."""
+        return SQLAlchemyCheckpointRepository.get(name=name)
+
+    @classmethod
+    def save(cls, name: str, block: int):
+        """Record the last block processed by a worker."""
+        return SQLAlchemyCheckpointRepository.save(name=name, block=block)
@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+
+from main.application_layer.adapters.nonce_repository import SQLAlchemyNonceRepository
+
+@dataclass
+class Nonce:
+    """Next nonce to be used by an address, shared by every worker."""
+
+    address: str
+    nonce: int
+
+    @classmethod
+    def get(cls):
+        """Retrieve the next nonce of every tracked address."""
+        return SQLAlchemyNonceRepository.get()
+
+    @classmethod
+    def allocate(cls, address: str, chain_nonce, count: int = 1):
+        """Reserve consecutive nonces for an address, returning the first."""
+        return SQLAlchemyNonceRepository.allocate(address=address, chain_nonce=chain_nonce, count=count)
+
+    @classmethod
+    def release(cls, address: str, nonce: int, count: int = 1):
+        """Give back nonces that were never broadcast."""
+        return SQLAlchemyNonceRepository.release(address=address, nonce=nonce, count=count)
+
+    @classmethod
+    def resync(cls, address: str, chain_nonce: int, force: bool = False):
+        """Align the next nonce of an address with the chain."""
+        return SQLAlchemyNonceRepository.resync(address=address, chain_nonce=chain_nonce, force=force)
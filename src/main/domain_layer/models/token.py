@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+
+from main.application_layer.adapters.token_repository import SQLAlchemyTokenRepository
+
+@dataclass
+class Token:
+    """ERC-20 contract with the metadata read from the chain once."""
+
+    chain_id: int
+    address: str
+    symbol: str
+    decimals: int
+
+    @classmethod
+    def get(cls, chain_id: int):
+        """Retrieve the known tokens of a chain."""
+        return SQLAlchemyTokenRepository.get(chain_id=chain_id)
+
+    @classmethod
+    def create(cls, chain_id: int, address: str, symbol: str, decimals: int):
+        """Add a token, returning the stored one if it already exists."""
+        return SQLAlchemyTokenRepository.create(chain_id=chain_id, address=address, symbol=symbol, decimals=decimals)
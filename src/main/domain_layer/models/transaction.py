@@ -24,4 +24,19 @@ class Transaction:
     @classmethod
     def create(cls, tx_hash: str, asset: str, to_address: str, value: float):
         """Add a new transaction to the repository."""
-        return SQLAlchemyTransactionRepository.create(tx_hash, asset, to_address, value)
\ No newline at end of file
+        return SQLAlchemyTransactionRepository.create(tx_hash, asset, to_address, value)
+
+    @classmethod
+    def get_registered(cls, tx_hashes: list):
+        """Retrieve which of the hashes are already registered."""
+        return SQLAlchemyTransactionRepository.get_registered_hashes(tx_hashes)
+
+    @classmethod
+    def create_many(cls, transactions: list):
+        """Add several transactions at once."""
+        return SQLAlchemyTransactionRepository.create_many(transactions)
+
+    @classmethod
+    def create_each(cls, groups: dict):
+        """Add each group of transactions on its own; returns the rejected keys."""
+        return SQLAlchemyTransactionRepository.create_each(groups)
@@ -16,17 +16,79 @@ class Transfer:
     status: str
     gas_used: float
     gas_price: float
+    nonce: int = None
+    sent_block: int = None
+    approval_tx_hash: str = None
 
     @classmethod
-    def get(cls):
-        """Retrieve all transfers."""
+    def get(cls, uuid: UUID = None):
+        """Retrieve a transfer by its uuid, or all transfers."""
+        if uuid:
+            return SQLAlchemyTransferRepository.get(uuid=uuid)
         return SQLAlchemyTransferRepository.get()
     
     @classmethod
-    def create(cls, tx_hash: str, from_address: str, to_address: str, asset: str, value: float, status: str, gas_used: float, gas_price: float):
+    def get_by_status(cls, status: str):
+        """Retrieve the transfers with a given status."""
+        return SQLAlchemyTransferRepository.get_by_status(status=status)
+
+    @classmethod
+    def get_by_batch(cls, batch_uuid: UUID):
+        """Retrieve the transfers of a batch."""
+        return SQLAlchemyTransferRepository.get_by_batch(batch_uuid=batch_uuid)
+
+    @classmethod
+    def get_in_flight(cls):
+        """Count, value per asset and max fees of the 'sent' transfers of each sending address."""
+        return SQLAlchemyTransferRepository.get_in_flight()
+
+    @classmethod
+    def get_holders(cls, asset: str, addresses: list):
+        """Retrieve which of the addresses already received a confirmed transfer of an asset."""
+        return SQLAlchemyTransferRepository.get_holders(asset=asset, addresses=addresses)
+
+    @classmethod
+    def get_gas_used(cls, asset: str, recipient_class: str, limit: int):
+        """Retrieve the gas used by the latest confirmed transfers of a recipient class."""
+        return SQLAlchemyTransferRepository.get_gas_used(asset=asset, recipient_class=recipient_class, limit=limit)
+
+    @classmethod
+    def create(cls, tx_hash: str, from_address: str, to_address: str, asset: str, value: float, status: str, gas_used: float, gas_price: float, recipient_class: str = None, nonce: int = None):
         """Add a new transfer to the repository."""
-        return SQLAlchemyTransferRepository.create(tx_hash, from_address, to_address, asset, value, status, gas_used, gas_price)
+        return SQLAlchemyTransferRepository.create(tx_hash, from_address, to_address, asset, value, status, gas_used, gas_price, recipient_class, nonce)
     
+    @classmethod
+    def create_many(cls, transfers: list, batch_uuid: UUID = None):
+        """Add several transfers to the repository in one statement."""
+        return SQLAlchemyTransferRepository.create_many(transfers=transfers, batch_uuid=batch_uuid)
+
+    @classmethod
+    def update_status_many(cls, uuids: list, status: str):
+        """Update the status of several transfers."""
+        return SQLAlchemyTransferRepository.update_status_many(uuids=uuids, status=status)
+
+    @classmethod
+    def mark_sent_block(cls, block_number: int):
+        """Stamp the unseen 'sent' transfers with the current block."""
+        return SQLAlchemyTransferRepository.mark_sent_block(block_number=block_number)
+
+    @classmethod
+    def get_stuck(cls, sent_before_block: int):
+        """Retrieve the 'sent' transfers broadcast at or before a block."""
+        return SQLAlchemyTransferRepository.get_stuck(sent_before_block=sent_before_block)
+
+    @classmethod
+    def update_replacement(cls, uuids: list, tx_hash: str, gas_price: float, sent_block: int):
+        """Point transfers at the hash of their replacement transaction."""
+        return SQLAlchemyTransferRepository.update_replacement(
+            uuids=uuids, tx_hash=tx_hash, gas_price=gas_price, sent_block=sent_block)
+
+    @classmethod
+    def update_approval(cls, uuids: list, approval_tx_hash: str, sent_block: int):
+        """Point the transfers of a multi-send at the hash of its approval."""
+        return SQLAlchemyTransferRepository.update_approval(
+            uuids=uuids, approval_tx_hash=approval_tx_hash, sent_block=sent_block)
+
     @classmethod
     def update_tx_hash(cls, uuid: UUID, tx_hash: str):
         """Update transfer tx_hash."""
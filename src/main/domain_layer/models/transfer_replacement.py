@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from main.application_layer.adapters.transfer_replacement_repository import SQLAlchemyTransferReplacementRepository
+
+@dataclass
+class TransferReplacement:
+    """Fee-bumped transaction re-signed with the nonce of a stuck transfer."""
+
+    uuid: UUID
+    transfer_uuid: UUID
+    tx_hash: str
+    replaced_tx_hash: str
+    max_fee_per_gas: float
+    max_priority_fee_per_gas: float
+    block: int
+
+    @classmethod
+    def get_by_transfer(cls, transfer_uuid: UUID):
+        """Retrieve the replacements of a transfer, oldest first."""
+        return SQLAlchemyTransferReplacementRepository.get_by_transfer(transfer_uuid=transfer_uuid)
+
+    @classmethod
+    def get_replaced_hashes(cls, status: str):
+        """Retrieve the replaced hashes of the transfers with a given status."""
+        return SQLAlchemyTransferReplacementRepository.get_replaced_hashes(status=status)
+
+    @classmethod
+    def create_many(cls, transfer_uuids: list, tx_hash: str, replaced_tx_hash: str, max_fee_per_gas: float, max_priority_fee_per_gas: float, block: int):
+        """Record a replacement for each transfer sharing the replaced hash."""
+        return SQLAlchemyTransferReplacementRepository.create_many(
+            transfer_uuids=transfer_uuids,
+            tx_hash=tx_hash,
+            replaced_tx_hash=replaced_tx_hash,
+            max_fee_per_gas=max_fee_per_gas,
+            max_priority_fee_per_gas=max_priority_fee_per_gas,
+            block=block)
+
+    @classmethod
+    def delete(cls, tx_hash: str):
+        """Remove the records of a replacement that never reached a node."""
+        return SQLAlchemyTransferReplacementRepository.delete(tx_hash=tx_hash)
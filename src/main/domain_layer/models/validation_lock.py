@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from main.application_layer.adapters.validation_lock_repository import SQLAlchemyValidationLockRepository
+
+@dataclass
+class ValidationLock:
+    """Claim of a worker on validating a transaction, carrying the result
+    for the callers that waited on it."""
+
+    tx_hash: str
+    owner: str
+    result: dict
+    acquired_at: datetime
+    completed_at: datetime
+
+    @classmethod
+    def get(cls, tx_hash: str):
+        """Retrieve the claim on a transaction, if any."""
+        return SQLAlchemyValidationLockRepository.get(tx_hash=tx_hash)
+
+    @classmethod
+    def acquire(cls, tx_hash: str, owner: str, timeout: float, result_ttl: float):
+        """Claim the validation of a transaction, returning False when
+        another worker holds it."""
+        return SQLAlchemyValidationLockRepository.acquire(
+            tx_hash=tx_hash, owner=owner, timeout=timeout, result_ttl=result_ttl)
+
+    @classmethod
+    def complete(cls, tx_hash: str, owner: str, result: dict):
+        """Publish the result of a claimed validation."""
+        return SQLAlchemyValidationLockRepository.complete(tx_hash=tx_hash, owner=owner, result=result)
+
+    @classmethod
+    def release(cls, tx_hash: str, owner: str):
+        """Drop a claim without a result, so another caller computes it."""
+        return SQLAlchemyValidationLockRepository.release(tx_hash=tx_hash, owner=owner)
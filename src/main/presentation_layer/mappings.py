@@ -18,19 +18,24 @@ class ValidateMapping(Mapping):
     def tx_hash(self):
         return self.payload['tx_hash']
     
+class ValidateBatchMapping(Mapping):
+
+    @property
+    def tx_hashes(self):
+        tx_hashes = self.payload.get('tx_hashes')
+        if not isinstance(tx_hashes, list) or not all(isinstance(tx_hash, str) for tx_hash in tx_hashes):
+            raise InvalidDataException("tx_hashes must be a list of transaction hashes")
+        return tx_hashes
+
 class TransferMapping(Mapping):
 
     @property
     def from_address(self):
-        return self.payload['from_address']
+        return self.payload.get('from_address')
 
     @property
     def private_key(self):
-        return self.payload['private_key']
-    
-    @property
-    def private_key(self):
-        return self.payload['private_key']
+        return self.payload.get('private_key')
     
     @property
     def to_address(self):
@@ -43,3 +48,34 @@ class TransferMapping(Mapping):
     @property
     def amount(self):
         return self.payload['amount']
+
+    @property
+    def is_async(self):
+        return bool(self.payload.get('async', False))
+
+    @property
+    def urgency(self):
+        return self.payload.get('urgency', 'standard')
+
+
+class TransferBatchMapping(Mapping):
+
+    @property
+    def from_address(self):
+        return self.payload.get('from_address')
+
+    @property
+    def private_key(self):
+        return self.payload.get('private_key')
+
+    @property
+    def transfers(self):
+        return self.payload.get('transfers', [])
+
+    @property
+    def mode(self):
+        return self.payload.get('mode')
+
+    @property
+    def urgency(self):
+        return self.payload.get('urgency', 'standard')
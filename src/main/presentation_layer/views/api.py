@@ -1,13 +1,19 @@
 import logging
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from flask_restx import Api, Resource
-from json import loads
+from json import dumps, loads
 
+from main.application_layer.metrics import metrics
 from main.application_layer.use_cases.address import AddressUseCase
+from main.application_layer.use_cases.fees import FeeUseCase
 from main.application_layer.use_cases.transaction import TransactionUseCase
 from main.application_layer.use_cases.transfer import TransferUseCase
-from main.presentation_layer.views.schemas import validate_model, transfer_model
-from main.presentation_layer.mappings import ValidateMapping, TransferMapping
+from main.presentation_layer.views.schemas import (
+    validate_model, validate_batch_model, transfer_model, transfer_item_model, transfer_batch_model
+)
+from main.presentation_layer.mappings import (
+    ValidateMapping, ValidateBatchMapping, TransferMapping, TransferBatchMapping
+)
 
 logger = logging.getLogger("teste-mb." + __name__)
 
@@ -37,7 +43,10 @@ api = Api(blueprint,
 ns = api.namespace('', description='teste-mb API endpoints')
 
 api.models[validate_model.name] = validate_model
+api.models[validate_batch_model.name] = validate_batch_model
 api.models[transfer_model.name] = transfer_model
+api.models[transfer_item_model.name] = transfer_item_model
+api.models[transfer_batch_model.name] = transfer_batch_model
 
 @ns.route('/healthz', doc=False)
 class Index(Resource):
@@ -51,10 +60,11 @@ class Generate(Resource):
     def post(self):
         data = request.get_json()
         quantity = data.get('quantity', 1)
+        hot_wallet = bool(data.get('hot_wallet', False))
 
         address_usecase = AddressUseCase()
         try:
-            generated_addresses = address_usecase.generate(quantity=quantity)
+            generated_addresses = address_usecase.generate(quantity=quantity, hot_wallet=hot_wallet)
             return {'status': 'success', 'generated_addresses': generated_addresses}
         except Exception as e:
             logger.exception(
@@ -118,6 +128,54 @@ class Validate(Resource):
                 })
             return {"message": str(e)}, 400
 
+@ns.route('/validate/batch')
+class ValidateBatch(Resource):
+
+    @ns.expect(validate_batch_model)
+    @ns.response(200, 'OK')
+    def post(self):
+
+        try:
+
+            tx_hashes = ValidateBatchMapping(payload=loads(request.data)).tx_hashes
+            max_hashes = current_app.config["VALIDATE_BATCH_MAX_HASHES"]
+            if len(tx_hashes) > max_hashes:
+                return {"message": f"At most {max_hashes} hashes per batch"}, 400
+
+            results = TransactionUseCase().validate_batch(tx_hashes=tx_hashes)
+
+        except Exception as e:
+            logger.exception(
+                "Validate batch requested failed",
+                extra={
+                    "props": {
+                        "request": "/api/validate/batch",
+                        "method": "POST",
+                        "error_message": str(e)
+                    }
+                })
+            return {"message": str(e)}, 400
+
+        def stream():
+            # Uma linha JSON por hash, enviada assim que o resultado sai
+            try:
+                for result in results:
+                    yield dumps(result) + "\n"
+            except Exception as e:
+                logger.exception(
+                    "Validate batch stream failed",
+                    extra={
+                        "props": {
+                            "request": "/api/validate/batch",
+                            "method": "POST",
+                            "quantity": len(tx_hashes),
+                            "error_message": str(e)
+                        }
+                    })
+                yield dumps({"error": str(e)}) + "\n"
+
+        return Response(stream_with_context(stream()), mimetype='application/x-ndjson')
+
 @ns.route('/transactions')
 class Transactions(Resource):
 
@@ -147,18 +205,21 @@ class Transfers(Resource):
 
     @ns.expect(transfer_model)
     @ns.response(200, 'OK')
+    @ns.response(202, 'Accepted')
     def post(self):
         transfer_mapping = TransferMapping(payload=loads(request.data))
 
         try:
 
             transfer_usecase = TransferUseCase()
-            result = transfer_usecase.execute(
+            run = transfer_usecase.submit if transfer_mapping.is_async else transfer_usecase.execute
+            result = run(
                 from_address=transfer_mapping.from_address,
                 private_key=transfer_mapping.private_key,
                 to_address=transfer_mapping.to_address,
                 asset=transfer_mapping.asset,
-                amount=transfer_mapping.amount
+                amount=transfer_mapping.amount,
+                urgency=transfer_mapping.urgency
             )
 
             return result
@@ -179,3 +240,124 @@ class Transfers(Resource):
                     }
                 })
             return {"message": str(e)}, 400
+
+@ns.route('/transfers/<uuid:transfer_uuid>')
+class TransferStatus(Resource):
+
+    @ns.response(200, 'OK')
+    @ns.response(404, 'Not Found')
+    def get(self, transfer_uuid):
+
+        try:
+
+            transfer_usecase = TransferUseCase()
+            transfer = transfer_usecase.get(uuid=transfer_uuid)
+            if not transfer:
+                return {"message": f"Transfer {transfer_uuid} not found"}, 404
+            return transfer
+
+        except Exception as e:
+            logger.exception(
+                "Transfer status requested failed",
+                extra={
+                    "props": {
+                        "request": "/api/transfers/<uuid>",
+                        "method": "GET",
+                        "uuid": str(transfer_uuid),
+                        "error_message": str(e)
+                    }
+                })
+            return {"message": str(e)}, 400
+
+@ns.route('/transfer/batch')
+class TransferBatch(Resource):
+
+    @ns.expect(transfer_batch_model)
+    @ns.response(202, 'Accepted')
+    def post(self):
+        batch_mapping = TransferBatchMapping(payload=loads(request.data))
+
+        try:
+
+            transfer_usecase = TransferUseCase()
+            return transfer_usecase.execute_batch(
+                from_address=batch_mapping.from_address,
+                private_key=batch_mapping.private_key,
+                transfers=batch_mapping.transfers,
+                mode=batch_mapping.mode,
+                urgency=batch_mapping.urgency
+            )
+
+        except Exception as e:
+            logger.exception(
+                "Transfer batch requested failed",
+                extra={
+                    "props": {
+                        "request": "/api/transfer/batch",
+                        "method": "POST",
+                        "from_address": batch_mapping.from_address,
+                        "quantity": len(batch_mapping.transfers),
+                        "error_message": str(e)
+                    }
+                })
+            return {"message": str(e)}, 400
+
+@ns.route('/transfers/batch/<uuid:batch_uuid>')
+class TransferBatchStatus(Resource):
+
+    @ns.response(200, 'OK')
+    @ns.response(404, 'Not Found')
+    def get(self, batch_uuid):
+
+        try:
+
+            transfer_usecase = TransferUseCase()
+            batch = transfer_usecase.get_batch(batch_uuid=batch_uuid)
+            if not batch:
+                return {"message": f"Batch {batch_uuid} not found"}, 404
+            return batch
+
+        except Exception as e:
+            logger.exception(
+                "Transfer batch status requested failed",
+                extra={
+                    "props": {
+                        "request": "/api/transfers/batch/<uuid>",
+                        "method": "GET",
+                        "uuid": str(batch_uuid),
+                        "error_message": str(e)
+                    }
+                })
+            return {"message": str(e)}, 400
+
+@ns.route('/fees')
+class Fees(Resource):
+
+    @ns.response(200, 'OK')
+    def get(self):
+
+        try:
+
+            fee_usecase = FeeUseCase()
+            return fee_usecase.get_quotes()
+
+        except Exception as e:
+            logger.exception(
+                "Fees requested failed",
+                extra={
+                    "props": {
+                        "request": "/api/fees",
+                        "method": "GET",
+                        "error_message": str(e)
+                    }
+                })
+            return {"message": str(e)}, 400
+
+
+@ns.route('/metrics', doc=False)
+class Metrics(Resource):
+
+    @ns.response(200, 'OK')
+    def get(self):
+
+        return metrics.snapshot()
@@ -13,13 +13,42 @@ validate_model = Model(
     }
 )
 
+validate_batch_model = Model(
+    'validate_batch',
+    {
+        'tx_hashes': fields.List(fields.String()),
+    }
+)
+
 transfer_model = Model(
     'transfer',
     {
         'from_address': fields.String(),
         'private_key': fields.String(),
+        'to_address': fields.String(),
+        'asset': fields.String(),
+        'amount': fields.Float(),
+        'async': fields.Boolean(default=False),
+        'urgency': fields.String(enum=['slow', 'standard', 'fast'], default='standard')
+    }
+)
+
+transfer_item_model = Model(
+    'transfer_item',
+    {
         'to_address': fields.String(),
         'asset': fields.String(),
         'amount': fields.Float()
     }
-)
\ No newline at end of file
+)
+
+transfer_batch_model = Model(
+    'transfer_batch',
+    {
+        'from_address': fields.String(),
+        'private_key': fields.String(),
+        'transfers': fields.List(fields.Nested(transfer_item_model)),
+        'mode': fields.String(enum=['multisend']),
+        'urgency': fields.String(enum=['slow', 'standard', 'fast'], default='standard')
+    }
+)
@@ -0,0 +1,113 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from eth_abi import decode, encode
+from eth_utils import keccak
+
+AGGREGATE3_SELECTOR = keccak(text="aggregate3((address,bool,bytes)[])")[:4]
+
+
+def multicall3(contracts: dict):
+    """eth_call handler emulating Multicall3 aggregate3.
+
+    `contracts` maps a lowercase target address to a function receiving
+    the call data and returning the ABI encoded result; raising makes that
+    call revert."""
+
+    def eth_call(params):
+        data = bytes.fromhex(params[0]["data"][2:])
+        assert data[:4] == AGGREGATE3_SELECTOR
+        (calls,) = decode(["(address,bool,bytes)[]"], data[4:])
+
+        results = []
+        for target, allow_failure, call_data in calls:
+            try:
+                results.append((True, contracts[target.lower()](call_data)))
+            except Exception:
+                if not allow_failure:
+                    raise
+                results.append((False, b""))
+        return "0x" + encode(["(bool,bytes)[]"], [results]).hex()
+
+    return eth_call
+
+
+class JsonRpcStub:
+    """Local stand-in JSON-RPC node for adapter tests.
+
+    `methods` maps a JSON-RPC method to a function receiving the params and
+    returning the result; raising turns into a JSON-RPC error. Single and
+    batch requests are supported, and every request body is recorded.
+    Setting `status` makes the node answer every request with that HTTP
+    status, as an overloaded node would."""
+
+    def __init__(self, methods: dict, delay: float = 0, status: int = 200):
+        self.methods = dict(methods)
+        self.methods.setdefault("eth_chainId", lambda params: "0xaa36a7")
+        self.delay = delay
+        self.status = status
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _respond(self, call):
+        try:
+            result = self.methods[call["method"]](call.get("params", []))
+            return {"jsonrpc": "2.0", "id": call["id"], "result": result}
+        except Exception as e:
+            return {"jsonrpc": "2.0", "id": call["id"], "error": {"code": -32000, "message": str(e)}}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub._lock:
+                    stub.requests.append(body)
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.delay)
+                    if isinstance(body, list):
+                        response = [stub._respond(call) for call in body]
+                    else:
+                        response = stub._respond(body)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+                payload = json.dumps(response).encode()
+                self.send_response(stub.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                if self.headers.get("Connection", "").lower() == "close":
+                    # Como um nó de verdade, avisa que vai fechar a conexão
+                    self.send_header("Connection", "close")
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -62,14 +62,16 @@ class TestSQLAlchemyAddressRepository(unittest.TestCase):
         self.assertIsNone(result)
         mock_factory.assert_not_called()
 
+    @patch("main.application_layer.adapters.address_repository.SQLAlchemyCounterRepository")
     @patch("main.application_layer.adapters.address_repository.db")
     @patch("main.application_layer.adapters.address_repository.address_table")
-    def test_create_success(self, mock_address_table, mock_db):
+    def test_create_success(self, mock_address_table, mock_db, mock_counter):
         # Setup
         mock_insert = MagicMock()
         mock_values = MagicMock()
         mock_address_table.insert.return_value = mock_insert
         mock_insert.values.return_value = mock_values
+        mock_counter.increment.return_value = 7
 
         # Act
         SQLAlchemyAddressRepository.create("addr1", "pk1")
@@ -77,12 +79,15 @@ class TestSQLAlchemyAddressRepository(unittest.TestCase):
         # Assert
         mock_address_table.insert.assert_called_once()
         mock_insert.values.assert_called_once()
+        mock_counter.increment.assert_called_once_with("whitelist")
+        self.assertEqual(mock_insert.values.call_args.kwargs["whitelist_version"], 7)
         mock_db.session.execute.assert_called_once_with(mock_values)
         mock_db.session.flush.assert_called_once()
 
+    @patch("main.application_layer.adapters.address_repository.SQLAlchemyCounterRepository")
     @patch("main.application_layer.adapters.address_repository.db")
     @patch("main.application_layer.adapters.address_repository.address_table")
-    def test_create_exception(self, mock_address_table, mock_db):
+    def test_create_exception(self, mock_address_table, mock_db, mock_counter):
         # Setup
         mock_insert = MagicMock()
         mock_values = MagicMock()
@@ -93,4 +98,45 @@ class TestSQLAlchemyAddressRepository(unittest.TestCase):
         # Act & Assert
         with self.assertRaises(Exception):
             SQLAlchemyAddressRepository.create("addr1", "pk1")
-        mock_db.session.rollback.assert_called_once()
\ No newline at end of file
+        mock_db.session.rollback.assert_called_once()
+
+    @patch("main.application_layer.adapters.address_repository.db")
+    def test_get_addresses_since(self, mock_db):
+        connection = mock_db.engine.connect.return_value.__enter__.return_value
+        connection.scalars.return_value.all.return_value = ["addr2"]
+
+        result = SQLAlchemyAddressRepository.get_addresses_since(1)
+
+        self.assertEqual(result, ["addr2"])
+        statement = connection.scalars.call_args.args[0]
+        self.assertIn("whitelist_version >", str(statement))
+        mock_db.session.execute.assert_not_called()
+
+    @patch("main.application_layer.adapters.address_repository.AddressFactory")
+    @patch("main.application_layer.adapters.address_repository.db")
+    @patch("main.application_layer.adapters.address_repository.address_table")
+    def test_get_hot_wallets(self, mock_address_table, mock_db, mock_factory):
+        mock_address = MagicMock(uuid="uuid1", address="addr1", private_key="pk1")
+        mock_db.session.query.return_value.filter.return_value.all.return_value = [mock_address]
+        mock_factory.return_value.create_address.return_value = "address_obj"
+
+        result = SQLAlchemyAddressRepository.get_hot_wallets()
+
+        self.assertEqual(result, ["address_obj"])
+        mock_factory.assert_called_once_with(uuid="uuid1", address="addr1", private_key="pk1")
+
+    @patch("main.application_layer.adapters.address_repository.db")
+    @patch("main.application_layer.adapters.address_repository.address_table")
+    def test_set_hot_wallet(self, mock_address_table, mock_db):
+        mock_db.session.execute.return_value.rowcount = 1
+
+        self.assertTrue(SQLAlchemyAddressRepository.set_hot_wallet("addr1", True))
+        mock_address_table.update.return_value.values.assert_called_once_with(hot_wallet=True)
+        mock_db.session.flush.assert_called_once()
+
+    @patch("main.application_layer.adapters.address_repository.db")
+    @patch("main.application_layer.adapters.address_repository.address_table")
+    def test_set_hot_wallet_unknown_address(self, mock_address_table, mock_db):
+        mock_db.session.execute.return_value.rowcount = 0
+
+        self.assertFalse(SQLAlchemyAddressRepository.set_hot_wallet("addr1", True))
@@ -0,0 +1,119 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+
+from main.application_layer.adapters.chain_cache import ChainCache
+from main.application_layer.metrics import metrics
+
+
+class TestChainCache(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "chain-cache.db")
+        self.cache = ChainCache(self.path, max_bytes=10_000, finality_depth=64)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip_keeps_web3_types(self):
+        receipt = AttributeDict({"blockNumber": 1, "logs": [AttributeDict({"data": HexBytes("0x01")})]})
+        self.cache.set("receipt", receipt)
+
+        self.assertEqual(self.cache.get("receipt"), receipt)
+        self.assertIsInstance(self.cache.get("receipt")["logs"][0]["data"], HexBytes)
+
+    def test_round_trip_keeps_call_results(self):
+        value = [("0x" + "11" * 20, 5), b"\x00\x01", True, None, 2 ** 200]
+        self.cache.set("call", value)
+
+        self.assertEqual(self.cache.get("call"), value)
+
+    def test_stored_as_json(self):
+        self.cache.set("tx", AttributeDict({"hash": HexBytes("0x01"), "value": 10}))
+
+        data = self.cache._connection.execute("SELECT value FROM entries").fetchone()[0]
+        self.assertEqual(
+            json.loads(data), {"__attributedict__": {"hash": {"__hexbytes__": "0x01"}, "value": 10}})
+
+    def test_discards_entries_of_another_format(self):
+        self.cache._connection.execute("INSERT INTO entries VALUES ('old', x'8004', 2, 0)")
+        self.cache._connection.execute("PRAGMA user_version = 1")
+
+        other = ChainCache(self.path, max_bytes=10_000, finality_depth=64)
+
+        self.assertIsNone(other.get("old"))
+        self.assertEqual(other.stats(), {"entries": 0, "bytes": 0})
+
+    def test_keeps_running_totals(self):
+        self.cache.set("a", "x" * 100)
+        self.cache.set("b", "x" * 100)
+        self.cache.set("a", "x" * 10)
+
+        actual = self.cache._connection.execute("SELECT COUNT(*), SUM(size) FROM entries").fetchone()
+        self.assertEqual(self.cache.stats(), {"entries": actual[0], "bytes": actual[1]})
+        self.assertEqual(ChainCache(self.path, max_bytes=10_000, finality_depth=64).stats()["entries"], 2)
+
+    def test_hit_and_miss_counters(self):
+        self.cache.set("a", 1)
+        self.cache.get("a")
+        self.cache.get("b")
+
+        self.assertEqual(metrics.counter("chain_cache.hits"), 1)
+        self.assertEqual(metrics.counter("chain_cache.misses"), 1)
+
+    def test_shared_between_instances(self):
+        self.cache.set("a", {"value": 1})
+
+        other = ChainCache(self.path, max_bytes=10_000, finality_depth=64)
+
+        self.assertEqual(other.get("a"), {"value": 1})
+
+    def test_evicts_least_recently_used(self):
+        for index in range(30):
+            self.cache.set(f"key-{index}", "x" * 1000)
+
+        stats = self.cache.stats()
+        self.assertLessEqual(stats["bytes"], 10_000)
+        self.assertEqual(
+            self.cache._connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0], stats["bytes"])
+        self.assertIsNone(self.cache.get("key-0"))
+        self.assertIsNotNone(self.cache.get("key-29"))
+        self.assertGreater(metrics.counter("chain_cache.evictions"), 0)
+
+    def test_is_final(self):
+        self.assertFalse(self.cache.is_final(None))
+        self.assertFalse(self.cache.is_final(10))
+
+        self.cache.observe_head(100)
+
+        self.assertTrue(self.cache.is_final(36))
+        self.assertFalse(self.cache.is_final(37))
+
+    def test_is_final_refreshes_stale_head(self):
+        get_head = MagicMock(return_value=200)
+
+        self.assertTrue(self.cache.is_final(100, get_head=get_head))
+        # Bloco recente: a cabeça acabou de ser lida, não consulta de novo
+        self.assertFalse(self.cache.is_final(190, get_head=get_head))
+        get_head.assert_called_once()
+
+    def test_head_never_goes_back(self):
+        self.cache.observe_head(100)
+        self.cache.observe_head(90)
+
+        self.assertEqual(self.cache.head, 100)
+
+    @patch("main.application_layer.adapters.chain_cache.logger")
+    def test_errors_fall_back_to_miss(self, mock_logger):
+        self.cache._connection.close()
+
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.set("a", 1)
+
+        self.assertEqual(mock_logger.warning.call_count, 2)
@@ -0,0 +1,32 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from main.application_layer.adapters.checkpoint_repository import SQLAlchemyCheckpointRepository
+from main.application_layer.persistency.tables import checkpoint_table
+
+@pytest.fixture(autouse=True)
+def session():
+    engine = create_engine("sqlite://")
+    checkpoint_table.create(engine)
+    with Session(engine) as session, \
+            patch("main.application_layer.adapters.checkpoint_repository.db") as mock_db:
+        mock_db.session = session
+        yield session
+
+def test_get_without_checkpoint():
+    assert SQLAlchemyCheckpointRepository.get("confirm-transfers") is None
+
+def test_save_inserts_then_updates():
+    SQLAlchemyCheckpointRepository.save("confirm-transfers", 10)
+    SQLAlchemyCheckpointRepository.save("confirm-transfers", 11)
+    SQLAlchemyCheckpointRepository.save("other", 3)
+
+    assert SQLAlchemyCheckpointRepository.get("confirm-transfers") == 11
+    assert SQLAlchemyCheckpointRepository.get("other") == 3
+
+def test_get_raises_exception_logs_and_raises(session, caplog):
+    checkpoint_table.drop(session.get_bind())
+    with pytest.raises(Exception):
+        SQLAlchemyCheckpointRepository.get("confirm-transfers")
+    assert "Error while trying to get Checkpoint" in caplog.text
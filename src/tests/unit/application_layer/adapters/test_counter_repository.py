@@ -0,0 +1,37 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from main.application_layer.adapters.counter_repository import SQLAlchemyCounterRepository
+from main.application_layer.persistency.tables import counter_table
+
+@pytest.fixture(autouse=True)
+def session():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    counter_table.create(engine)
+    with Session(engine) as session, \
+            patch("main.application_layer.adapters.counter_repository.db") as mock_db:
+        mock_db.engine = engine
+        mock_db.session = session
+        yield session
+
+def test_get_without_counter():
+    assert SQLAlchemyCounterRepository.get("whitelist") == 0
+
+def test_increment_returns_new_value():
+    assert SQLAlchemyCounterRepository.increment("whitelist") == 1
+    assert SQLAlchemyCounterRepository.increment("whitelist") == 2
+    assert SQLAlchemyCounterRepository.increment("other") == 1
+
+def test_get_reads_committed_value(session):
+    SQLAlchemyCounterRepository.increment("whitelist")
+    session.commit()
+
+    assert SQLAlchemyCounterRepository.get("whitelist") == 1
+
+def test_get_raises_exception_logs_and_raises(session, caplog):
+    counter_table.drop(session.get_bind())
+    with pytest.raises(Exception):
+        SQLAlchemyCounterRepository.get("whitelist")
+    assert "Error while trying to get Counter" in caplog.text
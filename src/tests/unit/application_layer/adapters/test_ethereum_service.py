@@ -1,5 +1,6 @@
+import os
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, PropertyMock, patch
 from main.application_layer.adapters.ethereum_service import EthereumService
 
 class TestEthereumService(unittest.TestCase):
@@ -16,6 +17,51 @@ class TestEthereumService(unittest.TestCase):
         self.mock_w3.eth.gas_price = 12345
         self.assertEqual(self.service.gas_price, 12345)
 
+    def test_block_number(self):
+        self.mock_w3.eth.block_number = 100
+        self.assertEqual(self.service.block_number, 100)
+
+    def test_hedged_reads(self):
+        service = EthereumService(self.mock_w3, hedge=True)
+        self.mock_w3.eth.get_transaction.return_value = {"hash": "0x1"}
+
+        self.assertEqual(service.get_transaction("0x1"), {"hash": "0x1"})
+
+        self.mock_w3.provider.hedging.assert_called_once()
+        self.mock_w3.provider.hedging.return_value.__enter__.assert_called_once()
+
+    def test_broadcast_raw_transactions(self):
+        service = EthereumService(self.mock_w3, broadcast=True)
+
+        service.send_raw_transaction(b"raw")
+
+        self.mock_w3.provider.broadcasting.return_value.__enter__.assert_called_once()
+        self.mock_w3.eth.send_raw_transaction.assert_called_once_with(b"raw")
+
+    def test_hedging_off_by_default(self):
+        self.service.get_transaction("0x1")
+
+        self.mock_w3.provider.hedging.assert_not_called()
+
+    def test_get_block_receipts(self):
+        self.mock_w3.eth.get_block_receipts.return_value = [{"status": 1}]
+        result = self.service.get_block_receipts(100)
+        self.assertEqual(result, [{"status": 1}])
+        self.mock_w3.eth.get_block_receipts.assert_called_once_with(100)
+
+    def test_chain_id_is_read_once(self):
+        chain_id = PropertyMock(return_value=11155111)
+        type(self.mock_w3.eth).chain_id = chain_id
+        self.assertEqual(self.service.chain_id, 11155111)
+        self.assertEqual(EthereumService(self.mock_w3).chain_id, 11155111)
+        chain_id.assert_called_once()
+
+    def test_fee_history(self):
+        self.mock_w3.eth.fee_history.return_value = {"baseFeePerGas": [1]}
+        result = self.service.fee_history(10, "latest", [50])
+        self.assertEqual(result, {"baseFeePerGas": [1]})
+        self.mock_w3.eth.fee_history.assert_called_once_with(10, "latest", [50])
+
     def test_create(self):
         mock_account = MagicMock()
         self.mock_w3.eth.account.create.return_value = mock_account
@@ -53,11 +99,23 @@ class TestEthereumService(unittest.TestCase):
         self.assertEqual(result, 123)
         self.mock_w3.to_wei.assert_called_once_with(1.23, "ether")
 
+    def test_get_balance(self):
+        self.mock_w3.eth.get_balance.return_value = 10
+        result = self.service.get_balance("0xabc")
+        self.assertEqual(result, 10)
+        self.mock_w3.eth.get_balance.assert_called_once_with("0xabc")
+
     def test_get_transaction_count(self):
         self.mock_w3.eth.get_transaction_count.return_value = 7
         result = self.service.get_transaction_count("0xabc")
         self.assertEqual(result, 7)
-        self.mock_w3.eth.get_transaction_count.assert_called_once_with("0xabc")
+        self.mock_w3.eth.get_transaction_count.assert_called_once_with("0xabc", "latest")
+
+    def test_get_transaction_count_pending(self):
+        self.mock_w3.eth.get_transaction_count.return_value = 8
+        result = self.service.get_transaction_count("0xabc", "pending")
+        self.assertEqual(result, 8)
+        self.mock_w3.eth.get_transaction_count.assert_called_once_with("0xabc", "pending")
 
     def test_contract(self):
         with patch.object(self.service, 'to_checksum_address', return_value="0xABC") as mock_checksum:
@@ -101,3 +159,262 @@ class TestEthereumService(unittest.TestCase):
         result = self.service.send_raw_transaction(tx)
         self.assertEqual(result, "raw_hash")
         self.mock_w3.eth.send_raw_transaction.assert_called_once_with(tx)
+
+
+class TestEthereumServiceBatch(unittest.TestCase):
+    """Batch requests against a real HTTPProvider and a stubbed node."""
+
+    ENDPOINT = "http://node.test"
+    TOKEN = "0x65aFADD39029741B3b8f0756952C74678c9cEC93"
+
+    def setUp(self):
+        from web3 import Web3
+        self.w3 = Web3(Web3.HTTPProvider(self.ENDPOINT))
+        self.service = EthereumService(self.w3)
+        self.batches = []
+
+    def node(self, results):
+        def respond(request, context):
+            body = request.json()
+            if isinstance(body, dict):
+                # eth_chainId pedido pelo middleware de validação
+                return {"jsonrpc": "2.0", "id": body["id"], "result": "0xaa36a7"}
+            self.batches.append(body)
+            return [dict(result, jsonrpc="2.0", id=call["id"]) for call, result in zip(body, results)]
+        return respond
+
+    def test_batch_returns_results_in_order_in_one_post(self):
+        import requests_mock
+        contract = self.w3.eth.contract(address=self.TOKEN, abi=[{
+            "name": "decimals", "outputs": [{"type": "uint8"}], "inputs": [],
+            "stateMutability": "view", "type": "function"}])
+
+        with requests_mock.Mocker() as mocker:
+            mocker.post(self.ENDPOINT, json=self.node([
+                {"result": "0xde0b6b3a7640000"},
+                {"result": "0x" + "00" * 31 + "06"},
+            ]))
+            result = self.service.batch([("get_balance", self.TOKEN), contract.functions.decimals()])
+
+        self.assertEqual(result, [10 ** 18, 6])
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual([call["method"] for call in self.batches[0]], ["eth_getBalance", "eth_call"])
+
+    def test_batch_keeps_per_call_errors(self):
+        import requests_mock
+        from web3.exceptions import TransactionNotFound, Web3RPCError
+
+        with requests_mock.Mocker() as mocker:
+            mocker.post(self.ENDPOINT, json=self.node([
+                {"result": None},
+                {"error": {"code": -32000, "message": "header not found"}},
+                {"result": "0x1"},
+            ]))
+            result = self.service.batch([
+                ("get_transaction", "0x" + "11" * 32),
+                ("get_balance", self.TOKEN),
+                ("get_transaction_count", self.TOKEN),
+            ])
+
+        self.assertIsInstance(result[0], TransactionNotFound)
+        self.assertIsInstance(result[1], Web3RPCError)
+        self.assertEqual(result[2], 1)
+
+    def test_batch_rejected_by_node_raises(self):
+        import requests_mock
+        from web3.exceptions import Web3RPCError
+
+        with requests_mock.Mocker() as mocker:
+            mocker.post(self.ENDPOINT, json={"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "batch too large"}})
+            with self.assertRaises(Web3RPCError):
+                self.service.batch([("get_balance", self.TOKEN)])
+
+
+class TestEthereumServiceChainCache(unittest.TestCase):
+    """Finalized data is read through the on-disk chain cache."""
+
+    ADDRESS = "0x65aFADD39029741B3b8f0756952C74678c9cEC93"
+    TX_HASH = "0x" + "11" * 32
+
+    def setUp(self):
+        import tempfile
+        from main.application_layer.adapters.chain_cache import ChainCache
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ChainCache(self.directory.name + "/chain-cache.db", max_bytes=1_000_000, finality_depth=64)
+        self.tx_block = 100
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def node(self):
+        from tests.unit.application_layer.adapters.json_rpc_stub import JsonRpcStub
+        return JsonRpcStub({
+            "eth_getTransactionByHash": lambda params: {"hash": params[0], "blockNumber": hex(self.tx_block)},
+            "eth_getBalance": lambda params: "0x1",
+            "eth_blockNumber": lambda params: hex(200),
+        })
+
+    def methods(self, node):
+        return [
+            [call["method"] for call in request] if isinstance(request, list) else request["method"]
+            for request in node.requests
+        ]
+
+    def test_batch_reads_finalized_data_from_cache(self):
+        from web3 import Web3
+        with self.node() as node:
+            service = EthereumService(Web3(Web3.HTTPProvider(node.url)), cache=self.cache)
+            first = service.batch([("get_transaction", self.TX_HASH), ("get_balance", self.ADDRESS)])
+            second = service.batch([("get_transaction", self.TX_HASH), ("get_balance", self.ADDRESS)])
+
+        self.assertEqual(first, second)
+        self.assertEqual(second[0]["blockNumber"], 100)
+        batches = [methods for methods in self.methods(node) if isinstance(methods, list)]
+        # O bloco atual vai junto no primeiro lote; no segundo só o saldo
+        self.assertEqual(batches, [
+            ["eth_getTransactionByHash", "eth_getBalance", "eth_blockNumber"],
+            ["eth_getBalance"],
+        ])
+
+    def test_recent_data_is_not_cached(self):
+        from web3 import Web3
+        self.tx_block = 190
+        with self.node() as node:
+            service = EthereumService(Web3(Web3.HTTPProvider(node.url)), cache=self.cache)
+            service.batch([("get_transaction", self.TX_HASH)])
+            service.batch([("get_transaction", self.TX_HASH)])
+
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_single_call_read_through(self):
+        from web3 import Web3
+        with self.node() as node:
+            service = EthereumService(Web3(Web3.HTTPProvider(node.url)), cache=self.cache)
+            service.get_transaction(self.TX_HASH)
+            service.get_transaction(self.TX_HASH)
+
+        self.assertEqual(self.methods(node).count("eth_getTransactionByHash"), 1)
+        self.assertEqual(self.methods(node).count("eth_blockNumber"), 1)
+
+    def test_pinned_call_is_cached(self):
+        mock_w3 = MagicMock()
+        type(mock_w3.eth).chain_id = PropertyMock(return_value=1)
+        contract_function = MagicMock(address=self.ADDRESS, fn_name="decimals")
+        contract_function._encode_transaction_data.return_value = "0x313ce567"
+        contract_function.call.return_value = 6
+        self.cache.observe_head(200)
+        service = EthereumService(mock_w3, cache=self.cache)
+
+        self.assertEqual(service.call(contract_function, 100), 6)
+        self.assertEqual(service.call(contract_function, 100), 6)
+        contract_function.call.assert_called_once_with(block_identifier=100)
+
+        service.call(contract_function, "latest")
+        self.assertEqual(contract_function.call.call_count, 2)
+
+
+class TestEthereumServiceMulticall(unittest.TestCase):
+    """Multicall3 aggregation against a stand-in node emulating aggregate3."""
+
+    TOKEN = "0x65aFADD39029741B3b8f0756952C74678c9cEC93"
+    OTHER_TOKEN = "0x1111111111111111111111111111111111111111"
+    ABI = [
+        {"name": "symbol", "outputs": [{"type": "string"}], "inputs": [],
+         "stateMutability": "view", "type": "function"},
+        {"name": "decimals", "outputs": [{"type": "uint8"}], "inputs": [],
+         "stateMutability": "view", "type": "function"},
+        {"name": "balanceOf", "outputs": [{"type": "uint256"}], "inputs": [{"name": "owner", "type": "address"}],
+         "stateMutability": "view", "type": "function"},
+    ]
+
+    def token(self, symbol, decimals):
+        from eth_abi import encode
+        from eth_utils import keccak
+
+        def respond(call_data):
+            selector = call_data[:4]
+            if selector == keccak(text="symbol()")[:4]:
+                return encode(["string"], [symbol])
+            if selector == keccak(text="decimals()")[:4]:
+                return encode(["uint8"], [decimals])
+            raise ValueError("execution reverted")
+        return respond
+
+    def node(self):
+        from tests.unit.application_layer.adapters.json_rpc_stub import JsonRpcStub, multicall3
+        return JsonRpcStub({"eth_call": multicall3({
+            self.TOKEN.lower(): self.token("TKN", 18),
+            self.OTHER_TOKEN.lower(): lambda call_data: b"",
+        })})
+
+    def test_multicall_decodes_results_in_one_eth_call(self):
+        from web3 import Web3
+        with self.node() as node:
+            w3 = Web3(Web3.HTTPProvider(node.url))
+            service = EthereumService(w3)
+            token = w3.eth.contract(address=self.TOKEN, abi=self.ABI)
+
+            result = service.multicall([token.functions.symbol(), token.functions.decimals()])
+
+        self.assertEqual(result, ["TKN", 18])
+        eth_calls = [call for request in node.requests if isinstance(request, list)
+                     for call in request if call["method"] == "eth_call"]
+        self.assertEqual(len(eth_calls), 1)
+
+    def test_failures_are_returned_per_call(self):
+        from web3 import Web3
+        from web3.exceptions import ContractLogicError
+        with self.node() as node:
+            w3 = Web3(Web3.HTTPProvider(node.url))
+            service = EthereumService(w3)
+            token = w3.eth.contract(address=self.TOKEN, abi=self.ABI)
+            no_code = w3.eth.contract(address=self.OTHER_TOKEN, abi=self.ABI)
+
+            result = service.multicall([
+                token.functions.balanceOf(self.TOKEN), token.functions.decimals(), no_code.functions.decimals()])
+
+        self.assertIsInstance(result[0], ContractLogicError)
+        self.assertEqual(result[1], 18)
+        self.assertIsInstance(result[2], Exception)
+
+    @patch("main.application_layer.adapters.ethereum_service.MULTICALL_CHUNK_SIZE", 2)
+    def test_chunks_share_one_batch(self):
+        from web3 import Web3
+        with self.node() as node:
+            w3 = Web3(Web3.HTTPProvider(node.url))
+            service = EthereumService(w3)
+            token = w3.eth.contract(address=self.TOKEN, abi=self.ABI)
+
+            result = service.multicall([token.functions.decimals()] * 5)
+
+        self.assertEqual(result, [18] * 5)
+        batches = [request for request in node.requests if isinstance(request, list)]
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(len(batches[0]), 3)
+
+    def test_empty(self):
+        self.assertEqual(EthereumService(MagicMock()).multicall([]), [])
+
+
+@unittest.skipUnless(os.environ.get("MULTICALL_TEST_RPC"), "set MULTICALL_TEST_RPC to a local chain with Multicall3")
+class TestEthereumServiceMulticallLocalChain(unittest.TestCase):
+    """Against a local chain (e.g. anvil) with Multicall3 at its usual address."""
+
+    ABI = [
+        {"name": "getChainId", "outputs": [{"type": "uint256"}], "inputs": [],
+         "stateMutability": "view", "type": "function"},
+        {"name": "getBlockNumber", "outputs": [{"type": "uint256"}], "inputs": [],
+         "stateMutability": "view", "type": "function"},
+    ]
+
+    def test_multicall(self):
+        from web3 import Web3
+        from main.application_layer.adapters.ethereum_service import MULTICALL3_ADDRESS
+        w3 = Web3(Web3.HTTPProvider(os.environ["MULTICALL_TEST_RPC"]))
+        multicall = w3.eth.contract(address=MULTICALL3_ADDRESS, abi=self.ABI)
+
+        chain_id, block_number = EthereumService(w3).multicall(
+            [multicall.functions.getChainId(), multicall.functions.getBlockNumber()])
+
+        self.assertEqual(chain_id, w3.eth.chain_id)
+        self.assertLessEqual(block_number, w3.eth.block_number)
@@ -0,0 +1,425 @@
+import socket
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+from web3 import Web3
+from web3.exceptions import Web3RPCError
+
+from main.application_layer.adapters.failover_provider import (
+    FailoverProvider, NoProviderAvailable, ProviderHealth, is_known_transaction_error, is_rejected,
+    never_delivered)
+from main.application_layer.adapters.http_provider import PooledHTTPProvider
+from main.application_layer.exceptions import RateLimitExceeded
+from main.application_layer.metrics import metrics
+from tests.unit.application_layer.adapters.json_rpc_stub import JsonRpcStub
+
+
+def block_number(value):
+    return {"eth_blockNumber": lambda params: hex(value), "eth_getTransactionCount": lambda params: hex(value)}
+
+
+def refused_url():
+    """URL of a local port nobody listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def failover(*stubs, **kwargs):
+    kwargs.setdefault("explore_rate", 0)
+    kwargs.setdefault("min_calls", 2)
+    providers = [PooledHTTPProvider(stub.url, retries=0, timeouts={"read": 0.2}) for stub in stubs]
+    return Web3(FailoverProvider(providers, **kwargs))
+
+
+class TestProviderHealth(unittest.TestCase):
+    def test_opens_on_error_rate(self):
+        health = ProviderHealth(window=4, min_calls=4, error_rate=0.5, cooldown=30)
+
+        self.assertFalse(health.record(True, 0.1))
+        self.assertFalse(health.record(False, 0.1))
+        self.assertFalse(health.record(True, 0.1))
+        self.assertTrue(health.record(False, 0.1))
+
+        self.assertTrue(health.is_open())
+        self.assertFalse(health.acquire())
+
+    def test_half_open_probe(self):
+        health = ProviderHealth(window=2, min_calls=1, error_rate=0.5, cooldown=0.01)
+        health.record(False, 0.1)
+        time.sleep(0.02)
+
+        self.assertFalse(health.is_open())
+        self.assertTrue(health.acquire())
+        # Só uma chamada de teste por vez
+        self.assertFalse(health.acquire())
+
+        health.record(True, 0.05)
+
+        self.assertEqual(health.state, "closed")
+        self.assertEqual(health.error_rate, 0)
+        self.assertEqual(health.latency, 0.05)
+
+    def test_failed_probe_reopens(self):
+        health = ProviderHealth(window=2, min_calls=1, error_rate=0.5, cooldown=0.01)
+        health.record(False, 0.1)
+        time.sleep(0.02)
+        health.acquire()
+
+        self.assertTrue(health.record(False, 0.1))
+        self.assertTrue(health.is_open())
+
+    def test_skipped_probe_is_given_back(self):
+        health = ProviderHealth(window=2, min_calls=1, error_rate=0.5, cooldown=0.01)
+        health.record(False, 0.1)
+        time.sleep(0.02)
+        health.acquire()
+
+        health.skip()
+
+        self.assertTrue(health.acquire())
+        self.assertEqual(health.state, "half-open")
+
+
+class TestFailoverProvider(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def test_fails_over_on_http_error(self):
+        with JsonRpcStub(block_number(1), status=503) as down, JsonRpcStub(block_number(2)) as up:
+            w3 = failover(down, up)
+
+            self.assertEqual(w3.eth.block_number, 2)
+
+        self.assertEqual(len(down.requests), 1)
+        self.assertEqual(metrics.counter("rpc.failovers"), 1)
+
+    def test_fails_over_on_timeout(self):
+        with JsonRpcStub(block_number(1), delay=0.5) as slow, JsonRpcStub(block_number(2)) as fast:
+            w3 = failover(slow, fast)
+
+            self.assertEqual(w3.eth.block_number, 2)
+
+    def test_json_rpc_errors_do_not_fail_over(self):
+        def fail(params):
+            raise ValueError("execution reverted")
+
+        with JsonRpcStub({"eth_blockNumber": fail}) as first, JsonRpcStub(block_number(2)) as second:
+            w3 = failover(first, second)
+
+            with self.assertRaises(Web3RPCError):
+                w3.eth.block_number
+
+        self.assertEqual(second.requests, [])
+
+    def test_breaker_skips_unhealthy_provider(self):
+        with JsonRpcStub(block_number(1), status=503) as down, JsonRpcStub(block_number(2)) as up:
+            w3 = failover(down, up, min_calls=2, cooldown=30)
+            for _ in range(5):
+                self.assertEqual(w3.eth.block_number, 2)
+
+        # Depois de abrir o circuito o nó não recebe mais chamadas
+        self.assertEqual(len(down.requests), 2)
+        self.assertEqual(metrics.counter(f"rpc.breaker_opened.{w3.provider.providers[0].host}"), 1)
+        self.assertEqual(metrics.snapshot()["gauges"]["rpc.providers"][w3.provider.providers[0].host]["state"], "open")
+
+    def test_every_circuit_open_is_last_resort(self):
+        with JsonRpcStub(block_number(1)) as only:
+            w3 = failover(only)
+            w3.provider.health[0].state = "open"
+            w3.provider.health[0].opened_at = time.monotonic()
+
+            self.assertEqual(w3.eth.block_number, 1)
+
+    def test_routes_to_fastest(self):
+        with JsonRpcStub(block_number(1), delay=0.05) as slow, JsonRpcStub(block_number(2)) as fast:
+            w3 = failover(slow, fast)
+            # Cada nó recebe uma chamada antes de ter latência conhecida
+            w3.eth.block_number
+            w3.provider.health[1].record(True, 0.001)
+
+            for _ in range(5):
+                self.assertEqual(w3.eth.block_number, 2)
+
+        self.assertEqual(len(slow.requests), 1)
+
+    def test_sticky_methods_stay_on_one_provider(self):
+        with JsonRpcStub(block_number(1)) as first, JsonRpcStub(block_number(2)) as second:
+            w3 = failover(first, second)
+            address = "0x65aFADD39029741B3b8f0756952C74678c9cEC93"
+            self.assertEqual(w3.eth.get_transaction_count(address, "pending"), 1)
+
+            # O segundo nó fica mais rápido, mas o nonce continua no primeiro
+            w3.provider.health[0].record(True, 1)
+            w3.provider.health[1].record(True, 0.001)
+
+            self.assertEqual(w3.eth.get_transaction_count(address, "pending"), 1)
+            self.assertEqual(w3.eth.block_number, 2)
+
+    def test_sticky_moves_when_circuit_opens(self):
+        with JsonRpcStub(block_number(1)) as first, JsonRpcStub(block_number(2)) as second:
+            w3 = failover(first, second)
+            address = "0x65aFADD39029741B3b8f0756952C74678c9cEC93"
+            w3.eth.get_transaction_count(address, "pending")
+            first.status = 503
+
+            for _ in range(3):
+                self.assertEqual(w3.eth.get_transaction_count(address, "pending"), 2)
+
+        self.assertEqual(w3.provider._sticky, 1)
+
+    @patch("main.application_layer.adapters.failover_provider.random.random")
+    def test_explores_other_providers(self, mock_random):
+        mock_random.return_value = 0
+        with JsonRpcStub(block_number(1)) as first, JsonRpcStub(block_number(2)) as second:
+            w3 = failover(first, second, explore_rate=0.05)
+
+            self.assertEqual(w3.eth.block_number, 2)
+
+    def test_batch_request(self):
+        with JsonRpcStub(block_number(1), status=503) as down, JsonRpcStub(block_number(2)) as up:
+            w3 = failover(down, up)
+            with w3.batch_requests() as batch:
+                batch.add(w3.eth.get_block_number())
+                batch.add(w3.eth.get_block_number())
+                result = batch.execute()
+
+        self.assertEqual(result, [2, 2])
+
+    def test_all_providers_down(self):
+        with JsonRpcStub(block_number(1), status=503) as first, JsonRpcStub(block_number(2), status=503) as second:
+            w3 = failover(first, second)
+
+            with self.assertRaises(requests.HTTPError):
+                w3.eth.block_number
+
+
+    def test_rate_limited_provider_is_not_a_failure(self):
+        with JsonRpcStub(block_number(1)) as throttled, JsonRpcStub(block_number(2)) as up:
+            w3 = failover(throttled, up)
+            limiter = MagicMock()
+            limiter.acquire.side_effect = RateLimitExceeded("RPC read budget exhausted")
+            w3.provider.providers[0].limiter = limiter
+
+            for _ in range(3):
+                self.assertEqual(w3.eth.block_number, 2)
+
+        host = w3.provider.providers[0].host
+        self.assertEqual(throttled.requests, [])
+        self.assertEqual(w3.provider.health[0].state, "closed")
+        self.assertEqual(w3.provider.health[0].error_rate, 0)
+        self.assertEqual(metrics.counter(f"rpc.rate_limited.{host}"), 3)
+        self.assertEqual(metrics.counter("rpc.failovers"), 0)
+
+    def test_every_provider_rate_limited(self):
+        with JsonRpcStub(block_number(1)) as first, JsonRpcStub(block_number(2)) as second:
+            w3 = failover(first, second)
+            for provider in w3.provider.providers:
+                provider.limiter = MagicMock()
+                provider.limiter.acquire.side_effect = RateLimitExceeded("RPC read budget exhausted")
+
+            with self.assertRaises(RateLimitExceeded) as raised:
+                w3.eth.block_number
+
+        self.assertTrue(never_delivered(raised.exception))
+
+    def test_possibly_delivered_error_wins_over_connection_refused(self):
+        with JsonRpcStub(block_number(1), delay=0.5) as slow:
+            providers = [PooledHTTPProvider(url, retries=0, timeouts={"read": 0.2})
+                         for url in (slow.url, refused_url())]
+            w3 = Web3(FailoverProvider(providers, explore_rate=0))
+
+            with self.assertRaises(requests.ReadTimeout) as raised:
+                w3.eth.block_number
+
+        self.assertFalse(never_delivered(raised.exception))
+
+
+class TestDelivery(unittest.TestCase):
+    def test_connection_refused_never_delivered(self):
+        provider = PooledHTTPProvider(refused_url(), retries=0)
+
+        with self.assertRaises(requests.ConnectionError) as raised:
+            Web3(provider).eth.block_number
+
+        self.assertTrue(never_delivered(raised.exception))
+
+    def test_ambiguous_errors(self):
+        self.assertTrue(never_delivered(NoProviderAvailable("No RPC provider available")))
+        self.assertTrue(never_delivered(requests.ConnectTimeout()))
+        self.assertFalse(never_delivered(requests.ReadTimeout()))
+        self.assertFalse(never_delivered(requests.ConnectionError("Connection reset by peer")))
+        self.assertFalse(never_delivered(ValueError("nonce too low")))
+
+    def test_known_transaction_error(self):
+        self.assertTrue(is_known_transaction_error(Web3RPCError("{'message': 'already known'}")))
+        self.assertFalse(is_known_transaction_error(Web3RPCError("{'message': 'nonce too low'}")))
+
+    def test_rejected_error(self):
+        self.assertTrue(is_rejected(Web3RPCError("{'message': 'nonce too low'}")))
+        self.assertTrue(is_rejected(Web3RPCError("{'message': 'insufficient funds for gas * price + value'}")))
+        self.assertFalse(is_rejected(Web3RPCError("{'message': 'already known'}")))
+        self.assertFalse(is_rejected(requests.ReadTimeout()))
+        self.assertFalse(is_rejected(requests.ConnectionError("Connection reset by peer")))
+
+
+class TestHedgedReads(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def test_hedges_slow_read(self):
+        with JsonRpcStub(block_number(1), delay=0.3) as slow, JsonRpcStub(block_number(2)) as fast:
+            w3 = failover(slow, fast, hedge_delay=0.02)
+            w3.provider.health[0].record(True, 0.001)
+            w3.provider.health[1].record(True, 0.002)
+
+            started = time.monotonic()
+            with w3.provider.hedging():
+                self.assertEqual(w3.eth.block_number, 2)
+            elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.2)
+        self.assertEqual(len(slow.requests), 1)
+        self.assertEqual(w3.provider.hedge_stats(), {
+            "calls": 1, "hedged": 1, "wins": 1, "hedge_rate": 1.0, "win_rate": 1.0})
+
+    def test_fast_answer_is_not_hedged(self):
+        with JsonRpcStub(block_number(1)) as first, JsonRpcStub(block_number(2)) as second:
+            w3 = failover(first, second, hedge_delay=1)
+
+            with w3.provider.hedging():
+                self.assertEqual(w3.eth.block_number, 1)
+
+        self.assertEqual(second.requests, [])
+        self.assertEqual(w3.provider.hedge_stats()["hedged"], 0)
+
+    @patch("main.application_layer.adapters.failover_provider.metrics.percentile")
+    def test_delay_from_latency_percentile(self, mock_percentile):
+        mock_percentile.return_value = 0.25
+        w3 = failover()
+
+        self.assertEqual(w3.provider._hedge_delay("eth_call"), 0.25)
+        mock_percentile.assert_called_once_with("rpc.latency.eth_call", 95)
+
+        mock_percentile.return_value = None
+        self.assertEqual(w3.provider._hedge_delay("eth_call"), 0.1)
+
+    def test_writes_are_not_hedged(self):
+        with JsonRpcStub({"eth_sendRawTransaction": lambda params: "0x" + "ab" * 32}, delay=0.1) as first, \
+                JsonRpcStub({"eth_sendRawTransaction": lambda params: "0x" + "cd" * 32}) as second:
+            w3 = failover(first, second, hedge_delay=0.01)
+
+            with w3.provider.hedging():
+                w3.provider.make_request("eth_sendRawTransaction", ["0x01"])
+
+        self.assertEqual(second.requests, [])
+
+    def test_hedging_off_by_default(self):
+        with JsonRpcStub(block_number(1), delay=0.1) as slow, JsonRpcStub(block_number(2)) as fast:
+            w3 = failover(slow, fast, hedge_delay=0.01)
+
+            self.assertEqual(w3.eth.block_number, 1)
+
+        self.assertEqual(fast.requests, [])
+
+    def test_failed_primary_goes_to_second(self):
+        with JsonRpcStub(block_number(1), status=503) as down, JsonRpcStub(block_number(2)) as up:
+            w3 = failover(down, up, hedge_delay=1)
+
+            with w3.provider.hedging():
+                self.assertEqual(w3.eth.block_number, 2)
+
+        self.assertEqual(w3.provider.hedge_stats()["hedged"], 0)
+
+
+class TestBroadcast(unittest.TestCase):
+    RAW_TX = "0x02f86b"
+    TX_HASH = Web3.keccak(hexstr=RAW_TX).to_0x_hex()
+
+    def setUp(self):
+        metrics.reset()
+
+    def node(self, delay=0, error=None):
+        def send(params):
+            if error:
+                raise ValueError(error)
+            return Web3.keccak(hexstr=params[0]).to_0x_hex()
+        return JsonRpcStub({"eth_sendRawTransaction": send}, delay=delay)
+
+    def wait_for(self, condition):
+        deadline = time.monotonic() + 2
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_sends_to_every_provider_and_first_accept_wins(self):
+        with self.node(delay=0.3) as slow, self.node() as fast:
+            w3 = failover(slow, fast)
+            w3.provider.providers[0].timeouts["write"] = 1
+
+            started = time.monotonic()
+            with w3.provider.broadcasting():
+                tx_hash = w3.eth.send_raw_transaction(self.RAW_TX)
+            elapsed = time.monotonic() - started
+            self.wait_for(lambda: metrics.counter(f"rpc.broadcast.accepted.{w3.provider.providers[0].host}"))
+
+        self.assertEqual(tx_hash.to_0x_hex(), self.TX_HASH)
+        self.assertLess(elapsed, 0.25)
+        self.assertEqual((len(slow.requests), len(fast.requests)), (1, 1))
+        timings = metrics.snapshot()["timings"]
+        for provider in w3.provider.providers:
+            self.assertEqual(timings[f"rpc.broadcast.latency.{provider.host}"]["count"], 1)
+
+    def test_known_transaction_counts_as_accepted(self):
+        with self.node(error="already known") as first, self.node(error="already known") as second:
+            w3 = failover(first, second)
+
+            with w3.provider.broadcasting():
+                tx_hash = w3.eth.send_raw_transaction(self.RAW_TX)
+            self.wait_for(lambda: sum(
+                metrics.counter(f"rpc.broadcast.duplicates.{provider.host}") for provider in w3.provider.providers) == 2)
+
+        self.assertEqual(tx_hash.to_0x_hex(), self.TX_HASH)
+
+    def test_rejection_is_raised_when_nobody_accepts(self):
+        from web3.exceptions import Web3RPCError
+        with self.node(error="nonce too low") as first, self.node(error="nonce too low") as second:
+            w3 = failover(first, second)
+
+            with w3.provider.broadcasting(), self.assertRaises(Web3RPCError):
+                w3.eth.send_raw_transaction(self.RAW_TX)
+
+    def test_unknown_outcome_wins_over_rejection(self):
+        with self.node(error="nonce too low") as first, JsonRpcStub({}, status=503) as down:
+            w3 = failover(first, down)
+
+            with w3.provider.broadcasting(), self.assertRaises(requests.HTTPError):
+                w3.eth.send_raw_transaction(self.RAW_TX)
+
+    def test_accept_wins_over_rejection(self):
+        with self.node(error="nonce too low") as first, self.node(delay=0.05) as second:
+            w3 = failover(first, second)
+
+            with w3.provider.broadcasting():
+                tx_hash = w3.eth.send_raw_transaction(self.RAW_TX)
+
+        self.assertEqual(tx_hash.to_0x_hex(), self.TX_HASH)
+
+    def test_provider_down_does_not_block_broadcast(self):
+        with self.node() as up, JsonRpcStub({}, status=503) as down:
+            w3 = failover(down, up)
+
+            with w3.provider.broadcasting():
+                tx_hash = w3.eth.send_raw_transaction(self.RAW_TX)
+
+        self.assertEqual(tx_hash.to_0x_hex(), self.TX_HASH)
+
+    def test_single_destination_without_broadcasting(self):
+        with self.node() as first, self.node() as second:
+            w3 = failover(first, second)
+
+            w3.eth.send_raw_transaction(self.RAW_TX)
+
+        self.assertEqual(len(first.requests) + len(second.requests), 1)
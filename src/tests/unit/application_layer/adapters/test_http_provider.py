@@ -0,0 +1,118 @@
+import socket
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+from web3 import Web3
+
+from main.application_layer.adapters.http_provider import PooledHTTPProvider, method_class
+from main.application_layer.metrics import metrics
+from main.config import TestingConfig
+from tests.unit.application_layer.adapters.json_rpc_stub import JsonRpcStub
+
+
+def unused_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestMethodClass(unittest.TestCase):
+    def test_classes(self):
+        self.assertEqual(method_class("eth_getBalance"), "read")
+        self.assertEqual(method_class("eth_sendRawTransaction"), "write")
+        self.assertEqual(method_class("eth_getBlockReceipts"), "heavy")
+        self.assertEqual(method_class("debug_traceTransaction"), "heavy")
+
+
+class TestPooledHTTPProvider(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def test_from_config(self):
+        provider = PooledHTTPProvider.from_config("http://node:8545", TestingConfig)
+
+        self.assertEqual(provider.connect_timeout, TestingConfig.RPC_CONNECT_TIMEOUT)
+        self.assertEqual(provider.timeouts["heavy"], TestingConfig.RPC_HEAVY_TIMEOUT)
+        self.assertEqual(provider.adapter._pool_maxsize, TestingConfig.RPC_POOL_SIZE)
+        self.assertEqual(provider.timeout(["eth_call", "eth_getLogs"]),
+                         (TestingConfig.RPC_CONNECT_TIMEOUT, TestingConfig.RPC_HEAVY_TIMEOUT))
+
+    def test_reuses_connections(self):
+        with JsonRpcStub({"eth_blockNumber": lambda params: "0x10"}) as stub:
+            w3 = Web3(PooledHTTPProvider(stub.url))
+            for _ in range(5):
+                self.assertEqual(w3.eth.block_number, 16)
+
+            stats = w3.provider.connection_stats()
+
+        self.assertEqual(stats, {"opened": 1, "requests": 5, "reused": 4})
+        self.assertEqual(metrics.snapshot()["gauges"][f"rpc.connections.{w3.provider.host}"], stats)
+        self.assertEqual(metrics.snapshot()["timings"]["rpc.latency.eth_blockNumber"]["count"], 5)
+
+    def test_keep_alive_disabled(self):
+        with JsonRpcStub({"eth_blockNumber": lambda params: "0x10"}) as stub:
+            w3 = Web3(PooledHTTPProvider(stub.url, keep_alive=False))
+            for _ in range(3):
+                w3.eth.block_number
+
+            stats = w3.provider.connection_stats()
+
+        self.assertEqual(stats, {"opened": 3, "requests": 3, "reused": 0})
+
+    def test_read_timeout_per_method_class(self):
+        with JsonRpcStub({"eth_blockNumber": lambda params: "0x10"}, delay=0.3) as stub:
+            w3 = Web3(PooledHTTPProvider(stub.url, timeouts={"read": 0.05}, retries=0))
+
+            started = time.monotonic()
+            with self.assertRaises(requests.ReadTimeout):
+                w3.eth.block_number
+            elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.3)
+
+    def test_batch_request(self):
+        with JsonRpcStub({"eth_blockNumber": lambda params: "0x10", "eth_gasPrice": lambda params: "0x2"}) as stub:
+            w3 = Web3(PooledHTTPProvider(stub.url))
+            with w3.batch_requests() as batch:
+                batch.add(w3.eth.get_block_number())
+                batch.add(w3.eth.gas_price)
+                result = batch.execute()
+
+        self.assertEqual(result, [16, 2])
+        self.assertEqual(metrics.snapshot()["timings"]["rpc.latency.batch"]["count"], 1)
+
+    @patch("main.application_layer.adapters.http_provider.time.sleep")
+    def test_retries_connection_errors(self, mock_sleep):
+        port = unused_port()
+        provider = PooledHTTPProvider(f"http://127.0.0.1:{port}", retries=2, retry_backoff=0.1)
+
+        with self.assertRaises(requests.ConnectionError):
+            provider.make_request("eth_blockNumber", [])
+
+        self.assertEqual(metrics.counter(f"rpc.retries.127.0.0.1:{port}"), 2)
+        self.assertEqual(metrics.counter(f"rpc.connection_errors.127.0.0.1:{port}"), 3)
+        self.assertEqual([call.args[0] for call in mock_sleep.call_args_list], [0.1, 0.2])
+
+    def test_write_not_retried_after_reset(self):
+        provider = PooledHTTPProvider("http://127.0.0.1:1", retries=2)
+
+        self.assertEqual(provider.retry_errors(["eth_sendRawTransaction"]), (requests.ConnectTimeout,))
+        self.assertEqual(provider.retry_errors(["eth_call"]), (requests.ConnectionError,))
+
+    @patch("main.application_layer.adapters.http_provider.TokenBucketLimiter")
+    def test_rate_limits_by_method_class(self, mock_limiter_cls):
+        limiter = mock_limiter_cls.return_value
+        with JsonRpcStub({"eth_blockNumber": lambda params: "0x10", "eth_sendRawTransaction": lambda params: "0x1"}) as stub:
+            w3 = Web3(PooledHTTPProvider(stub.url, limiter=limiter))
+            w3.eth.block_number
+            w3.provider.make_request("eth_sendRawTransaction", ["0x01"])
+            with w3.batch_requests() as batch:
+                batch.add(w3.eth.get_block_number())
+                batch.add(w3.eth.get_block_number())
+                batch.execute()
+
+        self.assertEqual(
+            [call.args + tuple(call.kwargs.values()) for call in limiter.acquire.call_args_list],
+            [("read", 1), ("write", 1), ("read", 2)])
@@ -0,0 +1,54 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from main.application_layer.adapters.nonce_repository import SQLAlchemyNonceRepository
+from main.application_layer.persistency.tables import nonce_table
+
+@pytest.fixture(autouse=True)
+def engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    nonce_table.create(engine)
+    with patch("main.application_layer.adapters.nonce_repository.db") as mock_db:
+        mock_db.engine = engine
+        yield engine
+
+def test_allocate_untracked_address_reads_chain_once():
+    chain_nonce = MagicMock(return_value=7)
+    assert SQLAlchemyNonceRepository.allocate("0xabc", chain_nonce) == 7
+    assert SQLAlchemyNonceRepository.allocate("0xabc", chain_nonce) == 8
+    chain_nonce.assert_called_once()
+    assert SQLAlchemyNonceRepository.get() == {"0xabc": 9}
+
+def test_allocate_reserves_consecutive_range():
+    assert SQLAlchemyNonceRepository.allocate("0xabc", lambda: 0, count=3) == 0
+    assert SQLAlchemyNonceRepository.allocate("0xabc", lambda: 0) == 3
+
+def test_release_last_allocation():
+    nonce = SQLAlchemyNonceRepository.allocate("0xabc", lambda: 4)
+    assert SQLAlchemyNonceRepository.release("0xabc", nonce) is True
+    assert SQLAlchemyNonceRepository.get() == {"0xabc": 4}
+
+def test_release_with_later_allocation_keeps_gap():
+    nonce = SQLAlchemyNonceRepository.allocate("0xabc", lambda: 4)
+    SQLAlchemyNonceRepository.allocate("0xabc", lambda: 4)
+    assert SQLAlchemyNonceRepository.release("0xabc", nonce) is False
+    assert SQLAlchemyNonceRepository.get() == {"0xabc": 6}
+
+def test_resync_only_moves_forward():
+    SQLAlchemyNonceRepository.allocate("0xabc", lambda: 10)
+    SQLAlchemyNonceRepository.resync("0xabc", chain_nonce=5)
+    assert SQLAlchemyNonceRepository.get() == {"0xabc": 11}
+    SQLAlchemyNonceRepository.resync("0xabc", chain_nonce=20)
+    assert SQLAlchemyNonceRepository.get() == {"0xabc": 20}
+
+def test_resync_force_and_untracked():
+    SQLAlchemyNonceRepository.allocate("0xabc", lambda: 10)
+    SQLAlchemyNonceRepository.resync("0xabc", chain_nonce=5, force=True)
+    SQLAlchemyNonceRepository.resync("0xdef", chain_nonce=2)
+    assert SQLAlchemyNonceRepository.get() == {"0xabc": 5, "0xdef": 2}
+
+def test_allocate_raises_exception_logs_and_raises(engine, caplog):
+    with pytest.raises(Exception):
+        SQLAlchemyNonceRepository.allocate("0xabc", MagicMock(side_effect=Exception("rpc down")))
+    assert "Error while trying to allocate Nonce" in caplog.text
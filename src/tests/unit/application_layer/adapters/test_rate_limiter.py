@@ -0,0 +1,119 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from main.application_layer.adapters.rate_limiter import TokenBucketLimiter
+from main.application_layer.exceptions import RateLimitExceeded
+from main.application_layer.metrics import metrics
+from main.config import TestingConfig
+
+
+def take(path, count, queue):
+    limiter = TokenBucketLimiter(path, rates={"read": 1, "write": 0}, bursts={"read": 10, "write": 1}, max_wait=0)
+    taken = 0
+    for _ in range(count):
+        try:
+            limiter.reserve("read")
+            taken += 1
+        except RateLimitExceeded:
+            pass
+    queue.put(taken)
+
+
+class TestTokenBucketLimiter(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "node.bucket")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def limiter(self, **kwargs):
+        kwargs.setdefault("max_wait", 1)
+        return TokenBucketLimiter(
+            self.path, rates={"read": 10, "write": 1}, bursts={"read": 5, "write": 1}, **kwargs)
+
+    def test_burst_then_queues(self):
+        limiter = self.limiter()
+
+        waits = [limiter.reserve("read") for _ in range(7)]
+
+        self.assertEqual(waits[:5], [0] * 5)
+        self.assertAlmostEqual(waits[5], 0.1, places=2)
+        self.assertAlmostEqual(waits[6], 0.2, places=2)
+
+    def test_buckets_are_separate(self):
+        limiter = self.limiter()
+        for _ in range(5):
+            limiter.reserve("read")
+
+        self.assertEqual(limiter.reserve("write"), 0)
+
+    def test_rejects_beyond_max_wait(self):
+        limiter = self.limiter(max_wait=0.05)
+        limiter.reserve("write")
+
+        with self.assertRaises(RateLimitExceeded):
+            limiter.reserve("write")
+        self.assertEqual(metrics.counter("rpc.rate_limit.rejected.write"), 1)
+
+    def test_cost_above_burst_waits_for_its_excess(self):
+        limiter = self.limiter(max_wait=0.05)
+
+        # 5 de burst e 10/s: um lote de 15 espera 1s pelos 10 excedentes
+        self.assertAlmostEqual(limiter.reserve("read", cost=15), 1, places=2)
+        with self.assertRaises(RateLimitExceeded):
+            limiter.reserve("read")
+
+    def test_refills_over_time(self):
+        limiter = self.limiter()
+        for _ in range(5):
+            limiter.reserve("read")
+        time.sleep(0.2)
+
+        self.assertEqual(limiter.reserve("read"), 0)
+
+    def test_zero_rate_disables_bucket(self):
+        limiter = TokenBucketLimiter(self.path, rates={"read": 0, "write": 0}, bursts={"read": 1, "write": 1}, max_wait=0)
+
+        self.assertEqual([limiter.reserve("read") for _ in range(10)], [0] * 10)
+
+    @patch("main.application_layer.adapters.rate_limiter.time.sleep")
+    def test_acquire_sleeps_and_records_wait(self, mock_sleep):
+        limiter = self.limiter()
+
+        limiter.acquire("read", cost=6)
+
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(mock_sleep.call_args.args[0], 0.1, places=2)
+        self.assertEqual(metrics.snapshot()["timings"]["rpc.rate_limit.wait.read"]["count"], 1)
+
+    def test_budget_shared_across_processes(self):
+        queue = multiprocessing.get_context("fork").Queue()
+        processes = [
+            multiprocessing.get_context("fork").Process(target=take, args=(self.path, 10, queue))
+            for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        # 10 de burst (mais o que recarregou durante o teste) para os 4 processos
+        taken = sum(queue.get() for _ in processes)
+        self.assertGreaterEqual(taken, 10)
+        self.assertLess(taken, 14)
+
+    def test_from_config(self):
+        with patch.object(TestingConfig, "RPC_RATE_LIMIT_PATH", self.directory.name):
+            limiter = TokenBucketLimiter.from_config(TestingConfig, "node:8545")
+
+        self.assertEqual(limiter.path, os.path.join(self.directory.name, "node:8545.bucket"))
+        self.assertEqual(limiter.max_wait, TestingConfig.RPC_RATE_LIMIT_MAX_WAIT)
+
+        with patch.object(TestingConfig, "RPC_RATE_LIMIT_PATH", ""):
+            self.assertIsNone(TokenBucketLimiter.from_config(TestingConfig, "node:8545"))
@@ -0,0 +1,274 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+import requests
+from web3 import Web3
+from web3.exceptions import Web3RPCError
+
+from main.application_layer.adapters.ethereum_service import EthereumService
+from main.application_layer.adapters.failover_provider import FailoverProvider
+from main.application_layer.adapters.http_provider import PooledHTTPProvider
+from main.application_layer.adapters.replay_provider import (
+    CassetteMiss, LatencyProfile, RecordReplayProvider, canonical_params, endpoint_cassette)
+from main.application_layer.metrics import metrics
+from main.config import TestingConfig
+from tests.unit.application_layer.adapters.json_rpc_stub import JsonRpcStub
+
+ADDRESS = "0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed"
+
+
+class TestLatencyProfile(unittest.TestCase):
+    def test_recorded_by_default(self):
+        self.assertEqual(LatencyProfile().latency("eth_blockNumber", 0.03), 0.03)
+
+    def test_method_overrides_default(self):
+        profile = LatencyProfile({
+            "default": {"latency": {"distribution": "fixed", "value": 0.01}},
+            "eth_getLogs": {"latency": {"distribution": "fixed", "value": 0.5}},
+        })
+
+        self.assertEqual(profile.latency("eth_blockNumber", 0), 0.01)
+        self.assertEqual(profile.latency("eth_getLogs", 0), 0.5)
+
+    def test_jitter_within_bounds(self):
+        profile = LatencyProfile({"default": {"latency": {"distribution": "fixed", "value": 0.1}, "jitter": 0.2}},
+                                 seed=1)
+
+        values = [profile.latency("eth_call", 0) for _ in range(200)]
+
+        self.assertTrue(all(0.08 <= value <= 0.12 for value in values))
+        self.assertGreater(len(set(values)), 1)
+
+    def test_seed_is_reproducible(self):
+        settings = {"default": {"latency": {"distribution": "lognormal", "median": 0.05, "sigma": 0.5}}}
+
+        first = [LatencyProfile(settings, seed=7).latency("eth_call", 0) for _ in range(3)]
+        second = [LatencyProfile(settings, seed=7).latency("eth_call", 0) for _ in range(3)]
+
+        self.assertEqual(first, second)
+
+    def test_endpoint_overrides_from_config(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.json")
+            with open(path, "w") as profile_file:
+                json.dump({
+                    "default": {"latency": {"distribution": "fixed", "value": 0.01}},
+                    "endpoints": {"1": {"default": {"latency": {"distribution": "fixed", "value": 0.3}}}},
+                }, profile_file)
+
+            class Config(TestingConfig):
+                RPC_REPLAY_PROFILE = path
+
+            self.assertEqual(LatencyProfile.from_config(Config, 0).latency("eth_call", 0), 0.01)
+            self.assertEqual(LatencyProfile.from_config(Config, 1).latency("eth_call", 0), 0.3)
+
+    def test_unknown_distribution(self):
+        profile = LatencyProfile({"default": {"latency": {"distribution": "pareto"}}})
+
+        with self.assertRaises(ValueError):
+            profile.latency("eth_call", 0)
+
+
+class TestRecordReplayProvider(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cassette = os.path.join(self.directory.name, "rpc.jsonl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record(self, methods, calls):
+        with JsonRpcStub(methods) as stub:
+            provider = RecordReplayProvider(self.cassette, mode="record", provider=PooledHTTPProvider(stub.url))
+            w3 = Web3(provider)
+            return [call(w3) for call in calls]
+
+    def replay(self, profile=None):
+        return Web3(RecordReplayProvider(self.cassette, profile=profile))
+
+    def test_replays_offline(self):
+        recorded = self.record(
+            {"eth_blockNumber": lambda params: "0x10", "eth_getBalance": lambda params: "0x64"},
+            [lambda w3: w3.eth.block_number, lambda w3: w3.eth.get_balance(ADDRESS, "latest")])
+
+        w3 = self.replay()
+
+        self.assertEqual(recorded, [16, 100])
+        self.assertEqual(w3.eth.block_number, 16)
+        self.assertEqual(w3.eth.get_balance(ADDRESS, "latest"), 100)
+
+    def test_cassette_lines(self):
+        self.record({"eth_blockNumber": lambda params: "0x10"}, [lambda w3: w3.eth.block_number])
+
+        with open(self.cassette) as cassette:
+            entries = [json.loads(line) for line in cassette]
+
+        entry = next(entry for entry in entries if entry["method"] == "eth_blockNumber")
+        self.assertEqual(entry["params"], [])
+        self.assertEqual(entry["response"], {"result": "0x10"})
+        self.assertGreaterEqual(entry["latency"], 0)
+
+    def test_repeated_requests_replay_in_order(self):
+        heads = iter(["0x1", "0x2"])
+        self.record({"eth_blockNumber": lambda params: next(heads)},
+                    [lambda w3: w3.eth.block_number, lambda w3: w3.eth.block_number])
+
+        w3 = self.replay()
+
+        # A última resposta se repete
+        self.assertEqual([w3.eth.block_number for _ in range(3)], [1, 2, 2])
+
+    def test_miss(self):
+        self.record({"eth_blockNumber": lambda params: "0x10"}, [lambda w3: w3.eth.block_number])
+
+        with self.assertRaises(CassetteMiss):
+            self.replay().eth.get_balance(ADDRESS, "latest")
+
+    def test_recorded_errors_replay(self):
+        def failing(params):
+            raise ValueError("execution reverted")
+
+        self.record({"eth_getBalance": failing}, [lambda w3: self.assertRaises(Web3RPCError, w3.eth.get_balance,
+                                                                               ADDRESS, "latest")])
+
+        with self.assertRaises(Web3RPCError):
+            self.replay().eth.get_balance(ADDRESS, "latest")
+
+    def test_fixed_latency(self):
+        self.record({"eth_blockNumber": lambda params: "0x10"}, [lambda w3: w3.eth.block_number])
+        w3 = self.replay(LatencyProfile({"eth_blockNumber": {"latency": {"distribution": "fixed", "value": 0.2}}}))
+
+        started = time.monotonic()
+        w3.eth.block_number
+        elapsed = time.monotonic() - started
+
+        self.assertGreaterEqual(elapsed, 0.2)
+        self.assertLess(elapsed, 0.4)
+
+    def test_injected_errors(self):
+        self.record({"eth_blockNumber": lambda params: "0x10"}, [lambda w3: w3.eth.block_number])
+
+        expected = {
+            "timeout": requests.ReadTimeout,
+            "connection": requests.ConnectionError,
+            "http": requests.HTTPError,
+            "rpc": Web3RPCError,
+        }
+        for kind, exception in expected.items():
+            with self.subTest(kind=kind):
+                w3 = self.replay(LatencyProfile({"default": {"errors": {"rate": 1, "kind": kind}}}))
+
+                with self.assertRaises(exception):
+                    w3.eth.block_number
+
+    def test_batch(self):
+        tx_hash = "0x" + "ab" * 32
+        transaction = {
+            "hash": tx_hash, "blockNumber": "0x5", "from": ADDRESS, "to": ADDRESS, "value": "0x1",
+            "nonce": "0x0", "gas": "0x5208", "gasPrice": "0x1", "input": "0x",
+        }
+        methods = {"eth_blockNumber": lambda params: "0x10", "eth_getTransactionByHash": lambda params: transaction}
+        self.record(methods, [lambda w3: EthereumService(w3).batch([
+            ("get_block_number",), ("get_transaction", tx_hash)])])
+
+        w3 = self.replay(LatencyProfile({
+            "eth_blockNumber": {"latency": {"distribution": "fixed", "value": 0.05}},
+            "eth_getTransactionByHash": {"latency": {"distribution": "fixed", "value": 0.15}},
+        }))
+
+        started = time.monotonic()
+        block, replayed = EthereumService(w3).batch([("get_block_number",), ("get_transaction", tx_hash)])
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(block, 16)
+        self.assertEqual(replayed["value"], 1)
+        # Um round trip: vale a latência da chamada mais lenta
+        self.assertGreaterEqual(elapsed, 0.15)
+        self.assertLess(elapsed, 0.2 + 0.05)
+
+    def test_record_needs_provider(self):
+        with self.assertRaises(ValueError):
+            RecordReplayProvider(self.cassette, mode="record")
+
+    def test_canonical_params(self):
+        self.assertEqual(canonical_params([ADDRESS, "latest"]), canonical_params([ADDRESS.lower(), "latest"]))
+        self.assertEqual(canonical_params(None), "[]")
+
+    def test_endpoint_cassette(self):
+        self.assertEqual(endpoint_cassette("cassettes/rpc.jsonl", 0, 1), "cassettes/rpc.jsonl")
+        self.assertEqual(endpoint_cassette("cassettes/rpc.jsonl", 1, 2), "cassettes/rpc.1.jsonl")
+
+
+class TestReplayBehindFailover(unittest.TestCase):
+    """Each endpoint replays its own cassette inside the FailoverProvider."""
+
+    def setUp(self):
+        metrics.reset()
+        self.directory = tempfile.TemporaryDirectory()
+        self.cassette = os.path.join(self.directory.name, "rpc.jsonl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def config(self, mode, profile=None):
+        profile_path = ""
+        if profile is not None:
+            profile_path = os.path.join(self.directory.name, "profile.json")
+            with open(profile_path, "w") as profile_file:
+                json.dump(profile, profile_file)
+
+        class Config(TestingConfig):
+            RPC_CASSETTE_MODE = mode
+            RPC_CASSETTE = self.cassette
+            RPC_REPLAY_PROFILE = profile_path
+            RPC_EXPLORE_RATE = 0
+            RPC_HEDGE_DELAY = 0.02
+            RPC_RETRIES = 0
+
+        return Config
+
+    def record(self):
+        with JsonRpcStub({"eth_blockNumber": lambda params: "0x1"}) as first, \
+                JsonRpcStub({"eth_blockNumber": lambda params: "0x2"}) as second:
+            provider = FailoverProvider.from_config([first.url, second.url], self.config("record"))
+            # Cada endpoint grava a sua resposta
+            for index in range(2):
+                provider.providers[index].make_request("eth_blockNumber", [])
+
+    def replay(self, profile):
+        return FailoverProvider.from_config([None, None], self.config("replay", profile))
+
+    def test_endpoint_cassettes(self):
+        self.record()
+
+        provider = self.replay({})
+
+        self.assertTrue(all(isinstance(endpoint, RecordReplayProvider) for endpoint in provider.providers))
+        self.assertEqual([endpoint.cassette for endpoint in provider.providers],
+                         [endpoint_cassette(self.cassette, index, 2) for index in range(2)])
+
+    def test_hedges_slow_endpoint(self):
+        self.record()
+        provider = self.replay({"endpoints": {
+            "0": {"default": {"latency": {"distribution": "fixed", "value": 0.3}}},
+            "1": {"default": {"latency": {"distribution": "fixed", "value": 0.01}}},
+        }})
+        ethereum_service = EthereumService(Web3(provider), hedge=True)
+
+        started = time.monotonic()
+        block = ethereum_service.block_number
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(block, 2)
+        self.assertLess(elapsed, 0.2)
+        self.assertEqual(provider.hedge_stats()["wins"], 1)
+
+    def test_injected_timeout_fails_over(self):
+        self.record()
+        provider = self.replay({"endpoints": {"0": {"default": {"errors": {"rate": 1, "kind": "timeout"}}}}})
+
+        self.assertEqual(Web3(provider).eth.block_number, 2)
+        self.assertEqual(provider.health[0].error_rate, 1)
@@ -0,0 +1,34 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from main.application_layer.adapters.token_repository import SQLAlchemyTokenRepository
+from main.application_layer.persistency.tables import token_table
+from main.domain_layer.models.token import Token
+
+@pytest.fixture(autouse=True)
+def engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    token_table.create(engine)
+    with patch("main.application_layer.adapters.token_repository.db") as mock_db:
+        mock_db.engine = engine
+        yield engine
+
+def test_create_and_get_by_chain():
+    token = SQLAlchemyTokenRepository.create(11155111, "0xabc", "TKN", 18)
+    SQLAlchemyTokenRepository.create(1, "0xabc", "MAIN", 6)
+
+    assert token == Token(11155111, "0xabc", "TKN", 18)
+    assert SQLAlchemyTokenRepository.get(11155111) == [token]
+
+def test_create_existing_returns_stored_token():
+    SQLAlchemyTokenRepository.create(1, "0xabc", "TKN", 18)
+
+    assert SQLAlchemyTokenRepository.create(1, "0xabc", "OTHER", 6) == Token(1, "0xabc", "TKN", 18)
+    assert len(SQLAlchemyTokenRepository.get(1)) == 1
+
+def test_get_raises_exception_logs_and_raises(engine, caplog):
+    token_table.drop(engine)
+    with pytest.raises(Exception):
+        SQLAlchemyTokenRepository.get(1)
+    assert "Error while trying to get Tokens" in caplog.text
@@ -105,4 +105,51 @@ def test_create_exception(mock_db_session, mock_transaction_table):
     mock_transaction_table.insert.return_value.values.side_effect = Exception("Insert error")
     with pytest.raises(Exception) as excinfo:
         SQLAlchemyTransactionRepository.create("hash4", "asset4", "address4", 200.0)
-    assert "Insert error" in str(excinfo.value)
\ No newline at end of file
+    assert "Insert error" in str(excinfo.value)
+
+
+def test_get_registered_hashes_single_query(mock_db_session):
+    mock_db_session.scalars.return_value.all.return_value = ["0x1"]
+
+    assert SQLAlchemyTransactionRepository.get_registered_hashes(["0x1", "0x2"]) == {"0x1"}
+    mock_db_session.scalars.assert_called_once()
+
+def test_get_registered_hashes_empty(mock_db_session):
+    assert SQLAlchemyTransactionRepository.get_registered_hashes([]) == set()
+    mock_db_session.scalars.assert_not_called()
+
+def test_create_many_single_insert(mock_db_session):
+    rows = [
+        {"tx_hash": "0x1", "asset": "ETH", "to_address": "0xa", "value": "1"},
+        {"tx_hash": "0x2", "asset": "USDC", "to_address": "0xb", "value": "2"},
+    ]
+    SQLAlchemyTransactionRepository.create_many(rows)
+    mock_db_session.execute.assert_called_once()
+    mock_db_session.flush.assert_called_once()
+
+def test_create_many_exception(mock_db_session):
+    mock_db_session.execute.side_effect = Exception("DB error")
+    with pytest.raises(Exception) as exc:
+        SQLAlchemyTransactionRepository.create_many([{"tx_hash": "0x1", "asset": "ETH", "to_address": "0xa", "value": "1"}])
+    assert "DB error" in str(exc.value)
+
+def test_create_each_isolates_rejected_groups():
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.orm import Session
+    from main.application_layer.persistency.tables import transaction_table
+
+    engine = create_engine("sqlite://")
+    transaction_table.create(engine)
+    with Session(engine) as session, \
+            patch("main.application_layer.adapters.transaction_repository.db") as mock_db:
+        mock_db.session = session
+        rejected = SQLAlchemyTransactionRepository.create_each({
+            "0x1": [{"tx_hash": "0x1", "asset": "ETH", "to_address": "0xa", "value": "1"}],
+            "0x2": [{"tx_hash": "0x2", "asset": "ETH", "to_address": "0xa", "value": "1"},
+                    {"tx_hash": "0x2", "asset": "USDC", "to_address": "0xb", "value": "2"}],
+            "0x3": [{"tx_hash": "0x3", "asset": "ETH", "to_address": "0xc", "value": "3"}],
+        })
+        session.commit()
+
+        assert rejected == {"0x2"}
+        assert set(session.scalars(select(transaction_table.c.tx_hash)).all()) == {"0x1", "0x3"}
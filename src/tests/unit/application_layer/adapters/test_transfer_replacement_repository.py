@@ -0,0 +1,60 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from uuid import uuid4
+from main.application_layer.adapters.transfer_replacement_repository import SQLAlchemyTransferReplacementRepository
+
+@pytest.fixture
+def mock_db_session():
+    with patch("main.application_layer.adapters.transfer_replacement_repository.db") as mock_db:
+        yield mock_db
+
+@pytest.fixture
+def mock_replacement_factory():
+    with patch("main.application_layer.adapters.transfer_replacement_repository.TransferReplacementFactory") as mock_factory:
+        yield mock_factory
+
+def test_get_by_transfer(mock_db_session, mock_replacement_factory):
+    row = MagicMock(uuid=uuid4(), transfer_uuid=uuid4(), tx_hash="0xbump", replaced_tx_hash="0xstuck",
+                    max_fee_per_gas=1125, max_priority_fee_per_gas=113, block=20)
+    mock_db_session.session.query.return_value.filter.return_value.order_by.return_value.all.return_value = [row]
+    mock_replacement_factory.return_value.create_transfer_replacement.return_value = "replacement_obj"
+
+    assert SQLAlchemyTransferReplacementRepository.get_by_transfer(row.transfer_uuid) == ["replacement_obj"]
+    mock_replacement_factory.assert_called_once_with(
+        uuid=row.uuid,
+        transfer_uuid=row.transfer_uuid,
+        tx_hash="0xbump",
+        replaced_tx_hash="0xstuck",
+        max_fee_per_gas=1125,
+        max_priority_fee_per_gas=113,
+        block=20,
+    )
+
+def test_get_replaced_hashes(mock_db_session):
+    transfer_uuid = uuid4()
+    mock_db_session.session.query.return_value.join.return_value.filter.return_value.all.return_value = [
+        ("0xstuck", transfer_uuid)
+    ]
+    assert SQLAlchemyTransferReplacementRepository.get_replaced_hashes("sent") == [("0xstuck", transfer_uuid)]
+
+def test_create_many_inserts_one_row_per_transfer(mock_db_session):
+    transfer_uuids = [uuid4(), uuid4()]
+
+    result = SQLAlchemyTransferReplacementRepository.create_many(
+        transfer_uuids, "0xbump", "0xstuck", 1125, 113, 20)
+
+    assert len(result) == 2
+    mock_db_session.session.execute.assert_called_once()
+    mock_db_session.session.flush.assert_called_once()
+
+def test_create_many_raises(mock_db_session):
+    mock_db_session.session.execute.side_effect = Exception("DB error")
+    with pytest.raises(Exception):
+        SQLAlchemyTransferReplacementRepository.create_many([uuid4()], "0xbump", "0xstuck", 1125, 113, 20)
+
+def test_delete_by_hash(mock_db_session):
+    SQLAlchemyTransferReplacementRepository.delete("0xbump")
+
+    statement = mock_db_session.session.execute.call_args.args[0]
+    assert statement.compile().params == {"tx_hash_1": "0xbump"}
+    mock_db_session.session.flush.assert_called_once()
@@ -60,6 +60,47 @@ def test_get_transfer_by_uuid(mock_db_session, mock_transfer_table, mock_transfe
     assert result == "transfer_obj"
     mock_transfer_factory.assert_called_once()
 
+def test_get_transfer_by_uuid_not_found(mock_db_session, mock_transfer_table, mock_transfer_factory):
+    mock_db_session.session.query.return_value.filter.return_value.first.return_value = None
+
+    result = SQLAlchemyTransferRepository.get(uuid=uuid4())
+    assert result is None
+    mock_transfer_factory.assert_not_called()
+
+def test_get_by_status(mock_db_session, mock_transfer_table, mock_transfer_factory):
+    transfer_row = make_transfer_row()
+    mock_db_session.session.query.return_value.filter.return_value.all.return_value = [transfer_row]
+    mock_transfer_factory.return_value.create_transfer.return_value = "transfer_obj"
+
+    result = SQLAlchemyTransferRepository.get_by_status(status="sent")
+    assert result == ["transfer_obj"]
+    mock_transfer_factory.assert_called_once()
+
+def test_get_in_flight(mock_db_session, mock_transfer_table):
+    query = mock_db_session.session.query.return_value
+    # Uma linha por transação: o multi-send de USDC soma o gas uma vez
+    query.filter.return_value.group_by.return_value.all.return_value = [
+        ("0xfrom", "ETH", 1, 1, 500), ("0xfrom", "ETH", 1, 2, 400), ("0xfrom", "USDC", 3, 10, 250),
+        ("0xother", "ETH", 1, 1, 100)]
+
+    assert SQLAlchemyTransferRepository.get_in_flight() == {
+        "0xfrom": {"count": 5, "value": {"ETH": 3, "USDC": 10}, "gas_price": 1150},
+        "0xother": {"count": 1, "value": {"ETH": 1}, "gas_price": 100},
+    }
+    assert mock_transfer_table.c.tx_hash in query.filter.return_value.group_by.call_args.args
+
+def test_create_many_single_insert(mock_db_session, mock_transfer_table):
+    batch_uuid = uuid4()
+    rows = [{"tx_hash": "0x1"}, {"tx_hash": "0x2"}]
+
+    result = SQLAlchemyTransferRepository.create_many(transfers=rows, batch_uuid=batch_uuid)
+
+    assert len(result) == 2
+    mock_db_session.session.execute.assert_called_once()
+    inserted = mock_transfer_table.insert.return_value.values.call_args.args[0]
+    assert [row["uuid"] for row in inserted] == result
+    assert all(row["batch_uuid"] == batch_uuid for row in inserted)
+
 def test_create_transfer_success(mock_db_session, mock_transfer_table, mock_transfer_factory):
     inserted_uuid = uuid4()
     mock_cursor = MagicMock()
@@ -126,4 +167,40 @@ def test_create_raises_exception_logs_and_raises(mock_db_session, mock_transfer_
             gas_used=21000,
             gas_price=100
         )
-    assert "Error while trying to create Transaction" in caplog.text
\ No newline at end of file
+    assert "Error while trying to create Transaction" in caplog.text
+def test_mark_sent_block(mock_db_session, mock_transfer_table):
+    mock_db_session.session.execute.return_value.rowcount = 2
+    assert SQLAlchemyTransferRepository.mark_sent_block(20) == 2
+    mock_db_session.session.flush.assert_called_once()
+
+def test_get_stuck(mock_db_session, mock_transfer_table, mock_transfer_factory):
+    mock_transfer_table.c.sent_block.__le__ = MagicMock(return_value=True)
+    mock_db_session.session.query.return_value.filter.return_value.all.return_value = [make_transfer_row()]
+    mock_transfer_factory.return_value.create_transfer.return_value = "transfer_obj"
+
+    assert SQLAlchemyTransferRepository.get_stuck(15) == ["transfer_obj"]
+
+def test_update_replacement(mock_db_session, mock_transfer_table):
+    SQLAlchemyTransferRepository.update_replacement([uuid4()], "0xbump", 1125, 20)
+    mock_transfer_table.update.return_value.values.assert_called_once_with(
+        tx_hash="0xbump", gas_price=1125, sent_block=20)
+    mock_db_session.session.flush.assert_called_once()
+
+def test_update_approval(mock_db_session, mock_transfer_table):
+    SQLAlchemyTransferRepository.update_approval([uuid4()], "0xbump", 20)
+    mock_transfer_table.update.return_value.values.assert_called_once_with(
+        approval_tx_hash="0xbump", sent_block=20)
+    mock_db_session.session.flush.assert_called_once()
+
+def test_get_holders(mock_db_session, mock_transfer_table):
+    mock_db_session.session.query.return_value.filter.return_value.distinct.return_value.all.return_value = [
+        MagicMock(to_address="0xa")
+    ]
+    assert SQLAlchemyTransferRepository.get_holders("USDC", ["0xa", "0xb"]) == {"0xa"}
+
+def test_get_gas_used(mock_db_session, mock_transfer_table):
+    mock_db_session.session.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [
+        MagicMock(gas_used=51000), MagicMock(gas_used=52000)
+    ]
+    assert SQLAlchemyTransferRepository.get_gas_used("USDC", "fresh", 200) == [51000, 52000]
+    mock_db_session.session.query.return_value.filter.return_value.order_by.return_value.limit.assert_called_once_with(200)
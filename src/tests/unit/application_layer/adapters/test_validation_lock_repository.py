@@ -0,0 +1,72 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from main.application_layer.adapters.validation_lock_repository import SQLAlchemyValidationLockRepository
+from main.application_layer.persistency.tables import validation_lock_table
+
+@pytest.fixture(autouse=True)
+def engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    validation_lock_table.create(engine)
+    with patch("main.application_layer.adapters.validation_lock_repository.db") as mock_db:
+        mock_db.engine = engine
+        yield engine
+
+def acquire(tx_hash, owner, timeout=30, result_ttl=5):
+    return SQLAlchemyValidationLockRepository.acquire(tx_hash, owner, timeout=timeout, result_ttl=result_ttl)
+
+def age(engine, **columns):
+    past = datetime.now(timezone.utc) - timedelta(seconds=60)
+    with engine.begin() as conn:
+        conn.execute(validation_lock_table.update().values(**{column: past for column in columns}))
+
+def test_only_one_owner_acquires():
+    assert acquire("0xABC", "worker-1") is True
+    assert acquire("0xabc", "worker-2") is False
+
+    lock = SQLAlchemyValidationLockRepository.get("0xabc")
+    assert lock.owner == "worker-1"
+    assert lock.result is None
+
+def test_complete_shares_result():
+    acquire("0xabc", "worker-1")
+
+    assert SQLAlchemyValidationLockRepository.complete("0xabc", "worker-1", {"valid": True, "transfers": []})
+    assert SQLAlchemyValidationLockRepository.get("0xABC").result == {"valid": True, "transfers": []}
+
+def test_complete_by_other_owner_is_ignored():
+    acquire("0xabc", "worker-1")
+
+    assert SQLAlchemyValidationLockRepository.complete("0xabc", "worker-2", {"valid": True}) is False
+    assert SQLAlchemyValidationLockRepository.get("0xabc").result is None
+
+def test_release_lets_another_owner_acquire():
+    acquire("0xabc", "worker-1")
+    SQLAlchemyValidationLockRepository.release("0xabc", "worker-1")
+
+    assert SQLAlchemyValidationLockRepository.get("0xabc") is None
+    assert acquire("0xabc", "worker-2") is True
+
+def test_stale_claim_is_taken_over(engine):
+    acquire("0xabc", "worker-1")
+    age(engine, acquired_at=True)
+
+    assert acquire("0xabc", "worker-2") is True
+    assert SQLAlchemyValidationLockRepository.get("0xabc").owner == "worker-2"
+
+def test_expired_result_is_dropped(engine):
+    acquire("0xabc", "worker-1")
+    SQLAlchemyValidationLockRepository.complete("0xabc", "worker-1", {"valid": False})
+    assert acquire("0xabc", "worker-2") is False
+
+    age(engine, completed_at=True)
+
+    assert acquire("0xabc", "worker-2") is True
+
+def test_get_raises_exception_logs_and_raises(engine, caplog):
+    validation_lock_table.drop(engine)
+    with pytest.raises(Exception):
+        SQLAlchemyValidationLockRepository.get("0xabc")
+    assert "Error while trying to get Validation Lock" in caplog.text
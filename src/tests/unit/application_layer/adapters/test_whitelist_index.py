@@ -0,0 +1,242 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from main.application_layer.adapters import whitelist_index as whitelist_index_module
+from main.application_layer.adapters.whitelist_index import (
+    PENDING_KEY, WhitelistIndex, address_key, get_whitelist_index)
+
+ADDRESS = "0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed"
+OTHER = "0xfB6916095ca1df60bB79Ce92cE3Ea74c37c5d359"
+
+
+def addresses(count):
+    return ["0x" + index.to_bytes(20, "big").hex() for index in range(1, count + 1)]
+
+
+class TestWhitelistIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "whitelist.idx")
+        self.index = WhitelistIndex(self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_address_key(self):
+        self.assertEqual(address_key(ADDRESS), address_key(ADDRESS.lower()))
+        self.assertEqual(len(address_key(ADDRESS)), 20)
+        self.assertIsNone(address_key("0x1234"))
+        self.assertIsNone(address_key("0xzz" + "00" * 19))
+
+    def test_missing_index_contains_nothing(self):
+        self.assertFalse(self.index.exists())
+        self.assertFalse(self.index.contains(ADDRESS))
+
+    def test_rebuild_and_contains(self):
+        entries = addresses(1000)
+        self.index.rebuild(entries + [ADDRESS])
+
+        self.assertTrue(all(self.index.contains(address) for address in entries))
+        self.assertTrue(self.index.contains(ADDRESS.lower()))
+        self.assertFalse(self.index.contains(OTHER))
+        self.assertFalse(self.index.contains("not an address"))
+        self.assertEqual(os.path.getsize(self.path), 20 + 1001 * 20)
+
+    def test_empty_index(self):
+        self.index.rebuild([])
+
+        self.assertTrue(self.index.exists())
+        self.assertFalse(self.index.contains(ADDRESS))
+        self.assertEqual(self.index.stats(), {"entries": 0})
+
+    def test_add_merges_and_deduplicates(self):
+        self.index.rebuild(addresses(10))
+
+        self.assertTrue(self.index.add([ADDRESS, ADDRESS.lower(), addresses(1)[0]]))
+
+        self.assertTrue(self.index.contains(ADDRESS))
+        self.assertEqual(self.index.stats(), {"entries": 11})
+
+    def test_every_write_bumps_version(self):
+        self.assertIsNone(self.index.version())
+
+        self.index.rebuild([ADDRESS])
+        reader = WhitelistIndex(self.path)
+        first = reader.version()
+        self.index.add([OTHER])
+
+        self.assertEqual(reader.version(), first + 1)
+        self.index.rebuild([ADDRESS])
+        self.assertEqual(reader.version(), first + 2)
+
+    def test_add_without_index(self):
+        self.assertFalse(self.index.add([ADDRESS]))
+        self.assertFalse(self.index.exists())
+
+    def test_other_worker_sees_updates(self):
+        self.index.rebuild([ADDRESS])
+        reader = WhitelistIndex(self.path)
+        self.assertFalse(reader.contains(OTHER))
+
+        self.index.add([OTHER])
+
+        self.assertTrue(reader.contains(OTHER))
+
+    def test_ensure_builds_once(self):
+        load = MagicMock(return_value=[ADDRESS])
+
+        self.index.ensure(load, lambda: 3)
+        self.index.ensure(load, lambda: 3)
+
+        load.assert_called_once()
+        self.assertTrue(self.index.contains(ADDRESS))
+
+    def test_add_appends_without_rewriting_sorted_file(self):
+        self.index.rebuild(addresses(100))
+        sorted_file = os.stat(self.path)
+
+        self.index.add([ADDRESS])
+        self.index.add([OTHER])
+
+        self.assertEqual(os.stat(self.path).st_ino, sorted_file.st_ino)
+        self.assertEqual(os.path.getsize(self.index.delta_path), 16 + 2 * 20)
+        self.assertTrue(self.index.contains(ADDRESS))
+        self.assertTrue(self.index.contains(OTHER))
+
+    def test_segment_merged_when_full(self):
+        index = WhitelistIndex(self.path, delta_max=3)
+        index.rebuild(addresses(10))
+        reader = WhitelistIndex(self.path)
+        self.assertFalse(reader.contains(ADDRESS))
+        versions = [reader.version()]
+
+        for address in [ADDRESS, OTHER, addresses(11)[-1]]:
+            index.add([address])
+            versions.append(reader.version())
+
+        self.assertEqual(os.path.getsize(index.delta_path), 16)
+        self.assertEqual(os.path.getsize(self.path), 20 + 13 * 20)
+        self.assertTrue(all(reader.contains(address) for address in addresses(11) + [ADDRESS, OTHER]))
+        self.assertEqual(versions, sorted(set(versions)))
+        self.assertEqual(reader.stats(), {"entries": 13})
+
+    def test_refresh_fetches_addresses_committed_elsewhere(self):
+        self.index.ensure(lambda: [ADDRESS], lambda: 3)
+        load_since = MagicMock(return_value=[OTHER])
+        before = self.index.version()
+
+        self.assertTrue(self.index.refresh(lambda: 5, load_since))
+
+        load_since.assert_called_once_with(3)
+        self.assertTrue(self.index.contains(OTHER))
+        self.assertGreater(self.index.version(), before)
+        # Já na versão do banco: nenhuma consulta
+        self.assertFalse(self.index.refresh(lambda: 5, load_since))
+        load_since.assert_called_once()
+
+    def test_refresh_by_another_worker_is_not_repeated(self):
+        self.index.ensure(lambda: [ADDRESS], lambda: 3)
+        other_worker = WhitelistIndex(self.path)
+        other_worker.refresh(lambda: 5, lambda version: [OTHER])
+        load_since = MagicMock(return_value=[])
+
+        self.assertFalse(self.index.refresh(lambda: 5, load_since))
+
+        load_since.assert_not_called()
+        self.assertTrue(self.index.contains(OTHER))
+
+    def test_refresh_due_once_per_interval(self):
+        self.assertTrue(self.index.refresh_due(60))
+        self.assertFalse(self.index.refresh_due(60))
+        self.assertTrue(self.index.refresh_due(0))
+
+    def test_file_of_previous_format_is_rebuilt(self):
+        with open(self.path, "wb") as index_file:
+            index_file.write(b"WLI2" + bytes(16))
+
+        self.assertFalse(self.index.exists())
+        self.index.ensure(lambda: [ADDRESS], lambda: 0)
+
+        self.assertTrue(self.index.contains(ADDRESS))
+
+    def test_rejects_corrupted_file(self):
+        with open(self.path, "wb") as index_file:
+            index_file.write(b"garbage")
+
+        with self.assertRaises(Exception):
+            self.index.contains(ADDRESS)
+
+
+class TestWhitelistIndexConfig(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.app = Flask(__name__)
+        self.app.config["WHITELIST_INDEX_PATH"] = os.path.join(self.directory.name, "whitelist.idx")
+        self.app.config["WHITELIST_INDEX_DELTA_MAX_ENTRIES"] = 4096
+        self.app.config["WHITELIST_INDEX_REFRESH_INTERVAL"] = 60
+        whitelist_index_module._indexes.clear()
+        counter = patch("main.application_layer.adapters.counter_repository.SQLAlchemyCounterRepository.get", return_value=0)
+        self.mock_counter_get = counter.start()
+        self.addCleanup(counter.stop)
+
+    def tearDown(self):
+        whitelist_index_module._indexes.clear()
+        self.directory.cleanup()
+
+    @patch("main.application_layer.adapters.address_repository.SQLAlchemyAddressRepository.get_addresses")
+    def test_built_from_table_on_first_use(self, mock_get_addresses):
+        mock_get_addresses.return_value = [ADDRESS]
+
+        with self.app.app_context():
+            self.assertTrue(get_whitelist_index().contains(ADDRESS))
+            self.assertIs(get_whitelist_index(), get_whitelist_index())
+
+        mock_get_addresses.assert_called_once()
+
+    @patch("main.application_layer.adapters.address_repository.SQLAlchemyAddressRepository.get_addresses_since")
+    @patch("main.application_layer.adapters.address_repository.SQLAlchemyAddressRepository.get_addresses")
+    def test_refreshed_from_database_version(self, mock_get_addresses, mock_get_addresses_since):
+        mock_get_addresses.return_value = [ADDRESS]
+        mock_get_addresses_since.return_value = [OTHER]
+        self.app.config["WHITELIST_INDEX_REFRESH_INTERVAL"] = 0
+
+        with self.app.app_context():
+            self.assertFalse(get_whitelist_index().contains(OTHER))
+            # Endereço commitado por outro host
+            self.mock_counter_get.return_value = 1
+
+            self.assertTrue(get_whitelist_index().contains(OTHER))
+
+        mock_get_addresses_since.assert_called_once_with(0)
+
+    def test_disabled(self):
+        self.app.config["WHITELIST_INDEX_PATH"] = ""
+
+        with self.app.app_context():
+            self.assertIsNone(get_whitelist_index())
+
+    @patch("main.application_layer.adapters.address_repository.SQLAlchemyAddressRepository.get_addresses")
+    def test_addresses_added_only_after_commit(self, mock_get_addresses):
+        mock_get_addresses.return_value = []
+        engine = create_engine("sqlite://")
+
+        with self.app.app_context():
+            whitelist_index = get_whitelist_index()
+
+            with Session(engine) as session:
+                session.execute(text("SELECT 1"))
+                session.info.setdefault(PENDING_KEY, []).append(OTHER)
+                session.rollback()
+                session.execute(text("SELECT 1"))
+                session.info.setdefault(PENDING_KEY, []).append(ADDRESS)
+                self.assertFalse(whitelist_index.contains(ADDRESS))
+                session.commit()
+
+            self.assertTrue(whitelist_index.contains(ADDRESS))
+            self.assertFalse(whitelist_index.contains(OTHER))
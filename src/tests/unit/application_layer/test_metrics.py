@@ -0,0 +1,54 @@
+import unittest
+
+from main.application_layer.metrics import Metrics
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics()
+
+    def test_counters(self):
+        self.metrics.increment("a")
+        self.metrics.increment("a", 2)
+
+        self.assertEqual(self.metrics.counter("a"), 3)
+        self.assertEqual(self.metrics.counter("b"), 0)
+
+    def test_timings_snapshot(self):
+        for value in range(1, 101):
+            self.metrics.observe("rpc", value / 100)
+
+        timing = self.metrics.snapshot()["timings"]["rpc"]
+
+        self.assertEqual(timing["count"], 100)
+        self.assertEqual(timing["max"], 1.0)
+        self.assertAlmostEqual(timing["p50"], 0.505)
+        self.assertAlmostEqual(timing["p99"], 0.9901)
+
+    def test_single_sample_snapshot(self):
+        self.metrics.observe("rpc", 0.2)
+
+        timing = self.metrics.snapshot()["timings"]["rpc"]
+
+        self.assertEqual(timing["p95"], 0.2)
+
+    def test_percentile_needs_samples(self):
+        self.assertIsNone(self.metrics.percentile("rpc", 95))
+        self.metrics.observe("rpc", 0.1)
+        self.assertIsNone(self.metrics.percentile("rpc", 95))
+        self.metrics.observe("rpc", 0.3)
+        self.assertAlmostEqual(self.metrics.percentile("rpc", 50), 0.2)
+
+    def test_gauges(self):
+        self.metrics.gauge("ok", lambda: 5)
+        self.metrics.gauge("broken", lambda: 1 / 0)
+
+        gauges = self.metrics.snapshot()["gauges"]
+
+        self.assertEqual(gauges, {"ok": 5, "broken": None})
+
+    def test_reset(self):
+        self.metrics.increment("a")
+        self.metrics.reset()
+
+        self.assertEqual(self.metrics.snapshot(), {"counters": {}, "timings": {}, "gauges": {}})
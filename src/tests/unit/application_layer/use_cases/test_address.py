@@ -30,7 +30,16 @@ def test_generate_creates_addresses(mock_ethereum_service, mock_address_model):
     assert result == ['0x123', '0x123']
     assert mock_ethereum_service.create.call_count == 2
     assert mock_address_model.create.call_count == 2
-    mock_address_model.create.assert_called_with(address='0x123', private_key='0xabc')
+    mock_address_model.create.assert_called_with(address='0x123', private_key='0xabc', hot_wallet=False)
+
+def test_generate_hot_wallets(mock_ethereum_service, mock_address_model):
+    AddressUseCase().generate(1, hot_wallet=True)
+    mock_address_model.create.assert_called_once_with(address='0x123', private_key='0xabc', hot_wallet=True)
+
+def test_set_hot_wallet(mock_address_model):
+    mock_address_model.set_hot_wallet.return_value = True
+    assert AddressUseCase().set_hot_wallet('0x123', False) is True
+    mock_address_model.set_hot_wallet.assert_called_once_with(address='0x123', hot_wallet=False)
 
 def test_get_returns_addresses(mock_address_model):
     mock_address_model.get.return_value = ['addr1', 'addr2']
@@ -0,0 +1,156 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from main.application_layer.use_cases.confirmation import ConfirmationUseCase
+from main.app import create_app
+
+@pytest.fixture(autouse=True)
+def app_context():
+    with create_app().app_context():
+        yield
+
+@pytest.fixture
+def mock_ethereum_service():
+    with patch("main.application_layer.use_cases.confirmation.EthereumService") as mock_service_cls:
+        yield mock_service_cls.return_value
+
+@pytest.fixture
+def mock_transfer():
+    with patch("main.application_layer.use_cases.confirmation.Transfer") as mock_transfer_cls:
+        yield mock_transfer_cls
+
+@pytest.fixture(autouse=True)
+def mock_chain_cache():
+    with patch("main.application_layer.use_cases.confirmation.get_chain_cache") as mock:
+        yield mock
+
+@pytest.fixture(autouse=True)
+def mock_transfer_replacement():
+    with patch("main.application_layer.use_cases.confirmation.TransferReplacement") as mock_replacement_cls:
+        mock_replacement_cls.get_replaced_hashes.return_value = []
+        yield mock_replacement_cls
+
+@pytest.fixture(autouse=True)
+def mock_checkpoint():
+    with patch("main.application_layer.use_cases.confirmation.Checkpoint") as mock_checkpoint_cls:
+        mock_checkpoint_cls.get.return_value = None
+        yield mock_checkpoint_cls
+
+def make_receipt(tx_hash, status=1, gas_used=21000):
+    return {
+        "transactionHash": MagicMock(to_0x_hex=MagicMock(return_value=tx_hash)),
+        "status": status,
+        "gasUsed": gas_used,
+    }
+
+def test_confirm_block_updates_matching_transfers(mock_ethereum_service, mock_transfer):
+    pending = MagicMock(uuid="uuid1", tx_hash="0xAA")
+    mock_transfer.get_by_status.return_value = [pending, MagicMock(uuid="uuid2", tx_hash="0xbb")]
+    mock_ethereum_service.get_block_receipts.return_value = [
+        make_receipt("0xaa"), make_receipt("0xcc", status=0)
+    ]
+
+    result = ConfirmationUseCase().confirm_block(10)
+
+    assert result == ["uuid1"]
+    mock_ethereum_service.get_block_receipts.assert_called_once_with(10)
+    mock_transfer.update_confirmation.assert_called_once_with(
+        uuid="uuid1", status="confirmed", gas_used=21000, tx_hash="0xaa")
+
+def test_confirm_block_matches_replaced_hash(mock_ethereum_service, mock_transfer, mock_transfer_replacement):
+    mock_transfer.get_by_status.return_value = [MagicMock(uuid="uuid1", tx_hash="0xbump")]
+    mock_transfer_replacement.get_replaced_hashes.return_value = [("0xORIGINAL", "uuid1")]
+    mock_ethereum_service.get_block_receipts.return_value = [make_receipt("0xoriginal")]
+
+    assert ConfirmationUseCase().confirm_block(10) == ["uuid1"]
+    mock_transfer_replacement.get_replaced_hashes.assert_called_once_with(status="sent")
+    mock_transfer.update_confirmation.assert_called_once_with(
+        uuid="uuid1", status="confirmed", gas_used=21000, tx_hash="0xoriginal")
+
+def test_confirm_block_splits_multisend_gas(mock_ethereum_service, mock_transfer):
+    mock_transfer.get_by_status.return_value = [
+        MagicMock(uuid=f"uuid{index}", tx_hash="0xaa") for index in range(3)]
+    mock_ethereum_service.get_block_receipts.return_value = [make_receipt("0xaa", gas_used=150000)]
+
+    assert ConfirmationUseCase().confirm_block(10) == ["uuid0", "uuid1", "uuid2"]
+    # O gas da transação é contado uma vez na soma das linhas
+    assert [c.kwargs["gas_used"] for c in mock_transfer.update_confirmation.call_args_list] == [50000] * 3
+
+def test_confirm_block_marks_reverted_as_failed(mock_ethereum_service, mock_transfer):
+    mock_transfer.get_by_status.return_value = [MagicMock(uuid="uuid1", tx_hash="0xaa")]
+    mock_ethereum_service.get_block_receipts.return_value = [make_receipt("0xaa", status=0)]
+
+    ConfirmationUseCase().confirm_block(10)
+
+    assert mock_transfer.update_confirmation.call_args.kwargs["status"] == "failed"
+
+def test_confirm_block_without_pending_skips_rpc(mock_ethereum_service, mock_transfer):
+    mock_transfer.get_by_status.return_value = []
+
+    assert ConfirmationUseCase().confirm_block(10) == []
+    mock_ethereum_service.get_block_receipts.assert_not_called()
+
+def test_poll_processes_every_new_block(mock_ethereum_service, mock_transfer):
+    use_case = ConfirmationUseCase()
+    use_case.last_block = 7
+    mock_ethereum_service.block_number = 10
+
+    with patch.object(use_case, "confirm_block", return_value=[]) as mock_confirm_block:
+        use_case.poll()
+
+    assert [c.args[0] for c in mock_confirm_block.call_args_list] == [8, 9, 10]
+    assert use_case.last_block == 10
+
+def test_reconcile_skips_unmined_transfers(mock_ethereum_service, mock_transfer):
+    mock_transfer.get_by_status.return_value = [
+        MagicMock(uuid="uuid1", tx_hash="0xaa"), MagicMock(uuid="uuid2", tx_hash="0xbb")
+    ]
+    mock_ethereum_service.batch.return_value = [
+        make_receipt("0xaa"), Exception("not found")
+    ]
+
+    assert ConfirmationUseCase().reconcile() == ["uuid1"]
+    mock_ethereum_service.batch.assert_called_once_with(
+        [("get_transaction_receipt", "0xaa"), ("get_transaction_receipt", "0xbb")])
+
+def test_confirm_block_saves_checkpoint(mock_ethereum_service, mock_transfer, mock_checkpoint):
+    mock_transfer.get_by_status.return_value = []
+
+    ConfirmationUseCase().confirm_block(10)
+
+    mock_checkpoint.save.assert_called_once_with(name="confirm-transfers", block=10)
+
+def test_first_poll_resumes_from_checkpoint(mock_ethereum_service, mock_transfer, mock_checkpoint):
+    mock_transfer.get_by_status.return_value = []
+    mock_checkpoint.get.return_value = 5
+    mock_ethereum_service.block_number = 8
+    use_case = ConfirmationUseCase()
+
+    with patch.object(use_case, "confirm_block", return_value=[]) as mock_confirm_block:
+        use_case.poll()
+
+    assert [c.args[0] for c in mock_confirm_block.call_args_list] == [6, 7, 8]
+
+def test_first_poll_without_checkpoint_scans_from_head_read_before_reconcile(
+        mock_ethereum_service, mock_transfer, mock_checkpoint):
+    heads = iter([100, 102])
+    type(mock_ethereum_service).block_number = property(lambda self: next(heads))
+    use_case = ConfirmationUseCase()
+
+    with patch.object(use_case, "reconcile") as mock_reconcile, \
+            patch.object(use_case, "confirm_block", return_value=[]) as mock_confirm_block:
+        use_case.poll()
+
+    mock_reconcile.assert_called_once()
+    # Blocos minerados depois do reconcile não ficam de fora
+    assert [c.args[0] for c in mock_confirm_block.call_args_list] == [100, 101, 102]
+
+def test_first_poll_with_old_checkpoint_relies_on_reconcile(mock_ethereum_service, mock_transfer, mock_checkpoint):
+    mock_transfer.get_by_status.return_value = []
+    mock_checkpoint.get.return_value = 5
+    mock_ethereum_service.block_number = 5000
+    use_case = ConfirmationUseCase()
+
+    with patch.object(use_case, "confirm_block", return_value=[]) as mock_confirm_block:
+        use_case.poll()
+
+    assert [c.args[0] for c in mock_confirm_block.call_args_list] == [5000]
@@ -0,0 +1,66 @@
+import pytest
+from unittest.mock import MagicMock, PropertyMock, call, patch
+from main.application_layer.use_cases import fees
+from main.application_layer.use_cases.fees import FeeUseCase, build_quotes
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    fees._fee_cache.update(quotes=None, fetched_at=0)
+    yield
+    fees._fee_cache.update(quotes=None, fetched_at=0)
+
+@pytest.fixture
+def fee_history():
+    return {
+        "oldestBlock": 100,
+        "baseFeePerGas": [10, 11, 12],
+        "reward": [[1, 2, 3], [1, 4, 9], [1, 3, 5]],
+    }
+
+def test_build_quotes(fee_history):
+    quotes = build_quotes(fee_history)
+    assert quotes["block"] == 102
+    assert quotes["base_fee"] == 12
+    assert quotes["tiers"]["slow"] == {"maxFeePerGas": 25, "maxPriorityFeePerGas": 1}
+    assert quotes["tiers"]["standard"] == {"maxFeePerGas": 27, "maxPriorityFeePerGas": 3}
+    assert quotes["tiers"]["fast"] == {"maxFeePerGas": 29, "maxPriorityFeePerGas": 5}
+
+def test_quotes_are_served_from_cache(fee_history):
+    ethereum_service = MagicMock()
+    block_number = PropertyMock(return_value=102)
+    type(ethereum_service).block_number = block_number
+    ethereum_service.fee_history.return_value = fee_history
+
+    FeeUseCase(ethereum_service).quote("fast")
+    FeeUseCase(ethereum_service).quote("slow")
+    FeeUseCase(ethereum_service).get_quotes()
+
+    # Uma única chamada RPC para as três cotações
+    assert ethereum_service.method_calls == [call.fee_history(10, "latest", [10, 50, 90])]
+    block_number.assert_not_called()
+
+def test_expired_quotes_are_refreshed(fee_history):
+    ethereum_service = MagicMock()
+    ethereum_service.fee_history.return_value = fee_history
+    with patch("main.application_layer.use_cases.fees.time.monotonic", return_value=1000):
+        FeeUseCase(ethereum_service).get_quotes()
+
+    ethereum_service.fee_history.return_value = dict(fee_history, oldestBlock=101)
+    with patch("main.application_layer.use_cases.fees.time.monotonic", return_value=1000 + fees.QUOTE_TTL):
+        assert FeeUseCase(ethereum_service).get_quotes()["block"] == 103
+
+    assert ethereum_service.fee_history.call_count == 2
+
+def test_lagging_node_keeps_newer_quotes(fee_history):
+    ethereum_service = MagicMock()
+    ethereum_service.fee_history.return_value = fee_history
+    with patch("main.application_layer.use_cases.fees.time.monotonic", return_value=1000):
+        FeeUseCase(ethereum_service).get_quotes()
+
+    ethereum_service.fee_history.return_value = dict(fee_history, oldestBlock=99)
+    with patch("main.application_layer.use_cases.fees.time.monotonic", return_value=1000 + fees.QUOTE_TTL):
+        assert FeeUseCase(ethereum_service).get_quotes()["block"] == 102
+
+def test_unknown_urgency():
+    with pytest.raises(ValueError):
+        FeeUseCase(MagicMock()).quote("instant")
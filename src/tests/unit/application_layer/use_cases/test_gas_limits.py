@@ -0,0 +1,119 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from web3 import Web3
+from web3.providers import BaseProvider
+from main.application_layer.adapters.ethereum_service import EthereumService
+from main.application_layer.use_cases.gas_limits import (
+    GasLimitUseCase, gas_limit_from_samples, _gas_limit_cache
+)
+from main.application_layer.use_cases.tokens import TOKENS, token_registry
+from main.application_layer.use_cases.transfer import TransferUseCase
+from main.domain_layer.models.token import Token
+from main.app import create_app
+
+@pytest.fixture(autouse=True)
+def app_context():
+    app = create_app()
+    app.config["GAS_LIMIT_CACHE_TTL"] = 60
+    app.config["GAS_LIMIT_SAMPLES"] = 200
+    app.config["GAS_LIMIT_MIN_SAMPLES"] = 3
+    app.config["GAS_LIMIT_PERCENTILE"] = 95
+    app.config["GAS_LIMIT_MAX_SPREAD"] = 0.2
+    with app.app_context():
+        yield
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    _gas_limit_cache.clear()
+    yield
+    _gas_limit_cache.clear()
+
+@pytest.fixture
+def mock_transfer():
+    with patch("main.application_layer.use_cases.gas_limits.Transfer") as mock_transfer_cls:
+        yield mock_transfer_cls
+
+def test_gas_limit_from_samples_uses_high_percentile():
+    assert gas_limit_from_samples([50000] * 19 + [52000], 95, 0.2, 3) == int(50100 * 1.25)
+
+def test_gas_limit_from_samples_needs_enough_samples():
+    assert gas_limit_from_samples([50000, 50000], 95, 0.2, 3) is None
+
+def test_gas_limit_from_samples_rejects_large_spread():
+    assert gas_limit_from_samples([30000, 30000, 30000, 60000, 60000], 95, 0.2, 3) is None
+
+def test_recipient_class_from_history(mock_transfer):
+    mock_transfer.get_holders.return_value = {"0xto"}
+    ethereum_service = MagicMock()
+
+    assert GasLimitUseCase(ethereum_service).recipient_class("USDC", "0xto") == "holding"
+    mock_transfer.get_holders.return_value = set()
+    assert GasLimitUseCase(ethereum_service).recipient_class("USDC", "0xto") == "fresh"
+    assert ethereum_service.method_calls == []
+
+def test_recipient_classes_in_one_query(mock_transfer):
+    mock_transfer.get_holders.return_value = {"0xa"}
+
+    classes = GasLimitUseCase(MagicMock()).recipient_classes("USDC", ["0xa", "0xb", "0xa"])
+
+    assert classes == ["holding", "fresh", "holding"]
+    mock_transfer.get_holders.assert_called_once()
+    assert sorted(mock_transfer.get_holders.call_args.kwargs["addresses"]) == ["0xa", "0xb"]
+
+def test_gas_limit_served_from_history_without_rpc(mock_transfer):
+    mock_transfer.get_gas_used.return_value = [40000, 40000, 40000]
+    ethereum_service = MagicMock()
+    use_case = GasLimitUseCase(ethereum_service)
+
+    assert use_case.gas_limit("USDC", {}) == 50000
+    assert use_case.gas_limit("USDC", {}) == 50000
+
+    assert ethereum_service.method_calls == []
+    mock_transfer.get_gas_used.assert_called_once_with(asset="USDC", recipient_class="fresh", limit=200)
+
+def test_gas_limit_falls_back_to_live_estimate(mock_transfer):
+    mock_transfer.get_gas_used.return_value = []
+    ethereum_service = MagicMock()
+    ethereum_service.estimate_gas.return_value = 52000
+
+    assert GasLimitUseCase(ethereum_service).gas_limit("USDC", {"to": "0xtoken"}) == 65000
+    ethereum_service.estimate_gas.assert_called_once_with({"to": "0xtoken"})
+
+def test_gas_limit_cache_is_per_asset(mock_transfer):
+    mock_transfer.get_gas_used.side_effect = [[40000] * 3, [30000] * 3]
+    use_case = GasLimitUseCase(MagicMock())
+
+    assert use_case.gas_limit("USDC", {}) == 50000
+    assert use_case.gas_limit("USDT", {}) == 37500
+    assert use_case.gas_limit("USDC", {}) == 50000
+
+class CountingProvider(BaseProvider):
+    """Provider that records every JSON-RPC method it is asked for."""
+
+    def __init__(self):
+        super().__init__()
+        self.methods = []
+
+    def make_request(self, method, params):
+        self.methods.append(method)
+        return {"jsonrpc": "2.0", "id": 1, "result": "0xaa36a7"}
+
+def test_cached_token_transfer_makes_no_rpc(mock_transfer):
+    provider = CountingProvider()
+    ethereum_service = EthereumService(w3=Web3(provider))
+    mock_transfer.get_gas_used.return_value = [40000, 40000, 40000]
+    mock_transfer.get_holders.return_value = set()
+    token_registry.clear()
+    with patch("main.application_layer.use_cases.tokens.Token") as mock_token:
+        mock_token.get.side_effect = lambda chain_id: [Token(chain_id, TOKENS["USDC"], "USDC", 6)]
+        # Caches do processo já aquecidos: chain id e metadados do token
+        TransferUseCase()._build_transaction(
+            ethereum_service, "0x" + "01" * 20, "0x" + "02" * 20, "USDC", 1, 0, {"maxFeePerGas": 1})
+        provider.methods.clear()
+
+        tx, recipient_class = TransferUseCase()._build_transaction(
+            ethereum_service, "0x" + "01" * 20, "0x" + "03" * 20, "USDC", 2, 1, {"maxFeePerGas": 1})
+    token_registry.clear()
+
+    assert provider.methods == []
+    assert (tx["gas"], recipient_class) == (50000, "fresh")
@@ -0,0 +1,140 @@
+import decimal
+import pytest
+from unittest.mock import patch, MagicMock
+from flask import Flask
+from main.application_layer.exceptions import NoHotWalletAvailable
+from main.application_layer.use_cases.hot_wallet import HotWalletPool
+from main.application_layer.use_cases.tokens import TOKENS, token_registry
+from main.domain_layer.models.token import Token
+
+@pytest.fixture
+def mock_address():
+    with patch("main.application_layer.use_cases.hot_wallet.Address") as mock_address_cls:
+        yield mock_address_cls
+
+@pytest.fixture
+def mock_transfer():
+    with patch("main.application_layer.use_cases.hot_wallet.Transfer") as mock_transfer_cls:
+        yield mock_transfer_cls
+
+@pytest.fixture(autouse=True)
+def known_tokens():
+    token_registry.clear()
+    with patch("main.application_layer.use_cases.tokens.Token") as mock_token:
+        mock_token.get.side_effect = lambda chain_id: [Token(chain_id, TOKENS["USDC"], "USDC", 6)]
+        yield mock_token
+    token_registry.clear()
+
+@pytest.fixture(autouse=True)
+def app_context():
+    app = Flask(__name__)
+    app.config["HOT_WALLET_GAS_RESERVE"] = 100000
+    with app.app_context():
+        yield
+
+def in_flight(count, value=None, gas_price=0):
+    return {"count": count, "value": value or {}, "gas_price": gas_price}
+
+@pytest.fixture
+def pool():
+    return HotWalletPool(MagicMock())
+
+def test_select_prefers_least_in_flight(pool, mock_address, mock_transfer):
+    busy = MagicMock(address="0xbusy")
+    idle = MagicMock(address="0xidle")
+    mock_address.get_hot_wallets.return_value = [busy, idle]
+    mock_transfer.get_in_flight.return_value = {"0xbusy": in_flight(3)}
+
+    with patch.object(pool, "balances", side_effect=lambda addresses, asset: [decimal.Decimal(10)] * len(addresses)):
+        assert pool.select("ETH", decimal.Decimal(1)) is idle
+
+def test_select_skips_wallet_without_balance(pool, mock_address, mock_transfer):
+    idle = MagicMock(address="0xidle")
+    busy = MagicMock(address="0xbusy")
+    mock_address.get_hot_wallets.return_value = [idle, busy]
+    mock_transfer.get_in_flight.return_value = {"0xbusy": in_flight(1)}
+    balances = {"0xidle": decimal.Decimal("0.5"), "0xbusy": decimal.Decimal(5)}
+
+    with patch.object(pool, "balances", side_effect=lambda addresses, asset: [balances[a] for a in addresses]) as mock_balances:
+        assert pool.select("ETH", decimal.Decimal(1)) is busy
+    # Um único lote com todos os candidatos
+    mock_balances.assert_called_once_with(["0xidle", "0xbusy"], "ETH")
+
+def test_select_without_wallets(pool, mock_address, mock_transfer):
+    mock_address.get_hot_wallets.return_value = []
+    with pytest.raises(NoHotWalletAvailable):
+        pool.select("ETH", decimal.Decimal(1))
+
+def test_select_without_enough_balance(pool, mock_address, mock_transfer):
+    mock_address.get_hot_wallets.return_value = [MagicMock(address="0xidle")]
+    mock_transfer.get_in_flight.return_value = {}
+    with patch.object(pool, "token_and_eth_balances", return_value=([None], [decimal.Decimal(1)])):
+        with pytest.raises(NoHotWalletAvailable):
+            pool.select("USDC", decimal.Decimal(1))
+
+def test_token_balance_uses_decimals(pool):
+    contract = pool.ethereum_service.contract.return_value
+    pool.ethereum_service.multicall.return_value = [2500000]
+
+    assert pool.balance("0xidle", "USDC") == decimal.Decimal("2.5")
+    contract.functions.balanceOf.assert_called_once_with("0xidle")
+    pool.ethereum_service.multicall.assert_called_once_with([contract.functions.balanceOf.return_value])
+
+def test_token_and_eth_balances_in_one_multicall(pool):
+    contract = pool.ethereum_service.contract.return_value
+    pool.ethereum_service.multicall.return_value = [2500000, Exception("reverted"), 10 ** 18, 2 * 10 ** 18]
+
+    token, eth = pool.token_and_eth_balances(["0xa", "0xb"], "USDC")
+
+    assert token == [decimal.Decimal("2.5"), None]
+    assert eth == [decimal.Decimal(1), decimal.Decimal(2)]
+    pool.ethereum_service.multicall.assert_called_once()
+    contract.functions.getEthBalance.assert_any_call("0xb")
+
+def test_eth_balances_in_one_batch(pool):
+    pool.ethereum_service.batch.return_value = [10 ** 18, Exception("timeout")]
+
+    assert pool.balances(["0xa", "0xb"], "ETH") == [decimal.Decimal(1), None]
+    pool.ethereum_service.batch.assert_called_once_with([("get_balance", "0xa"), ("get_balance", "0xb")])
+
+def test_select_subtracts_in_flight_value(pool, mock_address, mock_transfer):
+    first = MagicMock(address="0xfirst")
+    second = MagicMock(address="0xsecond")
+    mock_address.get_hot_wallets.return_value = [first, second]
+    mock_transfer.get_in_flight.return_value = {
+        "0xfirst": in_flight(1, {"USDC": decimal.Decimal(8)}),
+        "0xsecond": in_flight(2, {"ETH": decimal.Decimal(5)}),
+    }
+
+    with patch.object(pool, "token_and_eth_balances", side_effect=lambda addresses, asset: (
+            [decimal.Decimal(10)] * len(addresses), [decimal.Decimal(1)] * len(addresses))):
+        # 10 - 8 USDC já comprometidos não cobrem 5
+        assert pool.select("USDC", decimal.Decimal(5)) is second
+
+def test_select_reserves_gas_of_in_flight_transfers(pool, mock_address, mock_transfer):
+    wallet = MagicMock(address="0xwallet")
+    mock_address.get_hot_wallets.return_value = [wallet]
+    # 2 transações a 5 gwei: 2 * 5e9 * 100000 = 0.001 ETH de gas reservado
+    mock_transfer.get_in_flight.return_value = {
+        "0xwallet": in_flight(2, {"USDC": decimal.Decimal(1)}, gas_price=decimal.Decimal(10 * 10 ** 9))}
+
+    with patch.object(pool, "balances", return_value=[decimal.Decimal("1.0005")]):
+        with pytest.raises(NoHotWalletAvailable):
+            pool.select("ETH", decimal.Decimal(1))
+    with patch.object(pool, "balances", return_value=[decimal.Decimal("1.001")]):
+        assert pool.select("ETH", decimal.Decimal(1)) is wallet
+
+def test_token_send_reserves_gas_of_in_flight_transfers(pool, mock_address, mock_transfer):
+    dry = MagicMock(address="0xdry")
+    funded = MagicMock(address="0xfunded")
+    mock_address.get_hot_wallets.return_value = [dry, funded]
+    # 0.001 ETH de gas reservado em cada carteira
+    mock_transfer.get_in_flight.return_value = {
+        "0xdry": in_flight(1, gas_price=decimal.Decimal(10 * 10 ** 9)),
+        "0xfunded": in_flight(1, gas_price=decimal.Decimal(10 * 10 ** 9)),
+    }
+    eth = {"0xdry": decimal.Decimal("0.0005"), "0xfunded": decimal.Decimal("0.001")}
+
+    with patch.object(pool, "token_and_eth_balances", side_effect=lambda addresses, asset: (
+            [decimal.Decimal(10)] * len(addresses), [eth[address] for address in addresses])):
+        assert pool.select("USDC", decimal.Decimal(5)) is funded
@@ -0,0 +1,250 @@
+import pytest
+from decimal import Decimal
+from unittest.mock import patch, MagicMock
+import requests
+from web3.exceptions import TransactionNotFound, Web3RPCError
+from main.application_layer.use_cases.replacement import ReplacementUseCase, bump
+from main.app import create_app
+
+def stuck(**kwargs):
+    return MagicMock(**{"approval_tx_hash": None, **kwargs})
+
+@pytest.fixture(autouse=True)
+def app_context():
+    app = create_app()
+    app.config["REPLACEMENT_FEE_BUMP"] = 12.5
+    app.config["REPLACEMENT_PENDING_BLOCKS"] = 5
+    app.config["REPLACEMENT_MAX_FEE_PER_GAS"] = 0
+    with app.app_context():
+        yield app
+
+@pytest.fixture
+def mock_ethereum_service():
+    service = MagicMock()
+    service.chain_id = 11155111
+    service.get_transaction.return_value = {
+        "blockNumber": None,
+        "nonce": 7,
+        "to": "0xto",
+        "value": 10,
+        "input": b"",
+        "gas": 21000,
+        "maxFeePerGas": 1000,
+        "maxPriorityFeePerGas": 100,
+    }
+    service.sign_transaction.return_value = MagicMock(
+        raw_transaction=b"rawtx", hash=MagicMock(to_0x_hex=lambda: "0xbump"))
+    return service
+
+@pytest.fixture(autouse=True)
+def mock_fees():
+    with patch("main.application_layer.use_cases.replacement.FeeUseCase") as mock_fee_usecase:
+        mock_fee_usecase.return_value.quote.return_value = {
+            "maxFeePerGas": 500, "maxPriorityFeePerGas": 50
+        }
+        yield mock_fee_usecase
+
+@pytest.fixture
+def mock_transfer():
+    with patch("main.application_layer.use_cases.replacement.Transfer") as mock_transfer_cls:
+        yield mock_transfer_cls
+
+@pytest.fixture
+def mock_transfer_replacement():
+    with patch("main.application_layer.use_cases.replacement.TransferReplacement") as mock_replacement_cls:
+        yield mock_replacement_cls
+
+@pytest.fixture
+def mock_address():
+    with patch("main.application_layer.use_cases.replacement.Address") as mock_address_cls:
+        mock_address_cls.get.return_value = MagicMock(private_key="key")
+        yield mock_address_cls
+
+def test_bump_rounds_up():
+    assert bump(100, 12.5) == 113
+    assert bump(8, 12.5) == 9
+
+def test_bumped_fees_uses_quote_when_higher(mock_ethereum_service, mock_fees):
+    mock_fees.return_value.quote.return_value = {"maxFeePerGas": 5000, "maxPriorityFeePerGas": 50}
+
+    fees = ReplacementUseCase(mock_ethereum_service).bumped_fees(
+        {"maxFeePerGas": 1000, "maxPriorityFeePerGas": 100})
+
+    assert fees == {"maxFeePerGas": 5000, "maxPriorityFeePerGas": 113}
+    mock_fees.return_value.quote.assert_called_once_with("fast")
+
+def test_bumped_fees_from_legacy_transaction(mock_ethereum_service):
+    fees = ReplacementUseCase(mock_ethereum_service).bumped_fees({"gasPrice": 1000})
+    assert fees == {"maxFeePerGas": 1125, "maxPriorityFeePerGas": 1125}
+
+def test_replace_resigns_same_nonce(mock_ethereum_service, mock_transfer, mock_transfer_replacement, mock_address):
+    transfers = [stuck(uuid="uuid1", from_address="0xfrom"), stuck(uuid="uuid2", from_address="0xfrom")]
+
+    result = ReplacementUseCase(mock_ethereum_service).replace("0xstuck", transfers, 20)
+
+    assert result == "0xbump"
+    tx, private_key = mock_ethereum_service.sign_transaction.call_args.args
+    assert private_key == "key"
+    assert tx["nonce"] == 7
+    assert tx["type"] == 2
+    assert tx["maxFeePerGas"] == 1125
+    assert tx["maxPriorityFeePerGas"] == 113
+    mock_transfer_replacement.create_many.assert_called_once_with(
+        transfer_uuids=["uuid1", "uuid2"], tx_hash="0xbump", replaced_tx_hash="0xstuck",
+        max_fee_per_gas=1125, max_priority_fee_per_gas=113, block=20)
+    mock_transfer.update_replacement.assert_called_once_with(
+        uuids=["uuid1", "uuid2"], tx_hash="0xbump", gas_price=1125, sent_block=20)
+    mock_ethereum_service.send_raw_transaction.assert_called_once_with(b"rawtx")
+
+def test_replace_skips_mined_transaction(mock_ethereum_service, mock_transfer, mock_transfer_replacement, mock_address):
+    mock_ethereum_service.get_transaction.return_value = {"blockNumber": 19}
+
+    assert ReplacementUseCase(mock_ethereum_service).replace("0xstuck", [stuck()], 20) is None
+    mock_ethereum_service.send_raw_transaction.assert_not_called()
+
+def test_replace_skips_unknown_sender(mock_ethereum_service, mock_transfer, mock_transfer_replacement, mock_address):
+    mock_address.get.return_value = None
+
+    assert ReplacementUseCase(mock_ethereum_service).replace("0xstuck", [stuck()], 20) is None
+    mock_ethereum_service.sign_transaction.assert_not_called()
+
+def test_replace_respects_fee_cap(app_context, mock_ethereum_service, mock_transfer, mock_transfer_replacement, mock_address):
+    app_context.config["REPLACEMENT_MAX_FEE_PER_GAS"] = 1000
+
+    assert ReplacementUseCase(mock_ethereum_service).replace("0xstuck", [stuck()], 20) is None
+    mock_ethereum_service.sign_transaction.assert_not_called()
+
+def test_poll_groups_stuck_transfers_by_hash(mock_ethereum_service, mock_transfer):
+    mock_ethereum_service.block_number = 20
+    first, second, other = MagicMock(tx_hash="0xaa"), MagicMock(tx_hash="0xaa"), MagicMock(tx_hash="0xbb")
+    mock_transfer.get_stuck.return_value = [first, second, other]
+    use_case = ReplacementUseCase(mock_ethereum_service)
+
+    with patch.object(use_case, "replace", side_effect=["0xcc", Exception("replacement transaction underpriced")]) as mock_replace:
+        assert use_case.poll() == {"0xaa": "0xcc"}
+
+    mock_transfer.mark_sent_block.assert_called_once_with(block_number=20)
+    mock_transfer.get_stuck.assert_called_once_with(sent_before_block=15)
+    assert mock_replace.call_args_list[0].args == ("0xaa", [first, second], 20)
+    assert mock_replace.call_args_list[1].args == ("0xbb", [other], 20)
+
+def test_replace_rebuilds_evicted_transaction(mock_ethereum_service, mock_transfer, mock_transfer_replacement, mock_address):
+    mock_ethereum_service.get_transaction.side_effect = TransactionNotFound("not found")
+    transfers = [stuck(uuid="uuid1", from_address="0xfrom", to_address="0xto", asset="ETH",
+                           value=Decimal("0.5"), gas_price=Decimal("1000"), nonce=7)]
+
+    with patch("main.application_layer.use_cases.replacement.TransferUseCase") as mock_transfer_usecase:
+        mock_transfer_usecase.return_value._build_transaction.return_value = ({
+            "type": 2, "nonce": 7, "to": "0xto", "value": 500, "gas": 21000,
+            "maxFeePerGas": 1000, "maxPriorityFeePerGas": 0,
+        }, None)
+        result = ReplacementUseCase(mock_ethereum_service).replace("0xstuck", transfers, 20)
+
+    assert result == "0xbump"
+    mock_transfer_usecase.return_value._build_transaction.assert_called_once_with(
+        mock_ethereum_service, "0xfrom", "0xto", "ETH", Decimal("0.5"), 7,
+        {"maxFeePerGas": 1000, "maxPriorityFeePerGas": 0})
+    tx, _ = mock_ethereum_service.sign_transaction.call_args.args
+    assert (tx["nonce"], tx["to"], tx["value"], tx["data"], tx["gas"]) == (7, "0xto", 500, b"", 21000)
+    assert tx["maxFeePerGas"] == 1125
+    assert tx["maxPriorityFeePerGas"] == 50
+    mock_ethereum_service.send_raw_transaction.assert_called_once_with(b"rawtx")
+
+def test_replace_rebuilds_evicted_multisend(mock_ethereum_service, mock_transfer, mock_transfer_replacement, mock_address):
+    mock_ethereum_service.get_transaction.side_effect = TransactionNotFound("not found")
+    mock_ethereum_service.to_checksum_address.side_effect = lambda address: address
+    transfers = [
+        stuck(uuid=f"uuid{index}", from_address="0xfrom", to_address=to_address, asset="USDT",
+                  value=value, gas_price=Decimal("1000"), nonce=7)
+        for index, (to_address, value) in enumerate([("0xa", Decimal("1")), ("0xb", Decimal("2"))])
+    ]
+
+    with patch("main.application_layer.use_cases.replacement.TransferUseCase") as mock_transfer_usecase, \
+         patch("main.application_layer.use_cases.replacement.get_token_decimals", return_value=6), \
+         patch("main.application_layer.use_cases.replacement.get_token_address", return_value="0xtoken"):
+        mock_transfer_usecase.return_value._build_multisend_transaction.return_value = {
+            "nonce": 7, "to": "0xmultisend", "value": 0, "data": b"disperse", "gas": 140000,
+            "maxFeePerGas": 1000, "maxPriorityFeePerGas": 0,
+        }
+        assert ReplacementUseCase(mock_ethereum_service).replace("0xstuck", transfers, 20) == "0xbump"
+
+    mock_transfer_usecase.return_value._build_multisend_transaction.assert_called_once_with(
+        mock_ethereum_service, "0xfrom", "0xtoken", ["0xa", "0xb"], [1000000, 2000000], 7,
+        {"maxFeePerGas": 1000, "maxPriorityFeePerGas": 0})
+    tx, _ = mock_ethereum_service.sign_transaction.call_args.args
+    assert (tx["nonce"], tx["to"], tx["data"], tx["gas"]) == (7, "0xmultisend", b"disperse", 140000)
+
+def test_replace_skips_evicted_transaction_without_nonce(mock_ethereum_service, mock_transfer, mock_transfer_replacement, mock_address):
+    mock_ethereum_service.get_transaction.side_effect = TransactionNotFound("not found")
+
+    assert ReplacementUseCase(mock_ethereum_service).replace("0xstuck", [stuck(nonce=None)], 20) is None
+    mock_ethereum_service.sign_transaction.assert_not_called()
+
+def test_replace_keeps_records_when_broadcast_outcome_unknown(mock_ethereum_service, mock_transfer, mock_transfer_replacement, mock_address):
+    def send(raw_transaction):
+        # Os registros já foram gravados antes do envio
+        assert mock_transfer_replacement.create_many.called
+        assert mock_transfer.update_replacement.called
+        raise requests.ReadTimeout("read timed out")
+    mock_ethereum_service.send_raw_transaction.side_effect = send
+
+    result = ReplacementUseCase(mock_ethereum_service).replace("0xstuck", [stuck(uuid="uuid1")], 20)
+
+    assert result == "0xbump"
+    mock_transfer_replacement.delete.assert_not_called()
+    mock_transfer.update_replacement.assert_called_once()
+
+def test_replace_discards_records_when_rejected(mock_ethereum_service, mock_transfer, mock_transfer_replacement, mock_address):
+    mock_ethereum_service.send_raw_transaction.side_effect = Web3RPCError(
+        str({"code": -32000, "message": "replacement transaction underpriced"}))
+    transfers = [stuck(uuid="uuid1", gas_price=Decimal("1000"), sent_block=9)]
+
+    with pytest.raises(Web3RPCError):
+        ReplacementUseCase(mock_ethereum_service).replace("0xstuck", transfers, 20)
+
+    mock_transfer_replacement.delete.assert_called_once_with(tx_hash="0xbump")
+    assert mock_transfer.update_replacement.call_args.kwargs == {
+        "uuids": ["uuid1"], "tx_hash": "0xstuck", "gas_price": Decimal("1000"), "sent_block": 9}
+
+def test_replace_bumps_pending_approval_first(mock_ethereum_service, mock_transfer, mock_transfer_replacement, mock_address):
+    mock_ethereum_service.get_transaction_count.return_value = 7
+    transfers = [stuck(uuid="uuid1", from_address="0xfrom", nonce=8, approval_tx_hash="0xapprove"),
+                 stuck(uuid="uuid2", from_address="0xfrom", nonce=8, approval_tx_hash="0xapprove")]
+
+    result = ReplacementUseCase(mock_ethereum_service).replace("0xstuck", transfers, 20)
+
+    assert result == "0xbump"
+    mock_ethereum_service.get_transaction_count.assert_called_once_with("0xfrom", "latest")
+    mock_ethereum_service.get_transaction.assert_called_once_with("0xapprove")
+    mock_transfer.update_approval.assert_called_once_with(
+        uuids=["uuid1", "uuid2"], approval_tx_hash="0xbump", sent_block=20)
+    mock_transfer_replacement.create_many.assert_not_called()
+    mock_transfer.update_replacement.assert_not_called()
+
+def test_replace_rebuilds_evicted_approval(mock_ethereum_service, mock_transfer, mock_transfer_replacement, mock_address):
+    mock_ethereum_service.get_transaction_count.return_value = 7
+    mock_ethereum_service.get_transaction.side_effect = TransactionNotFound("not found")
+    transfers = [stuck(uuid="uuid1", from_address="0xfrom", asset="USDT", nonce=8,
+                       gas_price=Decimal("1000"), approval_tx_hash="0xapprove")]
+
+    with patch("main.application_layer.use_cases.replacement.TransferUseCase") as mock_transfer_usecase:
+        mock_transfer_usecase.return_value._build_approve_transaction.return_value = {
+            "nonce": 7, "to": "0xtoken", "value": 0, "data": b"approve", "gas": 60000,
+            "maxFeePerGas": 1000, "maxPriorityFeePerGas": 0,
+        }
+        assert ReplacementUseCase(mock_ethereum_service).replace("0xstuck", transfers, 20) == "0xbump"
+
+    mock_transfer_usecase.return_value._build_approve_transaction.assert_called_once_with(
+        mock_ethereum_service, "0xfrom", "USDT", 7, {"maxFeePerGas": 1000, "maxPriorityFeePerGas": 0})
+    tx, _ = mock_ethereum_service.sign_transaction.call_args.args
+    assert (tx["nonce"], tx["to"], tx["data"]) == (7, "0xtoken", b"approve")
+
+def test_replace_multisend_after_approval_mined(mock_ethereum_service, mock_transfer, mock_transfer_replacement, mock_address):
+    mock_ethereum_service.get_transaction_count.return_value = 8
+    transfers = [stuck(uuid="uuid1", from_address="0xfrom", nonce=8, approval_tx_hash="0xapprove")]
+
+    assert ReplacementUseCase(mock_ethereum_service).replace("0xstuck", transfers, 20) == "0xbump"
+
+    mock_ethereum_service.get_transaction.assert_called_once_with("0xstuck")
+    mock_transfer.update_approval.assert_not_called()
+    mock_transfer_replacement.create_many.assert_called_once()
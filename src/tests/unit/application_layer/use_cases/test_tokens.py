@@ -0,0 +1,102 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from eth_abi import encode
+from web3.exceptions import ContractLogicError
+
+from main.application_layer.use_cases.tokens import (
+    APPROVE_SELECTOR, TOKENS, TRANSFER_SELECTOR, encode_approve, encode_transfer, get_token_address,
+    get_token_decimals, token_registry
+)
+from main.domain_layer.models.token import Token
+
+@pytest.fixture(autouse=True)
+def mock_token():
+    token_registry.clear()
+    with patch("main.application_layer.use_cases.tokens.Token") as mock_token_cls:
+        mock_token_cls.get.return_value = []
+        mock_token_cls.create.side_effect = lambda **kwargs: Token(**kwargs)
+        yield mock_token_cls
+    token_registry.clear()
+
+@pytest.fixture
+def ethereum_service():
+    ethereum_service = MagicMock()
+    ethereum_service.chain_id = 11155111
+    return ethereum_service
+
+def test_transfer_selector():
+    assert TRANSFER_SELECTOR.hex() == "a9059cbb"
+
+def test_encode_transfer_matches_abi_encoding():
+    to_address = "0x65aFADD39029741B3b8f0756952C74678c9cEC93"
+    assert encode_transfer(to_address, 2500000) == TRANSFER_SELECTOR + encode(
+        ["address", "uint256"], [to_address, 2500000])
+
+def test_encode_approve_matches_abi_encoding():
+    spender = "0x65aFADD39029741B3b8f0756952C74678c9cEC93"
+    assert encode_approve(spender, 2 ** 256 - 1) == APPROVE_SELECTOR + encode(
+        ["address", "uint256"], [spender, 2 ** 256 - 1])
+
+@pytest.mark.parametrize("to_address, value", [
+    ("0x1234", 1),
+    ("0x" + "11" * 20, -1),
+    ("0x" + "11" * 20, 2 ** 256),
+])
+def test_encode_transfer_rejects_invalid_input(to_address, value):
+    with pytest.raises(ValueError):
+        encode_transfer(to_address, value)
+
+def test_get_token_address_is_checksummed_without_rpc():
+    assert get_token_address("usdc") == TOKENS["USDC"] == "0x65aFADD39029741B3b8f0756952C74678c9cEC93"
+
+def test_get_token_decimals_reads_chain_once(ethereum_service, mock_token):
+    ethereum_service.multicall.return_value = ["USDC", 6]
+
+    assert get_token_decimals("USDC", ethereum_service) == 6
+    assert get_token_decimals("usdc", ethereum_service) == 6
+    ethereum_service.multicall.assert_called_once()
+    mock_token.create.assert_called_once_with(chain_id=11155111, address=TOKENS["USDC"], symbol="USDC", decimals=6)
+
+def test_registry_loads_table_once_per_chain(ethereum_service, mock_token):
+    mock_token.get.return_value = [Token(11155111, "0xAbC", "TKN", 18)]
+
+    tokens = token_registry.get_many(["0xabc"], ethereum_service)
+    token_registry.get("0xABC", ethereum_service)
+
+    assert tokens["0xabc"].symbol == "TKN"
+    mock_token.get.assert_called_once_with(chain_id=11155111)
+    ethereum_service.multicall.assert_not_called()
+
+def test_registry_discovers_unknown_tokens_in_one_multicall(ethereum_service, mock_token):
+    mock_token.get.return_value = [Token(11155111, "0xknown", "KNW", 6)]
+    ethereum_service.multicall.return_value = ["AAA", 18, "BBB", 8]
+
+    tokens = token_registry.get_many(["0xknown", "0xa", "0xb"], ethereum_service, block_identifier=7)
+
+    assert [(token.symbol, token.decimals) for token in tokens.values()] == [("KNW", 6), ("AAA", 18), ("BBB", 8)]
+    functions = ethereum_service.contract.return_value.functions
+    ethereum_service.multicall.assert_called_once_with([
+        functions.symbol.return_value, functions.decimals.return_value,
+        functions.symbol.return_value, functions.decimals.return_value,
+    ], block_identifier=7)
+    assert mock_token.create.call_count == 2
+
+    # Já descobertos: nenhum RPC
+    token_registry.get_many(["0xa", "0xb"], ethereum_service)
+    ethereum_service.multicall.assert_called_once()
+
+def test_registry_does_not_persist_failed_reads(ethereum_service, mock_token):
+    ethereum_service.multicall.return_value = [ContractLogicError("execution reverted"), 18]
+
+    with pytest.raises(ContractLogicError):
+        token_registry.get("0xa", ethereum_service)
+    mock_token.create.assert_not_called()
+
+def test_registry_is_per_chain(ethereum_service, mock_token):
+    ethereum_service.multicall.return_value = ["AAA", 18]
+    token_registry.get("0xa", ethereum_service)
+
+    other_chain = MagicMock(chain_id=1)
+    other_chain.multicall.return_value = ["BBB", 6]
+
+    assert token_registry.get("0xa", other_chain).symbol == "BBB"
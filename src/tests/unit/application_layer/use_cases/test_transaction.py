@@ -1,6 +1,10 @@
+import threading
 import pytest
 from unittest.mock import patch, MagicMock
-from main.application_layer.use_cases.transaction import TransactionUseCase
+from flask import current_app
+from main.application_layer.use_cases.transaction import TransactionUseCase, is_whitelist, _validation_cache
+from main.application_layer.use_cases.tokens import token_registry
+from main.domain_layer.models.token import Token
 from main.app import create_app
 
 @pytest.fixture(autouse=True)
@@ -8,6 +12,34 @@ def app_context():
     with create_app().app_context():
         yield
         
+@pytest.fixture(autouse=True)
+def mock_chain_cache():
+    with patch("main.application_layer.use_cases.transaction.get_chain_cache") as mock:
+        yield mock
+
+@pytest.fixture(autouse=True)
+def mock_token():
+    token_registry.clear()
+    with patch("main.application_layer.use_cases.tokens.Token") as mock_token_cls:
+        mock_token_cls.get.return_value = []
+        mock_token_cls.create.side_effect = lambda **kwargs: Token(**kwargs)
+        yield mock_token_cls
+    token_registry.clear()
+
+@pytest.fixture(autouse=True)
+def mock_whitelist_version():
+    _validation_cache.clear()
+    with patch("main.application_layer.use_cases.transaction.whitelist_version") as mock:
+        mock.return_value = 1
+        yield mock
+    _validation_cache.clear()
+
+@pytest.fixture(autouse=True)
+def mock_validation_lock():
+    with patch("main.application_layer.use_cases.transaction.ValidationLock") as mock:
+        mock.acquire.return_value = True
+        yield mock
+
 @pytest.fixture
 def use_case():
     return TransactionUseCase()
@@ -28,7 +60,7 @@ def test_validate_already_registered(mock_w3, mock_is_whitelist, mock_ethereum_s
 def test_validate_contract_creation(mock_w3, mock_is_whitelist, mock_ethereum_service, mock_transaction, use_case):
     mock_transaction.get.return_value = None
     eth_service = mock_ethereum_service.return_value
-    eth_service.get_transaction.return_value = {"to": None}
+    eth_service.batch.return_value = [{"to": None}, {}]
     result = use_case.validate("0xabc")
     assert result == {"valid": False, "reason": "Contract creation"}
 
@@ -39,8 +71,7 @@ def test_validate_contract_creation(mock_w3, mock_is_whitelist, mock_ethereum_se
 def test_validate_eth_transfer_not_whitelisted(mock_w3, mock_is_whitelist, mock_ethereum_service, mock_transaction, use_case):
     mock_transaction.get.return_value = None
     eth_service = mock_ethereum_service.return_value
-    eth_service.get_transaction.return_value = {"to": "0xabc", "input": "0x", "value": 100}
-    eth_service.get_transaction_receipt.return_value = {}
+    eth_service.batch.return_value = [{"to": "0xabc", "input": "0x", "value": 100}, {}]
     eth_service.to_checksum_address.return_value = "0xabc"
     mock_is_whitelist.return_value = True
     result = use_case.validate("0xdef")
@@ -53,8 +84,7 @@ def test_validate_eth_transfer_not_whitelisted(mock_w3, mock_is_whitelist, mock_
 def test_validate_eth_transfer_success(mock_w3, mock_is_whitelist, mock_ethereum_service, mock_transaction, use_case):
     mock_transaction.get.return_value = None
     eth_service = mock_ethereum_service.return_value
-    eth_service.get_transaction.return_value = {"to": "0xabc", "input": "0x", "value": 1000000000000000000}
-    eth_service.get_transaction_receipt.return_value = {}
+    eth_service.batch.return_value = [{"to": "0xabc", "input": "0x", "value": 1000000000000000000}, {}]
     eth_service.to_checksum_address.return_value = "0xabc"
     eth_service.from_wei.return_value = 1
     mock_is_whitelist.return_value = False
@@ -74,13 +104,13 @@ def test_validate_erc20_transfer_not_whitelisted(mock_w3, mock_is_whitelist, moc
     eth_service = mock_ethereum_service.return_value
     mock_w3.keccak.return_value.hex.return_value = "0xa9059cbb"
     tx = {"to": "0xcontract", "input": "0xa9059cbb", "value": 0}
-    eth_service.get_transaction.return_value = tx
     log = {
         "topics": [MagicMock(hex=MagicMock(return_value="0xa9059cbb")), None, MagicMock(hex=MagicMock(return_value="0x000000000000000000000000abcdefabcdefabcdefabcdefabcdefabcdef"))],
         "address": "0xcontract",
         "data": MagicMock(hex=MagicMock(return_value="0x00000000000000000000000000000000000000000000000000000000000003e8"))
     }
-    eth_service.get_transaction_receipt.return_value = {"logs": [log]}
+    eth_service.batch.return_value = [tx, {"logs": [log], "blockNumber": 7}]
+    eth_service.multicall.return_value = ["TKN", 18]
     eth_service.to_checksum_address.return_value = "0xabcdefabcdefabcdefabcdefabcdefabcdefabcdef"
     mock_is_whitelist.return_value = True
     result = use_case.validate("0x789")
@@ -95,23 +125,22 @@ def test_validate_erc20_transfer_success(mock_w3, mock_is_whitelist, mock_ethere
     eth_service = mock_ethereum_service.return_value
     mock_w3.keccak.return_value.hex.return_value = "0xa9059cbb"
     tx = {"to": "0xcontract", "input": "0xa9059cbb", "value": 0}
-    eth_service.get_transaction.return_value = tx
     log = {
         "topics": [MagicMock(hex=MagicMock(return_value="0xa9059cbb")), None, MagicMock(hex=MagicMock(return_value="0x000000000000000000000000abcdefabcdefabcdefabcdefabcdefabcdef"))],
         "address": "0xcontract",
         "data": MagicMock(hex=MagicMock(return_value="0x00000000000000000000000000000000000000000000000000000000000003e8"))
     }
-    eth_service.get_transaction_receipt.return_value = {"logs": [log]}
+    eth_service.batch.return_value = [tx, {"logs": [log], "blockNumber": 7}]
+    eth_service.multicall.return_value = ["TKN", 18]
     eth_service.to_checksum_address.return_value = "0xabcdefabcdefabcdefabcdefabcdefabcdefabcdef"
     mock_is_whitelist.return_value = False
 
-    contract_mock = MagicMock()
-    contract_mock.functions.symbol().call.return_value = "TKN"
-    contract_mock.functions.decimals().call.return_value = 18
-    eth_service.contract.return_value = contract_mock
-
     mock_transaction.create = MagicMock()
     result = use_case.validate("0x101")
+    eth_service.batch.assert_called_once_with([("get_transaction", "0x101"), ("get_transaction_receipt", "0x101")])
+    contract_functions = eth_service.contract.return_value.functions
+    eth_service.multicall.assert_called_once_with(
+        [contract_functions.symbol.return_value, contract_functions.decimals.return_value], block_identifier=7)
     assert result["valid"] is True
     assert result["transfers"][0]["asset"] == "TKN"
     assert result["transfers"][0]["to"] == "0xabcdefabcdefabcdefabcdefabcdefabcdefabcdef"
@@ -124,7 +153,387 @@ def test_validate_erc20_transfer_success(mock_w3, mock_is_whitelist, mock_ethere
 def test_validate_no_valid_transfers(mock_w3, mock_is_whitelist, mock_ethereum_service, mock_transaction, use_case):
     mock_transaction.get.return_value = None
     eth_service = mock_ethereum_service.return_value
-    eth_service.get_transaction.return_value = {"to": "0xabc", "input": "0x", "value": 0}
-    eth_service.get_transaction_receipt.return_value = {"logs": []}
+    eth_service.batch.return_value = [{"to": "0xabc", "input": "0x", "value": 0}, {"logs": []}]
     result = use_case.validate("0x202")
-    assert result == {"valid": False, "reason": "No valid transfers to whitelisted addresses"}
\ No newline at end of file
+    assert result == {"valid": False, "reason": "No valid transfers to whitelisted addresses"}
+
+@patch("main.application_layer.use_cases.transaction.Transaction")
+@patch("main.application_layer.use_cases.transaction.EthereumService")
+@patch("main.application_layer.use_cases.transaction.is_whitelist")
+@patch("main.application_layer.use_cases.transaction.w3")
+def test_validate_raises_batch_error(mock_w3, mock_is_whitelist, mock_ethereum_service, mock_transaction, use_case):
+    mock_transaction.get.return_value = None
+    mock_ethereum_service.return_value.batch.return_value = [Exception("not found"), {}]
+    with pytest.raises(Exception, match="not found"):
+        use_case.validate("0x303")
+
+@patch("main.application_layer.use_cases.transaction.Address")
+@patch("main.application_layer.use_cases.transaction.get_whitelist_index")
+def test_is_whitelist_uses_index_without_database(mock_get_whitelist_index, mock_address):
+    mock_get_whitelist_index.return_value.contains.return_value = True
+    assert is_whitelist(address="0xabc") is True
+    mock_get_whitelist_index.return_value.contains.assert_called_once_with("0xabc")
+    mock_address.get.assert_not_called()
+
+@patch("main.application_layer.use_cases.transaction.Address")
+@patch("main.application_layer.use_cases.transaction.get_whitelist_index")
+def test_is_whitelist_without_index_queries_database(mock_get_whitelist_index, mock_address):
+    mock_get_whitelist_index.return_value = None
+    assert is_whitelist(address="0xabc") == mock_address.get.return_value
+    mock_address.get.assert_called_once_with(address="0xabc")
+
+def batch_by_hash(transactions):
+    """EthereumService.batch answering get_transaction/get_transaction_receipt
+    pairs from a dict of hash -> (tx, receipt)."""
+    def batch(requests):
+        results = []
+        for method, tx_hash in requests:
+            value = transactions[tx_hash]
+            if isinstance(value, Exception):
+                results.append(value)
+            else:
+                results.append(value[0] if method == "get_transaction" else value[1])
+        return results
+    return batch
+
+ETH_TX = ({"to": "0xdest", "input": "0x", "value": 10 ** 18}, {"logs": [], "blockNumber": 5})
+
+@patch("main.application_layer.use_cases.transaction.Transaction")
+@patch("main.application_layer.use_cases.transaction.EthereumService")
+@patch("main.application_layer.use_cases.transaction.is_whitelist")
+@patch("main.application_layer.use_cases.transaction.w3")
+def test_validate_batch(mock_w3, mock_is_whitelist, mock_ethereum_service, mock_transaction, use_case):
+    mock_transaction.get_registered.return_value = {"0x1"}
+    mock_is_whitelist.return_value = False
+    eth_service = mock_ethereum_service.return_value
+    eth_service.to_checksum_address.side_effect = lambda address: address
+    eth_service.from_wei.return_value = 1
+    eth_service.batch.side_effect = batch_by_hash({
+        "0x2": ETH_TX,
+        "0x3": ({"to": None, "input": "0x60", "value": 0}, {"logs": []}),
+        "0x4": Exception("not found"),
+    })
+
+    results = list(use_case.validate_batch(["0x1", "0x2", "0x1", "0x3", "0x4"]))
+
+    assert results[0] == {"tx_hash": "0x1", "valid": False, "reason": "Transaction 0x1 already registered"}
+    by_hash = {result["tx_hash"]: result for result in results}
+    assert len(results) == 4
+    assert by_hash["0x3"] == {"tx_hash": "0x3", "valid": False, "reason": "Contract creation"}
+    assert by_hash["0x4"] == {"tx_hash": "0x4", "error": "not found"}
+    assert results[-1] == {"tx_hash": "0x2", "valid": True,
+                           "transfers": [{"asset": "ETH", "to": "0xdest", "amount": "1"}]}
+    mock_transaction.get_registered.assert_called_once_with(["0x1", "0x2", "0x3", "0x4"])
+    eth_service.batch.assert_called_once()
+    mock_transaction.create_many.assert_called_once_with(
+        [{"tx_hash": "0x2", "to_address": "0xdest", "asset": "ETH", "value": "1"}])
+
+@patch("main.application_layer.use_cases.transaction.Transaction")
+@patch("main.application_layer.use_cases.transaction.EthereumService")
+@patch("main.application_layer.use_cases.transaction.is_whitelist")
+@patch("main.application_layer.use_cases.transaction.w3")
+def test_validate_batch_fetches_chunks_concurrently(mock_w3, mock_is_whitelist, mock_ethereum_service, mock_transaction, use_case):
+    from flask import current_app
+    current_app.config["VALIDATE_BATCH_CHUNK_SIZE"] = 2
+    mock_transaction.get_registered.return_value = set()
+    mock_is_whitelist.return_value = False
+    eth_service = mock_ethereum_service.return_value
+    eth_service.to_checksum_address.side_effect = lambda address: address
+    eth_service.from_wei.return_value = 1
+    eth_service.batch.side_effect = batch_by_hash({f"0x{index}": ETH_TX for index in range(5)})
+
+    results = list(use_case.validate_batch([f"0x{index}" for index in range(5)]))
+
+    assert all(result["valid"] for result in results)
+    assert sorted(len(call.args[0]) for call in eth_service.batch.call_args_list) == [2, 4, 4]
+    # Todas as linhas num único INSERT
+    mock_transaction.create_many.assert_called_once()
+    assert len(mock_transaction.create_many.call_args.args[0]) == 5
+
+@patch("main.application_layer.use_cases.transaction.Transaction")
+@patch("main.application_layer.use_cases.transaction.EthereumService")
+@patch("main.application_layer.use_cases.transaction.is_whitelist")
+@patch("main.application_layer.use_cases.transaction.w3")
+def test_validate_batch_resolves_tokens_once(mock_w3, mock_is_whitelist, mock_ethereum_service, mock_transaction, use_case):
+    mock_transaction.get_registered.return_value = set()
+    mock_is_whitelist.return_value = False
+    mock_w3.keccak.return_value.hex.return_value = "0xa9059cbb"
+    eth_service = mock_ethereum_service.return_value
+    eth_service.to_checksum_address.side_effect = lambda address: address
+    eth_service.multicall.return_value = ["TKN", 6]
+
+    def token_tx(block):
+        log = {
+            "topics": [MagicMock(hex=MagicMock(return_value="0xa9059cbb")), None,
+                       MagicMock(hex=MagicMock(return_value="0x" + "ab" * 32))],
+            "address": "0xtoken",
+            "data": MagicMock(hex=MagicMock(return_value="0x" + "00" * 29 + "0f4240")),
+        }
+        return {"to": "0xtoken", "input": "0xa9059cbb", "value": 0}, {"logs": [log], "blockNumber": block}
+
+    eth_service.batch.side_effect = batch_by_hash({"0x1": token_tx(7), "0x2": token_tx(9)})
+
+    results = list(use_case.validate_batch(["0x1", "0x2"]))
+
+    assert [result["transfers"][0]["amount"] for result in results] == ["1.0", "1.0"]
+    eth_service.multicall.assert_called_once()
+    assert eth_service.multicall.call_args.kwargs == {"block_identifier": 9}
+
+@patch("main.application_layer.use_cases.transaction.Transaction")
+@patch("main.application_layer.use_cases.transaction.EthereumService")
+@patch("main.application_layer.use_cases.transaction.is_whitelist")
+@patch("main.application_layer.use_cases.transaction.w3")
+def test_validate_batch_registered_concurrently(mock_w3, mock_is_whitelist, mock_ethereum_service, mock_transaction, use_case):
+    from sqlalchemy.exc import IntegrityError
+    mock_transaction.get_registered.side_effect = [set(), {"0x2"}]
+    mock_transaction.create_many.side_effect = IntegrityError("insert", {}, Exception("unique"))
+    mock_transaction.create_each.return_value = {"0x2"}
+    mock_is_whitelist.return_value = False
+    eth_service = mock_ethereum_service.return_value
+    eth_service.to_checksum_address.side_effect = lambda address: address
+    eth_service.from_wei.return_value = 1
+    eth_service.batch.side_effect = batch_by_hash({"0x2": ETH_TX, "0x3": ETH_TX})
+
+    results = {result["tx_hash"]: result for result in use_case.validate_batch(["0x2", "0x3"])}
+
+    assert results["0x2"] == {"tx_hash": "0x2", "valid": False, "reason": "Transaction 0x2 already registered"}
+    assert results["0x3"]["valid"] is True
+    assert set(mock_transaction.create_each.call_args.args[0]) == {"0x2", "0x3"}
+    assert mock_transaction.get_registered.call_args.args[0] == ["0x2"]
+
+@patch("main.application_layer.use_cases.transaction.Transaction")
+@patch("main.application_layer.use_cases.transaction.EthereumService")
+@patch("main.application_layer.use_cases.transaction.is_whitelist")
+@patch("main.application_layer.use_cases.transaction.w3")
+def test_validate_batch_isolates_transaction_with_several_transfers(mock_w3, mock_is_whitelist, mock_ethereum_service, mock_transaction, use_case):
+    mock_transaction.get_registered.return_value = set()
+    mock_is_whitelist.return_value = False
+    mock_w3.keccak.return_value.hex.return_value = "0xa9059cbb"
+    eth_service = mock_ethereum_service.return_value
+    eth_service.to_checksum_address.side_effect = lambda address: address
+    eth_service.from_wei.return_value = 1
+    eth_service.multicall.return_value = ["TKN", 6]
+
+    def transfer_log(recipient):
+        return {
+            "topics": [MagicMock(hex=MagicMock(return_value="0xa9059cbb")), None,
+                       MagicMock(hex=MagicMock(return_value="0x" + recipient * 32))],
+            "address": "0xtoken",
+            "data": MagicMock(hex=MagicMock(return_value="0x" + "00" * 29 + "0f4240")),
+        }
+
+    eth_service.batch.side_effect = batch_by_hash({
+        "0x1": ({"to": "0xtoken", "input": "0xa9059cbb", "value": 0},
+                {"logs": [transfer_log("ab"), transfer_log("cd")], "blockNumber": 7}),
+        "0x2": ETH_TX,
+    })
+
+    results = {result["tx_hash"]: result for result in use_case.validate_batch(["0x1", "0x2"])}
+
+    assert results["0x1"] == {"tx_hash": "0x1", "error": "Transaction 0x1 has several transfers to register"}
+    assert results["0x2"]["valid"] is True
+    mock_transaction.create_many.assert_called_once_with(
+        [{"tx_hash": "0x2", "to_address": "0xdest", "asset": "ETH", "value": "1"}])
+
+@patch("main.application_layer.use_cases.transaction.Transaction")
+@patch("main.application_layer.use_cases.transaction.EthereumService")
+@patch("main.application_layer.use_cases.transaction.is_whitelist")
+@patch("main.application_layer.use_cases.transaction.w3")
+def test_validate_repeat_served_from_cache(mock_w3, mock_is_whitelist, mock_ethereum_service, mock_transaction, use_case):
+    mock_transaction.get.return_value = None
+    eth_service = mock_ethereum_service.return_value
+    eth_service.batch.return_value = [{"to": "0xabc", "input": "0x", "value": 0}, {"logs": [], "blockNumber": 5}]
+    eth_service.cache.is_final.return_value = True
+    first = use_case.validate("0x404")
+    second = use_case.validate("0x404".upper().replace("0X", "0x"))
+    assert first == second == {"valid": False, "reason": "No valid transfers to whitelisted addresses"}
+    eth_service.batch.assert_called_once()
+    mock_transaction.get.assert_called_once()
+
+@patch("main.application_layer.use_cases.transaction.Transaction")
+@patch("main.application_layer.use_cases.transaction.EthereumService")
+@patch("main.application_layer.use_cases.transaction.is_whitelist")
+@patch("main.application_layer.use_cases.transaction.w3")
+def test_validate_recomputed_when_whitelist_changes(mock_w3, mock_is_whitelist, mock_ethereum_service, mock_transaction,
+                                                    mock_whitelist_version, use_case):
+    mock_transaction.get.return_value = None
+    eth_service = mock_ethereum_service.return_value
+    eth_service.batch.return_value = [{"to": "0xabc", "input": "0x", "value": 100}, {"logs": [], "blockNumber": 5}]
+    eth_service.to_checksum_address.return_value = "0xabc"
+    eth_service.cache.is_final.return_value = True
+    mock_is_whitelist.return_value = True
+    assert use_case.validate("0x505") == {"valid": False, "reason": "Destination not whitelisted"}
+
+    mock_whitelist_version.return_value = 2
+    mock_is_whitelist.return_value = False
+    assert use_case.validate("0x505")["valid"] is True
+    assert eth_service.batch.call_count == 2
+
+@patch("main.application_layer.use_cases.transaction.Transaction")
+@patch("main.application_layer.use_cases.transaction.EthereumService")
+@patch("main.application_layer.use_cases.transaction.is_whitelist")
+@patch("main.application_layer.use_cases.transaction.w3")
+def test_validate_recent_block_cached_briefly(mock_w3, mock_is_whitelist, mock_ethereum_service, mock_transaction, use_case):
+    mock_transaction.get.return_value = None
+    eth_service = mock_ethereum_service.return_value
+    eth_service.batch.return_value = [{"to": None}, {"blockNumber": 5}]
+    eth_service.cache.is_final.return_value = False
+    with patch("main.application_layer.use_cases.transaction.time.monotonic") as mock_monotonic:
+        mock_monotonic.return_value = 1000
+        use_case.validate("0x606")
+        mock_monotonic.return_value = 1000 + current_app.config["VALIDATION_CACHE_RECENT_TTL"]
+        use_case.validate("0x606")
+    assert eth_service.batch.call_count == 2
+
+@patch("main.application_layer.use_cases.transaction.Transaction")
+@patch("main.application_layer.use_cases.transaction.EthereumService")
+@patch("main.application_layer.use_cases.transaction.is_whitelist")
+@patch("main.application_layer.use_cases.transaction.w3")
+def test_validate_errors_not_cached(mock_w3, mock_is_whitelist, mock_ethereum_service, mock_transaction, use_case):
+    mock_transaction.get.return_value = None
+    mock_ethereum_service.return_value.batch.side_effect = [
+        [Exception("not found"), {}], [{"to": None}, {"blockNumber": 5}]]
+    with pytest.raises(Exception, match="not found"):
+        use_case.validate("0x707")
+    assert use_case.validate("0x707") == {"valid": False, "reason": "Contract creation"}
+
+@patch("main.application_layer.use_cases.transaction.Transaction")
+@patch("main.application_layer.use_cases.transaction.EthereumService")
+@patch("main.application_layer.use_cases.transaction.is_whitelist")
+@patch("main.application_layer.use_cases.transaction.w3")
+def test_validate_without_whitelist_version_not_cached(mock_w3, mock_is_whitelist, mock_ethereum_service,
+                                                       mock_transaction, mock_whitelist_version, use_case):
+    mock_whitelist_version.return_value = None
+    mock_transaction.get.return_value = None
+    eth_service = mock_ethereum_service.return_value
+    eth_service.batch.return_value = [{"to": None}, {"blockNumber": 5}]
+    use_case.validate("0x808")
+    use_case.validate("0x808")
+    assert eth_service.batch.call_count == 2
+
+@patch("main.application_layer.use_cases.transaction.Transaction")
+@patch("main.application_layer.use_cases.transaction.EthereumService")
+@patch("main.application_layer.use_cases.transaction.is_whitelist")
+@patch("main.application_layer.use_cases.transaction.w3")
+def test_validate_batch_uses_cache(mock_w3, mock_is_whitelist, mock_ethereum_service, mock_transaction, use_case):
+    mock_transaction.get.return_value = None
+    mock_transaction.get_registered.return_value = set()
+    eth_service = mock_ethereum_service.return_value
+    eth_service.batch.return_value = [{"to": None}, {"blockNumber": 5}]
+    eth_service.cache.is_final.return_value = True
+    use_case.validate("0x909")
+
+    eth_service.batch.side_effect = batch_by_hash({"0x910": ({"to": None}, {"blockNumber": 5})})
+    results = list(use_case.validate_batch(["0x909", "0x910"]))
+
+    assert {"tx_hash": "0x909", "valid": False, "reason": "Contract creation"} in results
+    mock_transaction.get_registered.assert_called_once_with(["0x910"])
+    assert list(use_case.validate_batch(["0x910"])) == [
+        {"tx_hash": "0x910", "valid": False, "reason": "Contract creation"}]
+    assert eth_service.batch.call_count == 2
+
+def in_app_context(target):
+    """Thread target running inside the test's app context."""
+    app = current_app._get_current_object()
+    def run():
+        with app.app_context():
+            target()
+    return run
+
+def test_validate_coalesces_concurrent_calls(use_case, mock_validation_lock):
+    started, release = threading.Event(), threading.Event()
+    waiting = threading.Semaphore(0)
+    calls = []
+
+    def slow_validate(tx_hash):
+        calls.append(tx_hash)
+        started.set()
+        release.wait(5)
+        return {"valid": True, "transfers": []}
+
+    results = []
+    with patch.object(use_case, "_validate", side_effect=slow_validate), \
+            patch("main.application_layer.use_cases.transaction.metrics") as mock_metrics:
+        mock_metrics.increment.side_effect = lambda name: name == "validation_flights.coalesced" and waiting.release()
+        threads = [threading.Thread(target=in_app_context(lambda: results.append(use_case.validate("0xAAA")))) for _ in range(5)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        # Libera o líder só com todos os seguidores esperando
+        for _ in threads[1:]:
+            assert waiting.acquire(timeout=5)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+    assert calls == ["0xAAA"]
+    assert results == [{"valid": True, "transfers": []}] * 5
+    mock_validation_lock.acquire.assert_called_once()
+    mock_validation_lock.complete.assert_called_once()
+
+def test_validate_cached_skips_flight_and_lock(use_case, mock_validation_lock):
+    with patch("main.application_layer.use_cases.transaction.cached_validation",
+               return_value={"valid": True, "transfers": []}), \
+            patch.object(use_case, "_validate") as mock_validate:
+        assert use_case.validate("0xAAA") == {"valid": True, "transfers": []}
+
+    mock_validate.assert_not_called()
+    mock_validation_lock.acquire.assert_not_called()
+
+def test_validate_shares_leader_error(use_case, mock_validation_lock):
+    started, release = threading.Event(), threading.Event()
+    waiting = threading.Semaphore(0)
+
+    def failing_validate(tx_hash):
+        started.set()
+        release.wait(5)
+        raise ValueError("rpc down")
+
+    errors = []
+
+    def call():
+        try:
+            use_case.validate("0xbbb")
+        except ValueError as e:
+            errors.append(e)
+
+    with patch.object(use_case, "_validate", side_effect=failing_validate) as mock_validate, \
+            patch("main.application_layer.use_cases.transaction.metrics") as mock_metrics:
+        mock_metrics.increment.side_effect = lambda name: waiting.release()
+        leader = threading.Thread(target=in_app_context(call))
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=in_app_context(call))
+        follower.start()
+        assert waiting.acquire(timeout=5)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+    assert len(errors) == 2 and errors[0] is errors[1]
+    mock_validate.assert_called_once()
+    mock_validation_lock.release.assert_called_once()
+    mock_validation_lock.complete.assert_not_called()
+
+def test_validate_shares_result_of_other_worker(use_case, mock_validation_lock):
+    mock_validation_lock.acquire.return_value = False
+    mock_validation_lock.get.side_effect = [
+        MagicMock(result=None), MagicMock(result={"valid": True, "transfers": []})]
+
+    with patch.object(use_case, "_validate") as mock_validate:
+        assert use_case.validate("0xccc") == {"valid": True, "transfers": []}
+
+    mock_validate.assert_not_called()
+    assert mock_validation_lock.get.call_count == 2
+
+def test_validate_takes_over_released_claim(use_case, mock_validation_lock):
+    mock_validation_lock.acquire.side_effect = [False, True]
+    mock_validation_lock.get.return_value = None
+
+    with patch.object(use_case, "_validate", return_value={"valid": False, "reason": "Contract creation"}):
+        assert use_case.validate("0xddd") == {"valid": False, "reason": "Contract creation"}
+
+    mock_validation_lock.complete.assert_called_once_with(
+        tx_hash="0xddd", owner=mock_validation_lock.acquire.call_args.kwargs["owner"],
+        result={"valid": False, "reason": "Contract creation"})
@@ -1,35 +1,66 @@
 import pytest
+import requests
 from unittest.mock import patch, MagicMock
 from flask import Flask
+from urllib3.exceptions import NewConnectionError
+from web3.exceptions import Web3RPCError
 
 from main.application_layer.use_cases.transfer import (
-    TransferUseCase, get_token_address, get_nonce_lock, ERC20_ABI
+    APPROVE_GAS, TransferUseCase, get_token_address, allocate_nonce, release_nonce, ERC20_ABI
 )
+from main.application_layer.use_cases.tokens import MAX_UINT256, TOKENS, encode_approve, encode_transfer, token_registry
+from main.domain_layer.models.token import Token
 
 @pytest.fixture
 def app():
     app = Flask(__name__)
     app.config['TESTING'] = True
+    app.config['RPC_BROADCAST_ALL'] = True
     return app
 
+@pytest.fixture(autouse=True)
+def mock_fees():
+    with patch("main.application_layer.use_cases.transfer.FeeUseCase") as mock_fee_usecase:
+        mock_fee_usecase.return_value.quote.return_value = {
+            'maxFeePerGas': 250, 'maxPriorityFeePerGas': 50
+        }
+        yield mock_fee_usecase
+
+@pytest.fixture(autouse=True)
+def mock_gas_limits():
+    with patch("main.application_layer.use_cases.transfer.GasLimitUseCase") as mock_gas_limit_usecase:
+        mock_gas_limit_usecase.return_value.recipient_class.return_value = "fresh"
+        mock_gas_limit_usecase.return_value.gas_limit.return_value = 65000
+        yield mock_gas_limit_usecase
+
+@pytest.fixture(autouse=True)
+def known_tokens():
+    token_registry.clear()
+    with patch("main.application_layer.use_cases.tokens.Token") as mock_token:
+        mock_token.get.side_effect = lambda chain_id: [Token(chain_id, TOKENS["USDC"], "USDC", 6)]
+        yield mock_token
+    token_registry.clear()
+
 @pytest.fixture
 def use_case():
     return TransferUseCase()
 
+def connection_refused():
+    return requests.ConnectionError(NewConnectionError(None, "Connection refused"))
+
 @pytest.fixture
 def mock_ethereum_service():
     mock = MagicMock()
     mock.to_checksum_address.side_effect = lambda x: x
     mock.to_checksum_address.return_value = "0x65aFADD39029741B3b8f0756952C74678c9cEC93"
     mock.to_wei.side_effect = lambda amount, unit: int(float(amount) * 1e18)
-    mock.contract.return_value.functions.decimals.return_value.call.return_value = 6
     mock.contract.return_value.functions.transfer.return_value.build_transaction.return_value = {
         'from': '0xfrom',
         'nonce': 1,
         'gasPrice': 100,
     }
     mock.estimate_gas.return_value = 21000
-    mock.sign_transaction.return_value = MagicMock(rawTransaction=b'rawtx')
+    mock.sign_transaction.return_value = MagicMock(raw_transaction=b'rawtx')
     mock.send_raw_transaction.return_value = MagicMock(hex=lambda: '0xtxhash')
     mock.wait_for_transaction_receipt.return_value = MagicMock(gasUsed=21000, status=1)
     return mock
@@ -45,26 +76,48 @@ def test_get_token_address_unsupported_token(mock_ethereum_service):
     with pytest.raises(ValueError):
         get_token_address("ABC", mock_ethereum_service)
 
-def test_get_nonce_lock_threadsafe():
-    lock1 = get_nonce_lock("0xabc")
-    lock2 = get_nonce_lock("0xabc")
-    assert lock1 is lock2
+@patch("main.application_layer.use_cases.transfer.Nonce")
+def test_allocate_nonce_reads_chain_only_when_untracked(mock_nonce, mock_ethereum_service):
+    mock_nonce.allocate.return_value = 5
+    assert allocate_nonce("0xabc", mock_ethereum_service) == 5
+    mock_ethereum_service.get_transaction_count.assert_not_called()
+
+    chain_nonce = mock_nonce.allocate.call_args.kwargs["chain_nonce"]
+    mock_ethereum_service.get_transaction_count.return_value = 3
+    assert chain_nonce() == 3
+    mock_ethereum_service.get_transaction_count.assert_called_once_with("0xabc", "pending")
 
+@patch("main.application_layer.use_cases.transfer.Nonce")
+def test_release_nonce_fills_gap_without_rewinding(mock_nonce, mock_ethereum_service):
+    mock_nonce.release.return_value = False
+    mock_ethereum_service.chain_id = 1
+    release_nonce("0xabc", 5, mock_ethereum_service, "privkey", count=2)
+    mock_nonce.resync.assert_not_called()
+    fillers = [c.args[0] for c in mock_ethereum_service.sign_transaction.call_args_list]
+    assert [(tx["nonce"], tx["to"], tx["value"]) for tx in fillers] == [(5, "0xabc", 0), (6, "0xabc", 0)]
+    assert mock_ethereum_service.send_raw_transaction.call_count == 2
+
+@patch("main.application_layer.use_cases.transfer.Nonce")
+def test_release_nonce_without_gap(mock_nonce, mock_ethereum_service):
+    mock_nonce.release.return_value = True
+    release_nonce("0xabc", 5, mock_ethereum_service, "privkey")
+    mock_nonce.resync.assert_not_called()
+    mock_ethereum_service.send_raw_transaction.assert_not_called()
+
+@patch("main.application_layer.use_cases.transfer.Nonce")
 @patch("main.application_layer.use_cases.transfer.EthereumService")
 @patch("main.application_layer.use_cases.transfer.Transfer")
 @patch("main.application_layer.use_cases.transfer.db")
 @patch("main.application_layer.use_cases.transfer.w3")
-def test_execute_eth_success(mock_w3, mock_db, mock_transfer, mock_eth_service, app, use_case):
+def test_execute_eth_success(mock_w3, mock_db, mock_transfer, mock_eth_service, mock_nonce, app, use_case):
     mock_eth_service.return_value = MagicMock()
     mock_eth_service.return_value.to_checksum_address.side_effect = lambda x: x
     mock_eth_service.return_value.to_wei.side_effect = lambda amount, unit: int(float(amount) * 1e18)
-    mock_w3.eth.get_transaction_count.return_value = 1
-    mock_w3.eth.gas_price = 100
-    mock_w3.eth.account.sign_transaction.return_value = MagicMock(rawTransaction=b'rawtx')
-    mock_eth_service.return_value.send_raw_transaction.return_value = MagicMock(hex=lambda: '0xtxhash')
+    mock_nonce.allocate.return_value = 1
+    mock_eth_service.return_value.sign_transaction.return_value = MagicMock(
+        raw_transaction=b'rawtx', hash=MagicMock(to_0x_hex=lambda: '0xtxhash'))
     mock_eth_service.return_value.wait_for_transaction_receipt.return_value = MagicMock(gasUsed=21000, status=1)
-    mock_transfer.create.return_value = MagicMock(uuid="uuid")
-    mock_transfer.update_tx_hash.return_value = None
+    mock_transfer.create.return_value = MagicMock(uuid="uuid", tx_hash="0xtxhash")
     mock_transfer.update_confirmation.return_value = None
 
     with app.test_request_context():
@@ -78,47 +131,89 @@ def test_execute_eth_success(mock_w3, mock_db, mock_transfer, mock_eth_service,
         assert resp.status_code == 200 or resp.status_code is None
         assert "tx_hash" in resp.json
         assert resp.json["status"] == "confirmed"
+    mock_eth_service.assert_called_once_with(w3=mock_w3, broadcast=True)
+    tx = mock_eth_service.return_value.sign_transaction.call_args.args[0]
+    assert tx['type'] == 2
+    assert tx['maxFeePerGas'] == 250
+    assert tx['maxPriorityFeePerGas'] == 50
+    assert 'gasPrice' not in tx
+
+@patch("main.application_layer.use_cases.transfer.Nonce")
+@patch("main.application_layer.use_cases.transfer.EthereumService")
+@patch("main.application_layer.use_cases.transfer.Transfer")
+@patch("main.application_layer.use_cases.transfer.db")
+@patch("main.application_layer.use_cases.transfer.w3")
+def test_execute_timeout_leaves_transfer_sent(mock_w3, mock_db, mock_transfer, mock_eth_service, mock_nonce, app, use_case):
+    from web3.exceptions import TimeExhausted
+
+    mock_eth_service.return_value.to_checksum_address.side_effect = lambda x: x
+    mock_eth_service.return_value.to_wei.side_effect = lambda amount, unit: int(float(amount) * 1e18)
+    mock_nonce.allocate.return_value = 1
+    mock_eth_service.return_value.sign_transaction.return_value = MagicMock(
+        raw_transaction=b'rawtx', hash=MagicMock(to_0x_hex=lambda: '0xtxhash'))
+    mock_eth_service.return_value.wait_for_transaction_receipt.side_effect = TimeExhausted("timeout")
+    mock_transfer.create.return_value = MagicMock(uuid="uuid", tx_hash="0xtxhash")
+
+    with app.test_request_context():
+        resp, status_code = use_case.execute(
+            from_address="0xfrom",
+            private_key="privkey",
+            to_address="0xto",
+            asset="ETH",
+            amount="1.0"
+        )
+        assert status_code == 202
+        assert resp.json["status"] == "sent"
+    mock_transfer.update_confirmation.assert_not_called()
+    mock_transfer.update_status.assert_not_called()
 
+@patch("main.application_layer.use_cases.transfer.Nonce")
 @patch("main.application_layer.use_cases.transfer.EthereumService")
 @patch("main.application_layer.use_cases.transfer.Transfer")
 @patch("main.application_layer.use_cases.transfer.db")
 @patch("main.application_layer.use_cases.transfer.w3")
-def test_execute_token_success(mock_w3, mock_db, mock_transfer, mock_eth_service, app, use_case):
+def test_execute_token_success(mock_w3, mock_db, mock_transfer, mock_eth_service, mock_nonce, app, use_case):
     mock_eth_service.return_value = MagicMock()
     mock_eth_service.return_value.to_checksum_address.side_effect = lambda x: x
-    mock_eth_service.return_value.contract.return_value.functions.decimals.return_value.call.return_value = 6
     mock_eth_service.return_value.contract.return_value.functions.transfer.return_value.build_transaction.return_value = {
         'from': '0xfrom',
         'nonce': 1,
         'gasPrice': 100,
     }
     mock_eth_service.return_value.estimate_gas.return_value = 21000
-    mock_eth_service.return_value.sign_transaction.return_value = MagicMock(rawTransaction=b'rawtx')
-    mock_eth_service.return_value.send_raw_transaction.return_value = MagicMock(hex=lambda: '0xtxhash')
+    mock_eth_service.return_value.sign_transaction.return_value = MagicMock(
+        raw_transaction=b'rawtx', hash=MagicMock(to_0x_hex=lambda: '0xtxhash'))
     mock_eth_service.return_value.wait_for_transaction_receipt.return_value = MagicMock(gasUsed=21000, status=1)
-    mock_w3.eth.get_transaction_count.return_value = 1
-    mock_w3.eth.gas_price = 100
-    mock_transfer.create.return_value = MagicMock(uuid="uuid")
-    mock_transfer.update_tx_hash.return_value = None
+    mock_nonce.allocate.return_value = 1
+    mock_transfer.create.return_value = MagicMock(uuid="uuid", tx_hash="0xtxhash")
     mock_transfer.update_confirmation.return_value = None
 
     with app.test_request_context():
         resp = use_case.execute(
             from_address="0xfrom",
             private_key="privkey",
-            to_address="0xto",
+            to_address="0x" + "11" * 20,
             asset="USDC",
             amount="1.0"
         )
         assert resp.status_code == 200 or resp.status_code is None
         assert "tx_hash" in resp.json
         assert resp.json["status"] == "confirmed"
+    tx = mock_eth_service.return_value.sign_transaction.call_args.args[0]
+    assert tx['to'] == get_token_address("USDC")
+    assert tx['value'] == 0
+    assert tx['data'] == encode_transfer("0x" + "11" * 20, 10 ** 6)
+    assert tx['gas'] == 65000
+    mock_eth_service.return_value.contract.return_value.functions.transfer.assert_not_called()
+    assert mock_transfer.create.call_args.kwargs["recipient_class"] == "fresh"
+    assert mock_transfer.create.call_args.kwargs["nonce"] == 1
 
+@patch("main.application_layer.use_cases.transfer.Nonce")
 @patch("main.application_layer.use_cases.transfer.EthereumService")
 @patch("main.application_layer.use_cases.transfer.Transfer")
 @patch("main.application_layer.use_cases.transfer.db")
 @patch("main.application_layer.use_cases.transfer.w3")
-def test_execute_invalid_amount(mock_w3, mock_db, mock_transfer, mock_eth_service, app, use_case):
+def test_execute_invalid_amount(mock_w3, mock_db, mock_transfer, mock_eth_service, mock_nonce, app, use_case):
     with app.test_request_context():
         resp = use_case.execute(
             from_address="0xfrom",
@@ -135,4 +230,396 @@ def test_execute_invalid_amount(mock_w3, mock_db, mock_transfer, mock_eth_servic
             status_code = resp.status_code
 
         assert status_code == 400
-        assert "error" in response.json
\ No newline at end of file
+        assert "error" in response.json
+
+@patch("main.application_layer.use_cases.transfer.Nonce")
+@patch("main.application_layer.use_cases.transfer.EthereumService")
+@patch("main.application_layer.use_cases.transfer.Transfer")
+@patch("main.application_layer.use_cases.transfer.db")
+@patch("main.application_layer.use_cases.transfer.w3")
+def test_execute_broadcast_failure_marks_error(mock_w3, mock_db, mock_transfer, mock_eth_service, mock_nonce, app, use_case):
+    mock_eth_service.return_value.to_checksum_address.side_effect = lambda x: x
+    mock_eth_service.return_value.to_wei.return_value = 10 ** 18
+    mock_eth_service.return_value.send_raw_transaction.side_effect = connection_refused()
+    mock_nonce.allocate.return_value = 1
+    mock_transfer.create.return_value = MagicMock(uuid="uuid", tx_hash="0xtxhash")
+
+    with app.test_request_context():
+        with pytest.raises(requests.ConnectionError):
+            use_case.execute(
+                from_address="0xfrom",
+                private_key="privkey",
+                to_address="0xto",
+                asset="ETH",
+                amount="1.0"
+            )
+    mock_transfer.update_status.assert_called_once_with(uuid="uuid", status="erro")
+    mock_nonce.release.assert_called_once_with(address="0xfrom", nonce=1, count=1)
+    mock_eth_service.return_value.wait_for_transaction_receipt.assert_not_called()
+
+@pytest.mark.parametrize("error", [
+    requests.ReadTimeout("read timed out"),
+    requests.ConnectionError("Connection reset by peer"),
+])
+@patch("main.application_layer.use_cases.transfer.Nonce")
+@patch("main.application_layer.use_cases.transfer.EthereumService")
+@patch("main.application_layer.use_cases.transfer.Transfer")
+@patch("main.application_layer.use_cases.transfer.db")
+@patch("main.application_layer.use_cases.transfer.w3")
+def test_submit_ambiguous_broadcast_keeps_transfer_sent(mock_w3, mock_db, mock_transfer, mock_eth_service, mock_nonce,
+                                                        error, app, use_case):
+    mock_eth_service.return_value.to_checksum_address.side_effect = lambda x: x
+    mock_eth_service.return_value.to_wei.return_value = 10 ** 18
+    mock_eth_service.return_value.send_raw_transaction.side_effect = error
+    mock_nonce.allocate.return_value = 1
+    mock_transfer.create.return_value = MagicMock(uuid="uuid", tx_hash="0xtxhash", status="sent")
+
+    with app.test_request_context():
+        response, status_code = use_case.submit(
+            from_address="0xfrom",
+            private_key="privkey",
+            to_address="0xto",
+            asset="ETH",
+            amount="1.0"
+        )
+
+    assert status_code == 202
+    assert response.json["status"] == "sent"
+    mock_transfer.update_status.assert_not_called()
+    mock_nonce.release.assert_not_called()
+    mock_nonce.resync.assert_not_called()
+
+@pytest.mark.parametrize("message", ["nonce too low", "insufficient funds for gas * price + value",
+                                     "intrinsic gas too low", "max fee per gas less than block base fee"])
+@patch("main.application_layer.use_cases.transfer.Nonce")
+@patch("main.application_layer.use_cases.transfer.EthereumService")
+@patch("main.application_layer.use_cases.transfer.Transfer")
+@patch("main.application_layer.use_cases.transfer.db")
+@patch("main.application_layer.use_cases.transfer.w3")
+def test_submit_rejected_broadcast_marks_error(mock_w3, mock_db, mock_transfer, mock_eth_service, mock_nonce,
+                                               message, app, use_case):
+    mock_eth_service.return_value.to_checksum_address.side_effect = lambda x: x
+    mock_eth_service.return_value.to_wei.return_value = 10 ** 18
+    mock_eth_service.return_value.send_raw_transaction.side_effect = Web3RPCError(
+        str({"code": -32000, "message": message}))
+    mock_nonce.allocate.return_value = 1
+    mock_transfer.create.return_value = MagicMock(uuid="uuid", tx_hash="0xtxhash", status="sent")
+
+    with app.test_request_context():
+        with pytest.raises(Web3RPCError):
+            use_case.submit(
+                from_address="0xfrom",
+                private_key="privkey",
+                to_address="0xto",
+                asset="ETH",
+                amount="1.0"
+            )
+
+    mock_transfer.update_status.assert_called_once_with(uuid="uuid", status="erro")
+    mock_nonce.release.assert_called_once_with(address="0xfrom", nonce=1, count=1)
+
+@patch("main.application_layer.use_cases.transfer.Nonce")
+@patch("main.application_layer.use_cases.transfer.EthereumService")
+@patch("main.application_layer.use_cases.transfer.Transfer")
+@patch("main.application_layer.use_cases.transfer.db")
+@patch("main.application_layer.use_cases.transfer.w3")
+def test_submit_known_transaction_is_accepted(mock_w3, mock_db, mock_transfer, mock_eth_service, mock_nonce, app, use_case):
+    mock_eth_service.return_value.to_checksum_address.side_effect = lambda x: x
+    mock_eth_service.return_value.to_wei.return_value = 10 ** 18
+    mock_eth_service.return_value.send_raw_transaction.side_effect = Web3RPCError(
+        str({"code": -32000, "message": "already known"}))
+    mock_nonce.allocate.return_value = 1
+    mock_transfer.create.return_value = MagicMock(uuid="uuid", tx_hash="0xtxhash", status="sent")
+
+    with app.test_request_context(), \
+            patch("main.application_layer.use_cases.transfer.logger") as mock_logger:
+        response, status_code = use_case.submit(
+            from_address="0xfrom",
+            private_key="privkey",
+            to_address="0xto",
+            asset="ETH",
+            amount="1.0"
+        )
+
+    assert status_code == 202
+    assert response.json["status"] == "sent"
+    mock_transfer.update_status.assert_not_called()
+    mock_nonce.release.assert_not_called()
+    mock_logger.warning.assert_not_called()
+
+@patch("main.application_layer.use_cases.transfer.Nonce")
+@patch("main.application_layer.use_cases.transfer.EthereumService")
+@patch("main.application_layer.use_cases.transfer.Transfer")
+@patch("main.application_layer.use_cases.transfer.db")
+@patch("main.application_layer.use_cases.transfer.w3")
+def test_submit_returns_accepted_without_waiting(mock_w3, mock_db, mock_transfer, mock_eth_service, mock_nonce, app, use_case):
+    mock_eth_service.return_value.to_checksum_address.side_effect = lambda x: x
+    mock_eth_service.return_value.to_wei.return_value = 10 ** 18
+    mock_eth_service.return_value.sign_transaction.return_value = MagicMock(
+        raw_transaction=b'rawtx', hash=MagicMock(to_0x_hex=lambda: '0xtxhash'))
+    mock_nonce.allocate.return_value = 1
+    mock_transfer.create.return_value = MagicMock(uuid="uuid", tx_hash="0xtxhash", status="sent")
+
+    with app.test_request_context():
+        response, status_code = use_case.submit(
+            from_address="0xfrom",
+            private_key="privkey",
+            to_address="0xto",
+            asset="ETH",
+            amount="1.0"
+        )
+        assert status_code == 202
+        assert response.json["uuid"] == "uuid"
+        assert response.json["tx_hash"] == "0xtxhash"
+        assert response.json["status"] == "sent"
+    mock_eth_service.return_value.send_raw_transaction.assert_called_once_with(b'rawtx')
+    mock_eth_service.return_value.wait_for_transaction_receipt.assert_not_called()
+
+@patch("main.application_layer.use_cases.transfer.TransferReplacement")
+@patch("main.application_layer.use_cases.transfer.Transfer")
+def test_get_transfer_status(mock_transfer, mock_replacement, use_case):
+    mock_transfer.get.return_value = MagicMock(
+        uuid="uuid", tx_hash="0xtxhash", from_address="0xfrom", to_address="0xto",
+        asset="ETH", value=1, status="sent", gas_used=None, gas_price=100)
+    mock_replacement.get_by_transfer.return_value = [MagicMock(tx_hash="0xbump")]
+    result = use_case.get(uuid="uuid")
+    assert result["status"] == "sent"
+    assert result["gas_used"] is None
+    assert result["replacements"] == ["0xbump"]
+    mock_transfer.get.assert_called_once_with(uuid="uuid")
+    mock_replacement.get_by_transfer.assert_called_once_with(transfer_uuid="uuid")
+
+@patch("main.application_layer.use_cases.transfer.Transfer")
+def test_get_transfer_status_not_found(mock_transfer, use_case):
+    mock_transfer.get.return_value = None
+    assert use_case.get(uuid="uuid") is None
+
+@patch("main.application_layer.use_cases.transfer.HotWalletPool")
+def test_sender_defaults_to_hot_wallet_pool(mock_pool, use_case, mock_ethereum_service):
+    mock_pool.return_value.select.return_value = MagicMock(address="0xhot", private_key="hotkey")
+
+    assert use_case._sender(mock_ethereum_service, None, None, "ETH", 1) == ("0xhot", "hotkey")
+    mock_pool.return_value.select.assert_called_once_with(asset="ETH", amount=1)
+
+@patch("main.application_layer.use_cases.transfer.HotWalletPool")
+def test_sender_keeps_explicit_address(mock_pool, use_case, mock_ethereum_service):
+    mock_ethereum_service.to_checksum_address.side_effect = lambda x: x.upper()
+
+    assert use_case._sender(mock_ethereum_service, "0xfrom", "key", "ETH", 1) == ("0XFROM", "key")
+    mock_pool.assert_not_called()
+
+def make_signed(tx_hash):
+    return MagicMock(raw_transaction=tx_hash.encode(), hash=MagicMock(to_0x_hex=lambda: tx_hash))
+
+@patch("main.application_layer.use_cases.transfer.Nonce")
+@patch("main.application_layer.use_cases.transfer.EthereumService")
+@patch("main.application_layer.use_cases.transfer.Transfer")
+@patch("main.application_layer.use_cases.transfer.db")
+@patch("main.application_layer.use_cases.transfer.w3")
+def test_execute_batch_signs_consecutive_nonces(mock_w3, mock_db, mock_transfer, mock_eth_service, mock_nonce, app, use_case, mock_gas_limits):
+    mock_gas_limits.return_value.recipient_classes.return_value = ["holding", "fresh"]
+    eth_service = mock_eth_service.return_value
+    eth_service.to_checksum_address.side_effect = lambda x: x
+    eth_service.to_wei.return_value = 10 ** 18
+    eth_service.contract.return_value.functions.transfer.return_value.build_transaction.return_value = {}
+    eth_service.estimate_gas.return_value = 50000
+    eth_service.sign_transaction.side_effect = [make_signed("0x1"), make_signed("0x2"), make_signed("0x3")]
+    mock_nonce.allocate.return_value = 10
+    mock_transfer.create_many.return_value = ["u1", "u2", "u3"]
+
+    with app.test_request_context():
+        response, status_code = use_case.execute_batch(
+            from_address="0xfrom",
+            private_key="privkey",
+            transfers=[
+                {"to_address": "0xa", "asset": "ETH", "amount": 1},
+                {"to_address": "0x" + "0b" * 20, "asset": "usdc", "amount": "2.5"},
+                {"to_address": "0x" + "0c" * 20, "asset": "USDC", "amount": 3},
+            ]
+        )
+
+    assert status_code == 202
+    assert [t["status"] for t in response.json["transfers"]] == ["sent", "sent", "sent"]
+    assert mock_nonce.allocate.call_args.kwargs["count"] == 3
+    assert [c.args[0]["nonce"] for c in eth_service.sign_transaction.call_args_list[:1]] == [10]
+    # Decimals vêm do registro de tokens, sem RPC
+    eth_service.contract.assert_not_called()
+    rows = mock_transfer.create_many.call_args.kwargs["transfers"]
+    assert [row["tx_hash"] for row in rows] == ["0x1", "0x2", "0x3"]
+    assert [row["nonce"] for row in rows] == [10, 11, 12]
+    # Classes dos destinatários do token num único multicall
+    mock_gas_limits.return_value.recipient_classes.assert_called_once_with("USDC", ["0x" + "0b" * 20, "0x" + "0c" * 20])
+    mock_gas_limits.return_value.recipient_class.assert_not_called()
+    assert [row["recipient_class"] for row in rows] == [None, "holding", "fresh"]
+    assert eth_service.send_raw_transaction.call_count == 3
+
+@patch("main.application_layer.use_cases.transfer.Nonce")
+@patch("main.application_layer.use_cases.transfer.EthereumService")
+@patch("main.application_layer.use_cases.transfer.Transfer")
+@patch("main.application_layer.use_cases.transfer.db")
+@patch("main.application_layer.use_cases.transfer.w3")
+def test_execute_batch_partial_broadcast_failure(mock_w3, mock_db, mock_transfer, mock_eth_service, mock_nonce, app, use_case):
+    eth_service = mock_eth_service.return_value
+    eth_service.to_checksum_address.side_effect = lambda x: x
+    eth_service.to_wei.return_value = 10 ** 18
+    eth_service.sign_transaction.side_effect = [make_signed("0x1"), make_signed("0x2")]
+    eth_service.send_raw_transaction.side_effect = [None, connection_refused()]
+    mock_nonce.allocate.return_value = 10
+    mock_nonce.release.return_value = True
+    mock_transfer.create_many.return_value = ["u1", "u2"]
+
+    with app.test_request_context():
+        response, status_code = use_case.execute_batch(
+            from_address="0xfrom",
+            private_key="privkey",
+            transfers=[
+                {"to_address": "0xa", "asset": "ETH", "amount": 1},
+                {"to_address": "0xb", "asset": "ETH", "amount": 1},
+            ]
+        )
+
+    assert [t["status"] for t in response.json["transfers"]] == ["sent", "erro"]
+    mock_transfer.update_status_many.assert_called_once_with(uuids=["u2"], status="erro")
+    mock_nonce.release.assert_called_once_with(address="0xfrom", nonce=11, count=1)
+
+@patch("main.application_layer.use_cases.transfer.Nonce")
+@patch("main.application_layer.use_cases.transfer.EthereumService")
+@patch("main.application_layer.use_cases.transfer.Transfer")
+@patch("main.application_layer.use_cases.transfer.db")
+@patch("main.application_layer.use_cases.transfer.w3")
+def test_execute_batch_ambiguous_broadcast_keeps_sending(mock_w3, mock_db, mock_transfer, mock_eth_service, mock_nonce, app, use_case):
+    eth_service = mock_eth_service.return_value
+    eth_service.to_checksum_address.side_effect = lambda x: x
+    eth_service.to_wei.return_value = 10 ** 18
+    eth_service.sign_transaction.side_effect = [make_signed("0x1"), make_signed("0x2")]
+    eth_service.send_raw_transaction.side_effect = [requests.ReadTimeout("read timed out"), None]
+    mock_nonce.allocate.return_value = 10
+    mock_transfer.create_many.return_value = ["u1", "u2"]
+
+    with app.test_request_context():
+        response, status_code = use_case.execute_batch(
+            from_address="0xfrom",
+            private_key="privkey",
+            transfers=[
+                {"to_address": "0xa", "asset": "ETH", "amount": 1},
+                {"to_address": "0xb", "asset": "ETH", "amount": 1},
+            ]
+        )
+
+    assert [t["status"] for t in response.json["transfers"]] == ["sent", "sent"]
+    assert eth_service.send_raw_transaction.call_count == 2
+    mock_transfer.update_status_many.assert_not_called()
+    mock_nonce.release.assert_not_called()
+
+@patch("main.application_layer.use_cases.transfer.EthereumService")
+def test_execute_batch_invalid_amount(mock_eth_service, app, use_case):
+    with app.test_request_context():
+        response, status_code = use_case.execute_batch(
+            from_address="0xfrom", private_key="privkey",
+            transfers=[{"to_address": "0xa", "asset": "ETH", "amount": "abc"}])
+    assert status_code == 400
+
+@patch("main.application_layer.use_cases.transfer.Transfer")
+def test_get_batch_aggregates_status(mock_transfer, use_case):
+    mock_transfer.get_by_batch.return_value = [
+        MagicMock(uuid="u1", status="confirmed"), MagicMock(uuid="u2", status="sent")
+    ]
+    result = use_case.get_batch(batch_uuid="batch")
+    assert result["status"] == "sent"
+    assert result["counts"] == {"confirmed": 1, "sent": 1}
+
+    mock_transfer.get_by_batch.return_value = [MagicMock(uuid="u1", status="confirmed")]
+    assert use_case.get_batch(batch_uuid="batch")["status"] == "confirmed"
+
+    mock_transfer.get_by_batch.return_value = []
+    assert use_case.get_batch(batch_uuid="batch") is None
+
+@patch("main.application_layer.use_cases.transfer.Nonce")
+@patch("main.application_layer.use_cases.transfer.EthereumService")
+@patch("main.application_layer.use_cases.transfer.Transfer")
+@patch("main.application_layer.use_cases.transfer.db")
+@patch("main.application_layer.use_cases.transfer.w3")
+def test_execute_batch_multisend_with_approval(mock_w3, mock_db, mock_transfer, mock_eth_service, mock_nonce, app, use_case):
+    multisend_address = "0x" + "22" * 20
+    app.config["MULTISEND_CONTRACT_ADDRESS"] = multisend_address
+    eth_service = mock_eth_service.return_value
+    eth_service.to_checksum_address.side_effect = lambda x: x
+    eth_service.chain_id = 11155111
+    contract = eth_service.contract.return_value
+    contract.address = "0xtoken"
+    contract.functions.allowance.return_value.call.return_value = 0
+    contract.functions.disperseToken.return_value.build_transaction.return_value = {'gas': 140000}
+    eth_service.sign_transaction.side_effect = [make_signed("0xapprove"), make_signed("0xdisperse")]
+    mock_nonce.allocate.return_value = 7
+    mock_transfer.create_many.return_value = ["u1", "u2"]
+
+    with app.test_request_context():
+        response, status_code = use_case.execute_batch(
+            from_address="0xfrom",
+            private_key="privkey",
+            transfers=[
+                {"to_address": "0xa", "asset": "USDC", "amount": 1},
+                {"to_address": "0xb", "asset": "USDC", "amount": 2},
+            ],
+            mode="multisend"
+        )
+
+    assert status_code == 202
+    assert response.json["tx_hash"] == "0xdisperse"
+    assert mock_nonce.allocate.call_args.kwargs["count"] == 2
+    contract.functions.disperseToken.assert_called_once_with("0xtoken", ["0xa", "0xb"], [1000000, 2000000])
+    rows = mock_transfer.create_many.call_args.kwargs["transfers"]
+    assert [row["tx_hash"] for row in rows] == ["0xdisperse", "0xdisperse"]
+    assert [row["approval_tx_hash"] for row in rows] == ["0xapprove", "0xapprove"]
+    assert [row["nonce"] for row in rows] == [8, 8]
+    assert eth_service.send_raw_transaction.call_count == 2
+    # Aprovação codificada localmente, com limite fixo; com ela pendente o
+    # disperse também não é estimado
+    approve_tx = eth_service.sign_transaction.call_args_list[0].args[0]
+    assert approve_tx["data"] == encode_approve(multisend_address, MAX_UINT256)
+    assert (approve_tx["nonce"], approve_tx["gas"], approve_tx["chainId"]) == (7, APPROVE_GAS, 11155111)
+    contract.functions.approve.assert_not_called()
+    eth_service.estimate_gas.assert_not_called()
+
+@patch("main.application_layer.use_cases.transfer.Nonce")
+@patch("main.application_layer.use_cases.transfer.EthereumService")
+@patch("main.application_layer.use_cases.transfer.Transfer")
+@patch("main.application_layer.use_cases.transfer.db")
+@patch("main.application_layer.use_cases.transfer.w3")
+def test_execute_batch_multisend_already_approved(mock_w3, mock_db, mock_transfer, mock_eth_service, mock_nonce, app, use_case):
+    app.config["MULTISEND_CONTRACT_ADDRESS"] = "0xmultisend"
+    eth_service = mock_eth_service.return_value
+    eth_service.to_checksum_address.side_effect = lambda x: x
+    contract = eth_service.contract.return_value
+    contract.functions.allowance.return_value.call.return_value = 10 ** 30
+    contract.functions.disperseToken.return_value.build_transaction.return_value = {}
+    eth_service.estimate_gas.return_value = 80000
+    eth_service.sign_transaction.side_effect = [make_signed("0xdisperse")]
+    mock_nonce.allocate.return_value = 7
+    mock_transfer.create_many.return_value = ["u1"]
+
+    with app.test_request_context():
+        use_case.execute_batch(
+            from_address="0xfrom",
+            private_key="privkey",
+            transfers=[{"to_address": "0xa", "asset": "USDC", "amount": 1}],
+            mode="multisend"
+        )
+
+    assert mock_nonce.allocate.call_args.kwargs["count"] == 1
+    contract.functions.approve.assert_not_called()
+    assert eth_service.sign_transaction.call_args.args[0]['gas'] == 100000
+
+@patch("main.application_layer.use_cases.transfer.EthereumService")
+def test_execute_batch_multisend_rejects_mixed_assets(mock_eth_service, app, use_case):
+    app.config["MULTISEND_CONTRACT_ADDRESS"] = "0xmultisend"
+    mock_eth_service.return_value.to_checksum_address.side_effect = lambda x: x
+    with app.test_request_context():
+        response, status_code = use_case.execute_batch(
+            from_address="0xfrom", private_key="privkey",
+            transfers=[
+                {"to_address": "0xa", "asset": "USDC", "amount": 1},
+                {"to_address": "0xb", "asset": "ETH", "amount": 1},
+            ],
+            mode="multisend")
+    assert status_code == 400
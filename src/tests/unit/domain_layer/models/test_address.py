@@ -38,5 +38,15 @@ def test_create_address(mock_create):
     mock_addr = MagicMock()
     mock_create.return_value = mock_addr
     result = Address.create("0xabc", "privkey")
-    mock_create.assert_called_once_with("0xabc", "privkey")
-    assert result == mock_addr
\ No newline at end of file
+    mock_create.assert_called_once_with("0xabc", "privkey", False)
+    assert result == mock_addr
+
+@patch("main.domain_layer.models.address.SQLAlchemyAddressRepository.get_hot_wallets")
+def test_get_hot_wallets(mock_get_hot_wallets):
+    Address.get_hot_wallets()
+    mock_get_hot_wallets.assert_called_once_with()
+
+@patch("main.domain_layer.models.address.SQLAlchemyAddressRepository.set_hot_wallet")
+def test_set_hot_wallet(mock_set_hot_wallet):
+    Address.set_hot_wallet("0xabc", True)
+    mock_set_hot_wallet.assert_called_once_with(address="0xabc", hot_wallet=True)
\ No newline at end of file
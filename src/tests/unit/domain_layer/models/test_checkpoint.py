@@ -0,0 +1,12 @@
+from unittest.mock import patch
+from main.domain_layer.models.checkpoint import Checkpoint
+
+@patch("main.domain_layer.models.checkpoint.SQLAlchemyCheckpointRepository.get")
+def test_get_calls_repository(mock_get):
+    Checkpoint.get("confirm-transfers")
+    mock_get.assert_called_once_with(name="confirm-transfers")
+
+@patch("main.domain_layer.models.checkpoint.SQLAlchemyCheckpointRepository.save")
+def test_save_calls_repository(mock_save):
+    Checkpoint.save("confirm-transfers", 10)
+    mock_save.assert_called_once_with(name="confirm-transfers", block=10)
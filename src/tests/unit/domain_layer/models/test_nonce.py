@@ -0,0 +1,18 @@
+from unittest.mock import patch
+from main.domain_layer.models.nonce import Nonce
+
+@patch("main.domain_layer.models.nonce.SQLAlchemyNonceRepository.allocate")
+def test_allocate_calls_repository(mock_allocate):
+    chain_nonce = lambda: 1
+    Nonce.allocate("0xabc", chain_nonce, count=2)
+    mock_allocate.assert_called_once_with(address="0xabc", chain_nonce=chain_nonce, count=2)
+
+@patch("main.domain_layer.models.nonce.SQLAlchemyNonceRepository.release")
+def test_release_calls_repository(mock_release):
+    Nonce.release("0xabc", 3)
+    mock_release.assert_called_once_with(address="0xabc", nonce=3, count=1)
+
+@patch("main.domain_layer.models.nonce.SQLAlchemyNonceRepository.resync")
+def test_resync_calls_repository(mock_resync):
+    Nonce.resync("0xabc", 4, force=True)
+    mock_resync.assert_called_once_with(address="0xabc", chain_nonce=4, force=True)
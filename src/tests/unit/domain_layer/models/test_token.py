@@ -0,0 +1,12 @@
+from unittest.mock import patch
+from main.domain_layer.models.token import Token
+
+@patch("main.domain_layer.models.token.SQLAlchemyTokenRepository.get")
+def test_get_calls_repository(mock_get):
+    Token.get(1)
+    mock_get.assert_called_once_with(chain_id=1)
+
+@patch("main.domain_layer.models.token.SQLAlchemyTokenRepository.create")
+def test_create_calls_repository(mock_create):
+    Token.create(1, "0xabc", "TKN", 18)
+    mock_create.assert_called_once_with(chain_id=1, address="0xabc", symbol="TKN", decimals=18)
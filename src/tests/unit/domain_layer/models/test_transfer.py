@@ -27,10 +27,21 @@ def test_get_calls_repository(mock_get):
     Transfer.get()
     mock_get.assert_called_once()
 
+@patch("main.domain_layer.models.transfer.SQLAlchemyTransferRepository.get")
+def test_get_by_uuid_calls_repository(mock_get):
+    uid = uuid4()
+    Transfer.get(uuid=uid)
+    mock_get.assert_called_once_with(uuid=uid)
+
+@patch("main.domain_layer.models.transfer.SQLAlchemyTransferRepository.get_by_status")
+def test_get_by_status_calls_repository(mock_get_by_status):
+    Transfer.get_by_status("sent")
+    mock_get_by_status.assert_called_once_with(status="sent")
+
 @patch("main.domain_layer.models.transfer.SQLAlchemyTransferRepository.create")
 def test_create_calls_repository(mock_create):
     Transfer.create("0xabc", "0xfrom", "0xto", "ETH", 1.0, "pending", 21000.0, 50.0)
-    mock_create.assert_called_once_with("0xabc", "0xfrom", "0xto", "ETH", 1.0, "pending", 21000.0, 50.0)
+    mock_create.assert_called_once_with("0xabc", "0xfrom", "0xto", "ETH", 1.0, "pending", 21000.0, 50.0, None, None)
 
 @patch("main.domain_layer.models.transfer.SQLAlchemyTransferRepository.update_tx_hash")
 def test_update_tx_hash_calls_repository(mock_update):
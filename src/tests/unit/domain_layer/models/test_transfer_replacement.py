@@ -0,0 +1,19 @@
+from unittest.mock import patch
+from main.domain_layer.models.transfer_replacement import TransferReplacement
+
+@patch("main.domain_layer.models.transfer_replacement.SQLAlchemyTransferReplacementRepository.get_by_transfer")
+def test_get_by_transfer_calls_repository(mock_get_by_transfer):
+    TransferReplacement.get_by_transfer("uuid")
+    mock_get_by_transfer.assert_called_once_with(transfer_uuid="uuid")
+
+@patch("main.domain_layer.models.transfer_replacement.SQLAlchemyTransferReplacementRepository.get_replaced_hashes")
+def test_get_replaced_hashes_calls_repository(mock_get_replaced_hashes):
+    TransferReplacement.get_replaced_hashes("sent")
+    mock_get_replaced_hashes.assert_called_once_with(status="sent")
+
+@patch("main.domain_layer.models.transfer_replacement.SQLAlchemyTransferReplacementRepository.create_many")
+def test_create_many_calls_repository(mock_create_many):
+    TransferReplacement.create_many(["uuid"], "0xbump", "0xstuck", 1125, 113, 20)
+    mock_create_many.assert_called_once_with(
+        transfer_uuids=["uuid"], tx_hash="0xbump", replaced_tx_hash="0xstuck",
+        max_fee_per_gas=1125, max_priority_fee_per_gas=113, block=20)
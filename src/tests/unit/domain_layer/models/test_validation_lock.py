@@ -0,0 +1,22 @@
+from unittest.mock import patch
+from main.domain_layer.models.validation_lock import ValidationLock
+
+@patch("main.domain_layer.models.validation_lock.SQLAlchemyValidationLockRepository.get")
+def test_get_calls_repository(mock_get):
+    ValidationLock.get("0xabc")
+    mock_get.assert_called_once_with(tx_hash="0xabc")
+
+@patch("main.domain_layer.models.validation_lock.SQLAlchemyValidationLockRepository.acquire")
+def test_acquire_calls_repository(mock_acquire):
+    ValidationLock.acquire("0xabc", "worker", 30, 5)
+    mock_acquire.assert_called_once_with(tx_hash="0xabc", owner="worker", timeout=30, result_ttl=5)
+
+@patch("main.domain_layer.models.validation_lock.SQLAlchemyValidationLockRepository.complete")
+def test_complete_calls_repository(mock_complete):
+    ValidationLock.complete("0xabc", "worker", {"valid": True})
+    mock_complete.assert_called_once_with(tx_hash="0xabc", owner="worker", result={"valid": True})
+
+@patch("main.domain_layer.models.validation_lock.SQLAlchemyValidationLockRepository.release")
+def test_release_calls_repository(mock_release):
+    ValidationLock.release("0xabc", "worker")
+    mock_release.assert_called_once_with(tx_hash="0xabc", owner="worker")
@@ -78,6 +78,49 @@ def test_validate_failure(mock_tx_usecase, mock_validate_mapping, client):
     data = resp.get_json()
     assert "fail" in data['message']
 
+@patch('main.presentation_layer.views.api.TransactionUseCase')
+def test_validate_batch_streams_ndjson(mock_tx_usecase, client):
+    client.application.config['VALIDATE_BATCH_MAX_HASHES'] = 10
+    mock_tx_usecase.return_value.validate_batch.return_value = iter([
+        {'tx_hash': '0x1', 'valid': False, 'reason': 'Contract creation'},
+        {'tx_hash': '0x2', 'valid': True, 'transfers': []},
+    ])
+    resp = client.post('/api/validate/batch', data=json.dumps({'tx_hashes': ['0x1', '0x2']}),
+                       content_type='application/json')
+    assert resp.status_code == 200
+    assert resp.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    assert [line['tx_hash'] for line in lines] == ['0x1', '0x2']
+    mock_tx_usecase.return_value.validate_batch.assert_called_once_with(tx_hashes=['0x1', '0x2'])
+
+@patch('main.presentation_layer.views.api.TransactionUseCase')
+def test_validate_batch_too_many_hashes(mock_tx_usecase, client):
+    client.application.config['VALIDATE_BATCH_MAX_HASHES'] = 1
+    resp = client.post('/api/validate/batch', data=json.dumps({'tx_hashes': ['0x1', '0x2']}),
+                       content_type='application/json')
+    assert resp.status_code == 400
+    mock_tx_usecase.return_value.validate_batch.assert_not_called()
+
+def test_validate_batch_invalid_payload(client):
+    client.application.config['VALIDATE_BATCH_MAX_HASHES'] = 10
+    resp = client.post('/api/validate/batch', data=json.dumps({'tx_hashes': '0x1'}), content_type='application/json')
+    assert resp.status_code == 400
+    assert "tx_hashes" in resp.get_json()['message']
+
+@patch('main.presentation_layer.views.api.TransactionUseCase')
+def test_validate_batch_stream_error(mock_tx_usecase, client):
+    client.application.config['VALIDATE_BATCH_MAX_HASHES'] = 10
+
+    def results():
+        yield {'tx_hash': '0x1', 'valid': False, 'reason': 'Contract creation'}
+        raise Exception("db down")
+
+    mock_tx_usecase.return_value.validate_batch.return_value = results()
+    resp = client.post('/api/validate/batch', data=json.dumps({'tx_hashes': ['0x1', '0x2']}),
+                       content_type='application/json')
+    lines = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    assert lines[-1] == {'error': 'db down'}
+
 @patch('main.presentation_layer.views.api.TransactionUseCase')
 def test_transactions_success(mock_tx_usecase, client):
     mock_tx_usecase.return_value.get_transanctions.return_value = [{'id': 1}]
@@ -102,6 +145,7 @@ def test_transfer_success(mock_transfer_usecase, mock_transfer_mapping, client):
     mock_transfer_mapping.return_value.to_address = 'to'
     mock_transfer_mapping.return_value.asset = 'asset'
     mock_transfer_mapping.return_value.amount = 10
+    mock_transfer_mapping.return_value.is_async = False
     mock_transfer_usecase.return_value.execute.return_value = {'tx': 'hash'}
     payload = {
         'from_address': 'from',
@@ -123,6 +167,7 @@ def test_transfer_failure(mock_transfer_usecase, mock_transfer_mapping, client):
     mock_transfer_mapping.return_value.to_address = 'to'
     mock_transfer_mapping.return_value.asset = 'asset'
     mock_transfer_mapping.return_value.amount = 10
+    mock_transfer_mapping.return_value.is_async = False
     mock_transfer_usecase.return_value.execute.side_effect = Exception("fail")
     payload = {
         'from_address': 'from',
@@ -134,4 +179,73 @@ def test_transfer_failure(mock_transfer_usecase, mock_transfer_mapping, client):
     resp = client.post('/api/transfer', data=json.dumps(payload), content_type='application/json')
     assert resp.status_code == 400
     data = resp.get_json()
-    assert "fail" in data['message']
\ No newline at end of file
+    assert "fail" in data['message']
+
+@patch('main.presentation_layer.views.api.TransferUseCase')
+def test_transfer_async_uses_submit(mock_transfer_usecase, client):
+    mock_transfer_usecase.return_value.submit.return_value = ({'uuid': 'uuid', 'status': 'sent'}, 202)
+    payload = {
+        'from_address': 'from',
+        'private_key': 'key',
+        'to_address': 'to',
+        'asset': 'ETH',
+        'amount': 10,
+        'async': True
+    }
+    resp = client.post('/api/transfer', data=json.dumps(payload), content_type='application/json')
+    assert resp.status_code == 202
+    assert resp.get_json() == {'uuid': 'uuid', 'status': 'sent'}
+    mock_transfer_usecase.return_value.execute.assert_not_called()
+
+@patch('main.presentation_layer.views.api.TransferUseCase')
+def test_transfer_status_success(mock_transfer_usecase, client):
+    mock_transfer_usecase.return_value.get.return_value = {'status': 'sent'}
+    resp = client.get('/api/transfers/0b0c7a47-43a5-4a43-9d0e-6f7b4bd5f0a1')
+    assert resp.status_code == 200
+    assert resp.get_json() == {'status': 'sent'}
+
+@patch('main.presentation_layer.views.api.TransferUseCase')
+def test_transfer_status_not_found(mock_transfer_usecase, client):
+    mock_transfer_usecase.return_value.get.return_value = None
+    resp = client.get('/api/transfers/0b0c7a47-43a5-4a43-9d0e-6f7b4bd5f0a1')
+    assert resp.status_code == 404
+
+@patch('main.presentation_layer.views.api.TransferUseCase')
+def test_transfer_batch_success(mock_transfer_usecase, client):
+    mock_transfer_usecase.return_value.execute_batch.return_value = ({'batch_uuid': 'batch'}, 202)
+    payload = {
+        'from_address': 'from',
+        'private_key': 'key',
+        'transfers': [{'to_address': 'to', 'asset': 'ETH', 'amount': 1}]
+    }
+    resp = client.post('/api/transfer/batch', data=json.dumps(payload), content_type='application/json')
+    assert resp.status_code == 202
+    assert resp.get_json() == {'batch_uuid': 'batch'}
+    mock_transfer_usecase.return_value.execute_batch.assert_called_once_with(
+        from_address='from', private_key='key', transfers=payload['transfers'], mode=None, urgency='standard')
+
+@patch('main.presentation_layer.views.api.TransferUseCase')
+def test_transfer_batch_status_not_found(mock_transfer_usecase, client):
+    mock_transfer_usecase.return_value.get_batch.return_value = None
+    resp = client.get('/api/transfers/batch/0b0c7a47-43a5-4a43-9d0e-6f7b4bd5f0a1')
+    assert resp.status_code == 404
+
+@patch('main.presentation_layer.views.api.FeeUseCase')
+def test_fees_success(mock_fee_usecase, client):
+    mock_fee_usecase.return_value.get_quotes.return_value = {'block': 1, 'base_fee': 10, 'tiers': {}}
+    resp = client.get('/api/fees')
+    assert resp.status_code == 200
+    assert resp.get_json()['base_fee'] == 10
+
+@patch('main.presentation_layer.views.api.FeeUseCase')
+def test_fees_failure(mock_fee_usecase, client):
+    mock_fee_usecase.return_value.get_quotes.side_effect = Exception("fail")
+    resp = client.get('/api/fees')
+    assert resp.status_code == 400
+
+@patch('main.presentation_layer.views.api.metrics')
+def test_metrics(mock_metrics, client):
+    mock_metrics.snapshot.return_value = {'counters': {'rpc.retries.node': 1}, 'timings': {}, 'gauges': {}}
+    resp = client.get('/api/metrics')
+    assert resp.status_code == 200
+    assert resp.get_json()['counters'] == {'rpc.retries.node': 1}